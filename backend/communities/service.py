@@ -36,6 +36,8 @@ from communities.models import (
 )
 from editor.models import PostPollVote
 from editor import service as editor_service
+from feeds.post_cards import post_card_context
+from feeds.public_feed_signals import record_public_feed_changes
 from feeds.post_paths import build_post_public_path, slugify_title
 from feeds.models import (
     Author,
@@ -778,6 +780,10 @@ def _is_telegram_channel_author(author: Author | None) -> bool:
 
 
 def _post_comun(post: Post) -> Comun | None:
+    card_context = post_card_context(post)
+    if card_context is not None:
+        return card_context.comuns[post.id]
+
     comun_slug = _post_comun_slug(post)
     if comun_slug:
         comun = Comun.objects.filter(slug=comun_slug, is_active=True).first()
@@ -816,8 +822,11 @@ def _serialize_post_comun(
         return None
 
     normalized_language = str(language or "ru").strip().lower()
+    card_context = post_card_context(post, current_user)
     translation = None
-    if normalized_language != "ru":
+    if card_context is not None and card_context.language == normalized_language:
+        translation = card_context.comun_translations.get(comun.id)
+    elif normalized_language != "ru":
         translation = (
             ComunTranslation.objects.filter(
                 comun=comun,
@@ -845,7 +854,11 @@ def _serialize_post_comun(
         "authors_count": int(getattr(comun, "authors_count", 0) or 0),
         "knowledge_base_enabled": bool(getattr(comun, "knowledge_base_enabled", False)),
         "roadmap_enabled": bool(getattr(comun, "roadmap_enabled", False)),
-        "can_moderate": _comun_is_moderator(current_user, comun),
+        "can_moderate": (
+            card_context.is_moderator(comun)
+            if card_context is not None
+            else _comun_is_moderator(current_user, comun)
+        ),
         "can_manage_roadmap": bool(current_user and comun.creator_id == current_user.id),
     }
 
@@ -1060,6 +1073,41 @@ def _payload_contains_external_links(
     return False
 
 
+def _post_contains_external_links(title: str | None, content: str | None, raw_data) -> bool:
+    template_payload, _template_error = editor_service._normalize_post_template_payload(
+        raw_data.get("template") if isinstance(raw_data, dict) else None
+    )
+    return _payload_contains_external_links(
+        title=title,
+        content=content,
+        template_payload=template_payload,
+    )
+
+
+def refresh_posts_external_links_flag(*, post_ids=None, batch_size: int = 500) -> dict[str, int]:
+    stats = {"posts": 0, "updated": 0}
+    posts = Post.objects.only("id", "title", "content", "raw_data", "has_external_links").order_by("id")
+    if post_ids is not None:
+        posts = posts.filter(id__in=list(post_ids))
+    batch_size = max(1, int(batch_size))
+    changed: list[Post] = []
+    for post in posts.iterator(chunk_size=batch_size):
+        stats["posts"] += 1
+        has_external_links = _post_contains_external_links(post.title, post.content, post.raw_data)
+        if has_external_links == post.has_external_links:
+            continue
+        post.has_external_links = has_external_links
+        changed.append(post)
+        if len(changed) >= batch_size:
+            Post.objects.bulk_update(changed, ["has_external_links"])
+            stats["updated"] += len(changed)
+            changed = []
+    if changed:
+        Post.objects.bulk_update(changed, ["has_external_links"])
+        stats["updated"] += len(changed)
+    return stats
+
+
 def _parse_serialized_editor_model(raw_value: object) -> dict | None:
     raw = str(raw_value or "").strip() if isinstance(raw_value, str) else ""
     if not raw:
@@ -1341,6 +1389,8 @@ def _recalculate_comun_rating(comun_id: int) -> tuple[int, int, Decimal]:
         votes_down=votes_down,
         rating_score=rating_score,
     )
+    # .update() sends no post_save, and rating_score feeds community_rating.
+    record_public_feed_changes(comun_ids=[comun_id], reason="comun_rating")
     return votes_up, votes_down, rating_score
 
 
@@ -1380,6 +1430,7 @@ def _apply_comun_rating_delta_for_post(
             contribution.score = _quantize_rating(_decimal_rating(contribution.score) + rating_delta)
             contribution.save(update_fields=["score", "updated_at"])
         Comun.objects.filter(id__in=comun_ids).update(rating_score=F("rating_score") + rating_delta)
+        record_public_feed_changes(comun_ids=comun_ids, reason="comun_rating")
     return rating_delta
 
 
@@ -1681,21 +1732,8 @@ def _comun_posts_base_queryset(comun: Comun, now=None):
         if blocked_tag_lemmas:
             blocked_tags_filter |= Q(tags__lemma__in=blocked_tag_lemmas)
         base_query = base_query.exclude(blocked_tags_filter).distinct()
-    blocked_post_ids: list[int] = []
     if bool(getattr(comun, "forbid_external_links", False)):
-        for row in base_query.values("id", "title", "content", "raw_data").iterator(chunk_size=200):
-            raw_data = row.get("raw_data") if isinstance(row, dict) else {}
-            template_payload, _template_error = editor_service._normalize_post_template_payload(
-                raw_data.get("template") if isinstance(raw_data, dict) else None
-            )
-            if _payload_contains_external_links(
-                title=row.get("title") if isinstance(row, dict) else None,
-                content=row.get("content") if isinstance(row, dict) else None,
-                template_payload=template_payload,
-            ):
-                blocked_post_ids.append(int(row["id"]))
-    if blocked_post_ids:
-        base_query = base_query.exclude(id__in=blocked_post_ids)
+        base_query = base_query.filter(has_external_links=False)
     return base_query
 
 
@@ -1851,6 +1889,7 @@ __all__ = [
     "_parse_post_reference_to_id",
     "_parse_tag_payload",
     "_payload_contains_external_links",
+    "_post_contains_external_links",
     "_post_belongs_to_comun",
     "_post_comun",
     "_post_comun_slug",
@@ -1866,6 +1905,7 @@ __all__ = [
     "_sync_comun_subscriber_counts",
     "_sync_comun_logo_from_author",
     "_text_contains_external_links",
+    "refresh_posts_external_links_flag",
 ]
 
 
@@ -7,6 +7,7 @@ from django.utils import timezone
 
 from communities.models import Comun
 from feeds.models import Author, Post, PostComment, PostDailyView
+from feeds.post_views import flush_post_views
 from my_feed.models import ComunSubscriptionEvent
 from users.service import _issue_token
 
@@ -112,5 +113,7 @@ class ComunAnalyticsTests(TestCase):
         response = self.client.post(reverse("post-view", kwargs={"post_id": self.post.id}))
 
         self.assertEqual(response.status_code, 200, response.content.decode())
+        self.assertFalse(PostDailyView.objects.filter(post=self.post).exists())
+        flush_post_views()
         metric = PostDailyView.objects.get(post=self.post, date=timezone.localdate())
         self.assertEqual(metric.views_count, 1)
@@ -5,7 +5,7 @@ from django.test import TestCase
 from django.urls import reverse
 
 from communities.models import Comun
-from my_feed.models import ComunSubscriptionEvent, UserFeedSettings
+from my_feed.models import ComunSubscription, ComunSubscriptionEvent, UserFeedSettings
 
 
 User = get_user_model()
@@ -96,6 +96,15 @@ class ComunManagementPermissionTests(TestCase):
         self.assertIn(self.comun.slug, owner_settings.my_feed_comuns)
         self.comun.refresh_from_db()
         self.assertEqual(self.comun.subscribers_count, 3)
+        self.assertEqual(
+            set(
+                ComunSubscription.objects.filter(
+                    comun=self.comun,
+                    category__isnull=True,
+                ).values_list("user_id", flat=True)
+            ),
+            {self.owner.id, self.moderator.id, self.outsider.id},
+        )
         self.assertEqual(
             ComunSubscriptionEvent.objects.filter(
                 comun=self.comun,
@@ -20,6 +20,7 @@ from feeds.models import (
     ComunTranslation,
     POST_TRANSLATION_STATUS_TRANSLATED,
     Post,
+    PostViewIncrement,
     Tag,
 )
 from my_feed.models import UserFeedSettings
@@ -239,7 +240,14 @@ class ComunPostingApiTests(TestCase):
         self.assertEqual(comun["product_description"], "Community description")
         self.assertEqual(comun["subscribers_count"], 42)
         self.assertEqual(comun["authors_count"], 7)
-        self.assertFalse(any("COUNT(" in query["sql"].upper() for query in queries))
+        # Buffered view increments are counted per request; community counters are not.
+        view_buffer_table = PostViewIncrement._meta.db_table
+        self.assertFalse(
+            any(
+                "COUNT(" in query["sql"].upper() and view_buffer_table not in query["sql"]
+                for query in queries
+            )
+        )
 
     def test_post_detail_uses_creator_as_minimum_subscriber_count(self):
         self.comun.product_description = "Описание сообщества"
@@ -1086,6 +1094,44 @@ class ComunPostingApiTests(TestCase):
         self.assertTrue(moderated_payload["can_moderate"])
         self.assertTrue(moderated_payload["can_start_post"])
 
+    def test_forbid_external_links_filters_on_stored_post_flag(self):
+        author = Author.objects.create(username="links-author")
+        raw_data = {"source": "manual_comun", "comun_slug": self.comun.slug}
+        clean_post = Post.objects.create(
+            author=author,
+            message_id=1,
+            title="Без ссылок",
+            content="Просто текст и https://comuna.ru/posts/1",
+            raw_data=raw_data,
+        )
+        linked_post = Post.objects.create(
+            author=author,
+            message_id=2,
+            title="Со ссылкой",
+            content="Смотрите https://example.com/record",
+            raw_data=raw_data,
+        )
+        self.assertFalse(clean_post.has_external_links)
+        self.assertTrue(linked_post.has_external_links)
+
+        self.comun.forbid_external_links = True
+        self.comun.save(update_fields=["forbid_external_links"])
+        with CaptureQueriesContext(connection) as queries:
+            post_ids = list(community_service._comun_posts_base_queryset(self.comun).values_list("id", flat=True))
+        self.assertEqual(post_ids, [clean_post.id])
+        self.assertFalse(any('"content"' in query["sql"] for query in queries.captured_queries))
+
+        linked_post.content = "Ссылку убрали"
+        linked_post.save(update_fields=["content"])
+        linked_post.refresh_from_db()
+        self.assertFalse(linked_post.has_external_links)
+
+        Post.objects.filter(id=clean_post.id).update(content="Теперь https://example.org")
+        stats = community_service.refresh_posts_external_links_flag()
+        self.assertEqual(stats, {"posts": 2, "updated": 1})
+        post_ids = set(community_service._comun_posts_base_queryset(self.comun).values_list("id", flat=True))
+        self.assertEqual(post_ids, {linked_post.id})
+
 
 def editor_personal_author_id(user):
     from editor import service as editor_service
@@ -42,7 +42,9 @@ from editor.models import (
     normalize_allowed_post_templates_override,
     normalize_post_template_type_code,
 )
+from feeds.post_cards import PostCardContext
 from feeds.post_paths import build_post_public_path, slugify_title
+from feeds.public_feed_signals import record_public_feed_changes
 from feeds.language_detection import detect_post_language, post_language_fallback_for_user
 from editor import service as editor_service
 from feeds.models import (
@@ -1156,6 +1158,7 @@ def _recalculate_comun_rating(comun_id: int) -> tuple[int, int, int]:
         votes_down=votes_down,
         rating_score=rating_score,
     )
+    record_public_feed_changes(comun_ids=[comun_id], reason="comun_rating")
     return votes_up, votes_down, rating_score
 
 
@@ -1574,20 +1577,7 @@ def _comun_posts_base_queryset(comun: Comun, now=None):
             blocked_tags_filter |= Q(tags__lemma__in=blocked_tag_lemmas)
         base_query = base_query.exclude(blocked_tags_filter).distinct()
     if bool(getattr(comun, "forbid_external_links", False)):
-        blocked_post_ids: list[int] = []
-        for row in base_query.values("id", "title", "content", "raw_data").iterator(chunk_size=200):
-            raw_data = row.get("raw_data") if isinstance(row, dict) else {}
-            template_payload, _template_error = editor_service._normalize_post_template_payload(
-                raw_data.get("template") if isinstance(raw_data, dict) else None
-            )
-            if _payload_contains_external_links(
-                title=row.get("title") if isinstance(row, dict) else None,
-                content=row.get("content") if isinstance(row, dict) else None,
-                template_payload=template_payload,
-            ):
-                blocked_post_ids.append(int(row["id"]))
-        if blocked_post_ids:
-            base_query = base_query.exclude(id__in=blocked_post_ids)
+        base_query = base_query.filter(has_external_links=False)
     return base_query
 
 
@@ -3221,8 +3211,7 @@ def comun_posts(request: HttpRequest, slug: str) -> HttpResponse:
         .order_by("-created_at")[offset : offset + limit]
     )
 
-    community_service._attach_post_user_votes(posts, current_user)
-    favorite_post_ids = community_service._favorite_post_ids_for_user(posts, current_user)
+    favorite_post_ids = PostCardContext.load(posts, current_user, language=language).favorite_post_ids
     assignments = {
         assignment.post_id: assignment
         for assignment in ComunPostCategoryAssignment.objects.select_related("category").filter(
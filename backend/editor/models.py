@@ -3,6 +3,7 @@ from __future__ import annotations
 import re
 
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.fields import ArrayField
 from django.db import OperationalError, ProgrammingError
 from django.db import models
 
@@ -560,6 +561,26 @@ class PostPollVote(models.Model):
         return f"{self.post_id}:{self.user_id}"
 
 
+class PostPollTally(models.Model):
+    post = models.OneToOneField(
+        "feeds.Post",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="poll_tally",
+    )
+    option_counts = ArrayField(models.PositiveIntegerField(), default=list, blank=True)
+    voters_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "feeds"
+        verbose_name = "Итоги опроса"
+        verbose_name_plural = "Итоги опросов"
+
+    def __str__(self) -> str:
+        return f"{self.post_id}:{self.voters_count}"
+
+
 class PostRatingVote(models.Model):
     post = models.ForeignKey("feeds.Post", on_delete=models.CASCADE, related_name="rating_votes")
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="post_rating_votes")
@@ -712,6 +733,7 @@ __all__ = [
     "ComunCustomPostTemplateBlock",
     "ComunCustomPostTemplateField",
     "PostTemplateConfig",
+    "PostPollTally",
     "PostPollVote",
     "PostRatingVote",
     "DraftBlockCommentThread",
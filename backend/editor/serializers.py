@@ -18,6 +18,7 @@ from editor.models import (
     normalize_template_editor_blocks_for_template,
 )
 from feeds.models import Post, PostFavorite
+from feeds.post_cards import post_card_context
 from communities.models import Comun, ComunPostCategoryAssignment
 from rabotaem_backend.media_urls import rewrite_public_media_payload, rewrite_public_media_urls
 
@@ -91,6 +92,26 @@ def _serialize_post_rating_block(
     *,
     include_legacy_votes: bool = False,
 ) -> dict:
+    card_context = post_card_context(post, user)
+    if card_context is not None:
+        average_raw, votes_count, user_vote = card_context.rating_block(post, block_id)
+        weighted_sum = float(average_raw) * votes_count if average_raw is not None else 0.0
+        if include_legacy_votes:
+            legacy_average_raw, legacy_votes_count, legacy_user_vote = card_context.rating_block(post, "")
+            if legacy_average_raw is not None and legacy_votes_count > 0:
+                weighted_sum += float(legacy_average_raw) * legacy_votes_count
+                votes_count += legacy_votes_count
+            if user_vote is None:
+                user_vote = legacy_user_vote
+        return {
+            "block_id": block_id,
+            "scale_min": 1,
+            "scale_max": 10,
+            "average_value": round(weighted_sum / votes_count, 1) if votes_count > 0 else None,
+            "votes_count": votes_count,
+            "user_vote": user_vote,
+        }
+
     current_votes = PostRatingVote.objects.filter(post=post, block_id=block_id)
     current_aggregate = current_votes.aggregate(
         average_value=Avg("value"),
@@ -195,6 +216,9 @@ def _user_can_manage_bug_report_status(user: User | None, post: Post) -> bool:
     comun = _fv().community_service._post_comun(post)
     if not comun:
         return False
+    card_context = post_card_context(post, user)
+    if card_context is not None:
+        return card_context.is_moderator(comun)
     return _fv().community_service._comun_is_moderator(user, comun)
 
 
@@ -205,6 +229,9 @@ def _serialize_bug_report_confirmation(post: Post, user: User | None) -> dict |
         or str(template_payload.get("type") or "").strip() != POST_TEMPLATE_TYPE_BUG_REPORT
     ):
         return None
+    card_context = post_card_context(post, user)
+    if card_context is not None:
+        return card_context.bug_report_confirmation(post)
     confirmations = PostBugReportConfirmation.objects.filter(post=post)
     return {
         "count": confirmations.count(),
@@ -9,8 +9,10 @@ from communities import views as community_views
 from communities import service as community_service
 from communities.models import Comun, ComunCategory, ComunPostCategoryAssignment
 from django.conf import settings
+from django.core.files.storage import default_storage
 from django.contrib.auth import get_user_model
 from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.db import transaction
 from django.db.models import Q
 from django.utils import timezone
 from django.utils.dateparse import parse_datetime
@@ -54,7 +56,8 @@ from editor.service import (
 )
 from editor import service as editor_service
 from feeds.language_detection import detect_post_language, post_language_fallback_for_user
-from feeds.models import Post, PostDraftAccess
+from feeds.image_variants import written_image_variants
+from feeds.models import ImageVariantJob, Post, PostDraftAccess
 from notifications.service import create_user_notification
 from rabotaem_backend.media_urls import public_url
 from users.models import AuthorAdmin
@@ -1005,7 +1008,12 @@ def user_upload(request: HttpRequest) -> HttpResponse:
         ext = ".jpg"
     filename = f"uploads/manual/{base_name}-{secrets.token_hex(8)}{ext}"
     upload.seek(0)
-    image_set = save_image_with_variants(data=upload.read(), original_path=filename)
+    image_set = save_image_with_variants(
+        data=upload.read(),
+        original_path=filename,
+        defer_variants=True,
+        user=user,
+    )
     url = _absolute_storage_url(request, image_set.default_url)
 
     return JsonResponse(
@@ -1020,6 +1028,32 @@ def user_upload(request: HttpRequest) -> HttpResponse:
                 }
                 for variant in image_set.variants
             ],
+            # Poll user_upload_variants for the widths generated in the background.
+            "variants_job_id": image_set.variants_job_id,
+        }
+    )
+
+
+def user_upload_variants(request: HttpRequest, job_id: int) -> HttpResponse:
+    user = _fv()._get_user_from_request(request)
+    if not user:
+        return JsonResponse({"ok": False, "error": "unauthorized"}, status=401)
+    if request.method != "GET":
+        return JsonResponse({"ok": False, "error": "method not allowed"}, status=405)
+    job = ImageVariantJob.objects.filter(pk=job_id, user=user).only("id", "status", "variants").first()
+    if job is None:
+        return JsonResponse({"ok": False, "error": "not found"}, status=404)
+    return JsonResponse(
+        {
+            "ok": True,
+            "status": job.status,
+            "variants": [
+                {
+                    "width": width,
+                    "url": _absolute_storage_url(request, default_storage.url(path)),
+                }
+                for width, path in written_image_variants(job)
+            ],
         }
     )
 
@@ -1522,7 +1556,8 @@ def post_poll_vote(request: HttpRequest, post_id: int) -> HttpResponse:
     if not normalized:
         return JsonResponse({"ok": False, "error": "options are required"}, status=400)
 
-    PostPollVote.objects.create(post=post, user=user, selected_options=normalized)
+    with transaction.atomic():
+        PostPollVote.objects.create(post=post, user=user, selected_options=normalized)
 
     live_poll = _fv()._live_poll_for_post(post, user)
     if not live_poll:
@@ -1612,4 +1647,5 @@ __all__ = [
     "user_post_update",
     "user_posts",
     "user_upload",
+    "user_upload_variants",
 ]
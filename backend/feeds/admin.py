@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied
-from django.http import HttpRequest, HttpResponseRedirect
+from django.http import HttpRequest, HttpResponseRedirect, JsonResponse
 from django.urls import path, reverse
 from django.utils.html import format_html_join
 
@@ -24,12 +24,14 @@ from .models import (
     Tag,
     TagRelation,
     TagRelationType,
+    TranslationMemoryEntry,
 )
 from .translation_service import (
     PostTranslationError,
     SUPPORTED_TRANSLATION_LANGUAGES,
     get_translation_language_label,
     queue_post_translation,
+    serialize_post_translation_status,
 )
 
 
@@ -100,6 +102,11 @@ class PostAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.translate_view),
                 name="feeds_post_translate",
             ),
+            path(
+                "<path:object_id>/translation-status/",
+                self.admin_site.admin_view(self.translation_status_view),
+                name="feeds_post_translation_status",
+            ),
         ]
         return custom_urls + urls
 
@@ -121,6 +128,12 @@ class PostAdmin(admin.ModelAdmin):
                 "Перевести все",
             )
         )
+        links.append(
+            (
+                reverse("admin:feeds_post_translation_status", args=[obj.pk]),
+                "Статус перевода",
+            )
+        )
         return format_html_join(" ", '<a class="button" href="{}">{}</a>', links)
 
     def translate_view(self, request: HttpRequest, object_id: str, language: str):
@@ -145,7 +158,7 @@ class PostAdmin(admin.ModelAdmin):
             )
             messages.success(
                 request,
-                f"Перевод запущен: {labels}. Обновите страницу через минуту.",
+                f"Перевод поставлен в очередь: {labels}. Обновите страницу через минуту.",
             )
         except PostTranslationError as exc:
             messages.error(request, f"Не удалось запустить перевод: {exc}")
@@ -153,6 +166,14 @@ class PostAdmin(admin.ModelAdmin):
         fallback_url = reverse("admin:feeds_post_change", args=[post.pk])
         return HttpResponseRedirect(request.META.get("HTTP_REFERER") or fallback_url)
 
+    def translation_status_view(self, request: HttpRequest, object_id: str):
+        post = self.get_object(request, object_id)
+        if post is None:
+            return JsonResponse({"detail": "Пост не найден"}, status=404)
+        if not self.has_view_permission(request, post):
+            raise PermissionDenied
+        return JsonResponse(serialize_post_translation_status(post))
+
 
 class PostTranslationInline(admin.StackedInline):
     model = PostTranslation
@@ -199,6 +220,8 @@ class ContentTranslationSettingsAdmin(admin.ModelAdmin):
         "post_daily_limit",
         "comment_daily_limit",
         "post_object_daily_limit",
+        "provider_concurrency",
+        "provider_tokens_per_minute",
         "updated_at",
     )
 
@@ -212,6 +235,13 @@ class ContentTranslationRunAdmin(admin.ModelAdmin):
     date_hierarchy = "created_at"
 
 
+@admin.register(TranslationMemoryEntry)
+class TranslationMemoryEntryAdmin(admin.ModelAdmin):
+    list_display = ("source_language", "target_language", "model", "hit_count", "created_at", "last_used_at")
+    list_filter = ("source_language", "target_language", "model")
+    search_fields = ("segment_hash",)
+
+
 @admin.register(PostCommentTranslation)
 class PostCommentTranslationAdmin(admin.ModelAdmin):
     list_display = ("comment", "language", "status", "model", "updated_at")
@@ -248,8 +278,8 @@ class ComunTranslationAdmin(admin.ModelAdmin):
 
 @admin.register(ContentTranslationTask)
 class ContentTranslationTaskAdmin(admin.ModelAdmin):
-    list_display = ("kind", "object_id", "status", "scheduled_at", "attempts", "updated_at")
-    list_filter = ("kind", "status")
+    list_display = ("kind", "object_id", "status", "priority", "scheduled_at", "attempts", "updated_at")
+    list_filter = ("kind", "status", "priority")
     search_fields = ("object_id", "last_error")
     readonly_fields = ("created_at", "updated_at", "locked_at")
 
@@ -7,4 +7,8 @@ class FeedsConfig(AppConfig):
 
     def ready(self):
         import feeds.cache_signals  # noqa: F401
+        import feeds.poll_signals  # noqa: F401
+        import feeds.public_feed_signals  # noqa: F401
+        import feeds.search_signals  # noqa: F401
+        import feeds.social_image_signals  # noqa: F401
         import feeds.translation_signals  # noqa: F401
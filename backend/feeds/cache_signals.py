@@ -1,9 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from rabotaem_backend.cache import bump_public_cache_prefix
+from communities.models import Comun
+from rabotaem_backend.cache import cache_tag, invalidate_cache_tags
 
-from .models import Post
+from .models import Author, ComunTranslation, Post, PostTranslation
 
 
 _POST_DETAIL_FIELDS = {
@@ -25,4 +26,29 @@ _POST_DETAIL_FIELDS = {
 @receiver(post_save, sender=Post, dispatch_uid="feeds.invalidate_post_detail_cache")
 def invalidate_post_detail_cache(sender, instance, created, update_fields, **kwargs):
     if created or update_fields is None or _POST_DETAIL_FIELDS.intersection(update_fields):
-        bump_public_cache_prefix("post-detail")
+        invalidate_cache_tags(cache_tag("post", instance.pk))
+
+
+@receiver(post_delete, sender=Post, dispatch_uid="feeds.invalidate_deleted_post_cache")
+def invalidate_deleted_post_cache(sender, instance, **kwargs):
+    invalidate_cache_tags(cache_tag("post", instance.pk))
+
+
+@receiver(post_save, sender=PostTranslation, dispatch_uid="feeds.invalidate_post_translation_cache")
+def invalidate_post_translation_cache(sender, instance, **kwargs):
+    invalidate_cache_tags(cache_tag("post", instance.post_id))
+
+
+@receiver(post_save, sender=Author, dispatch_uid="feeds.invalidate_author_cache")
+def invalidate_author_cache(sender, instance, **kwargs):
+    invalidate_cache_tags(cache_tag("author", instance.pk))
+
+
+@receiver(post_save, sender=Comun, dispatch_uid="feeds.invalidate_comun_cache")
+def invalidate_comun_cache(sender, instance, **kwargs):
+    invalidate_cache_tags(cache_tag("comun", instance.pk))
+
+
+@receiver(post_save, sender=ComunTranslation, dispatch_uid="feeds.invalidate_comun_translation_cache")
+def invalidate_comun_translation_cache(sender, instance, **kwargs):
+    invalidate_cache_tags(cache_tag("comun", instance.comun_id))
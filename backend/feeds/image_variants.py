@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from datetime import timedelta
+
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from feeds.models import (
+    IMAGE_VARIANT_JOB_STATUS_DONE,
+    IMAGE_VARIANT_JOB_STATUS_FAILED,
+    IMAGE_VARIANT_JOB_STATUS_PENDING,
+    IMAGE_VARIANT_JOB_STATUS_RUNNING,
+    ImageVariantJob,
+)
+from rabotaem_backend.images import WEBP_METHOD, encode_webp_variant_from_bytes, save_webp_variant_bytes
+
+IMAGE_VARIANT_JOB_MAX_ATTEMPTS = 3
+IMAGE_VARIANT_JOB_STALE_AFTER = timedelta(minutes=10)
+IMAGE_VARIANT_UPLOAD_WORKERS = 4
+
+
+def enqueue_image_variant_job(
+    *,
+    original_path: str,
+    variants: list[tuple[int, str]],
+    delete_original: bool = False,
+    user=None,
+) -> ImageVariantJob:
+    return ImageVariantJob.objects.create(
+        original_path=original_path,
+        variants=[{"width": width, "path": path, "done": False} for width, path in variants],
+        delete_original=delete_original,
+        user=user,
+    )
+
+
+def written_image_variants(job: ImageVariantJob) -> list[tuple[int, str]]:
+    return [(variant["width"], variant["path"]) for variant in job.variants if variant.get("done")]
+
+
+def image_variant_encoder_pool(workers: int) -> ProcessPoolExecutor:
+    # Workers only run Pillow; spawn keeps them free of inherited DB sockets.
+    return ProcessPoolExecutor(max_workers=max(1, workers), mp_context=multiprocessing.get_context("spawn"))
+
+
+def _reset_stale_image_variant_jobs(now) -> int:
+    stale_jobs = ImageVariantJob.objects.filter(
+        status=IMAGE_VARIANT_JOB_STATUS_RUNNING,
+        locked_at__lt=now - IMAGE_VARIANT_JOB_STALE_AFTER,
+    )
+    failed = stale_jobs.filter(attempts__gte=IMAGE_VARIANT_JOB_MAX_ATTEMPTS).update(
+        status=IMAGE_VARIANT_JOB_STATUS_FAILED,
+        locked_at=None,
+        last_error="Исчерпан лимит попыток после таймаута обработчика",
+        updated_at=now,
+    )
+    pending = stale_jobs.filter(attempts__lt=IMAGE_VARIANT_JOB_MAX_ATTEMPTS).update(
+        status=IMAGE_VARIANT_JOB_STATUS_PENDING,
+        locked_at=None,
+        updated_at=now,
+    )
+    return failed + pending
+
+
+def _claim_image_variant_jobs(*, limit: int) -> list[ImageVariantJob]:
+    with transaction.atomic():
+        jobs = list(
+            ImageVariantJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=IMAGE_VARIANT_JOB_STATUS_PENDING,
+                attempts__lt=IMAGE_VARIANT_JOB_MAX_ATTEMPTS,
+            )
+            .order_by("id")[:limit]
+        )
+        locked_at = timezone.now()
+        for job in jobs:
+            job.status = IMAGE_VARIANT_JOB_STATUS_RUNNING
+            job.locked_at = locked_at
+            job.attempts = int(job.attempts or 0) + 1
+            job.updated_at = locked_at
+        ImageVariantJob.objects.bulk_update(jobs, ["status", "locked_at", "attempts", "updated_at"])
+        return jobs
+
+
+def _generate_job_variants(job: ImageVariantJob, *, encoder: Executor, uploader: Executor) -> None:
+    pending = [variant for variant in job.variants if not variant.get("done")]
+    for variant in pending:
+        # Uploads finished by an interrupted attempt are kept as they are.
+        if default_storage.exists(variant["path"]):
+            variant["done"] = True
+    pending = [variant for variant in pending if not variant.get("done")]
+    if not pending:
+        return
+
+    with default_storage.open(job.original_path, "rb") as original:
+        data = original.read()
+    encodes = {
+        encoder.submit(encode_webp_variant_from_bytes, data, variant["width"], WEBP_METHOD): variant
+        for variant in pending
+    }
+    uploads = {}
+    for future in as_completed(encodes):
+        variant = encodes[future]
+        encoded = future.result()
+        if encoded is None:
+            raise ValueError(f"Не удалось закодировать вариант {variant['width']}px")
+        uploads[uploader.submit(save_webp_variant_bytes, variant["path"], encoded[1])] = variant
+    for future in as_completed(uploads):
+        variant = uploads[future]
+        variant["path"] = future.result()
+        variant["done"] = True
+
+
+def _process_image_variant_job(job: ImageVariantJob, *, encoder: Executor, uploader: Executor) -> str:
+    try:
+        _generate_job_variants(job, encoder=encoder, uploader=uploader)
+        if job.delete_original:
+            default_storage.delete(job.original_path)
+    except Exception as exc:
+        job.status = (
+            IMAGE_VARIANT_JOB_STATUS_PENDING
+            if job.attempts < IMAGE_VARIANT_JOB_MAX_ATTEMPTS
+            else IMAGE_VARIANT_JOB_STATUS_FAILED
+        )
+        job.last_error = str(exc)[:2000]
+        result = "retry" if job.status == IMAGE_VARIANT_JOB_STATUS_PENDING else "failed"
+    else:
+        job.status = IMAGE_VARIANT_JOB_STATUS_DONE
+        job.last_error = ""
+        result = "done"
+    job.locked_at = None
+    job.save(update_fields=["variants", "status", "last_error", "locked_at", "updated_at"])
+    return result
+
+
+def process_image_variant_jobs(*, limit: int = 20, encoder: Executor | None = None) -> dict[str, int]:
+    _reset_stale_image_variant_jobs(timezone.now())
+    jobs = _claim_image_variant_jobs(limit=max(1, int(limit)))
+    stats = {"processed": 0, "done": 0, "retry": 0, "failed": 0}
+    if not jobs:
+        return stats
+    encoder_context = nullcontext(encoder) if encoder is not None else ThreadPoolExecutor(max_workers=1)
+    with encoder_context as job_encoder, ThreadPoolExecutor(max_workers=IMAGE_VARIANT_UPLOAD_WORKERS) as uploader:
+        for job in jobs:
+            result = _process_image_variant_job(job, encoder=job_encoder, uploader=uploader)
+            stats["processed"] += 1
+            stats[result] += 1
+    return stats
+
+
+__all__ = [
+    "IMAGE_VARIANT_JOB_MAX_ATTEMPTS",
+    "enqueue_image_variant_job",
+    "image_variant_encoder_pool",
+    "process_image_variant_jobs",
+    "written_image_variants",
+]
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from communities.service import refresh_posts_external_links_flag
+
+
+class Command(BaseCommand):
+    help = "Recomputes Post.has_external_links used by communities that forbid external links."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--post-id", type=int, action="append", dest="post_ids")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        stats = refresh_posts_external_links_flag(
+            post_ids=options["post_ids"],
+            batch_size=max(1, int(options["batch_size"])),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Backfilled external link flags: posts={posts} updated={updated}".format(**stats)
+            )
+        )
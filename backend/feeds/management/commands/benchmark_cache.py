@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import statistics
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+
+def _measure_hits(cache_backend, keys, rounds: int) -> list[float]:
+    timings = []
+    for _round in range(rounds):
+        for key in keys:
+            started = time.perf_counter()
+            cache_backend.get(key)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+    return timings
+
+
+def _summary(timings: list[float]) -> str:
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f"p50={statistics.median(timings):.1f}us p95={p95:.1f}us mean={statistics.fmean(timings):.1f}us"
+
+
+class Command(BaseCommand):
+    help = "Compares cache hit latency of a configured cache alias against an in-process LocMem cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--alias", default="default")
+        parser.add_argument("--keys", type=int, default=200)
+        parser.add_argument("--rounds", type=int, default=5)
+        parser.add_argument("--payload-bytes", type=int, default=2048)
+
+    def handle(self, *args, **options):
+        key_count = max(1, int(options["keys"]))
+        rounds = max(1, int(options["rounds"]))
+        payload = {"content": b"x" * max(0, int(options["payload_bytes"])), "status": 200}
+        keys = [f"cache-benchmark:{index}" for index in range(key_count)]
+        backends = {
+            "locmem": LocMemCache("cache-benchmark", {}),
+            options["alias"]: caches[options["alias"]],
+        }
+        for label, cache_backend in backends.items():
+            cache_backend.set_many({key: payload for key in keys}, timeout=300)
+            try:
+                timings = _measure_hits(cache_backend, keys, rounds)
+            finally:
+                cache_backend.delete_many(keys)
+            self.stdout.write(f"{label} ({type(cache_backend).__name__}): {_summary(timings)}")
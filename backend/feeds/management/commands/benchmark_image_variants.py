@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from feeds.image_variants import image_variant_encoder_pool
+from rabotaem_backend.images import (
+    IMAGE_VARIANT_WIDTHS,
+    PREVIEW_WEBP_METHOD,
+    WEBP_METHOD,
+    encode_webp_variant,
+    encode_webp_variant_from_bytes,
+    open_image,
+    planned_variant_widths,
+)
+
+_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks WebP variant generation over a directory of sample images: the old sequential "
+        "pass, the in-request preview and the pooled background pass. Nothing is written to storage."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("corpus", help="Directory with sample images.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--limit", type=int, default=0)
+
+    def handle(self, *args, **options):
+        corpus = Path(options["corpus"])
+        if not corpus.is_dir():
+            raise CommandError(f"Corpus directory does not exist: {corpus}")
+        paths = sorted(path for path in corpus.rglob("*") if path.suffix.lower() in _IMAGE_EXTENSIONS)
+        if options["limit"]:
+            paths = paths[: options["limit"]]
+        if not paths:
+            raise CommandError("Corpus has no images.")
+
+        totals = {"sequential": 0.0, "preview": 0.0, "pooled": 0.0}
+        with image_variant_encoder_pool(int(options["workers"])) as pool:
+            # Warm the pool so process start-up is not billed to the first image.
+            list(pool.map(abs, range(int(options["workers"]))))
+            for path in paths:
+                data = path.read_bytes()
+                timings = self._measure(data, pool)
+                if timings is None:
+                    self.stdout.write(f"{path.name}: not an image, skipped")
+                    continue
+                for label, seconds in timings.items():
+                    totals[label] += seconds
+                self.stdout.write(
+                    f"{path.name}: sequential={timings['sequential'] * 1000:.0f}ms "
+                    f"preview={timings['preview'] * 1000:.0f}ms pooled={timings['pooled'] * 1000:.0f}ms"
+                )
+        self.stdout.write(
+            "Total: sequential={sequential:.2f}s preview(in-request)={preview:.2f}s pooled(background)={pooled:.2f}s".format(
+                **totals
+            )
+        )
+
+    def _measure(self, data: bytes, pool) -> dict[str, float] | None:
+        started = time.perf_counter()
+        image = open_image(data)
+        if image is None:
+            return None
+        widths = planned_variant_widths(image.width, IMAGE_VARIANT_WIDTHS)
+        for width in widths:
+            encode_webp_variant(image, width, method=WEBP_METHOD)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        encode_webp_variant(open_image(data), widths[-1], method=PREVIEW_WEBP_METHOD)
+        preview = time.perf_counter() - started
+
+        started = time.perf_counter()
+        list(pool.map(encode_webp_variant_from_bytes, [data] * (len(widths) - 1), widths[:-1]))
+        pooled = time.perf_counter() - started
+        return {"sequential": sequential, "preview": preview, "pooled": pooled}
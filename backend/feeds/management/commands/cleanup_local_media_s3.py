@@ -13,6 +13,8 @@ from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 
+from rabotaem_backend.storage import prune_local_media_manifest
+
 
 REPORT_DIR_NAME = "_migration_reports"
 READ_CHUNK_SIZE = 1024 * 1024
@@ -146,6 +148,11 @@ class Command(BaseCommand):
                     f"errors={counts.get('delete_error', 0) + counts.get('content_mismatch', 0)}"
                 )
 
+        deleted_keys = [row["key"] for row in rows if row["deleted"]]
+        pruned = prune_local_media_manifest(deleted_keys) if deleted_keys else 0
+        if pruned:
+            self.stdout.write(f"Local media manifest entries removed: {pruned}")
+
         finished_at = timezone.now()
         summary = {
             "started_at": started_at.isoformat(),
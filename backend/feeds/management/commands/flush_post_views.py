@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from feeds.post_views import POST_VIEW_FLUSH_BATCH_SIZE, flush_post_views
+
+
+class Command(BaseCommand):
+    help = "Folds buffered post views into Post.real_views_count and PostDailyView in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=POST_VIEW_FLUSH_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument("--interval", type=int, default=5)
+
+    def handle(self, *args, **options):
+        batch_size = max(1, int(options["batch_size"]))
+        interval = max(1, int(options["interval"] or 5))
+        while True:
+            stats = flush_post_views(batch_size=batch_size)
+            if stats["views"] or not options["loop"]:
+                self.stdout.write(
+                    "Flushed post views: views={views} posts={posts} days={days}".format(**stats)
+                )
+            if options["loop"] and stats["views"] >= batch_size:
+                continue
+            if not options["loop"]:
+                break
+            time.sleep(interval)
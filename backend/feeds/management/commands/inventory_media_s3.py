@@ -22,6 +22,8 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import models
 from django.utils import timezone
 
+from rabotaem_backend.storage import local_media_manifest_path, write_local_media_manifest
+
 
 ABSOLUTE_MEDIA_URL_RE = re.compile(
     r"""(?:
@@ -136,6 +138,9 @@ class Command(BaseCommand):
             limit=max(0, int(options["limit"] or 0)),
         )
         self.stdout.write(f"Local files found: {len(local_files)}")
+        if not prefix and not options["limit"]:
+            manifest_path = write_local_media_manifest(item.key for item in local_files)
+            self.stdout.write(f"Local media manifest: {manifest_path}")
 
         references: list[MediaReference] = []
         if not options["skip_db_scan"]:
@@ -210,9 +215,12 @@ class Command(BaseCommand):
         files: list[LocalMediaFile] = []
         report_dir_resolved = report_dir.resolve()
 
+        manifest_path = local_media_manifest_path().resolve()
         for path in sorted(media_root.rglob("*")):
             if not path.is_file():
                 continue
+            if path.resolve() == manifest_path:
+                continue
             if self._is_inside(path.resolve(), report_dir_resolved):
                 continue
             if REPORT_DIR_NAME in path.relative_to(media_root).parts:
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from feeds.image_variants import image_variant_encoder_pool, process_image_variant_jobs
+
+
+class Command(BaseCommand):
+    help = "Encodes and uploads deferred WebP image variants using a process pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20)
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument("--interval", type=int, default=2)
+
+    def handle(self, *args, **options):
+        limit = max(1, int(options["limit"]))
+        interval = max(1, int(options["interval"] or 2))
+        with image_variant_encoder_pool(int(options["workers"])) as encoder:
+            while True:
+                stats = process_image_variant_jobs(limit=limit, encoder=encoder)
+                if stats["processed"] or not options["loop"]:
+                    self.stdout.write(
+                        "Image variant jobs: processed={processed} done={done} retry={retry} failed={failed}".format(
+                            **stats
+                        )
+                    )
+                if not options["loop"]:
+                    break
+                if stats["processed"] < limit:
+                    time.sleep(interval)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import signal
-import time
+import threading
 
 from django.core.management.base import BaseCommand
 
-from feeds.translation_service import process_due_translation_tasks
+from feeds.translation_service import get_content_translation_settings
+from feeds.translation_worker import TRANSLATION_WORKER_DEFAULT_CONCURRENCY, run_translation_worker
 
 
 class Command(BaseCommand):
@@ -15,35 +16,49 @@ class Command(BaseCommand):
         parser.add_argument("--limit", type=int, default=20)
         parser.add_argument("--loop", action="store_true")
         parser.add_argument("--interval", type=int, default=30)
-        parser.add_argument("--run-timeout", type=int, default=720)
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=0,
+            help="Tasks processed at once; defaults to the provider concurrency from translation settings.",
+        )
+        parser.add_argument(
+            "--shutdown-timeout",
+            type=int,
+            default=30,
+            help="Seconds to wait for running tasks on SIGTERM before returning them to the queue.",
+        )
 
     def handle(self, *args, **options):
         limit = max(int(options["limit"] or 20), 1)
         interval = max(int(options["interval"] or 30), 1)
-        run_timeout = max(int(options["run_timeout"] or 720), 1)
-
-        while True:
-            stats = {"processed": 0, "done": 0, "failed": 0, "skipped": 0}
-            for _ in range(limit):
-                signal.signal(signal.SIGALRM, _raise_timeout)
-                signal.alarm(run_timeout)
-                try:
-                    result = process_due_translation_tasks(limit=1)
-                finally:
-                    signal.alarm(0)
-                for key in stats:
-                    stats[key] += result.get(key, 0)
-                if result["processed"] == 0:
-                    break
-            self.stdout.write(
-                "processed={processed} done={done} failed={failed} skipped={skipped}".format(
-                    **stats
-                )
-            )
-            if not options["loop"]:
-                break
-            time.sleep(interval)
+        concurrency = int(options["concurrency"] or 0)
+        if concurrency <= 0:
+            # 0 means the provider has no concurrency cap; the pool still needs a size.
+            concurrency = int(get_content_translation_settings().provider_concurrency or 0)
+            if concurrency <= 0:
+                concurrency = TRANSLATION_WORKER_DEFAULT_CONCURRENCY
+
+        stop_event = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_args: stop_event.set())
 
+        stats = run_translation_worker(
+            concurrency=concurrency,
+            stop_event=stop_event,
+            limit=None if options["loop"] else limit,
+            loop=options["loop"],
+            idle_seconds=interval,
+            shutdown_timeout=max(int(options["shutdown_timeout"] or 0), 0),
+            report=self._report if options["loop"] else None,
+            report_interval=interval,
+        )
+        if not options["loop"]:
+            self._report(stats)
 
-def _raise_timeout(signum, frame):
-    raise TimeoutError("Translation task processor exceeded run timeout")
+    def _report(self, stats: dict[str, int]) -> None:
+        self.stdout.write(
+            "processed={processed} done={done} failed={failed} skipped={skipped} released={released}".format(
+                **stats
+            )
+        )
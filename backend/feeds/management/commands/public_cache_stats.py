@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.urls import get_resolver
+
+from rabotaem_backend.cache import ANONYMOUS_CACHE_OUTCOMES, anonymous_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Prints hit/miss/stale/refresh counters of the anonymous public API cache per prefix."
+
+    def handle(self, *args, **options):
+        # Cached views register their prefixes when the URLconf is imported.
+        get_resolver().url_patterns
+        for prefix, counters in anonymous_cache_stats().items():
+            summary = " ".join(f"{outcome}={counters[outcome]}" for outcome in ANONYMOUS_CACHE_OUTCOMES)
+            self.stdout.write(f"{prefix}: {summary}")
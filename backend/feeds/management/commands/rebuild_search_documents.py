@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from feeds.search_documents import SEARCH_DOCUMENT_BATCH_SIZE, rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = "Recomputes stored full-text search vectors for posts, authors, comuns and users."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=SEARCH_DOCUMENT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        stats = rebuild_search_documents(batch_size=max(1, int(options["batch_size"])))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Rebuilt search documents: posts={posts} authors={authors} comuns={comuns} users={users}".format(
+                    **stats
+                )
+            )
+        )
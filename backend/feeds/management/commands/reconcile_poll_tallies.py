@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+
+from feeds.poll_tallies import POLL_TALLY_REBUILD_BATCH_SIZE, rebuild_poll_tallies
+
+
+class Command(BaseCommand):
+    help = "Rebuilds denormalized poll option tallies from PostPollVote rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--post-id", type=int, action="append", dest="post_ids")
+        parser.add_argument("--batch-size", type=int, default=POLL_TALLY_REBUILD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        stats = rebuild_poll_tallies(
+            post_ids=options["post_ids"],
+            batch_size=max(1, int(options["batch_size"])),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Reconciled poll tallies: posts={posts} tallies={tallies} skipped={skipped} removed={removed}".format(
+                    **stats
+                )
+            )
+        )
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from feeds.models import Post
+from feeds.social_images import refresh_post_social_image
+
+
+class Command(BaseCommand):
+    help = "Pre-renders social preview images for published posts that do not have one yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--post-id", type=int, action="append", dest="post_ids")
+        parser.add_argument("--force", action="store_true", help="Re-render even when the source is unchanged.")
+        parser.add_argument("--batch-size", type=int, default=200)
+
+    def handle(self, *args, **options):
+        posts = (
+            Post.objects.select_related("author")
+            .filter(is_blocked=False, is_pending=False, author__is_blocked=False)
+            .filter(Q(publish_at__isnull=True) | Q(publish_at__lte=timezone.now()))
+            .order_by("id")
+        )
+        if options["post_ids"]:
+            posts = posts.filter(id__in=options["post_ids"])
+        elif not options["force"]:
+            posts = posts.filter(social_image__isnull=True)
+
+        stats = {"posts": 0, "rendered": 0, "errors": 0}
+        for post in posts.iterator(chunk_size=max(1, int(options["batch_size"]))):
+            stats["posts"] += 1
+            try:
+                social_image = refresh_post_social_image(post, force=options["force"])
+            except Exception as exc:
+                stats["errors"] += 1
+                self.stderr.write(f"post_id={post.id}: {exc}")
+                continue
+            if social_image.image_path:
+                stats["rendered"] += 1
+        self.stdout.write(
+            self.style.SUCCESS("Rendered social images: posts={posts} rendered={rendered} errors={errors}".format(**stats))
+        )
@@ -6,7 +6,7 @@ from feeds.models import Post
 from feeds.translation_service import (
     SUPPORTED_TRANSLATION_LANGUAGES,
     PostTranslationError,
-    translate_post_to_language,
+    translate_post_to_languages,
 )
 
 
@@ -31,13 +31,9 @@ class Command(BaseCommand):
         except Post.DoesNotExist as exc:
             raise CommandError(f"Post {post_id} does not exist") from exc
 
-        for language in languages:
-            if language == post.original_language:
-                continue
-            try:
-                translation = translate_post_to_language(post, language)
-            except PostTranslationError as exc:
-                self.stderr.write(f"{language}: {exc}")
+        for language, translation in translate_post_to_languages(post, languages).items():
+            if isinstance(translation, PostTranslationError):
+                self.stderr.write(f"{language}: {translation}")
                 continue
             self.stdout.write(
                 self.style.SUCCESS(
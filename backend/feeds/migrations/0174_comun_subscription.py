@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0173_post_event_starts_at_posteventattendance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComunSubscription',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='feed_subscriptions', to='feeds.comuncategory')),
+                ('comun', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_subscriptions', to='feeds.comun')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='comun_subscriptions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Подписка на сообщество',
+                'verbose_name_plural': 'Подписки на сообщества',
+                'indexes': [models.Index(fields=['comun', 'category', 'user'], name='feeds_comunsub_lookup_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('category__isnull', True)), fields=('user', 'comun'), name='feeds_comunsub_unique_comun'), models.UniqueConstraint(condition=models.Q(('category__isnull', False)), fields=('user', 'comun', 'category'), name='feeds_comunsub_unique_category')],
+            },
+        ),
+    ]
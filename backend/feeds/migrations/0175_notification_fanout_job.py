@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 02:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0174_comun_subscription'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationFanoutJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_key', models.CharField(max_length=80)),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('running', 'Выполняется'), ('done', 'Готово'), ('failed', 'Ошибка')], default='pending', max_length=16)),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('cursor_user_id', models.PositiveBigIntegerField(default=0)),
+                ('pending_delivery_ids', models.JSONField(blank=True, default=list)),
+                ('recipients_processed', models.PositiveIntegerField(default=0)),
+                ('notifications_created', models.PositiveIntegerField(default=0)),
+                ('notifications_grouped', models.PositiveIntegerField(default=0)),
+                ('deliveries_sent', models.PositiveIntegerField(default=0)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('scheduled_at', models.DateTimeField()),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Рассылка уведомлений',
+                'verbose_name_plural': 'Рассылки уведомлений',
+                'ordering': ('-created_at', '-id'),
+                'indexes': [models.Index(fields=['status', 'scheduled_at'], name='notif_fanout_due_idx')],
+            },
+        ),
+    ]
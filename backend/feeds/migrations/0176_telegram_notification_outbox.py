@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0175_notification_fanout_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TelegramNotificationOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chat_id', models.BigIntegerField()),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('sending', 'Отправляется'), ('sent', 'Отправлено'), ('failed', 'Ошибка')], default='pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('available_at', models.DateTimeField()),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('notification', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='telegram_outbox_items', to='feeds.sitenotification')),
+            ],
+            options={
+                'verbose_name': 'Telegram-уведомление в очереди',
+                'verbose_name_plural': 'Очередь Telegram-уведомлений',
+                'ordering': ('-created_at', '-id'),
+                'indexes': [models.Index(fields=['status', 'available_at'], name='tg_outbox_due_idx'), models.Index(fields=['chat_id', 'status'], name='tg_outbox_chat_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:15
+
+import django.db.models.constraints
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0176_telegram_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublicFeedCandidate',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='public_feed_candidate', serialize=False, to='feeds.post')),
+                ('author_id_snapshot', models.BigIntegerField()),
+                ('post_created_at', models.DateTimeField()),
+                ('score', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('community_id', models.BigIntegerField(blank=True, null=True)),
+                ('community_day', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PublicFeedChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_id_snapshot', models.BigIntegerField(blank=True, null=True)),
+                ('author_id_snapshot', models.BigIntegerField(blank=True, null=True)),
+                ('comun_id_snapshot', models.BigIntegerField(blank=True, null=True)),
+                ('full_rebuild', models.BooleanField(default=False)),
+                ('reason', models.CharField(blank=True, max_length=32)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RemoveConstraint(
+            model_name='publicfeeditem',
+            name='feeds_public_feed_unique_rank',
+        ),
+        migrations.AddConstraint(
+            model_name='publicfeeditem',
+            constraint=models.UniqueConstraint(deferrable=django.db.models.constraints.Deferrable['DEFERRED'], fields=('feed', 'rank'), name='feeds_public_feed_unique_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='publicfeedcandidate',
+            index=models.Index(fields=['-post_created_at', '-post'], name='pubfeed_cand_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicfeedcandidate',
+            index=models.Index(fields=['author_id_snapshot'], name='pubfeed_cand_author_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='publicfeedcandidate',
+            index=models.Index(fields=['community_id'], name='pubfeed_cand_comun_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:21
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0177_public_feed_incremental'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publicfeedcandidate',
+            name='comun_slugs',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=160), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='publicfeedcandidate',
+            name='languages',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=8), blank=True, default=list, size=None),
+        ),
+        migrations.AddField(
+            model_name='publicfeeditem',
+            name='comun_slugs_snapshot',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=160), blank=True, default=list, size=None),
+        ),
+        migrations.AlterField(
+            model_name='publicfeeditem',
+            name='feed',
+            field=models.CharField(choices=[('home', 'Главная'), ('home:ru', 'Главная (Русский)'), ('home:en', 'Главная (Английский)'), ('home:es', 'Главная (Испанский)'), ('home:pt', 'Главная (Португальский)'), ('home:de', 'Главная (Немецкий)'), ('home:fr', 'Главная (Французский)'), ('home:tr', 'Главная (Турецкий)'), ('home:id', 'Главная (Индонезийский)')], default='home', max_length=32),
+        ),
+        migrations.AlterField(
+            model_name='publicfeeditem',
+            name='score',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=14),
+        ),
+    ]
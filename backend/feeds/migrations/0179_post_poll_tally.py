@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:33
+
+import django.contrib.postgres.fields
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def _poll_options_count(raw_data) -> int:
+    raw_poll = raw_data.get("poll") if isinstance(raw_data, dict) else None
+    raw_options = raw_poll.get("options") if isinstance(raw_poll, dict) else None
+    if not isinstance(raw_options, list):
+        return 0
+    return sum(
+        1
+        for option in raw_options
+        if isinstance(option, dict) and str(option.get("text") or "").strip()
+    )
+
+
+def backfill_poll_tallies(apps, schema_editor):
+    Post = apps.get_model("feeds", "Post")
+    PostPollVote = apps.get_model("feeds", "PostPollVote")
+    PostPollTally = apps.get_model("feeds", "PostPollTally")
+
+    post_ids = PostPollVote.objects.values_list("post_id", flat=True).distinct()
+    tallies = []
+    for post in Post.objects.filter(id__in=post_ids).only("id", "raw_data").iterator(chunk_size=500):
+        options_count = _poll_options_count(post.raw_data)
+        if not options_count:
+            continue
+        counts = [0] * options_count
+        voters_count = 0
+        for selected_options in PostPollVote.objects.filter(post_id=post.id).values_list(
+            "selected_options",
+            flat=True,
+        ):
+            selection = []
+            for raw in selected_options if isinstance(selected_options, list) else []:
+                try:
+                    index = int(raw)
+                except (TypeError, ValueError):
+                    continue
+                if 0 <= index < options_count and index not in selection:
+                    selection.append(index)
+            if not selection:
+                continue
+            voters_count += 1
+            for index in selection:
+                counts[index] += 1
+        tallies.append(PostPollTally(post_id=post.id, option_counts=counts, voters_count=voters_count))
+        if len(tallies) >= 500:
+            PostPollTally.objects.bulk_create(tallies)
+            tallies = []
+    if tallies:
+        PostPollTally.objects.bulk_create(tallies)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0178_public_feed_language_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostPollTally',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='poll_tally', serialize=False, to='feeds.post')),
+                ('option_counts', django.contrib.postgres.fields.ArrayField(base_field=models.PositiveIntegerField(), blank=True, default=list, size=None)),
+                ('voters_count', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Итоги опроса',
+                'verbose_name_plural': 'Итоги опросов',
+            },
+        ),
+        migrations.RunPython(backfill_poll_tallies, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0179_post_poll_tally'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='has_external_links',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+    ]
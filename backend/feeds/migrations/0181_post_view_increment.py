@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0180_post_has_external_links'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostViewIncrement',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('post_id_snapshot', models.BigIntegerField()),
+                ('date', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Непроведённый просмотр поста',
+                'verbose_name_plural': 'Непроведённые просмотры постов',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['post_id_snapshot'], name='postviewincrement_post_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,134 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:50
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+SEARCH_DOCUMENT_BATCH_SIZE = 5000
+
+SEARCH_DOCUMENT_SOURCES = (
+    ("feeds_postsearchdocument", "post_id", "feeds_post", (("title", "A"), ("content", "B"))),
+    (
+        "feeds_authorsearchdocument",
+        "author_id",
+        "feeds_author",
+        (("username", "A"), ("title", "A"), ("description", "B")),
+    ),
+    (
+        "feeds_comunsearchdocument",
+        "comun_id",
+        "feeds_comun",
+        (
+            ("name", "A"),
+            ("slug", "A"),
+            ("product_description", "B"),
+            ("target_audience", "C"),
+            ("rules_text", "C"),
+        ),
+    ),
+    (
+        "feeds_usersearchdocument",
+        "user_id",
+        "auth_user",
+        (("username", "A"), ("first_name", "B"), ("last_name", "B")),
+    ),
+)
+
+
+def backfill_search_documents(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        for document_table, document_column, source_table, weighted_columns in SEARCH_DOCUMENT_SOURCES:
+            vector_sql = " || ".join(
+                f"setweight(to_tsvector('simple', coalesce(source.{column}, '')), '{weight}')"
+                for column, weight in weighted_columns
+            )
+            cursor.execute(f"SELECT coalesce(max(id), 0) FROM {source_table}")
+            max_id = cursor.fetchone()[0]
+            for start in range(0, max_id + 1, SEARCH_DOCUMENT_BATCH_SIZE):
+                cursor.execute(
+                    f"""
+                    INSERT INTO {document_table} ({document_column}, search_vector, updated_at)
+                    SELECT source.id, {vector_sql}, now()
+                    FROM {source_table} AS source
+                    WHERE source.id >= %s AND source.id < %s
+                    ON CONFLICT ({document_column}) DO NOTHING
+                    """,
+                    [start, start + SEARCH_DOCUMENT_BATCH_SIZE],
+                )
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('feeds', '0181_post_view_increment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorSearchDocument',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='feeds.author')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс автора',
+                'verbose_name_plural': 'Поисковые индексы авторов',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='author_search_vector_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ComunSearchDocument',
+            fields=[
+                ('comun', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='feeds.comun')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс сообщества',
+                'verbose_name_plural': 'Поисковые индексы сообществ',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='comun_search_vector_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostSearchDocument',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='feeds.post')),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс поста',
+                'verbose_name_plural': 'Поисковые индексы постов',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_vector_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserSearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс пользователя',
+                'verbose_name_plural': 'Поисковые индексы пользователей',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='user_search_vector_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_search_documents, migrations.RunPython.noop),
+        migrations.RunSQL(
+            sql=[
+                "DROP INDEX CONCURRENTLY IF EXISTS feeds_post_search_fts_idx",
+                "DROP INDEX CONCURRENTLY IF EXISTS feeds_author_search_fts_idx",
+                "DROP INDEX CONCURRENTLY IF EXISTS feeds_comun_search_fts_idx",
+                "DROP INDEX CONCURRENTLY IF EXISTS auth_user_search_fts_idx",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,96 @@
+# Generated by Django 5.2.18 on 2026-10-17 03:54
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+SEARCH_LANGUAGE_CONFIGS = {
+    "ru": "russian",
+    "en": "english",
+    "es": "spanish",
+    "pt": "portuguese",
+    "de": "german",
+    "fr": "french",
+    "tr": "turkish",
+    "id": "indonesian",
+}
+
+TRANSLATION_SEARCH_DOCUMENT_SOURCES = (
+    (
+        "feeds_posttranslationsearchdocument",
+        "feeds_posttranslation",
+        "post_id",
+        (("title", "A"), ("content", "B")),
+    ),
+    (
+        "feeds_comuntranslationsearchdocument",
+        "feeds_comuntranslation",
+        "comun_id",
+        (("name", "A"), ("product_description", "B"), ("target_audience", "C"), ("rules_text", "C")),
+    ),
+)
+
+
+def backfill_translation_search_documents(apps, schema_editor):
+    branches = " ".join(
+        f"WHEN '{language}' THEN '{config}'::regconfig" for language, config in SEARCH_LANGUAGE_CONFIGS.items()
+    )
+    config_sql = f"(CASE source.language {branches} ELSE 'simple'::regconfig END)"
+    with schema_editor.connection.cursor() as cursor:
+        for document_table, source_table, owner_column, weighted_columns in TRANSLATION_SEARCH_DOCUMENT_SOURCES:
+            vector_sql = " || ".join(
+                f"setweight(to_tsvector({config_sql}, coalesce(source.{column}, '')), '{weight}')"
+                for column, weight in weighted_columns
+            )
+            cursor.execute(
+                f"""
+                INSERT INTO {document_table} (translation_id, {owner_column}, language, search_vector, updated_at)
+                SELECT source.id, source.{owner_column}, source.language, {vector_sql}, now()
+                FROM {source_table} AS source
+                WHERE source.status = 'translated'
+                ON CONFLICT (translation_id) DO NOTHING
+                """
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0182_search_documents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ComunTranslationSearchDocument',
+            fields=[
+                ('translation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='feeds.comuntranslation')),
+                ('language', models.CharField(choices=[('en', 'Английский'), ('es', 'Испанский'), ('pt', 'Португальский'), ('de', 'Немецкий'), ('fr', 'Французский'), ('tr', 'Турецкий'), ('id', 'Индонезийский')], max_length=8)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('comun', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translation_search_documents', to='feeds.comun')),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс перевода сообщества',
+                'verbose_name_plural': 'Поисковые индексы переводов сообществ',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'en')), fields=['search_vector'], name='comun_tr_search_en_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'es')), fields=['search_vector'], name='comun_tr_search_es_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'pt')), fields=['search_vector'], name='comun_tr_search_pt_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'de')), fields=['search_vector'], name='comun_tr_search_de_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'fr')), fields=['search_vector'], name='comun_tr_search_fr_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'tr')), fields=['search_vector'], name='comun_tr_search_tr_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'id')), fields=['search_vector'], name='comun_tr_search_id_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PostTranslationSearchDocument',
+            fields=[
+                ('translation', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='feeds.posttranslation')),
+                ('language', models.CharField(choices=[('en', 'Английский'), ('es', 'Испанский'), ('pt', 'Португальский'), ('de', 'Немецкий'), ('fr', 'Французский'), ('tr', 'Турецкий'), ('id', 'Индонезийский')], max_length=8)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='translation_search_documents', to='feeds.post')),
+            ],
+            options={
+                'verbose_name': 'Поисковый индекс перевода поста',
+                'verbose_name_plural': 'Поисковые индексы переводов постов',
+                'indexes': [django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'en')), fields=['search_vector'], name='post_tr_search_en_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'es')), fields=['search_vector'], name='post_tr_search_es_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'pt')), fields=['search_vector'], name='post_tr_search_pt_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'de')), fields=['search_vector'], name='post_tr_search_de_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'fr')), fields=['search_vector'], name='post_tr_search_fr_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'tr')), fields=['search_vector'], name='post_tr_search_tr_idx'), django.contrib.postgres.indexes.GinIndex(condition=models.Q(('language', 'id')), fields=['search_vector'], name='post_tr_search_id_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_translation_search_documents, migrations.RunPython.noop),
+    ]
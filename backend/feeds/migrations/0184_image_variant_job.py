@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0183_translation_search_documents'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImageVariantJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_path', models.CharField(max_length=500)),
+                ('variants', models.JSONField(blank=True, default=list)),
+                ('delete_original', models.BooleanField(default=False)),
+                ('status', models.CharField(choices=[('pending', 'Ожидает'), ('running', 'Выполняется'), ('done', 'Готово'), ('failed', 'Ошибка')], default='pending', max_length=16)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('locked_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Задача генерации вариантов изображения',
+                'verbose_name_plural': 'Задачи генерации вариантов изображений',
+                'indexes': [models.Index(fields=['status', 'id'], name='image_variant_job_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:32
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0184_image_variant_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostSocialImage',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='social_image', serialize=False, to='feeds.post')),
+                ('source_path', models.CharField(blank=True, max_length=500)),
+                ('image_path', models.CharField(blank=True, max_length=500)),
+                ('rendered_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Картинка поста для соцсетей',
+                'verbose_name_plural': 'Картинки постов для соцсетей',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0185_post_social_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contenttranslationsettings',
+            name='provider_concurrency',
+            field=models.PositiveIntegerField(default=4),
+        ),
+        migrations.AddField(
+            model_name='contenttranslationsettings',
+            name='provider_tokens_per_minute',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0186_content_translation_provider_limits'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationMemoryEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('segment_hash', models.CharField(max_length=64)),
+                ('source_language', models.CharField(max_length=8)),
+                ('target_language', models.CharField(max_length=8)),
+                ('model', models.CharField(max_length=120)),
+                ('translation', models.JSONField()),
+                ('hit_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_used_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Сегмент памяти переводов',
+                'verbose_name_plural': 'Память переводов',
+                'constraints': [models.UniqueConstraint(fields=('segment_hash', 'source_language', 'target_language', 'model'), name='unique_translation_memory_segment')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0187_translation_memory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contenttranslationtask',
+            name='languages',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='contenttranslationtask',
+            name='priority',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='contenttranslationrun',
+            name='kind',
+            field=models.CharField(choices=[('post', 'Пост'), ('post_manual', 'Пост (ручной перевод)'), ('comment', 'Комментарий'), ('comun', 'Сообщество'), ('static_page', 'Статичная страница')], max_length=16),
+        ),
+        migrations.AlterField(
+            model_name='contenttranslationtask',
+            name='kind',
+            field=models.CharField(choices=[('post', 'Пост'), ('post_manual', 'Пост (ручной перевод)'), ('comment', 'Комментарий'), ('comun', 'Сообщество'), ('static_page', 'Статичная страница')], max_length=16),
+        ),
+        migrations.AddIndex(
+            model_name='contenttranslationtask',
+            index=models.Index(fields=['status', '-priority', 'scheduled_at'], name='content_trans_task_lane_idx'),
+        ),
+    ]
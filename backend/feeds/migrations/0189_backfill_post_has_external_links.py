@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def backfill_post_has_external_links(apps, schema_editor):
+    from communities.service import _post_contains_external_links
+
+    Post = apps.get_model("feeds", "Post")
+
+    post_ids = []
+    for post in Post.objects.only("id", "title", "content", "raw_data").iterator(chunk_size=500):
+        if _post_contains_external_links(post.title, post.content, post.raw_data):
+            post_ids.append(post.id)
+        if len(post_ids) >= 500:
+            Post.objects.filter(id__in=post_ids).update(has_external_links=True)
+            post_ids.clear()
+    if post_ids:
+        Post.objects.filter(id__in=post_ids).update(has_external_links=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feeds", "0188_content_translation_task_priority"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_post_has_external_links, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("feeds", "0189_backfill_post_has_external_links"),
+    ]
+
+    # Table behind rabotaem_backend.cache_backends.postgres.PostgresCache.
+    # IF NOT EXISTS adopts tables created lazily by earlier versions.
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                CREATE UNLOGGED TABLE IF NOT EXISTS rabotaem_shared_cache (
+                    cache_key varchar(255) PRIMARY KEY,
+                    value bytea,
+                    int_value bigint,
+                    expires_at double precision
+                )
+                """,
+                "CREATE INDEX IF NOT EXISTS rabotaem_shared_cache_expires_idx ON rabotaem_shared_cache (expires_at)",
+            ],
+            reverse_sql="DROP TABLE IF EXISTS rabotaem_shared_cache",
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:47
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0190_shared_cache_table'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='imagevariantjob',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='image_variant_jobs', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
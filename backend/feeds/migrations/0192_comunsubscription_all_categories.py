@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:51
+
+from django.db import migrations, models
+
+
+def mark_comun_level_subscriptions(apps, schema_editor):
+    ComunSubscription = apps.get_model("feeds", "ComunSubscription")
+    ComunSubscription.objects.filter(category__isnull=True).update(all_categories=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feeds', '0191_imagevariantjob_user'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comunsubscription',
+            name='all_categories',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(mark_comun_level_subscriptions, migrations.RunPython.noop),
+    ]
@@ -13,6 +13,9 @@ except ImportError:  # optional dependency for lemmatization
     pymorphy2 = None
 
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth import get_user_model
 from editor.models import (
@@ -366,6 +369,7 @@ class Post(models.Model):
     is_blocked = models.BooleanField(default=False)
     publish_at = models.DateTimeField(null=True, blank=True)
     raw_data = models.JSONField(default=dict, blank=True)
+    has_external_links = models.BooleanField(default=False, db_index=True)
     accepted_answer = models.ForeignKey(
         "PostComment",
         on_delete=models.SET_NULL,
@@ -410,6 +414,9 @@ class Post(models.Model):
             {"content", "raw_data"} & set(update_fields)
         )
         should_refresh_seo_text = update_fields is None or "content" in set(update_fields)
+        should_refresh_external_links = update_fields is None or bool(
+            {"title", "content", "raw_data"} & set(update_fields)
+        )
         if should_refresh_preview:
             from feeds.preview import build_post_preview
 
@@ -428,6 +435,18 @@ class Post(models.Model):
                 kwargs["update_fields"] = list(
                     set(kwargs["update_fields"]) | {"seo_text_length"}
                 )
+        if should_refresh_external_links:
+            from communities.service import _post_contains_external_links
+
+            self.has_external_links = _post_contains_external_links(
+                self.title,
+                self.content,
+                self.raw_data,
+            )
+            if update_fields is not None:
+                kwargs["update_fields"] = list(
+                    set(kwargs["update_fields"]) | {"has_external_links"}
+                )
         super().save(*args, **kwargs)
 
 
@@ -457,6 +476,85 @@ class PostDailyView(models.Model):
         return f"{self.post_id}:{self.date}:{self.views_count}"
 
 
+class PostViewIncrement(models.Model):
+    post_id_snapshot = models.BigIntegerField()
+    date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=("post_id_snapshot",), name="postviewincrement_post_idx"),
+        ]
+        verbose_name = "Непроведённый просмотр поста"
+        verbose_name_plural = "Непроведённые просмотры постов"
+
+    def __str__(self) -> str:
+        return f"view:{self.post_id_snapshot}:{self.date}"
+
+
+IMAGE_VARIANT_JOB_STATUS_PENDING = "pending"
+IMAGE_VARIANT_JOB_STATUS_RUNNING = "running"
+IMAGE_VARIANT_JOB_STATUS_DONE = "done"
+IMAGE_VARIANT_JOB_STATUS_FAILED = "failed"
+IMAGE_VARIANT_JOB_STATUS_CHOICES = (
+    (IMAGE_VARIANT_JOB_STATUS_PENDING, "Ожидает"),
+    (IMAGE_VARIANT_JOB_STATUS_RUNNING, "Выполняется"),
+    (IMAGE_VARIANT_JOB_STATUS_DONE, "Готово"),
+    (IMAGE_VARIANT_JOB_STATUS_FAILED, "Ошибка"),
+)
+
+
+class ImageVariantJob(models.Model):
+    original_path = models.CharField(max_length=500)
+    # [{"width": 640, "path": "...-640.webp", "done": false}, ...]
+    variants = models.JSONField(default=list, blank=True)
+    delete_original = models.BooleanField(default=False)
+    # Uploader; only they may poll the job from the API.
+    user = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="image_variant_jobs",
+    )
+    status = models.CharField(
+        max_length=16,
+        choices=IMAGE_VARIANT_JOB_STATUS_CHOICES,
+        default=IMAGE_VARIANT_JOB_STATUS_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "id"], name="image_variant_job_due_idx"),
+        ]
+        verbose_name = "Задача генерации вариантов изображения"
+        verbose_name_plural = "Задачи генерации вариантов изображений"
+
+    def __str__(self) -> str:
+        return f"{self.original_path}:{self.status}"
+
+
+class PostSocialImage(models.Model):
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name="social_image")
+    source_path = models.CharField(max_length=500, blank=True)
+    # Empty when the source could not be rendered; retried once the source changes.
+    image_path = models.CharField(max_length=500, blank=True)
+    rendered_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Картинка поста для соцсетей"
+        verbose_name_plural = "Картинки постов для соцсетей"
+
+    def __str__(self) -> str:
+        return f"social:{self.post_id}"
+
+
 class PostDraftAccess(models.Model):
     post = models.ForeignKey(
         Post,
@@ -863,8 +961,10 @@ CONTENT_TRANSLATION_KIND_POST = "post"
 CONTENT_TRANSLATION_KIND_COMMENT = "comment"
 CONTENT_TRANSLATION_KIND_COMUN = "comun"
 CONTENT_TRANSLATION_KIND_STATIC_PAGE = "static_page"
+CONTENT_TRANSLATION_KIND_POST_MANUAL = "post_manual"
 CONTENT_TRANSLATION_KIND_CHOICES = (
     (CONTENT_TRANSLATION_KIND_POST, "Пост"),
+    (CONTENT_TRANSLATION_KIND_POST_MANUAL, "Пост (ручной перевод)"),
     (CONTENT_TRANSLATION_KIND_COMMENT, "Комментарий"),
     (CONTENT_TRANSLATION_KIND_COMUN, "Сообщество"),
     (CONTENT_TRANSLATION_KIND_STATIC_PAGE, "Статичная страница"),
@@ -882,6 +982,8 @@ CONTENT_TRANSLATION_TASK_STATUS_CHOICES = (
     (CONTENT_TRANSLATION_TASK_STATUS_FAILED, "Ошибка"),
     (CONTENT_TRANSLATION_TASK_STATUS_SKIPPED, "Пропущено"),
 )
+CONTENT_TRANSLATION_TASK_PRIORITY_AUTO = 0
+CONTENT_TRANSLATION_TASK_PRIORITY_MANUAL = 10
 
 
 class ContentTranslationTask(models.Model):
@@ -894,6 +996,8 @@ class ContentTranslationTask(models.Model):
         db_index=True,
     )
     scheduled_at = models.DateTimeField(db_index=True)
+    priority = models.PositiveSmallIntegerField(default=CONTENT_TRANSLATION_TASK_PRIORITY_AUTO)
+    languages = models.JSONField(default=list, blank=True)
     source_updated_at = models.DateTimeField(null=True, blank=True)
     attempts = models.PositiveSmallIntegerField(default=0)
     last_error = models.TextField(blank=True)
@@ -910,6 +1014,7 @@ class ContentTranslationTask(models.Model):
         ]
         indexes = [
             models.Index(fields=["status", "scheduled_at"], name="content_trans_task_due_idx"),
+            models.Index(fields=["status", "-priority", "scheduled_at"], name="content_trans_task_lane_idx"),
             models.Index(fields=["kind", "object_id"], name="content_trans_task_obj_idx"),
         ]
         verbose_name = "Задача перевода контента"
@@ -924,6 +1029,8 @@ class ContentTranslationSettings(models.Model):
     post_daily_limit = models.PositiveIntegerField(default=200)
     comment_daily_limit = models.PositiveIntegerField(default=1000)
     post_object_daily_limit = models.PositiveIntegerField(default=3)
+    provider_concurrency = models.PositiveIntegerField(default=4)
+    provider_tokens_per_minute = models.PositiveIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
@@ -958,6 +1065,30 @@ class ContentTranslationRun(models.Model):
         return f"{self.kind}:{self.object_id}:{self.created_at:%Y-%m-%d %H:%M:%S}"
 
 
+class TranslationMemoryEntry(models.Model):
+    segment_hash = models.CharField(max_length=64)
+    source_language = models.CharField(max_length=8)
+    target_language = models.CharField(max_length=8)
+    model = models.CharField(max_length=120)
+    translation = models.JSONField()
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["segment_hash", "source_language", "target_language", "model"],
+                name="unique_translation_memory_segment",
+            ),
+        ]
+        verbose_name = "Сегмент памяти переводов"
+        verbose_name_plural = "Память переводов"
+
+    def __str__(self) -> str:
+        return f"{self.source_language}->{self.target_language}:{self.segment_hash[:12]}"
+
+
 class PostCommentLike(models.Model):
     comment = models.ForeignKey(PostComment, on_delete=models.CASCADE, related_name="likes")
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="comment_likes")
@@ -1043,14 +1174,16 @@ class PublicFeedItem(models.Model):
     FEED_HOME = "home"
     FEED_CHOICES = (
         (FEED_HOME, "Главная"),
+        *((f"home:{language}", f"Главная ({label})") for language, label in POST_LANGUAGE_CHOICES),
     )
 
     feed = models.CharField(max_length=32, choices=FEED_CHOICES, default=FEED_HOME)
     post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="public_feed_items")
     rank = models.PositiveIntegerField()
-    score = models.IntegerField(default=0)
+    score = models.DecimalField(max_digits=14, decimal_places=2, default=0)
     post_created_at = models.DateTimeField()
     author_id_snapshot = models.BigIntegerField()
+    comun_slugs_snapshot = ArrayField(models.CharField(max_length=160), default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -1058,7 +1191,11 @@ class PublicFeedItem(models.Model):
         ordering = ["feed", "rank"]
         constraints = [
             models.UniqueConstraint(fields=["feed", "post"], name="feeds_public_feed_unique_post"),
-            models.UniqueConstraint(fields=["feed", "rank"], name="feeds_public_feed_unique_rank"),
+            models.UniqueConstraint(
+                fields=["feed", "rank"],
+                name="feeds_public_feed_unique_rank",
+                deferrable=models.Deferrable.DEFERRED,
+            ),
         ]
         indexes = [
             models.Index(fields=["feed", "rank"], name="pubfeed_feed_rank_idx"),
@@ -1069,6 +1206,154 @@ class PublicFeedItem(models.Model):
     def __str__(self) -> str:
         return f"{self.feed}:{self.rank}:{self.post_id}"
 
+    @classmethod
+    def home_feed_for_language(cls, language: str) -> str:
+        return f"{cls.FEED_HOME}:{language}"
+
+
+class PublicFeedCandidate(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="public_feed_candidate",
+    )
+    author_id_snapshot = models.BigIntegerField()
+    post_created_at = models.DateTimeField()
+    score = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    community_id = models.BigIntegerField(null=True, blank=True)
+    community_day = models.DateField(null=True, blank=True)
+    languages = ArrayField(models.CharField(max_length=8), default=list, blank=True)
+    comun_slugs = ArrayField(models.CharField(max_length=160), default=list, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["-post_created_at", "-post"], name="pubfeed_cand_created_idx"),
+            models.Index(fields=["author_id_snapshot"], name="pubfeed_cand_author_idx"),
+            models.Index(fields=["community_id"], name="pubfeed_cand_comun_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"candidate:{self.post_id}:{self.score}"
+
+
+class PublicFeedChange(models.Model):
+    post_id_snapshot = models.BigIntegerField(null=True, blank=True)
+    author_id_snapshot = models.BigIntegerField(null=True, blank=True)
+    comun_id_snapshot = models.BigIntegerField(null=True, blank=True)
+    full_rebuild = models.BooleanField(default=False)
+    reason = models.CharField(max_length=32, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+
+    def __str__(self) -> str:
+        return f"feed-change:{self.id}:{self.reason}"
+
+
+class PostSearchDocument(models.Model):
+    post = models.OneToOneField(Post, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    search_vector = SearchVectorField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"], name="post_search_vector_idx")]
+        verbose_name = "Поисковый индекс поста"
+        verbose_name_plural = "Поисковые индексы постов"
+
+
+class AuthorSearchDocument(models.Model):
+    author = models.OneToOneField(Author, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    search_vector = SearchVectorField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"], name="author_search_vector_idx")]
+        verbose_name = "Поисковый индекс автора"
+        verbose_name_plural = "Поисковые индексы авторов"
+
+
+class ComunSearchDocument(models.Model):
+    comun = models.OneToOneField("Comun", on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    search_vector = SearchVectorField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"], name="comun_search_vector_idx")]
+        verbose_name = "Поисковый индекс сообщества"
+        verbose_name_plural = "Поисковые индексы сообществ"
+
+
+class UserSearchDocument(models.Model):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    search_vector = SearchVectorField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"], name="user_search_vector_idx")]
+        verbose_name = "Поисковый индекс пользователя"
+        verbose_name_plural = "Поисковые индексы пользователей"
+
+
+SEARCH_DOCUMENT_LANGUAGES = tuple(language for language, _label in POST_TRANSLATION_LANGUAGE_CHOICES)
+
+
+class PostTranslationSearchDocument(models.Model):
+    translation = models.OneToOneField(
+        PostTranslation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name="translation_search_documents")
+    language = models.CharField(max_length=8, choices=POST_TRANSLATION_LANGUAGE_CHOICES)
+    search_vector = SearchVectorField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["search_vector"],
+                condition=models.Q(language=language),
+                name=f"post_tr_search_{language}_idx",
+            )
+            for language in SEARCH_DOCUMENT_LANGUAGES
+        ]
+        verbose_name = "Поисковый индекс перевода поста"
+        verbose_name_plural = "Поисковые индексы переводов постов"
+
+
+class ComunTranslationSearchDocument(models.Model):
+    translation = models.OneToOneField(
+        ComunTranslation,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="search_document",
+    )
+    comun = models.ForeignKey("Comun", on_delete=models.CASCADE, related_name="translation_search_documents")
+    language = models.CharField(max_length=8, choices=POST_TRANSLATION_LANGUAGE_CHOICES)
+    search_vector = SearchVectorField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(
+                fields=["search_vector"],
+                condition=models.Q(language=language),
+                name=f"comun_tr_search_{language}_idx",
+            )
+            for language in SEARCH_DOCUMENT_LANGUAGES
+        ]
+        verbose_name = "Поисковый индекс перевода сообщества"
+        verbose_name_plural = "Поисковые индексы переводов сообществ"
+
 
 from users.models import (
     AuthorAdmin,
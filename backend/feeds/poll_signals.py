@@ -0,0 +1,54 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from editor.models import PostPollVote
+from feeds.models import Post
+from feeds.poll_tallies import apply_poll_vote_change, poll_option_texts, rebuild_poll_tally
+
+
+def _touches_selection(update_fields) -> bool:
+    return update_fields is None or "selected_options" in update_fields
+
+
+@receiver(pre_save, sender=PostPollVote, dispatch_uid="feeds.poll_vote_previous_selection")
+def poll_vote_previous_selection(sender, instance, update_fields=None, **kwargs):
+    instance._previous_selected_options = []
+    if instance.pk and _touches_selection(update_fields):
+        instance._previous_selected_options = (
+            PostPollVote.objects.filter(pk=instance.pk).values_list("selected_options", flat=True).first() or []
+        )
+
+
+@receiver(post_save, sender=PostPollVote, dispatch_uid="feeds.poll_vote_saved")
+def poll_vote_saved(sender, instance, created, update_fields, **kwargs):
+    if created or _touches_selection(update_fields):
+        apply_poll_vote_change(
+            instance.post_id,
+            getattr(instance, "_previous_selected_options", []),
+            instance.selected_options,
+        )
+
+
+@receiver(post_delete, sender=PostPollVote, dispatch_uid="feeds.poll_vote_deleted")
+def poll_vote_deleted(sender, instance, **kwargs):
+    apply_poll_vote_change(instance.post_id, instance.selected_options, [])
+
+
+@receiver(pre_save, sender=Post, dispatch_uid="feeds.post_previous_poll_options")
+def post_previous_poll_options(sender, instance, update_fields=None, **kwargs):
+    instance._previous_poll_option_texts = None
+    if not instance.pk or (update_fields is not None and "raw_data" not in update_fields):
+        return
+    if isinstance(instance.raw_data, dict) and instance.raw_data.get("poll"):
+        previous_raw_data = Post.objects.filter(pk=instance.pk).values_list("raw_data", flat=True).first()
+        instance._previous_poll_option_texts = poll_option_texts(previous_raw_data)
+
+
+@receiver(post_save, sender=Post, dispatch_uid="feeds.post_poll_options_saved")
+def post_poll_options_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, "_previous_poll_option_texts", None)
+    if created or previous is None or previous == poll_option_texts(instance.raw_data):
+        return
+    with transaction.atomic():
+        rebuild_poll_tally(instance)
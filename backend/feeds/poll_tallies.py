@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+from django.db import transaction
+
+from editor.models import PostPollTally, PostPollVote
+from feeds.models import Post
+
+POLL_TALLY_REBUILD_BATCH_SIZE = 500
+
+
+def _fv():
+    from feeds import views as feed_views
+
+    return feed_views
+
+
+def poll_option_texts(raw_data) -> tuple[str, ...]:
+    raw_poll = raw_data.get("poll") if isinstance(raw_data, dict) else None
+    if not isinstance(raw_poll, dict):
+        return ()
+    return tuple(str(option.get("text") or "").strip() for option in _fv()._extract_poll_options(raw_poll))
+
+
+def poll_options_count(post: Post) -> int:
+    raw_data = post.raw_data if isinstance(post.raw_data, dict) else {}
+    payload = _fv()._build_poll_payload(raw_data.get("poll"))
+    if not payload:
+        return 0
+    return len(payload.get("options") or [])
+
+
+def _tally_selections(selections, options_count: int) -> tuple[list[int], int]:
+    counts = [0] * options_count
+    voters_count = 0
+    for selected_options in selections:
+        normalized = _fv()._normalize_poll_selection(selected_options, options_count)
+        if not normalized:
+            continue
+        voters_count += 1
+        for index in normalized:
+            counts[index] += 1
+    return counts, voters_count
+
+
+def rebuild_poll_tally(post: Post) -> PostPollTally | None:
+    options_count = poll_options_count(post)
+    if not options_count:
+        PostPollTally.objects.filter(post_id=post.id).delete()
+        return None
+    PostPollTally.objects.select_for_update().filter(post_id=post.id).first()
+    counts, voters_count = _tally_selections(
+        PostPollVote.objects.filter(post_id=post.id).values_list("selected_options", flat=True).iterator(),
+        options_count,
+    )
+    tally, _created = PostPollTally.objects.update_or_create(
+        post_id=post.id,
+        defaults={"option_counts": counts, "voters_count": voters_count},
+    )
+    return tally
+
+
+def apply_poll_vote_change(post_id: int, previous_selection, selection) -> None:
+    with transaction.atomic():
+        tally = (
+            PostPollTally.objects.select_for_update(of=("self",))
+            .select_related("post")
+            .filter(post_id=post_id)
+            .first()
+        )
+        if tally is None:
+            if not selection:
+                return
+            post = Post.objects.select_for_update().filter(id=post_id).first()
+            if post is None:
+                return
+            if not PostPollTally.objects.filter(post_id=post_id).exists():
+                rebuild_poll_tally(post)
+                return
+            tally = PostPollTally.objects.select_for_update().get(post_id=post_id)
+            tally.post = post
+
+        options_count = max(len(tally.option_counts), poll_options_count(tally.post))
+        counts = list(tally.option_counts) + [0] * (options_count - len(tally.option_counts))
+        previous = _fv()._normalize_poll_selection(previous_selection, options_count)
+        current = _fv()._normalize_poll_selection(selection, options_count)
+        for index in previous:
+            counts[index] = max(counts[index] - 1, 0)
+        for index in current:
+            counts[index] += 1
+        tally.option_counts = counts
+        tally.voters_count = max(int(tally.voters_count) + bool(current) - bool(previous), 0)
+        tally.save(update_fields=["option_counts", "voters_count", "updated_at"])
+
+
+def poll_tallies_for_posts(post_ids) -> dict[int, PostPollTally]:
+    return {tally.post_id: tally for tally in PostPollTally.objects.filter(post_id__in=list(post_ids))}
+
+
+def rebuild_poll_tallies(*, post_ids=None, batch_size: int = POLL_TALLY_REBUILD_BATCH_SIZE) -> dict[str, int]:
+    stats = {"posts": 0, "tallies": 0, "skipped": 0, "removed": 0}
+    posts = Post.objects.filter(raw_data__has_key="poll").only("id", "raw_data").order_by("id")
+    if post_ids is not None:
+        posts = posts.filter(id__in=list(post_ids))
+    for post in posts.iterator(chunk_size=max(1, int(batch_size))):
+        stats["posts"] += 1
+        with transaction.atomic():
+            Post.objects.select_for_update().filter(id=post.id).values_list("id", flat=True).first()
+            if rebuild_poll_tally(post) is None:
+                stats["skipped"] += 1
+            else:
+                stats["tallies"] += 1
+    orphaned = PostPollTally.objects.exclude(post__raw_data__has_key="poll")
+    if post_ids is not None:
+        orphaned = orphaned.filter(post_id__in=list(post_ids))
+    stats["removed"] += orphaned.delete()[0]
+    return stats
+
+
+__all__ = [
+    "apply_poll_vote_change",
+    "poll_option_texts",
+    "poll_options_count",
+    "poll_tallies_for_posts",
+    "rebuild_poll_tallies",
+    "rebuild_poll_tally",
+]
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Iterable
+
+from django.contrib.auth import get_user_model
+from django.db.models import Avg, Count
+
+from communities.models import Comun, ComunPostCategoryAssignment
+from editor.models import (
+    PostBugReportConfirmation,
+    PostPollTally,
+    PostPollVote,
+    PostRatingVote,
+    PostTemplateConfig,
+    default_enabled_template_editor_blocks,
+    normalize_template_editor_blocks_for_template,
+)
+from editor import service as editor_service
+from feeds.models import POST_TRANSLATION_STATUS_TRANSLATED, ComunTranslation, Post, PostFavorite, PostLike
+from feeds.poll_tallies import poll_tallies_for_posts
+from feeds.post_views import pending_post_views
+from ratings.service import (
+    calculate_author_ratings,
+    calculate_posts_base_rating,
+    calculate_posts_community_rating,
+    get_rating_settings,
+)
+
+User = get_user_model()
+
+_ANY_USER = object()
+
+
+@dataclass
+class PostCardContext:
+    user_id: int | None
+    language: str
+    comuns: dict[int, Comun | None] = field(default_factory=dict)
+    comun_translations: dict[int, ComunTranslation] = field(default_factory=dict)
+    moderated_comun_ids: set[int] = field(default_factory=set)
+    poll_tallies: dict[int, PostPollTally] = field(default_factory=dict)
+    poll_user_selections: dict[int, object] = field(default_factory=dict)
+    rating_aggregates: dict[tuple[int, str], tuple[float | None, int]] = field(default_factory=dict)
+    rating_user_votes: dict[tuple[int, str], int] = field(default_factory=dict)
+    bug_report_counts: dict[int, int] = field(default_factory=dict)
+    bug_report_confirmed_post_ids: set[int] = field(default_factory=set)
+    favorite_post_ids: set[int] = field(default_factory=set)
+    base_ratings: dict[int, Decimal] = field(default_factory=dict)
+    community_ratings: dict[int, Decimal] = field(default_factory=dict)
+    author_ratings: dict[int, Decimal] | None = None
+    enabled_editor_blocks: dict[str, object] = field(default_factory=dict)
+    rating_settings: object = None
+
+    @classmethod
+    def load(
+        cls,
+        posts: Iterable[Post],
+        user: User | None = None,
+        *,
+        language: str = "ru",
+        with_author_ratings: bool = False,
+    ) -> PostCardContext:
+        posts = [post for post in posts if post is not None and post.id]
+        context = cls(user_id=user.id if user else None, language=str(language or "ru").strip().lower())
+        if not posts:
+            return context
+        post_ids = [post.id for post in posts]
+
+        context._load_comuns(posts, user)
+        context._load_polls(posts, user)
+        context._load_post_ratings(posts, user)
+        context._load_bug_reports(posts, user)
+        if user:
+            context.favorite_post_ids = set(
+                PostFavorite.objects.filter(user=user, post_id__in=post_ids).values_list("post_id", flat=True)
+            )
+            vote_by_post_id = dict(
+                PostLike.objects.filter(user=user, post_id__in=post_ids).values_list("post_id", "value")
+            )
+        else:
+            vote_by_post_id = {}
+
+        context.rating_settings = get_rating_settings()
+        context.base_ratings = calculate_posts_base_rating(posts, settings=context.rating_settings)
+        context.community_ratings = calculate_posts_community_rating(posts, settings=context.rating_settings)
+        if with_author_ratings:
+            context.author_ratings = calculate_author_ratings(
+                {post.author_id: post.author for post in posts}.values(),
+                settings=context.rating_settings,
+            )
+        context.enabled_editor_blocks = {
+            str(row["template_type"]): row["enabled_editor_blocks"]
+            for row in PostTemplateConfig.objects.filter(is_active=True).values(
+                "template_type",
+                "enabled_editor_blocks",
+            )
+        }
+
+        pending_views = pending_post_views(post_ids)
+        for post in posts:
+            post._card_context = context
+            post._current_user_vote = int(vote_by_post_id.get(post.id, 0))
+            post._pending_views_count = int(pending_views.get(post.id, 0))
+        return context
+
+    def _load_comuns(self, posts: list[Post], user: User | None) -> None:
+        slugs_by_post_id = {}
+        for post in posts:
+            raw_data = post.raw_data if isinstance(post.raw_data, dict) else {}
+            comun_slug = str(raw_data.get("comun_slug") or "").strip()
+            if comun_slug:
+                slugs_by_post_id[post.id] = comun_slug
+        comuns_by_slug = {}
+        if slugs_by_post_id:
+            comuns_by_slug = {
+                comun.slug: comun
+                for comun in Comun.objects.filter(slug__in=set(slugs_by_post_id.values()), is_active=True)
+            }
+        assignment_comuns: dict[int, Comun] = {}
+        for assignment in (
+            ComunPostCategoryAssignment.objects.select_related("comun")
+            .filter(post_id__in=[post.id for post in posts], comun__is_active=True)
+            .order_by("post_id", "comun__sort_order", "comun__name")
+        ):
+            assignment_comuns.setdefault(assignment.post_id, assignment.comun)
+        source_comuns = {
+            comun.telegram_source_author_id: comun
+            for comun in Comun.objects.filter(
+                telegram_source_author_id__in={post.author_id for post in posts if post.author_id},
+            )
+        }
+
+        for post in posts:
+            comun = comuns_by_slug.get(slugs_by_post_id.get(post.id)) or assignment_comuns.get(post.id)
+            if comun is None:
+                source_comun = source_comuns.get(post.author_id)
+                if source_comun is not None and source_comun.is_active:
+                    comun = source_comun
+            self.comuns[post.id] = comun
+
+        comun_ids = {comun.id for comun in self.comuns.values() if comun is not None}
+        if not comun_ids:
+            return
+        if self.language != "ru":
+            for translation in (
+                ComunTranslation.objects.filter(
+                    comun_id__in=comun_ids,
+                    language=self.language,
+                    status=POST_TRANSLATION_STATUS_TRANSLATED,
+                )
+                .only("comun_id", "name", "product_description")
+                .order_by("comun_id", "-updated_at")
+            ):
+                self.comun_translations.setdefault(translation.comun_id, translation)
+        if user:
+            self.moderated_comun_ids = {
+                comun.id for comun in self.comuns.values() if comun is not None and comun.creator_id == user.id
+            }
+            self.moderated_comun_ids.update(
+                Comun.moderators.through.objects.filter(
+                    comun_id__in=comun_ids,
+                    user_id=user.id,
+                ).values_list("comun_id", flat=True)
+            )
+
+    def _load_polls(self, posts: list[Post], user: User | None) -> None:
+        poll_post_ids = [
+            post.id
+            for post in posts
+            if isinstance(post.raw_data, dict) and post.raw_data.get("poll")
+        ]
+        if not poll_post_ids:
+            return
+        self.poll_tallies = poll_tallies_for_posts(poll_post_ids)
+        if user:
+            self.poll_user_selections = dict(
+                PostPollVote.objects.filter(post_id__in=poll_post_ids, user=user).values_list(
+                    "post_id",
+                    "selected_options",
+                )
+            )
+
+    def _load_post_ratings(self, posts: list[Post], user: User | None) -> None:
+        rating_post_ids = [
+            post.id
+            for post in posts
+            if editor_service._extract_inline_post_rating_blocks(post.content or "")
+        ]
+        if not rating_post_ids:
+            return
+        for row in (
+            PostRatingVote.objects.filter(post_id__in=rating_post_ids)
+            .values("post_id", "block_id")
+            .annotate(average_value=Avg("value"), votes_count=Count("id"))
+        ):
+            self.rating_aggregates[(row["post_id"], row["block_id"])] = (
+                row["average_value"],
+                int(row["votes_count"] or 0),
+            )
+        if user:
+            self.rating_user_votes = {
+                (post_id, block_id): int(value)
+                for post_id, block_id, value in PostRatingVote.objects.filter(
+                    post_id__in=rating_post_ids,
+                    user=user,
+                ).values_list("post_id", "block_id", "value")
+            }
+
+    def _load_bug_reports(self, posts: list[Post], user: User | None) -> None:
+        post_ids = [post.id for post in posts]
+        self.bug_report_counts = dict(
+            PostBugReportConfirmation.objects.filter(post_id__in=post_ids)
+            .values("post_id")
+            .annotate(total=Count("id"))
+            .values_list("post_id", "total")
+        )
+        if user and self.bug_report_counts:
+            self.bug_report_confirmed_post_ids = set(
+                PostBugReportConfirmation.objects.filter(
+                    post_id__in=self.bug_report_counts.keys(),
+                    user=user,
+                ).values_list("post_id", flat=True)
+            )
+
+    def enabled_template_editor_blocks(self, template_payload: dict | None) -> list[str]:
+        template_type = editor_service._template_type_from_payload(template_payload)
+        if template_type not in self.enabled_editor_blocks:
+            return default_enabled_template_editor_blocks(template_type)
+        return normalize_template_editor_blocks_for_template(
+            template_type, self.enabled_editor_blocks[template_type]
+        )
+
+    def is_moderator(self, comun: Comun) -> bool:
+        return comun.id in self.moderated_comun_ids
+
+    def rating_block(self, post: Post, block_id: str) -> tuple[float | None, int, int | None]:
+        average_value, votes_count = self.rating_aggregates.get((post.id, block_id), (None, 0))
+        return average_value, votes_count, self.rating_user_votes.get((post.id, block_id))
+
+    def bug_report_confirmation(self, post: Post) -> dict:
+        return {
+            "count": self.bug_report_counts.get(post.id, 0),
+            "confirmed": post.id in self.bug_report_confirmed_post_ids,
+        }
+
+
+def post_card_context(post: Post, user=_ANY_USER) -> PostCardContext | None:
+    context = getattr(post, "_card_context", None)
+    if context is None or post.id not in context.comuns:
+        return None
+    if user is not _ANY_USER and context.user_id != (user.id if user else None):
+        return None
+    return context
+
+
+__all__ = [
+    "PostCardContext",
+    "post_card_context",
+]
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from feeds.models import Post, PostDailyView, PostViewIncrement
+
+POST_VIEW_FLUSH_BATCH_SIZE = 5000
+
+
+def record_post_view(post_id: int, view_date=None) -> None:
+    PostViewIncrement.objects.create(
+        post_id_snapshot=post_id,
+        date=view_date or timezone.localdate(),
+    )
+
+
+def pending_post_views(post_ids) -> dict[int, int]:
+    post_ids = [post_id for post_id in post_ids if post_id]
+    if not post_ids:
+        return {}
+    return dict(
+        PostViewIncrement.objects.filter(post_id_snapshot__in=post_ids)
+        .values("post_id_snapshot")
+        .annotate(n=Count("id"))
+        .order_by()
+        .values_list("post_id_snapshot", "n")
+    )
+
+
+def attach_pending_post_views(posts) -> None:
+    posts = [post for post in posts if post is not None and post.id]
+    pending = pending_post_views([post.id for post in posts])
+    for post in posts:
+        post._pending_views_count = int(pending.get(post.id, 0))
+
+
+def _claim_post_view_increments(batch_size: int) -> list[tuple[int, object, int]]:
+    table = connection.ops.quote_name(PostViewIncrement._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH claimed AS (
+                DELETE FROM {table}
+                WHERE id IN (
+                    SELECT id FROM {table}
+                    ORDER BY id
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                RETURNING post_id_snapshot, date
+            )
+            SELECT post_id_snapshot, date, COUNT(*) FROM claimed
+            GROUP BY post_id_snapshot, date
+            ORDER BY post_id_snapshot, date
+            """,
+            [batch_size],
+        )
+        return cursor.fetchall()
+
+
+def _apply_post_views_totals(totals: dict[int, int]) -> None:
+    post_table = connection.ops.quote_name(Post._meta.db_table)
+    values = ", ".join(["(%s::bigint, %s::integer)"] * len(totals))
+    params = [value for row in sorted(totals.items()) for value in row]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            UPDATE {post_table} AS post
+            SET real_views_count = post.real_views_count + pending.views
+            FROM (VALUES {values}) AS pending(post_id, views)
+            WHERE post.id = pending.post_id
+            """,
+            params,
+        )
+
+
+def _apply_post_daily_views(rows: list[tuple[int, object, int]]) -> None:
+    post_table = connection.ops.quote_name(Post._meta.db_table)
+    daily_table = connection.ops.quote_name(PostDailyView._meta.db_table)
+    values = ", ".join(["(%s::bigint, %s::date, %s::integer)"] * len(rows))
+    params = [value for row in rows for value in row]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {daily_table} (post_id, date, views_count)
+            SELECT pending.post_id, pending.date, pending.views
+            FROM (VALUES {values}) AS pending(post_id, date, views)
+            JOIN {post_table} AS post ON post.id = pending.post_id
+            ON CONFLICT (post_id, date)
+            DO UPDATE SET views_count = {daily_table}.views_count + EXCLUDED.views_count
+            """,
+            params,
+        )
+
+
+def flush_post_views(*, batch_size: int = POST_VIEW_FLUSH_BATCH_SIZE) -> dict[str, int]:
+    stats = {"views": 0, "posts": 0, "days": 0}
+    with transaction.atomic():
+        rows = _claim_post_view_increments(max(1, int(batch_size)))
+        if not rows:
+            return stats
+        totals: dict[int, int] = {}
+        for post_id, _date, views in rows:
+            totals[post_id] = totals.get(post_id, 0) + int(views)
+        _apply_post_views_totals(totals)
+        _apply_post_daily_views(rows)
+    stats["views"] = sum(totals.values())
+    stats["posts"] = len(totals)
+    stats["days"] = len(rows)
+    return stats
+
+
+__all__ = [
+    "attach_pending_post_views",
+    "flush_post_views",
+    "pending_post_views",
+    "record_post_view",
+]
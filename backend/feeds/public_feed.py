@@ -0,0 +1,437 @@
+from __future__ import annotations
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q, QuerySet
+from django.utils import timezone
+
+from communities.models import Comun, ComunPostCategoryAssignment
+from feeds.models import (
+    POST_TRANSLATION_STATUS_TRANSLATED,
+    Author,
+    Post,
+    PostTranslation,
+    PublicFeedCandidate,
+    PublicFeedChange,
+    PublicFeedItem,
+    Tag,
+)
+from feeds.views import PUBLIC_POST_LANGUAGES, _publish_ready_filter
+from ratings.service import (
+    calculate_author_ratings,
+    calculate_home_feed_post_metrics,
+    get_rating_settings,
+)
+
+PUBLIC_FEED_DEFAULT_LIMIT = 1000
+PUBLIC_FEED_DEFAULT_FETCH_MULTIPLIER = 5
+PUBLIC_FEED_CHANGE_BATCH_SIZE = 5000
+PUBLIC_FEED_SCHEDULED_LOOKBACK = timedelta(days=1)
+
+
+def public_feed_candidate_queryset(now) -> QuerySet:
+    hidden_home_tag_qs = Tag.objects.filter(
+        posts__id=OuterRef("pk"),
+        hide_from_home=True,
+    )
+    hidden_home_comun_category_post_ids = ComunPostCategoryAssignment.objects.filter(
+        category__hide_from_home=True,
+    ).values("post_id")
+
+    base_query = (
+        Post.objects.filter(
+            is_blocked=False,
+            is_pending=False,
+            author__is_blocked=False,
+        )
+        .filter(_publish_ready_filter(now))
+        .filter(Q(author__shadow_banned=False) | Q(author__force_home=True))
+        .annotate(has_hidden_home_tag=Exists(hidden_home_tag_qs))
+        .filter(has_hidden_home_tag=False)
+        .exclude(id__in=hidden_home_comun_category_post_ids)
+    )
+
+    hidden_home_comun_slugs = list(
+        Comun.objects.filter(hide_from_home=True).values_list("slug", flat=True)
+    )
+    if hidden_home_comun_slugs:
+        hidden_home_comun_post_ids = (
+            Post.objects.filter(
+                raw_data__source="manual_comun",
+                raw_data__comun_slug__in=hidden_home_comun_slugs,
+            )
+            .exclude(comun_category_assignments__category_id__isnull=False)
+            .values("id")
+        )
+        base_query = base_query.exclude(id__in=hidden_home_comun_post_ids)
+    return base_query
+
+
+def _score_public_feed_candidates(posts: list[Post], rating_settings) -> list[PublicFeedCandidate]:
+    if not posts:
+        return []
+    author_rating_map = calculate_author_ratings(
+        Author.objects.filter(id__in={post.author_id for post in posts}),
+        settings=rating_settings,
+    )
+    post_score_map, community_day_key_map = calculate_home_feed_post_metrics(
+        posts,
+        settings=rating_settings,
+        author_ratings=author_rating_map,
+    )
+    post_ids = [post.id for post in posts]
+    languages_by_post_id: dict[int, set[str]] = {post.id: {post.original_language} for post in posts}
+    for post_id, language in PostTranslation.objects.filter(
+        post_id__in=post_ids,
+        status=POST_TRANSLATION_STATUS_TRANSLATED,
+    ).values_list("post_id", "language"):
+        languages_by_post_id[post_id].add(language)
+    comun_slugs_by_post_id = _comun_slugs_for_posts(posts)
+    candidates = []
+    for post in posts:
+        community_day_key = community_day_key_map.get(post.id)
+        candidates.append(
+            PublicFeedCandidate(
+                post_id=post.id,
+                author_id_snapshot=post.author_id,
+                post_created_at=post.created_at,
+                score=post_score_map.get(post.id, 0),
+                community_id=community_day_key[0] if community_day_key else None,
+                community_day=community_day_key[1] if community_day_key else None,
+                languages=sorted(languages_by_post_id.get(post.id) or []),
+                comun_slugs=sorted(comun_slugs_by_post_id.get(post.id) or []),
+            )
+        )
+    return candidates
+
+
+def _comun_slugs_for_posts(posts: list[Post]) -> dict[int, set[str]]:
+    slugs_by_post_id: dict[int, set[str]] = {post.id: set() for post in posts}
+    for post in posts:
+        raw_data = post.raw_data if isinstance(post.raw_data, dict) else {}
+        comun_slug = str(raw_data.get("comun_slug") or "").strip().lower()
+        if comun_slug:
+            slugs_by_post_id[post.id].add(comun_slug)
+    for post_id, comun_slug in ComunPostCategoryAssignment.objects.filter(
+        post_id__in=slugs_by_post_id.keys(),
+    ).values_list("post_id", "comun__slug"):
+        if comun_slug:
+            slugs_by_post_id[post_id].add(str(comun_slug).lower())
+    source_comun_slugs = dict(
+        Comun.objects.filter(
+            telegram_source_author_id__in={post.author_id for post in posts},
+        ).values_list("telegram_source_author_id", "slug")
+    )
+    for post in posts:
+        source_comun_slug = source_comun_slugs.get(post.author_id)
+        if source_comun_slug:
+            slugs_by_post_id[post.id].add(str(source_comun_slug).lower())
+    return slugs_by_post_id
+
+
+def _public_feed_variants(candidates: list[PublicFeedCandidate]) -> list[tuple[str, list[PublicFeedCandidate]]]:
+    variants = [(PublicFeedItem.FEED_HOME, candidates)]
+    for language in PUBLIC_POST_LANGUAGES:
+        variants.append(
+            (
+                PublicFeedItem.home_feed_for_language(language),
+                [candidate for candidate in candidates if language in (candidate.languages or [])],
+            )
+        )
+    return variants
+
+
+def _apply_public_feed_variants(
+    candidates: list[PublicFeedCandidate],
+    *,
+    limit: int,
+    home_posts_per_community_per_day: int,
+) -> dict[str, int]:
+    stats = {"items": 0, "created": 0, "updated": 0, "deleted": 0}
+    for feed, feed_candidates in _public_feed_variants(candidates):
+        selected = _select_public_feed_candidates(
+            feed_candidates,
+            limit=limit,
+            home_posts_per_community_per_day=home_posts_per_community_per_day,
+        )
+        feed_stats = _apply_public_feed_items(feed, selected)
+        if feed == PublicFeedItem.FEED_HOME:
+            stats["items"] = feed_stats["items"]
+        for key in ("created", "updated", "deleted"):
+            stats[key] += feed_stats[key]
+    return stats
+
+
+def _select_public_feed_candidates(
+    candidates: list[PublicFeedCandidate],
+    *,
+    limit: int,
+    home_posts_per_community_per_day: int,
+) -> list[PublicFeedCandidate]:
+    selected: list[PublicFeedCandidate] = []
+    community_day_counts: dict[tuple[int, object], int] = {}
+    remaining = candidates[:]
+    last_author_id = None
+    while remaining and len(selected) < limit:
+        next_index = None
+        for index, candidate in enumerate(remaining):
+            if candidate.author_id_snapshot != last_author_id:
+                next_index = index
+                break
+        if next_index is None:
+            next_index = 0
+        candidate = remaining.pop(next_index)
+        if candidate.score < 0:
+            continue
+        if candidate.community_id is not None and candidate.community_day is not None:
+            community_day_key = (candidate.community_id, candidate.community_day)
+            community_day_count = community_day_counts.get(community_day_key, 0)
+            if community_day_count >= home_posts_per_community_per_day:
+                continue
+            community_day_counts[community_day_key] = community_day_count + 1
+        selected.append(candidate)
+        last_author_id = candidate.author_id_snapshot
+    return selected
+
+
+def _home_posts_per_community_per_day(rating_settings) -> int:
+    return max(int(getattr(rating_settings, "home_posts_per_community_per_day", 3) or 3), 1)
+
+
+def _apply_public_feed_items(feed: str, selected: list[PublicFeedCandidate]) -> dict[str, int]:
+    existing_by_post_id = {
+        item.post_id: item
+        for item in PublicFeedItem.objects.filter(feed=feed).only(
+            "id",
+            "post_id",
+            "rank",
+            "score",
+            "post_created_at",
+            "author_id_snapshot",
+            "comun_slugs_snapshot",
+        )
+    }
+    selected_post_ids = {candidate.post_id for candidate in selected}
+    stale_ids = [item.id for post_id, item in existing_by_post_id.items() if post_id not in selected_post_ids]
+    now = timezone.now()
+    to_create: list[PublicFeedItem] = []
+    to_update: list[PublicFeedItem] = []
+    for index, candidate in enumerate(selected):
+        rank = index + 1
+        score = candidate.score or 0
+        comun_slugs = list(candidate.comun_slugs or [])
+        item = existing_by_post_id.get(candidate.post_id)
+        if item is None:
+            to_create.append(
+                PublicFeedItem(
+                    feed=feed,
+                    post_id=candidate.post_id,
+                    rank=rank,
+                    score=score,
+                    post_created_at=candidate.post_created_at,
+                    author_id_snapshot=candidate.author_id_snapshot,
+                    comun_slugs_snapshot=comun_slugs,
+                )
+            )
+            continue
+        if (
+            item.rank == rank
+            and item.score == score
+            and item.post_created_at == candidate.post_created_at
+            and item.author_id_snapshot == candidate.author_id_snapshot
+            and list(item.comun_slugs_snapshot or []) == comun_slugs
+        ):
+            continue
+        item.rank = rank
+        item.score = score
+        item.post_created_at = candidate.post_created_at
+        item.author_id_snapshot = candidate.author_id_snapshot
+        item.comun_slugs_snapshot = comun_slugs
+        item.updated_at = now
+        to_update.append(item)
+
+    with transaction.atomic():
+        if stale_ids:
+            PublicFeedItem.objects.filter(id__in=stale_ids).delete()
+        if to_update:
+            PublicFeedItem.objects.bulk_update(
+                to_update,
+                ["rank", "score", "post_created_at", "author_id_snapshot", "comun_slugs_snapshot", "updated_at"],
+                batch_size=1000,
+            )
+        if to_create:
+            PublicFeedItem.objects.bulk_create(to_create, batch_size=1000)
+    return {
+        "items": len(selected),
+        "created": len(to_create),
+        "updated": len(to_update),
+        "deleted": len(stale_ids),
+    }
+
+
+def _window_size(limit: int, fetch_multiplier: int) -> int:
+    return max(1, int(limit)) * max(1, int(fetch_multiplier))
+
+
+def _ordered_candidates(window_size: int) -> list[PublicFeedCandidate]:
+    return list(PublicFeedCandidate.objects.order_by("-post_created_at", "-post_id")[:window_size])
+
+
+def rebuild_public_feed(
+    *,
+    limit: int = PUBLIC_FEED_DEFAULT_LIMIT,
+    fetch_multiplier: int = PUBLIC_FEED_DEFAULT_FETCH_MULTIPLIER,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    limit = max(1, int(limit))
+    now = timezone.now()
+    last_change_id = PublicFeedChange.objects.order_by("-id").values_list("id", flat=True).first()
+    posts = list(
+        public_feed_candidate_queryset(now)
+        .select_related("author")
+        .order_by("-created_at", "-id")[: _window_size(limit, fetch_multiplier)]
+    )
+    rating_settings = get_rating_settings()
+    candidates = _score_public_feed_candidates(posts, rating_settings)
+    home_posts_per_community_per_day = _home_posts_per_community_per_day(rating_settings)
+    if dry_run:
+        selected = _select_public_feed_candidates(
+            candidates,
+            limit=limit,
+            home_posts_per_community_per_day=home_posts_per_community_per_day,
+        )
+        return {"candidates": len(candidates), "items": len(selected), "created": 0, "updated": 0, "deleted": 0}
+
+    stats = {"candidates": len(candidates)}
+
+    with transaction.atomic():
+        PublicFeedCandidate.objects.all().delete()
+        PublicFeedCandidate.objects.bulk_create(candidates, batch_size=1000)
+        stats.update(
+            _apply_public_feed_variants(
+                candidates,
+                limit=limit,
+                home_posts_per_community_per_day=home_posts_per_community_per_day,
+            )
+        )
+        if last_change_id is not None:
+            PublicFeedChange.objects.filter(id__lte=last_change_id).delete()
+    return stats
+
+
+def _dirty_post_ids_for_changes(changes: list[PublicFeedChange], *, window_start, now) -> set[int]:
+    post_ids = {int(change.post_id_snapshot) for change in changes if change.post_id_snapshot}
+    author_ids = {int(change.author_id_snapshot) for change in changes if change.author_id_snapshot}
+    comun_ids = {int(change.comun_id_snapshot) for change in changes if change.comun_id_snapshot}
+    if post_ids:
+        author_ids.update(Post.objects.filter(id__in=post_ids).values_list("author_id", flat=True))
+
+    recent_posts = Post.objects.filter(created_at__gte=window_start) if window_start else Post.objects.all()
+    if author_ids:
+        post_ids.update(recent_posts.filter(author_id__in=author_ids).values_list("id", flat=True))
+        post_ids.update(
+            PublicFeedCandidate.objects.filter(author_id_snapshot__in=author_ids).values_list("post_id", flat=True)
+        )
+    if comun_ids:
+        comun_filter = Q()
+        for slug, source_author_id in Comun.objects.filter(id__in=comun_ids).values_list(
+            "slug",
+            "telegram_source_author_id",
+        ):
+            comun_filter |= Q(raw_data__comun_slug=slug)
+            if source_author_id:
+                comun_filter |= Q(author_id=source_author_id)
+        if comun_filter:
+            post_ids.update(recent_posts.filter(comun_filter).values_list("id", flat=True))
+        post_ids.update(
+            PublicFeedCandidate.objects.filter(community_id__in=comun_ids).values_list("post_id", flat=True)
+        )
+
+    post_ids.update(
+        recent_posts.filter(
+            publish_at__gt=now - PUBLIC_FEED_SCHEDULED_LOOKBACK,
+            publish_at__lte=now,
+            public_feed_candidate__isnull=True,
+        ).values_list("id", flat=True)
+    )
+    return post_ids
+
+
+def refresh_public_feed(
+    *,
+    limit: int = PUBLIC_FEED_DEFAULT_LIMIT,
+    fetch_multiplier: int = PUBLIC_FEED_DEFAULT_FETCH_MULTIPLIER,
+    batch_size: int = PUBLIC_FEED_CHANGE_BATCH_SIZE,
+) -> dict[str, int]:
+    limit = max(1, int(limit))
+    window_size = _window_size(limit, fetch_multiplier)
+    changes = list(PublicFeedChange.objects.order_by("id")[: max(1, int(batch_size))])
+    if not PublicFeedCandidate.objects.exists() or any(change.full_rebuild for change in changes):
+        stats = rebuild_public_feed(limit=limit, fetch_multiplier=fetch_multiplier)
+        stats["changes"] = len(changes)
+        stats["rescored"] = stats["candidates"]
+        return stats
+
+    now = timezone.now()
+    window = _ordered_candidates(window_size)
+    window_start = window[-1].post_created_at if len(window) >= window_size else None
+    dirty_post_ids = _dirty_post_ids_for_changes(changes, window_start=window_start, now=now)
+    stats = {"changes": len(changes), "rescored": 0, "items": 0, "created": 0, "updated": 0, "deleted": 0}
+    if not dirty_post_ids:
+        if changes:
+            PublicFeedChange.objects.filter(id__lte=changes[-1].id).delete()
+        return stats
+
+    rating_settings = get_rating_settings()
+    eligible_posts = list(
+        public_feed_candidate_queryset(now).filter(id__in=dirty_post_ids).select_related("author")
+    )
+    if window_start is not None:
+        eligible_posts = [post for post in eligible_posts if post.created_at >= window_start]
+    candidates = _score_public_feed_candidates(eligible_posts, rating_settings)
+    stats["rescored"] = len(candidates)
+    eligible_ids = {candidate.post_id for candidate in candidates}
+
+    with transaction.atomic():
+        PublicFeedCandidate.objects.filter(post_id__in=dirty_post_ids - eligible_ids).delete()
+        if candidates:
+            PublicFeedCandidate.objects.bulk_create(
+                candidates,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=["post"],
+                update_fields=[
+                    "author_id_snapshot",
+                    "post_created_at",
+                    "score",
+                    "community_id",
+                    "community_day",
+                    "languages",
+                    "comun_slugs",
+                    "updated_at",
+                ],
+            )
+        window = _ordered_candidates(window_size)
+        if len(window) >= window_size:
+            PublicFeedCandidate.objects.filter(
+                Q(post_created_at__lt=window[-1].post_created_at)
+                | Q(post_created_at=window[-1].post_created_at, post_id__lt=window[-1].post_id)
+            ).delete()
+        stats.update(
+            _apply_public_feed_variants(
+                window,
+                limit=limit,
+                home_posts_per_community_per_day=_home_posts_per_community_per_day(rating_settings),
+            )
+        )
+        if changes:
+            PublicFeedChange.objects.filter(id__lte=changes[-1].id).delete()
+    return stats
+
+
+__all__ = [
+    "public_feed_candidate_queryset",
+    "rebuild_public_feed",
+    "refresh_public_feed",
+]
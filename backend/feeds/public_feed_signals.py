@@ -0,0 +1,171 @@
+from django.db.models import Min
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.db.utils import OperationalError, ProgrammingError
+from django.dispatch import receiver
+
+from communities.models import Comun, ComunCategory, ComunPostCategoryAssignment
+from ratings.models import RatingSettings
+
+from .models import (
+    Author,
+    Post,
+    PostComment,
+    PostCommentLike,
+    PostLike,
+    PostTranslation,
+    PublicFeedCandidate,
+    PublicFeedChange,
+    Tag,
+)
+
+
+_POST_FEED_FIELDS = {
+    "author",
+    "author_id",
+    "is_pending",
+    "is_blocked",
+    "publish_at",
+    "raw_data",
+    "rating",
+    "comments_count",
+    "created_at",
+}
+_AUTHOR_FEED_FIELDS = {"is_blocked", "shadow_banned", "force_home", "username"}
+_COMUN_FEED_FIELDS = {"slug", "is_active", "hide_from_home", "telegram_source_author", "rating_score"}
+
+
+def record_public_feed_changes(
+    *,
+    post_ids=(),
+    author_ids=(),
+    comun_ids=(),
+    full_rebuild: bool = False,
+    reason: str = "",
+) -> None:
+    rows = [PublicFeedChange(post_id_snapshot=post_id, reason=reason) for post_id in post_ids if post_id]
+    rows.extend(PublicFeedChange(author_id_snapshot=author_id, reason=reason) for author_id in author_ids if author_id)
+    rows.extend(PublicFeedChange(comun_id_snapshot=comun_id, reason=reason) for comun_id in comun_ids if comun_id)
+    if full_rebuild:
+        rows.append(PublicFeedChange(full_rebuild=True, reason=reason))
+    if not rows:
+        return
+    try:
+        PublicFeedChange.objects.bulk_create(rows)
+    except (OperationalError, ProgrammingError):
+        return
+
+
+def _touches(update_fields, fields: set[str]) -> bool:
+    return update_fields is None or bool(fields.intersection(update_fields))
+
+
+@receiver(post_save, sender=Post, dispatch_uid="feeds.public_feed_post_saved")
+def post_saved(sender, instance, created, update_fields, **kwargs):
+    if created or _touches(update_fields, _POST_FEED_FIELDS):
+        record_public_feed_changes(post_ids=[instance.pk], reason="post")
+
+
+@receiver(post_delete, sender=Post, dispatch_uid="feeds.public_feed_post_deleted")
+def post_deleted(sender, instance, **kwargs):
+    record_public_feed_changes(author_ids=[instance.author_id], reason="post_delete")
+
+
+@receiver(m2m_changed, sender=Post.tags.through, dispatch_uid="feeds.public_feed_post_tags_changed")
+def post_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in {"post_add", "post_remove", "post_clear"}:
+        return
+    if reverse:
+        record_public_feed_changes(post_ids=sorted(pk_set or []), reason="tags")
+    else:
+        record_public_feed_changes(post_ids=[instance.pk], reason="tags")
+
+
+@receiver(post_save, sender=PostLike, dispatch_uid="feeds.public_feed_post_like_saved")
+@receiver(post_delete, sender=PostLike, dispatch_uid="feeds.public_feed_post_like_deleted")
+def post_like_changed(sender, instance, **kwargs):
+    record_public_feed_changes(post_ids=[instance.post_id], reason="vote")
+
+
+@receiver(post_save, sender=PostComment, dispatch_uid="feeds.public_feed_comment_saved")
+def comment_saved(sender, instance, created, update_fields, **kwargs):
+    if created or _touches(update_fields, {"is_deleted"}):
+        record_public_feed_changes(post_ids=[instance.post_id], reason="comment")
+
+
+@receiver(post_delete, sender=PostComment, dispatch_uid="feeds.public_feed_comment_deleted")
+def comment_deleted(sender, instance, **kwargs):
+    record_public_feed_changes(post_ids=[instance.post_id], reason="comment")
+
+
+@receiver(post_save, sender=PostCommentLike, dispatch_uid="feeds.public_feed_comment_like_saved")
+@receiver(post_delete, sender=PostCommentLike, dispatch_uid="feeds.public_feed_comment_like_deleted")
+def comment_like_changed(sender, instance, **kwargs):
+    post_id = PostComment.objects.filter(id=instance.comment_id).values_list("post_id", flat=True).first()
+    record_public_feed_changes(post_ids=[post_id], reason="comment_like")
+
+
+@receiver(post_save, sender=PostTranslation, dispatch_uid="feeds.public_feed_translation_saved")
+def translation_saved(sender, instance, created, update_fields, **kwargs):
+    if created or _touches(update_fields, {"status", "language"}):
+        record_public_feed_changes(post_ids=[instance.post_id], reason="translation")
+
+
+@receiver(post_delete, sender=PostTranslation, dispatch_uid="feeds.public_feed_translation_deleted")
+def translation_deleted(sender, instance, **kwargs):
+    record_public_feed_changes(post_ids=[instance.post_id], reason="translation")
+
+
+@receiver(post_save, sender=ComunPostCategoryAssignment, dispatch_uid="feeds.public_feed_assignment_saved")
+@receiver(post_delete, sender=ComunPostCategoryAssignment, dispatch_uid="feeds.public_feed_assignment_deleted")
+def comun_assignment_changed(sender, instance, **kwargs):
+    record_public_feed_changes(post_ids=[instance.post_id], reason="comun_category")
+
+
+@receiver(post_save, sender=Author, dispatch_uid="feeds.public_feed_author_saved")
+def author_saved(sender, instance, created, update_fields, **kwargs):
+    if not created and _touches(update_fields, _AUTHOR_FEED_FIELDS):
+        record_public_feed_changes(author_ids=[instance.pk], reason="author")
+
+
+@receiver(post_save, sender=Comun, dispatch_uid="feeds.public_feed_comun_saved")
+def comun_saved(sender, instance, created, update_fields, **kwargs):
+    if _touches(update_fields, _COMUN_FEED_FIELDS):
+        record_public_feed_changes(comun_ids=[instance.pk], reason="comun")
+
+
+def _home_visibility_post_ids(instance) -> list[int]:
+    # Posts older than the candidate window cannot enter it, so only the
+    # window's range is refreshed; with no candidates the next refresh rebuilds.
+    window_start = PublicFeedCandidate.objects.aggregate(start=Min("post_created_at"))["start"]
+    if window_start is None:
+        return []
+    if isinstance(instance, Tag):
+        posts = Post.objects.filter(tags=instance)
+    else:
+        posts = Post.objects.filter(comun_category_assignments__category=instance)
+    return list(posts.filter(created_at__gte=window_start).values_list("id", flat=True).distinct())
+
+
+@receiver(pre_save, sender=Tag, dispatch_uid="feeds.public_feed_tag_pre_save")
+@receiver(pre_save, sender=ComunCategory, dispatch_uid="feeds.public_feed_comun_category_pre_save")
+def home_visibility_pre_save(sender, instance, update_fields, **kwargs):
+    if instance.pk is None or not _touches(update_fields, {"hide_from_home"}):
+        return
+    instance._public_feed_hide_from_home = (
+        sender.objects.filter(pk=instance.pk).values_list("hide_from_home", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Tag, dispatch_uid="feeds.public_feed_tag_saved")
+@receiver(post_save, sender=ComunCategory, dispatch_uid="feeds.public_feed_comun_category_saved")
+def home_visibility_saved(sender, instance, created, update_fields, **kwargs):
+    previous = instance.__dict__.pop("_public_feed_hide_from_home", None)
+    if created or previous is None or previous == instance.hide_from_home:
+        return
+    record_public_feed_changes(post_ids=_home_visibility_post_ids(instance), reason="hide_from_home")
+
+
+@receiver(post_save, sender=RatingSettings, dispatch_uid="feeds.public_feed_rating_settings_saved")
+def rating_settings_saved(sender, instance, created, **kwargs):
+    if not created:
+        record_public_feed_changes(full_rebuild=True, reason="rating_settings")
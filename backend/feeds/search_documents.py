@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from communities.models import Comun
+from feeds.models import (
+    POST_TRANSLATION_STATUS_TRANSLATED,
+    Author,
+    AuthorSearchDocument,
+    ComunSearchDocument,
+    ComunTranslation,
+    ComunTranslationSearchDocument,
+    Post,
+    PostSearchDocument,
+    PostTranslation,
+    PostTranslationSearchDocument,
+    UserSearchDocument,
+)
+
+User = get_user_model()
+
+SEARCH_CONFIG = "simple"
+SEARCH_LANGUAGE_CONFIGS = {
+    "ru": "russian",
+    "en": "english",
+    "es": "spanish",
+    "pt": "portuguese",
+    "de": "german",
+    "fr": "french",
+    "tr": "turkish",
+    "id": "indonesian",
+}
+SEARCH_DOCUMENT_BATCH_SIZE = 2000
+
+SEARCH_DOCUMENT_SOURCES = {
+    PostSearchDocument: ("posts", Post, (("title", "A"), ("content", "B"))),
+    AuthorSearchDocument: ("authors", Author, (("username", "A"), ("title", "A"), ("description", "B"))),
+    ComunSearchDocument: (
+        "comuns",
+        Comun,
+        (
+            ("name", "A"),
+            ("slug", "A"),
+            ("product_description", "B"),
+            ("target_audience", "C"),
+            ("rules_text", "C"),
+        ),
+    ),
+    UserSearchDocument: ("users", User, (("username", "A"), ("first_name", "B"), ("last_name", "B"))),
+}
+
+TRANSLATION_SEARCH_DOCUMENT_SOURCES = {
+    PostTranslationSearchDocument: ("post_translations", PostTranslation, "post_id", (("title", "A"), ("content", "B"))),
+    ComunTranslationSearchDocument: (
+        "comun_translations",
+        ComunTranslation,
+        "comun_id",
+        (("name", "A"), ("product_description", "B"), ("target_audience", "C"), ("rules_text", "C")),
+    ),
+}
+
+
+def search_config_for_language(language: str | None) -> str:
+    return SEARCH_LANGUAGE_CONFIGS.get(str(language or "").strip().lower(), SEARCH_CONFIG)
+
+
+def _search_vector_sql(weighted_columns, config_sql: str = f"'{SEARCH_CONFIG}'") -> str:
+    quote = connection.ops.quote_name
+    return " || ".join(
+        f"setweight(to_tsvector({config_sql}, coalesce(source.{quote(column)}, '')), '{weight}')"
+        for column, weight in weighted_columns
+    )
+
+
+def _language_config_sql() -> str:
+    branches = " ".join(
+        f"WHEN '{language}' THEN '{config}'::regconfig" for language, config in SEARCH_LANGUAGE_CONFIGS.items()
+    )
+    return f"(CASE source.language {branches} ELSE '{SEARCH_CONFIG}'::regconfig END)"
+
+
+def refresh_search_documents(document_model, source_ids) -> int:
+    source_ids = [int(source_id) for source_id in source_ids if source_id]
+    if not source_ids:
+        return 0
+    _label, source_model, weighted_columns = SEARCH_DOCUMENT_SOURCES[document_model]
+    quote = connection.ops.quote_name
+    document_column = quote(document_model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {quote(document_model._meta.db_table)} ({document_column}, search_vector, updated_at)
+            SELECT source.id, {_search_vector_sql(weighted_columns)}, now()
+            FROM {quote(source_model._meta.db_table)} AS source
+            WHERE source.id = ANY(%s)
+            ON CONFLICT ({document_column})
+            DO UPDATE SET search_vector = EXCLUDED.search_vector, updated_at = EXCLUDED.updated_at
+            """,
+            [source_ids],
+        )
+        return cursor.rowcount
+
+
+def refresh_translation_search_documents(document_model, translation_ids) -> int:
+    translation_ids = [int(translation_id) for translation_id in translation_ids if translation_id]
+    if not translation_ids:
+        return 0
+    _label, source_model, owner_column, weighted_columns = TRANSLATION_SEARCH_DOCUMENT_SOURCES[document_model]
+    quote = connection.ops.quote_name
+    document_table = quote(document_model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            DELETE FROM {document_table}
+            WHERE translation_id = ANY(%s)
+              AND translation_id NOT IN (
+                  SELECT id FROM {quote(source_model._meta.db_table)}
+                  WHERE id = ANY(%s) AND status = %s
+              )
+            """,
+            [translation_ids, translation_ids, POST_TRANSLATION_STATUS_TRANSLATED],
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO {document_table} (translation_id, {quote(owner_column)}, language, search_vector, updated_at)
+            SELECT
+                source.id,
+                source.{quote(owner_column)},
+                source.language,
+                {_search_vector_sql(weighted_columns, _language_config_sql())},
+                now()
+            FROM {quote(source_model._meta.db_table)} AS source
+            WHERE source.id = ANY(%s) AND source.status = %s
+            ON CONFLICT (translation_id)
+            DO UPDATE SET
+                {quote(owner_column)} = EXCLUDED.{quote(owner_column)},
+                language = EXCLUDED.language,
+                search_vector = EXCLUDED.search_vector,
+                updated_at = EXCLUDED.updated_at
+            """,
+            [translation_ids, POST_TRANSLATION_STATUS_TRANSLATED],
+        )
+        return cursor.rowcount
+
+
+def rebuild_search_documents(*, batch_size: int = SEARCH_DOCUMENT_BATCH_SIZE) -> dict[str, int]:
+    batch_size = max(1, int(batch_size))
+    stats = {}
+    for document_model, (label, source_model, _weighted_columns) in SEARCH_DOCUMENT_SOURCES.items():
+        stats[label] = 0
+        batch = []
+        for source_id in source_model.objects.order_by("id").values_list("id", flat=True).iterator(
+            chunk_size=batch_size
+        ):
+            batch.append(source_id)
+            if len(batch) >= batch_size:
+                stats[label] += refresh_search_documents(document_model, batch)
+                batch = []
+        stats[label] += refresh_search_documents(document_model, batch)
+    for document_model, (label, source_model, _owner_column, _weighted_columns) in (
+        TRANSLATION_SEARCH_DOCUMENT_SOURCES.items()
+    ):
+        document_model.objects.exclude(translation__status=POST_TRANSLATION_STATUS_TRANSLATED).delete()
+        stats[label] = 0
+        batch = []
+        for translation_id in (
+            source_model.objects.filter(status=POST_TRANSLATION_STATUS_TRANSLATED)
+            .order_by("id")
+            .values_list("id", flat=True)
+            .iterator(chunk_size=batch_size)
+        ):
+            batch.append(translation_id)
+            if len(batch) >= batch_size:
+                stats[label] += refresh_translation_search_documents(document_model, batch)
+                batch = []
+        stats[label] += refresh_translation_search_documents(document_model, batch)
+    return stats
+
+
+__all__ = [
+    "SEARCH_CONFIG",
+    "SEARCH_DOCUMENT_SOURCES",
+    "SEARCH_LANGUAGE_CONFIGS",
+    "TRANSLATION_SEARCH_DOCUMENT_SOURCES",
+    "rebuild_search_documents",
+    "refresh_search_documents",
+    "refresh_translation_search_documents",
+    "search_config_for_language",
+]
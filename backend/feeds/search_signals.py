@@ -0,0 +1,70 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from communities.models import Comun
+
+from .models import (
+    Author,
+    AuthorSearchDocument,
+    ComunSearchDocument,
+    ComunTranslation,
+    ComunTranslationSearchDocument,
+    Post,
+    PostSearchDocument,
+    PostTranslation,
+    PostTranslationSearchDocument,
+    UserSearchDocument,
+)
+from .search_documents import (
+    SEARCH_DOCUMENT_SOURCES,
+    TRANSLATION_SEARCH_DOCUMENT_SOURCES,
+    refresh_search_documents,
+    refresh_translation_search_documents,
+)
+
+User = get_user_model()
+
+
+def _refresh_if_touched(document_model, instance, created, update_fields) -> None:
+    _label, _source_model, weighted_columns = SEARCH_DOCUMENT_SOURCES[document_model]
+    search_fields = {column for column, _weight in weighted_columns}
+    if created or update_fields is None or search_fields.intersection(update_fields):
+        refresh_search_documents(document_model, [instance.pk])
+
+
+def _refresh_translation_if_touched(document_model, instance, created, update_fields) -> None:
+    _label, _source_model, _owner_column, weighted_columns = TRANSLATION_SEARCH_DOCUMENT_SOURCES[document_model]
+    search_fields = {column for column, _weight in weighted_columns} | {"language", "status"}
+    if created or update_fields is None or search_fields.intersection(update_fields):
+        refresh_translation_search_documents(document_model, [instance.pk])
+
+
+@receiver(post_save, sender=Post, dispatch_uid="feeds.search_post_saved")
+def post_saved(sender, instance, created, update_fields, **kwargs):
+    _refresh_if_touched(PostSearchDocument, instance, created, update_fields)
+
+
+@receiver(post_save, sender=Author, dispatch_uid="feeds.search_author_saved")
+def author_saved(sender, instance, created, update_fields, **kwargs):
+    _refresh_if_touched(AuthorSearchDocument, instance, created, update_fields)
+
+
+@receiver(post_save, sender=Comun, dispatch_uid="feeds.search_comun_saved")
+def comun_saved(sender, instance, created, update_fields, **kwargs):
+    _refresh_if_touched(ComunSearchDocument, instance, created, update_fields)
+
+
+@receiver(post_save, sender=User, dispatch_uid="feeds.search_user_saved")
+def user_saved(sender, instance, created, update_fields, **kwargs):
+    _refresh_if_touched(UserSearchDocument, instance, created, update_fields)
+
+
+@receiver(post_save, sender=PostTranslation, dispatch_uid="feeds.search_post_translation_saved")
+def post_translation_saved(sender, instance, created, update_fields, **kwargs):
+    _refresh_translation_if_touched(PostTranslationSearchDocument, instance, created, update_fields)
+
+
+@receiver(post_save, sender=ComunTranslation, dispatch_uid="feeds.search_comun_translation_saved")
+def comun_translation_saved(sender, instance, created, update_fields, **kwargs):
+    _refresh_translation_if_touched(ComunTranslationSearchDocument, instance, created, update_fields)
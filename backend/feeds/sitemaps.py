@@ -15,7 +15,7 @@ from urllib.parse import quote
 from xml.sax.saxutils import escape as xml_escape
 
 from django.conf import settings
-from django.db.models import Count, Max, Prefetch, QuerySet
+from django.db.models import BigIntegerField, Count, ExpressionWrapper, F, Max, Prefetch, QuerySet
 from django.http import FileResponse, Http404, HttpRequest, HttpResponse
 from django.utils import timezone
 from django.utils.http import http_date
@@ -257,41 +257,67 @@ def _range_bounds(item_id: int) -> tuple[int, int]:
     return start, start + SITEMAP_SHARD_SIZE - 1
 
 
-def _ranges_for_queryset(queryset: QuerySet) -> list[tuple[int, int]]:
-    max_id = queryset.aggregate(value=Max("id")).get("value") or 0
-    return [
-        (start, start + SITEMAP_SHARD_SIZE - 1)
-        for start in range(1, int(max_id) + 1, SITEMAP_SHARD_SIZE)
-    ]
+def _shard_stats(queryset: QuerySet, *, field: str = "id", **aggregates) -> dict[tuple[int, int], dict]:
+    """Returns ``aggregates`` for every shard of ``field`` in one grouped query."""
+    shard = ExpressionWrapper((F(field) - 1) / SITEMAP_SHARD_SIZE, output_field=BigIntegerField())
+    rows = (
+        queryset.order_by()
+        .annotate(sitemap_shard=shard)
+        .values("sitemap_shard")
+        .annotate(**aggregates)
+    )
+    return {
+        _range_bounds(int(row.pop("sitemap_shard")) * SITEMAP_SHARD_SIZE + 1): row
+        for row in rows
+    }
+
+
+def _empty_stats() -> dict:
+    return {"count": 0, "max_updated": None}
 
 
 def _public_posts(now=None) -> QuerySet:
     return seo_indexable_posts_queryset(now=now)
 
 
-def _post_group_fingerprint(queryset: QuerySet) -> tuple[str, int]:
-    stats = queryset.aggregate(
+def _post_shard_fingerprints(queryset: QuerySet) -> dict[tuple[int, int], tuple[str, int]]:
+    posts = _shard_stats(
+        queryset,
         count=Count("id"),
         max_updated=Max("updated_at"),
         max_author_updated=Max("author__updated_at"),
     )
-    translations = PostTranslation.objects.filter(
-        post_id__in=queryset.values("id"),
-        status=POST_TRANSLATION_STATUS_TRANSLATED,
-        language__in=PUBLIC_LANGUAGES,
-    ).aggregate(count=Count("id"), max_updated=Max("updated_at"))
-    comments = PostComment.objects.filter(
-        post_id__in=queryset.values("id"),
-        is_deleted=False,
-    ).aggregate(count=Count("id"), max_updated=Max("updated_at"))
-    payload = {
-        "kind": "posts",
-        "version": SITEMAP_MATERIALIZER_VERSION,
-        "posts": stats,
-        "translations": translations,
-        "comments": comments,
+    translations = _shard_stats(
+        PostTranslation.objects.filter(
+            post_id__in=queryset.values("id"),
+            status=POST_TRANSLATION_STATUS_TRANSLATED,
+            language__in=PUBLIC_LANGUAGES,
+        ),
+        field="post_id",
+        count=Count("id"),
+        max_updated=Max("updated_at"),
+    )
+    comments = _shard_stats(
+        PostComment.objects.filter(post_id__in=queryset.values("id"), is_deleted=False),
+        field="post_id",
+        count=Count("id"),
+        max_updated=Max("updated_at"),
+    )
+    return {
+        bounds: (
+            _fingerprint(
+                {
+                    "kind": "posts",
+                    "version": SITEMAP_MATERIALIZER_VERSION,
+                    "posts": stats,
+                    "translations": translations.get(bounds) or _empty_stats(),
+                    "comments": comments.get(bounds) or _empty_stats(),
+                }
+            ),
+            int(stats.get("count") or 0),
+        )
+        for bounds, stats in posts.items()
     }
-    return _fingerprint(payload), int(stats.get("count") or 0)
 
 
 def _post_fallback_titles(post_ids: list[int]) -> dict[int, str]:
@@ -365,11 +391,14 @@ def _public_authors() -> QuerySet:
     return Author.objects.filter(is_blocked=False)
 
 
-def _author_group_fingerprint(queryset: QuerySet) -> tuple[str, int]:
-    stats = queryset.aggregate(count=Count("id"), max_updated=Max("updated_at"))
-    return _fingerprint({"kind": "authors", "version": SITEMAP_MATERIALIZER_VERSION, **stats}), int(
-        stats.get("count") or 0
-    )
+def _author_shard_fingerprints(queryset: QuerySet) -> dict[tuple[int, int], tuple[str, int]]:
+    return {
+        bounds: (
+            _fingerprint({"kind": "authors", "version": SITEMAP_MATERIALIZER_VERSION, **stats}),
+            int(stats.get("count") or 0),
+        )
+        for bounds, stats in _shard_stats(queryset, count=Count("id"), max_updated=Max("updated_at")).items()
+    }
 
 
 def _build_author_files(queryset: QuerySet, start: int, end: int, base_url: str) -> dict[str, str]:
@@ -389,11 +418,14 @@ def _public_landing_pages() -> QuerySet:
     return LandingPage.objects.filter(is_published=True)
 
 
-def _landing_page_group_fingerprint(queryset: QuerySet) -> tuple[str, int]:
-    stats = queryset.aggregate(count=Count("id"), max_updated=Max("updated_at"))
-    return _fingerprint(
-        {"kind": "landing-pages", "version": SITEMAP_MATERIALIZER_VERSION, **stats}
-    ), int(stats.get("count") or 0)
+def _landing_page_shard_fingerprints(queryset: QuerySet) -> dict[tuple[int, int], tuple[str, int]]:
+    return {
+        bounds: (
+            _fingerprint({"kind": "landing-pages", "version": SITEMAP_MATERIALIZER_VERSION, **stats}),
+            int(stats.get("count") or 0),
+        )
+        for bounds, stats in _shard_stats(queryset, count=Count("id"), max_updated=Max("updated_at")).items()
+    }
 
 
 def _build_landing_page_files(
@@ -419,21 +451,32 @@ def _public_comuns() -> QuerySet:
     return seo_indexable_comuns_queryset()
 
 
-def _comun_group_fingerprint(queryset: QuerySet) -> tuple[str, int]:
-    stats = queryset.aggregate(count=Count("id"), max_updated=Max("updated_at"))
-    translations = ComunTranslation.objects.filter(
-        comun_id__in=queryset.values("id"),
-        status=POST_TRANSLATION_STATUS_TRANSLATED,
-        language__in=TRANSLATED_LANGUAGES,
-    ).aggregate(count=Count("id"), max_updated=Max("updated_at"))
-    return _fingerprint(
-        {
-            "kind": "comuns",
-            "version": SITEMAP_MATERIALIZER_VERSION,
-            "comuns": stats,
-            "translations": translations,
-        }
-    ), int(stats.get("count") or 0)
+def _comun_shard_fingerprints(queryset: QuerySet) -> dict[tuple[int, int], tuple[str, int]]:
+    comuns = _shard_stats(queryset, count=Count("id"), max_updated=Max("updated_at"))
+    translations = _shard_stats(
+        ComunTranslation.objects.filter(
+            comun_id__in=queryset.values("id"),
+            status=POST_TRANSLATION_STATUS_TRANSLATED,
+            language__in=TRANSLATED_LANGUAGES,
+        ),
+        field="comun_id",
+        count=Count("id"),
+        max_updated=Max("updated_at"),
+    )
+    return {
+        bounds: (
+            _fingerprint(
+                {
+                    "kind": "comuns",
+                    "version": SITEMAP_MATERIALIZER_VERSION,
+                    "comuns": stats,
+                    "translations": translations.get(bounds) or _empty_stats(),
+                }
+            ),
+            int(stats.get("count") or 0),
+        )
+        for bounds, stats in comuns.items()
+    }
 
 
 def _build_comun_files(queryset: QuerySet, start: int, end: int, base_url: str) -> dict[str, str]:
@@ -648,20 +691,19 @@ def materialize_sitemaps(
         )
 
         specifications = (
-            ("posts", _public_posts(), _post_group_fingerprint, _build_post_files),
-            ("authors", _public_authors(), _author_group_fingerprint, _build_author_files),
+            ("posts", _public_posts(), _post_shard_fingerprints, _build_post_files),
+            ("authors", _public_authors(), _author_shard_fingerprints, _build_author_files),
             (
                 "landing-pages",
                 _public_landing_pages(),
-                _landing_page_group_fingerprint,
+                _landing_page_shard_fingerprints,
                 _build_landing_page_files,
             ),
-            ("comuns", _public_comuns(), _comun_group_fingerprint, _build_comun_files),
+            ("comuns", _public_comuns(), _comun_shard_fingerprints, _build_comun_files),
         )
         for kind, base_queryset, signature_builder, file_builder in specifications:
-            for start, end in _ranges_for_queryset(base_queryset):
-                queryset = base_queryset.filter(id__gte=start, id__lte=end)
-                fingerprint, count = signature_builder(queryset)
+            shard_fingerprints = signature_builder(base_queryset)
+            for (start, end), (fingerprint, count) in sorted(shard_fingerprints.items()):
                 if count <= 0:
                     continue
                 key = f"{kind}:{start}:{end}"
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Post
+from .social_images import refresh_post_social_image_by_id
+
+
+_SOCIAL_IMAGE_FIELDS = {
+    "content",
+    "raw_data",
+    "preview_image_url",
+    "is_pending",
+    "is_blocked",
+    "publish_at",
+}
+
+
+@receiver(post_save, sender=Post, dispatch_uid="feeds.refresh_post_social_image")
+def refresh_social_image_on_publish(sender, instance, created, update_fields, **kwargs):
+    if instance.is_pending or instance.is_blocked:
+        return
+    if created or update_fields is None or _SOCIAL_IMAGE_FIELDS.intersection(update_fields):
+        post_id = instance.pk
+        transaction.on_commit(lambda: refresh_post_social_image_by_id(post_id))
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from feeds.models import Post, PostSocialImage
+from rabotaem_backend.images import IMAGE_VARIANT_WIDTHS
+from rabotaem_backend.media_urls import media_storage_path_from_url
+
+logger = logging.getLogger(__name__)
+
+SOCIAL_IMAGE_MAX_BYTES = 12 * 1024 * 1024
+SOCIAL_IMAGE_MAX_SIZE = (1200, 1200)
+_WEBP_VARIANT_RE = re.compile(r"-(\d+)\.webp$", re.IGNORECASE)
+
+
+def _feeds_views():
+    from feeds import views as feeds_views
+
+    return feeds_views
+
+
+def social_image_source_path(post: Post) -> str:
+    feeds_views = _feeds_views()
+    preview_image_url, _thumbnail_url = feeds_views._extract_post_preview_image_urls(
+        None,
+        post,
+        template_payload=feeds_views._serialize_post_template(post),
+    )
+    return media_storage_path_from_url(preview_image_url or "") or ""
+
+
+def _source_candidates(source_path: str) -> list[str]:
+    candidates = [source_path]
+    match = _WEBP_VARIANT_RE.search(source_path)
+    if match:
+        # Smaller widths of a fresh upload may still be queued; the default
+        # (largest) variant is written with the upload itself.
+        current_width = int(match.group(1))
+        candidates.extend(
+            _WEBP_VARIANT_RE.sub(f"-{width}.webp", source_path)
+            for width in sorted(IMAGE_VARIANT_WIDTHS, reverse=True)
+            if width > current_width
+        )
+    return candidates
+
+
+def _read_source(source_path: str) -> bytes | None:
+    # Only a missing file is final; any other storage error propagates so the
+    # render is retried instead of being recorded as "no image".
+    for candidate in _source_candidates(source_path):
+        try:
+            with default_storage.open(candidate, "rb") as source:
+                data = source.read(SOCIAL_IMAGE_MAX_BYTES + 1)
+        except FileNotFoundError:
+            continue
+        if len(data) > SOCIAL_IMAGE_MAX_BYTES:
+            return None
+        return data
+    return None
+
+
+def render_social_image_bytes(source_bytes: bytes) -> bytes:
+    with Image.open(BytesIO(source_bytes)) as source_image:
+        image = ImageOps.exif_transpose(source_image)
+        image.thumbnail(SOCIAL_IMAGE_MAX_SIZE, Image.Resampling.LANCZOS)
+        if image.mode != "RGB":
+            rgba_image = image.convert("RGBA")
+            background = Image.new("RGB", rgba_image.size, "white")
+            background.paste(rgba_image, mask=rgba_image.getchannel("A"))
+            image = background
+        output = BytesIO()
+        image.save(output, format="JPEG", quality=88, optimize=True)
+    return output.getvalue()
+
+
+def _social_image_path(post_id: int, source_path: str) -> str:
+    digest = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:12]
+    return f"social/posts/{post_id}/{digest}.jpg"
+
+
+def refresh_post_social_image(post: Post, *, force: bool = False) -> PostSocialImage:
+    source_path = social_image_source_path(post)
+    social_image = PostSocialImage.objects.filter(post_id=post.id).first()
+    if social_image is not None and social_image.source_path == source_path and not force:
+        return social_image
+
+    previous_path = social_image.image_path if social_image is not None else ""
+    image_path = ""
+    source_bytes = _read_source(source_path) if source_path else None
+    if source_bytes is not None:
+        try:
+            rendered = render_social_image_bytes(source_bytes)
+        except (OSError, ValueError, UnidentifiedImageError):
+            logger.warning("Failed to render social image for post_id=%s", post.id, exc_info=True)
+        else:
+            target_path = _social_image_path(post.id, source_path)
+            if default_storage.exists(target_path):
+                default_storage.delete(target_path)
+            image_path = default_storage.save(target_path, ContentFile(rendered))
+
+    social_image, _created = PostSocialImage.objects.update_or_create(
+        post_id=post.id,
+        defaults={"source_path": source_path, "image_path": image_path},
+    )
+    if previous_path and previous_path != image_path:
+        default_storage.delete(previous_path)
+    return social_image
+
+
+def refresh_post_social_image_by_id(post_id: int) -> None:
+    post = Post.objects.select_related("author").filter(id=post_id).first()
+    if post is None:
+        return
+    try:
+        refresh_post_social_image(post)
+    except Exception:
+        logger.warning("Failed to refresh social image for post_id=%s", post_id, exc_info=True)
+
+
+__all__ = [
+    "SOCIAL_IMAGE_MAX_SIZE",
+    "refresh_post_social_image",
+    "refresh_post_social_image_by_id",
+    "render_social_image_bytes",
+    "social_image_source_path",
+]
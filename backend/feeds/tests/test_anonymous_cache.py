@@ -0,0 +1,73 @@
+from hashlib import sha256
+
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.test import SimpleTestCase, override_settings
+from django.test.client import RequestFactory
+
+from rabotaem_backend.cache import (
+    anonymous_cache,
+    anonymous_cache_stats,
+    bump_public_cache_prefix,
+    flush_anonymous_cache_stats,
+)
+
+
+@override_settings(PUBLIC_API_STALE_SECONDS=300)
+class AnonymousCacheStampedeTests(SimpleTestCase):
+    def setUp(self):
+        flush_anonymous_cache_stats()
+        cache.clear()
+        self.calls = 0
+
+        @anonymous_cache(prefix="stampede-test", seconds=100)
+        def view(request):
+            self.calls += 1
+            return JsonResponse({"call": self.calls})
+
+        self.view = view
+        self.cache_key = f"public-api:stampede-test:{sha256(b'/items/').hexdigest()}"
+
+    def _get(self):
+        response = self.view(RequestFactory().get("/items/"))
+        return response["X-Cache"], response.content
+
+    def _hold_lock(self):
+        cache.add(f"{self.cache_key}:lock", 1)
+
+    def test_previous_version_is_served_while_another_worker_recomputes(self):
+        self.assertEqual(self._get(), ("MISS", b'{"call": 1}'))
+        self.assertEqual(self._get(), ("HIT", b'{"call": 1}'))
+
+        bump_public_cache_prefix("stampede-test")
+        self._hold_lock()
+        self.assertEqual(self._get(), ("STALE", b'{"call": 1}'))
+        self.assertEqual(self.calls, 1)
+
+        cache.delete(f"{self.cache_key}:lock")
+        self.assertEqual(self._get(), ("MISS", b'{"call": 2}'))
+        self.assertEqual(self._get(), ("HIT", b'{"call": 2}'))
+
+    def test_entry_near_expiry_is_refreshed_by_a_single_request(self):
+        self._get()
+        entry = cache.get(self.cache_key)
+        entry["stored_at"] -= 95
+        cache.set(self.cache_key, entry)
+
+        self._hold_lock()
+        self.assertEqual(self._get(), ("HIT", b'{"call": 1}'))
+        cache.delete(f"{self.cache_key}:lock")
+        self.assertEqual(self._get(), ("REFRESH", b'{"call": 2}'))
+        self.assertEqual(self._get(), ("HIT", b'{"call": 2}'))
+
+    def test_outcomes_are_counted_per_prefix(self):
+        self._get()
+        self._get()
+        bump_public_cache_prefix("stampede-test")
+        self._hold_lock()
+        self._get()
+
+        self.assertEqual(
+            anonymous_cache_stats()["stampede-test"],
+            {"hit": 1, "miss": 1, "stale": 1, "refresh": 0},
+        )
@@ -0,0 +1,149 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from feeds.image_variants import process_image_variant_jobs
+from feeds.models import (
+    IMAGE_VARIANT_JOB_STATUS_DONE,
+    IMAGE_VARIANT_JOB_STATUS_PENDING,
+    Author,
+    ImageVariantJob,
+    Post,
+)
+from feeds.views import _extract_post_preview_image_urls
+from rabotaem_backend.images import save_image_with_variants
+from users.service import _issue_token
+
+
+def _jpeg_bytes(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 80, 40)).save(output, format="JPEG")
+    return output.getvalue()
+
+
+class DeferredImageVariantTests(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.media_root = Path(tmp_dir.name)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_URL="/media/")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_request_saves_original_preview_and_card_widths_and_queues_the_rest(self):
+        image_set = save_image_with_variants(
+            data=_jpeg_bytes(1000, 500),
+            original_path="uploads/manual/photo.jpg",
+            defer_variants=True,
+        )
+
+        self.assertEqual(image_set.default_path, "uploads/manual/photo-960.webp")
+        self.assertEqual([variant.width for variant in image_set.variants], [640, 960])
+        self.assertTrue((self.media_root / "uploads/manual/photo.jpg").exists())
+        self.assertTrue((self.media_root / "uploads/manual/photo-960.webp").exists())
+        self.assertTrue((self.media_root / "uploads/manual/photo-640.webp").exists())
+        self.assertFalse((self.media_root / "uploads/manual/photo-320.webp").exists())
+        job = ImageVariantJob.objects.get()
+        self.assertEqual(image_set.variants_job_id, job.pk)
+        self.assertEqual([variant["width"] for variant in job.variants], [320])
+
+        self.assertEqual(process_image_variant_jobs()["done"], 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, IMAGE_VARIANT_JOB_STATUS_DONE)
+        with Image.open(self.media_root / "uploads/manual/photo-320.webp") as variant:
+            self.assertEqual(variant.size, (320, 160))
+
+    def test_feed_card_widths_exist_before_the_job_runs(self):
+        image_set = save_image_with_variants(
+            data=_jpeg_bytes(2000, 1000),
+            original_path="uploads/manual/card.jpg",
+            defer_variants=True,
+        )
+        post = Post.objects.create(
+            author=Author.objects.create(username="card-author"),
+            message_id=1,
+            title="Card",
+            content=f'<img src="{image_set.default_url}" alt="">',
+        )
+
+        preview_url, thumbnail_url = _extract_post_preview_image_urls(None, post)
+
+        for url in (preview_url, thumbnail_url):
+            self.assertTrue((self.media_root / url.split("/media/", 1)[1]).exists(), url)
+
+    def test_failed_job_resumes_without_redoing_uploaded_widths(self):
+        save_image_with_variants(
+            data=_jpeg_bytes(2000, 1000),
+            original_path="uploads/manual/resume.jpg",
+            defer_variants=True,
+        )
+        (self.media_root / "uploads/manual/resume-320.webp").write_bytes(b"already uploaded")
+
+        with patch("feeds.image_variants.save_webp_variant_bytes", side_effect=OSError("storage down")):
+            self.assertEqual(process_image_variant_jobs()["retry"], 1)
+        job = ImageVariantJob.objects.get()
+        self.assertEqual(job.status, IMAGE_VARIANT_JOB_STATUS_PENDING)
+        self.assertEqual([variant["done"] for variant in job.variants], [True, False])
+
+        self.assertEqual(process_image_variant_jobs()["done"], 1)
+        self.assertEqual((self.media_root / "uploads/manual/resume-320.webp").read_bytes(), b"already uploaded")
+        self.assertTrue((self.media_root / "uploads/manual/resume-960.webp").exists())
+
+    def test_dropped_original_is_removed_by_the_job(self):
+        image_set = save_image_with_variants(
+            data=_jpeg_bytes(400, 400),
+            original_path="avatars/a.png",
+            keep_original=False,
+            defer_variants=True,
+        )
+
+        self.assertEqual(image_set.original_path, "avatars/a-320.webp")
+        process_image_variant_jobs()
+        self.assertFalse((self.media_root / "avatars/a.png").exists())
+
+    def test_upload_lists_only_written_widths_until_the_job_finishes(self):
+        user = get_user_model().objects.create_user(username="uploader")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {_issue_token(user)}"}
+
+        response = self.client.post(
+            "/api/auth/uploads/",
+            {"image": SimpleUploadedFile("photo.jpg", _jpeg_bytes(1000, 500), content_type="image/jpeg")},
+            **headers,
+        )
+
+        payload = response.json()
+        self.assertEqual([variant["width"] for variant in payload["variants"]], [640, 960])
+        variants_url = f"/api/auth/uploads/variants/{payload['variants_job_id']}/"
+        self.assertEqual(self.client.get(variants_url, **headers).json()["variants"], [])
+
+        process_image_variant_jobs()
+
+        written = self.client.get(variants_url, **headers).json()
+        self.assertEqual(written["status"], IMAGE_VARIANT_JOB_STATUS_DONE)
+        self.assertEqual([variant["width"] for variant in written["variants"]], [320])
+
+    def test_upload_variants_are_visible_only_to_the_uploader(self):
+        user_model = get_user_model()
+        uploader = user_model.objects.create_user(username="variant-owner")
+        stranger = user_model.objects.create_user(username="variant-stranger")
+        response = self.client.post(
+            "/api/auth/uploads/",
+            {"image": SimpleUploadedFile("photo.jpg", _jpeg_bytes(1000, 500), content_type="image/jpeg")},
+            HTTP_AUTHORIZATION=f"Bearer {_issue_token(uploader)}",
+        )
+        job_id = response.json()["variants_job_id"]
+        self.assertEqual(ImageVariantJob.objects.get(pk=job_id).user, uploader)
+
+        other = self.client.get(
+            f"/api/auth/uploads/variants/{job_id}/",
+            HTTP_AUTHORIZATION=f"Bearer {_issue_token(stranger)}",
+        )
+
+        self.assertEqual(other.status_code, 404)
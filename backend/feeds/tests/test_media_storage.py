@@ -0,0 +1,86 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase, override_settings
+
+from rabotaem_backend import storage as storage_module
+from rabotaem_backend.storage import S3MediaStorage, prune_local_media_manifest, write_local_media_manifest
+
+
+class S3MediaStorageManifestTests(SimpleTestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.media_root = Path(tmp_dir.name)
+        (self.media_root / "legacy").mkdir()
+        (self.media_root / "legacy" / "old.jpg").write_bytes(b"old")
+        settings_override = override_settings(MEDIA_ROOT=self.media_root, MEDIA_LOCAL_MANIFEST_PATH="")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.storage = S3MediaStorage()
+        self.storage.s3_storage = FileSystemStorage(
+            location=self.media_root / "s3",
+            base_url="https://media.example/",
+        )
+
+    def test_unlisted_keys_are_answered_from_manifest_without_stat(self):
+        write_local_media_manifest(["legacy/old.jpg"])
+        self.assertEqual(self.storage.url("legacy/old.jpg"), "/media/legacy/old.jpg")
+
+        with patch.object(FileSystemStorage, "exists", side_effect=AssertionError("stat")):
+            self.assertEqual(self.storage.url("legacy/old.jpg"), "/media/legacy/old.jpg")
+            self.assertEqual(self.storage.url("uploads/new.jpg"), "https://media.example/uploads/new.jpg")
+
+    def test_listed_file_missing_on_disk_falls_back_to_s3(self):
+        write_local_media_manifest(["legacy/old.jpg"])
+        self.storage.s3_storage.save("legacy/old.jpg", ContentFile(b"s3"))
+        (self.media_root / "legacy" / "old.jpg").unlink()
+
+        self.assertEqual(self.storage.url("legacy/old.jpg"), "https://media.example/legacy/old.jpg")
+        with self.storage.open("legacy/old.jpg") as media_file:
+            self.assertEqual(media_file.read(), b"s3")
+
+    def test_prune_removes_deleted_keys_from_the_manifest_file(self):
+        manifest_path = write_local_media_manifest(["legacy/old.jpg", "legacy/kept.jpg"])
+
+        self.assertEqual(prune_local_media_manifest(["legacy/old.jpg", "uploads/new.jpg"]), 1)
+
+        self.assertEqual(manifest_path.read_text(encoding="utf-8"), "legacy/kept.jpg\n")
+
+    def test_concurrent_prunes_do_not_lose_updates(self):
+        keys = [f"legacy/{index}.jpg" for index in range(200)]
+        manifest_path = write_local_media_manifest(keys)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            pruned = list(executor.map(lambda start: prune_local_media_manifest(keys[start:150:8]), range(8)))
+
+        self.assertEqual(sum(pruned), 150)
+        self.assertEqual(manifest_path.read_text(encoding="utf-8").split(), sorted(keys[150:]))
+        self.assertEqual([path.name for path in manifest_path.parent.glob("*.tmp")], [])
+
+    def test_delete_leaves_manifest_file_to_the_cleanup_command(self):
+        manifest_path = write_local_media_manifest(["legacy/old.jpg"])
+
+        self.storage.delete("legacy/old.jpg")
+
+        self.assertEqual(manifest_path.read_text(encoding="utf-8"), "legacy/old.jpg\n")
+        self.assertEqual(self.storage.url("legacy/old.jpg"), "https://media.example/legacy/old.jpg")
+
+    def test_urls_are_memoized_until_the_manifest_changes(self):
+        write_local_media_manifest(["legacy/old.jpg"])
+        self.assertEqual(self.storage.url("legacy/old.jpg"), "/media/legacy/old.jpg")
+
+        with patch.object(S3MediaStorage, "_resolve_url", side_effect=AssertionError("resolved")):
+            self.assertEqual(self.storage.url("legacy/old.jpg"), "/media/legacy/old.jpg")
+
+        write_local_media_manifest([])
+        with patch.object(storage_module, "LOCAL_MEDIA_MANIFEST_CHECK_SECONDS", 0):
+            self.assertEqual(self.storage.url("legacy/old.jpg"), "https://media.example/legacy/old.jpg")
+
+    def test_missing_manifest_falls_back_to_filesystem(self):
+        self.assertEqual(self.storage.url("legacy/old.jpg"), "/media/legacy/old.jpg")
+        self.assertEqual(self.storage.url("uploads/new.jpg"), "https://media.example/uploads/new.jpg")
@@ -1,8 +1,11 @@
 import base64
 import json
+from unittest.mock import patch
 
+from django.core.cache import cache
 from django.test import SimpleTestCase, override_settings
 
+from rabotaem_backend import media_urls
 from rabotaem_backend.media_urls import (
     media_storage_path_from_url,
     public_url,
@@ -100,3 +103,40 @@ class MediaUrlRewriteTests(SimpleTestCase):
             media_storage_path_from_url("https://media.tambur.pub/uploads/post/a.jpg"),
             "uploads/post/a.jpg",
         )
+
+
+@override_settings(
+    SITE_BASE_URL="https://tambur.pub",
+    MEDIA_URL="/media/",
+    MEDIA_LEGACY_URL="/media/",
+    AWS_S3_CUSTOM_DOMAIN="media.tambur.pub",
+    MEDIA_PUBLIC_URL_MODE="s3",
+)
+class CachedMediaUrlRewriteTests(SimpleTestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        media_urls._REWRITE_MEMO.clear()
+        self.html = "<p>" + "Длинный текст. " * 30 + '<img src="/media/uploads/post/a.jpg"></p>'
+
+    def test_each_content_version_is_rewritten_once(self) -> None:
+        with patch.object(
+            media_urls,
+            "_rewrite_public_media_text",
+            wraps=media_urls._rewrite_public_media_text,
+        ) as rewrite:
+            first = rewrite_public_media_urls(self.html)
+            media_urls._REWRITE_MEMO.clear()
+            second = rewrite_public_media_urls(self.html)
+            rewrite_public_media_urls(self.html + " ")
+
+        self.assertEqual(first, second)
+        self.assertIn('src="https://media.tambur.pub/uploads/post/a.jpg"', first)
+        self.assertEqual(rewrite.call_count, 2)
+
+    def test_media_settings_change_the_cache_key(self) -> None:
+        rewrite_public_media_urls(self.html)
+
+        with override_settings(AWS_S3_CUSTOM_DOMAIN="cdn.tambur.pub"):
+            rewritten = rewrite_public_media_urls(self.html)
+
+        self.assertIn('src="https://cdn.tambur.pub/uploads/post/a.jpg"', rewritten)
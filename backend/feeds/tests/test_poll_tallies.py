@@ -0,0 +1,77 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from editor.models import PostPollTally, PostPollVote
+from feeds import views as feed_views
+from feeds.models import Author, Post
+
+
+User = get_user_model()
+
+
+class PollTallyTests(TestCase):
+    def setUp(self):
+        self.voters = [User.objects.create_user(username=f"poll-voter-{index}", password="secret") for index in range(3)]
+        self.post = Post.objects.create(
+            author=Author.objects.create(username="poll-author"),
+            message_id=1,
+            title="Poll",
+            content="<p>Poll</p>",
+            raw_data={
+                "poll": {
+                    "question": "Что выбрать?",
+                    "allows_multiple_answers": True,
+                    "options": [{"text": "Первый", "voter_count": 2}, {"text": "Второй"}, {"text": "Третий"}],
+                },
+            },
+            is_pending=False,
+            is_blocked=False,
+        )
+
+    def _option_counts(self, user=None) -> list[int]:
+        live_poll = feed_views._live_poll_for_post(self.post, user)
+        return [option["voter_count"] for option in live_poll["poll"]["options"]]
+
+    def test_votes_maintain_tally_and_reads_skip_vote_scan(self):
+        PostPollVote.objects.create(post=self.post, user=self.voters[0], selected_options=[0, 2])
+        PostPollVote.objects.create(post=self.post, user=self.voters[1], selected_options=[2])
+        vote = PostPollVote.objects.create(post=self.post, user=self.voters[2], selected_options=[1])
+
+        tally = PostPollTally.objects.get(post=self.post)
+        self.assertEqual(tally.option_counts, [1, 1, 2])
+        self.assertEqual(tally.voters_count, 3)
+        with self.assertNumQueries(2):
+            live_poll = feed_views._live_poll_for_post(self.post, self.voters[0])
+        self.assertEqual([option["voter_count"] for option in live_poll["poll"]["options"]], [3, 1, 2])
+        self.assertEqual(live_poll["poll"]["user_selection"], [0, 2])
+
+        vote.selected_options = [0]
+        vote.save()
+        self.assertEqual(self._option_counts(), [4, 0, 2])
+        vote.delete()
+        self.assertEqual(self._option_counts(), [3, 0, 2])
+        self.assertEqual(PostPollTally.objects.get(post=self.post).voters_count, 2)
+
+    def test_reconcile_command_rebuilds_drifted_tallies(self):
+        PostPollVote.objects.create(post=self.post, user=self.voters[0], selected_options=[1])
+        PostPollTally.objects.filter(post=self.post).update(option_counts=[7, 7, 7], voters_count=9)
+
+        call_command("reconcile_poll_tallies", stdout=StringIO())
+
+        tally = PostPollTally.objects.get(post=self.post)
+        self.assertEqual(tally.option_counts, [0, 1, 0])
+        self.assertEqual(tally.voters_count, 1)
+
+    def test_editing_poll_options_rebuilds_tally(self):
+        PostPollVote.objects.create(post=self.post, user=self.voters[0], selected_options=[0, 2])
+        PostPollVote.objects.create(post=self.post, user=self.voters[1], selected_options=[2])
+
+        self.post.raw_data["poll"]["options"] = [{"text": "Первый"}, {"text": "Второй"}]
+        self.post.save(update_fields=["raw_data"])
+
+        tally = PostPollTally.objects.get(post=self.post)
+        self.assertEqual(tally.option_counts, [1, 0])
+        self.assertEqual(tally.voters_count, 1)
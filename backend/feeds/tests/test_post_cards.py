@@ -0,0 +1,77 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from communities import service as community_service
+from communities.models import Comun
+from editor.models import PostPollVote, PostRatingVote
+from editor.serializers import _serialize_post_ratings
+from feeds import views as feed_views
+from feeds.models import Author, Post, PostFavorite
+from feeds.post_cards import PostCardContext
+
+
+User = get_user_model()
+
+
+class PostCardContextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="card-reader", password="secret")
+        self.other = User.objects.create_user(username="card-voter", password="secret")
+        self.comun = Comun.objects.create(name="Карточки", slug="cards", creator=self.other)
+        self.comun.moderators.add(self.user)
+        self.author = Author.objects.create(username="card-author")
+
+    def _post(self, message_id: int) -> Post:
+        post = Post.objects.create(
+            author=self.author,
+            message_id=message_id,
+            title=f"Card {message_id}",
+            content=json.dumps(
+                {"blocks": [{"id": "score", "type": "post_rating", "data": {}}]}
+            ),
+            raw_data={
+                "comun_slug": "cards",
+                "poll": {"question": "Да?", "options": [{"text": "Да"}, {"text": "Нет"}]},
+            },
+            is_pending=False,
+            is_blocked=False,
+        )
+        PostPollVote.objects.create(post=post, user=self.other, selected_options=[0])
+        PostPollVote.objects.create(post=post, user=self.user, selected_options=[1])
+        PostRatingVote.objects.create(post=post, user=self.other, block_id="score", value=8)
+        PostRatingVote.objects.create(post=post, user=self.user, block_id="score", value=5)
+        return post
+
+    def _card_parts(self, post: Post) -> tuple:
+        return (
+            community_service._serialize_post_comun(None, post, self.user),
+            feed_views._live_poll_for_post(post, self.user),
+            _serialize_post_ratings(post, self.user),
+            feed_views._post_rating_score(post, author_rating=1),
+        )
+
+    def test_loaded_context_serves_card_parts_without_queries(self):
+        posts = [self._post(message_id) for message_id in range(1, 6)]
+        PostFavorite.objects.create(user=self.user, post=posts[0])
+        expected = [self._card_parts(post) for post in posts]
+        fresh_posts = list(Post.objects.filter(id__in=[post.id for post in posts]).select_related("author").order_by("id"))
+
+        with self.assertNumQueries(16):
+            context = PostCardContext.load(fresh_posts, self.user)
+        with self.assertNumQueries(0):
+            actual = [self._card_parts(post) for post in fresh_posts]
+
+        self.assertEqual(actual, expected)
+        self.assertEqual(context.favorite_post_ids, {posts[0].id})
+        self.assertTrue(actual[0][0]["can_moderate"])
+        self.assertEqual(actual[0][2]["score"]["user_vote"], 5)
+
+    def test_context_is_ignored_for_a_different_user(self):
+        post = self._post(10)
+        PostCardContext.load([post], self.user)
+
+        ratings = _serialize_post_ratings(post, self.other)
+
+        self.assertEqual(ratings["score"]["user_vote"], 8)
@@ -1,40 +1,79 @@
+from types import SimpleNamespace
 from unittest.mock import patch
 
-from django.test import SimpleTestCase
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
 
 from feeds.cache_signals import invalidate_post_detail_cache
+from feeds.models import Author, Post
 
 
 class PostDetailCacheInvalidationTests(SimpleTestCase):
-    @patch("feeds.cache_signals.bump_public_cache_prefix")
-    def test_content_update_invalidates_cached_post_detail(self, bump_cache):
+    @patch("feeds.cache_signals.invalidate_cache_tags")
+    def test_content_update_invalidates_cached_post_detail(self, invalidate_tags):
         invalidate_post_detail_cache(
             sender=None,
-            instance=None,
+            instance=SimpleNamespace(pk=7),
             created=False,
             update_fields=frozenset({"content", "updated_at"}),
         )
 
-        bump_cache.assert_called_once_with("post-detail")
+        invalidate_tags.assert_called_once_with("post:7")
 
-    @patch("feeds.cache_signals.bump_public_cache_prefix")
-    def test_new_post_invalidates_cached_post_detail(self, bump_cache):
+    @patch("feeds.cache_signals.invalidate_cache_tags")
+    def test_new_post_invalidates_cached_post_detail(self, invalidate_tags):
         invalidate_post_detail_cache(
             sender=None,
-            instance=None,
+            instance=SimpleNamespace(pk=8),
             created=True,
             update_fields=None,
         )
 
-        bump_cache.assert_called_once_with("post-detail")
+        invalidate_tags.assert_called_once_with("post:8")
 
-    @patch("feeds.cache_signals.bump_public_cache_prefix")
-    def test_view_counter_update_does_not_invalidate_cached_post_detail(self, bump_cache):
+    @patch("feeds.cache_signals.invalidate_cache_tags")
+    def test_view_counter_update_does_not_invalidate_cached_post_detail(self, invalidate_tags):
         invalidate_post_detail_cache(
             sender=None,
-            instance=None,
+            instance=SimpleNamespace(pk=9),
             created=False,
             update_fields=frozenset({"real_views_count", "updated_at"}),
         )
 
-        bump_cache.assert_not_called()
+        invalidate_tags.assert_not_called()
+
+
+class PostDetailTaggedCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(username="tagged-author", title="Автор")
+        self.post = Post.objects.create(author=self.author, message_id=1, title="Первый", content="Текст")
+        self.other_post = Post.objects.create(author=Author.objects.create(username="other"), message_id=2, title="Второй")
+
+    def _get(self, post):
+        response = self.client.get(reverse("post-detail", kwargs={"post_id": post.id}))
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        return response
+
+    def test_editing_a_post_only_invalidates_its_own_entry(self):
+        self._get(self.post)
+        self._get(self.other_post)
+
+        self.post.title = "Исправленный"
+        self.post.save(update_fields=["title"])
+
+        response = self._get(self.post)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.json()["post"]["title"], "Исправленный")
+        self.assertEqual(self._get(self.other_post)["X-Cache"], "HIT")
+
+    def test_author_edit_invalidates_entries_that_depend_on_it(self):
+        self._get(self.post)
+        self._get(self.other_post)
+
+        self.author.title = "Новое имя"
+        self.author.save(update_fields=["title"])
+
+        self.assertEqual(self._get(self.post)["X-Cache"], "MISS")
+        self.assertEqual(self._get(self.other_post)["X-Cache"], "HIT")
@@ -15,9 +15,12 @@ from feeds.models import (
     CONTENT_TRANSLATION_KIND_COMMENT,
     CONTENT_TRANSLATION_KIND_COMUN,
     CONTENT_TRANSLATION_KIND_POST,
+    CONTENT_TRANSLATION_KIND_POST_MANUAL,
+    CONTENT_TRANSLATION_TASK_PRIORITY_MANUAL,
     CONTENT_TRANSLATION_TASK_STATUS_DONE,
     CONTENT_TRANSLATION_TASK_STATUS_FAILED,
     CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+    CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
     Comun,
     ContentTranslationRun,
     ContentTranslationSettings,
@@ -323,8 +326,7 @@ class PostTranslationServiceTests(TestCase):
         self.assertEqual(translation.status, POST_TRANSLATION_STATUS_FAILED)
         self.assertIn("OPENROUTER_API_KEY", translation.error_message)
 
-    @patch("feeds.translation_service.subprocess.Popen")
-    def test_queue_post_translation_sets_pending_and_starts_worker(self, popen_mock) -> None:
+    def test_queue_post_translation_sets_pending_and_queues_priority_task(self) -> None:
         translations = queue_post_translation(self.post, ["tr", "id"])
 
         self.assertEqual([translation.language for translation in translations], ["tr", "id"])
@@ -336,12 +338,95 @@ class PostTranslationServiceTests(TestCase):
             ),
             [("id", POST_TRANSLATION_STATUS_PENDING), ("tr", POST_TRANSLATION_STATUS_PENDING)],
         )
-        popen_mock.assert_called_once()
-        command = popen_mock.call_args.args[0]
-        self.assertIn("translate_post", command)
-        self.assertIn(str(self.post.pk), command)
-        self.assertIn("tr", command)
-        self.assertIn("id", command)
+        task = ContentTranslationTask.objects.get(
+            kind=CONTENT_TRANSLATION_KIND_POST_MANUAL,
+            object_id=self.post.pk,
+        )
+        self.assertEqual(task.status, CONTENT_TRANSLATION_TASK_STATUS_PENDING)
+        self.assertEqual(task.priority, CONTENT_TRANSLATION_TASK_PRIORITY_MANUAL)
+        self.assertEqual(task.languages, ["tr", "id"])
+
+        queue_post_translation(self.post, ["id", "en"])
+
+        task.refresh_from_db()
+        self.assertEqual(task.languages, ["tr", "id", "en"])
+
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
+    def test_manual_translation_task_is_claimed_before_auto_tasks(self, translate_mock) -> None:
+        ContentTranslationTask.objects.filter(
+            kind=CONTENT_TRANSLATION_KIND_POST,
+            object_id=self.post.pk,
+        ).update(scheduled_at=timezone.now() - timedelta(hours=1))
+        queue_post_translation(self.post, ["en"])
+
+        stats = process_due_translation_tasks(limit=1)
+
+        self.assertEqual(stats["done"], 1)
+        translate_mock.assert_called_once_with(self.post, ["en"])
+        self.assertEqual(
+            ContentTranslationTask.objects.get(
+                kind=CONTENT_TRANSLATION_KIND_POST_MANUAL,
+                object_id=self.post.pk,
+            ).status,
+            CONTENT_TRANSLATION_TASK_STATUS_DONE,
+        )
+        self.assertEqual(
+            ContentTranslationTask.objects.get(
+                kind=CONTENT_TRANSLATION_KIND_POST,
+                object_id=self.post.pk,
+            ).status,
+            CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+        )
+
+    def test_manual_request_during_running_task_is_requeued_by_the_finishing_run(self) -> None:
+        queue_post_translation(self.post, ["en"])
+        task = ContentTranslationTask.objects.get(
+            kind=CONTENT_TRANSLATION_KIND_POST_MANUAL,
+            object_id=self.post.pk,
+        )
+
+        def translate_during_new_request(post, languages):
+            queue_post_translation(post, ["de"])
+            in_flight = ContentTranslationTask.objects.get(pk=task.pk)
+            self.assertEqual(in_flight.status, CONTENT_TRANSLATION_TASK_STATUS_RUNNING)
+            self.assertIsNotNone(in_flight.locked_at)
+            self.assertEqual(in_flight.languages, ["en", "de"])
+            return {}
+
+        with patch(
+            "feeds.translation_service.translate_post_to_languages",
+            side_effect=translate_during_new_request,
+        ):
+            self.assertEqual(process_translation_task(task.pk), "skipped")
+
+        task.refresh_from_db()
+        self.assertEqual(task.status, CONTENT_TRANSLATION_TASK_STATUS_PENDING)
+        self.assertIsNone(task.locked_at)
+        self.assertEqual(task.attempts, 0)
+        self.assertEqual(task.languages, ["en", "de"])
+
+    def test_admin_translation_status_reports_task_and_translations(self) -> None:
+        admin_user = User.objects.create_superuser(username="admin", password="secret")
+        self.client.force_login(admin_user)
+        queue_post_translation(self.post, ["en"])
+
+        response = self.client.get(f"/admin/feeds/post/{self.post.pk}/translation-status/")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["task"]["status"], CONTENT_TRANSLATION_TASK_STATUS_PENDING)
+        self.assertEqual(payload["task"]["languages"], ["en"])
+        self.assertEqual(
+            payload["translations"],
+            [
+                {
+                    "language": "en",
+                    "status": POST_TRANSLATION_STATUS_PENDING,
+                    "error_message": "",
+                    "updated_at": payload["translations"][0]["updated_at"],
+                }
+            ],
+        )
 
     def test_post_save_schedules_auto_translation_after_ten_minutes(self) -> None:
         task = ContentTranslationTask.objects.get(
@@ -402,7 +487,7 @@ class PostTranslationServiceTests(TestCase):
             ).exists()
         )
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_process_due_translation_tasks_claims_due_batch(self, translate_mock) -> None:
         second_post = Post.objects.create(
             author=self.author,
@@ -420,7 +505,8 @@ class PostTranslationServiceTests(TestCase):
 
         self.assertEqual(stats["processed"], 1)
         self.assertEqual(stats["done"], 1)
-        self.assertEqual(translate_mock.call_count, 7)
+        translate_mock.assert_called_once()
+        self.assertEqual(len(translate_mock.call_args.args[1]), 7)
         self.assertEqual(
             ContentTranslationTask.objects.filter(
                 kind=CONTENT_TRANSLATION_KIND_POST,
@@ -436,7 +522,7 @@ class PostTranslationServiceTests(TestCase):
             1,
         )
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_process_due_translation_tasks_retries_old_failed_tasks(self, translate_mock) -> None:
         task = ContentTranslationTask.objects.get(
             kind=CONTENT_TRANSLATION_KIND_POST,
@@ -457,7 +543,7 @@ class PostTranslationServiceTests(TestCase):
         task.refresh_from_db()
         self.assertEqual(task.status, CONTENT_TRANSLATION_TASK_STATUS_DONE)
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_process_due_translation_tasks_stops_after_max_attempts(self, translate_mock) -> None:
         task = ContentTranslationTask.objects.get(
             kind=CONTENT_TRANSLATION_KIND_POST,
@@ -518,7 +604,7 @@ class PostTranslationServiceTests(TestCase):
             1,
         )
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_exhausted_stale_task_becomes_failed(self, translate_mock) -> None:
         task = ContentTranslationTask.objects.get(
             kind=CONTENT_TRANSLATION_KIND_POST,
@@ -538,7 +624,7 @@ class PostTranslationServiceTests(TestCase):
         self.assertIn("таймаута", task.last_error)
         translate_mock.assert_not_called()
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_process_due_translation_tasks_skips_exhausted_pending_task(
         self,
         translate_mock,
@@ -589,7 +675,7 @@ class PostTranslationServiceTests(TestCase):
         self.assertEqual(task.status, CONTENT_TRANSLATION_TASK_STATUS_PENDING)
         self.assertEqual(task.attempts, 0)
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_disabled_auto_translation_reschedules_without_openrouter(self, translate_mock) -> None:
         ContentTranslationSettings.objects.update_or_create(
             pk=1,
@@ -617,7 +703,7 @@ class PostTranslationServiceTests(TestCase):
         self.assertFalse(ContentTranslationRun.objects.exists())
         translate_mock.assert_not_called()
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_post_daily_translation_limit_reschedules_task(self, translate_mock) -> None:
         ContentTranslationSettings.objects.update_or_create(
             pk=1,
@@ -652,7 +738,7 @@ class PostTranslationServiceTests(TestCase):
         )
         translate_mock.assert_not_called()
 
-    @patch("feeds.translation_service.translate_post_to_language")
+    @patch("feeds.translation_service.translate_post_to_languages", return_value={})
     def test_one_post_translation_limit_uses_rolling_24_hours(self, translate_mock) -> None:
         ContentTranslationSettings.objects.update_or_create(
             pk=1,
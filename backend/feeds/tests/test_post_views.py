@@ -0,0 +1,59 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from feeds.models import Author, Post, PostDailyView, PostViewIncrement
+from feeds.post_views import flush_post_views, record_post_view
+
+
+class BufferedPostViewTests(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(username="views-author")
+        self.post = Post.objects.create(
+            author=self.author,
+            message_id=1,
+            title="Просмотры",
+            real_views_count=10,
+            fake_views_target=0,
+        )
+        self.other_post = Post.objects.create(author=self.author, message_id=2, title="Другой", fake_views_target=0)
+
+    @patch("feeds.views.is_rate_limited", return_value=False)
+    def test_view_is_buffered_but_reported_live(self, _rate_limited):
+        url = reverse("post-view", kwargs={"post_id": self.post.id})
+
+        self.client.post(url)
+        response = self.client.post(url)
+
+        self.assertEqual(response.json()["views_count"], 12)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.real_views_count, 10)
+        self.assertEqual(PostViewIncrement.objects.count(), 2)
+
+    def test_flush_folds_buffer_into_counters_in_one_batch(self):
+        today = timezone.localdate()
+        yesterday = today - timedelta(days=1)
+        PostDailyView.objects.create(post=self.post, date=today, views_count=4)
+        for _index in range(3):
+            record_post_view(self.post.id, today)
+        record_post_view(self.post.id, yesterday)
+        record_post_view(self.other_post.id, today)
+        record_post_view(999999, today)
+
+        with self.assertNumQueries(5):
+            stats = flush_post_views()
+
+        self.assertEqual(stats, {"views": 6, "posts": 3, "days": 4})
+        self.assertFalse(PostViewIncrement.objects.exists())
+        self.post.refresh_from_db()
+        self.other_post.refresh_from_db()
+        self.assertEqual(self.post.real_views_count, 14)
+        self.assertEqual(self.other_post.real_views_count, 1)
+        self.assertEqual(
+            dict(PostDailyView.objects.filter(post=self.post).values_list("date", "views_count")),
+            {today: 7, yesterday: 1},
+        )
+        self.assertEqual(flush_post_views(), {"views": 0, "posts": 0, "days": 0})
@@ -0,0 +1,172 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from communities import service as community_service
+from feeds.models import (
+    POST_TRANSLATION_LANGUAGE_ENGLISH,
+    POST_TRANSLATION_STATUS_TRANSLATED,
+    Author,
+    Comun,
+    Post,
+    PostLike,
+    PostTranslation,
+    PublicFeedCandidate,
+    PublicFeedChange,
+    PublicFeedItem,
+    Tag,
+)
+from my_feed.models import UserFeedSettings
+from users import service as user_service
+from feeds.public_feed import rebuild_public_feed, refresh_public_feed
+
+
+User = get_user_model()
+
+
+class PublicFeedMaterializerTests(TestCase):
+    def _post(self, username: str, message_id: int) -> Post:
+        author = Author.objects.create(username=username)
+        return Post.objects.create(
+            author=author,
+            message_id=message_id,
+            title=f"Post {message_id}",
+            content="<p>Content</p>",
+            is_pending=False,
+            is_blocked=False,
+        )
+
+    def _ranked_post_ids(self, feed: str = PublicFeedItem.FEED_HOME) -> list[int]:
+        return list(
+            PublicFeedItem.objects.filter(feed=feed)
+            .order_by("rank")
+            .values_list("post_id", flat=True)
+        )
+
+    def test_refresh_applies_logged_changes_in_place(self):
+        first = self._post("feed-first", 1)
+        second = self._post("feed-second", 2)
+        third = self._post("feed-third", 3)
+        rebuild_public_feed()
+        self.assertEqual(self._ranked_post_ids(), [third.id, second.id, first.id])
+        self.assertFalse(PublicFeedChange.objects.exists())
+        untouched_item_id = PublicFeedItem.objects.get(feed=PublicFeedItem.FEED_HOME, post=first).id
+
+        second.is_blocked = True
+        second.save(update_fields=["is_blocked", "updated_at"])
+        fourth = self._post("feed-fourth", 4)
+        self.assertTrue(PublicFeedChange.objects.filter(post_id_snapshot=fourth.id).exists())
+
+        stats = refresh_public_feed()
+
+        self.assertEqual(self._ranked_post_ids(), [fourth.id, third.id, first.id])
+        self.assertEqual(stats["created"], 2)
+        self.assertEqual(stats["deleted"], 2)
+        self.assertEqual(PublicFeedItem.objects.get(feed=PublicFeedItem.FEED_HOME, post=first).id, untouched_item_id)
+        self.assertFalse(PublicFeedCandidate.objects.filter(post=second).exists())
+        self.assertFalse(PublicFeedChange.objects.exists())
+
+    def test_refresh_drops_post_whose_score_turns_negative_after_vote(self):
+        voter = User.objects.create_user(username="feed-voter", password="secret")
+        first = self._post("feed-vote-first", 10)
+        second = self._post("feed-vote-second", 11)
+        rebuild_public_feed()
+
+        Post.objects.filter(id=second.id).update(rating=-50)
+        PostLike.objects.create(post=second, user=voter, value=-1)
+        refresh_public_feed()
+
+        self.assertEqual(self._ranked_post_ids(), [first.id])
+        self.assertLess(PublicFeedCandidate.objects.get(post=second).score, 0)
+
+    def test_refresh_without_changes_writes_nothing(self):
+        self._post("feed-idle", 20)
+        rebuild_public_feed()
+
+        stats = refresh_public_feed()
+
+        self.assertEqual(stats["rescored"], 0)
+        self.assertEqual(stats["created"] + stats["updated"] + stats["deleted"], 0)
+
+    def test_comun_rating_update_marks_comun_dirty(self):
+        comun = Comun.objects.create(name="Rated", slug="rated")
+        PublicFeedChange.objects.all().delete()
+
+        community_service._recalculate_comun_rating(comun.id)
+
+        self.assertTrue(
+            PublicFeedChange.objects.filter(comun_id_snapshot=comun.id, reason="comun_rating").exists()
+        )
+
+    def test_hiding_tag_from_home_refreshes_only_its_posts(self):
+        tagged = self._post("feed-tagged", 25)
+        other = self._post("feed-untagged", 26)
+        tag = Tag.objects.create(name="hidden-later")
+        tagged.tags.add(tag)
+        rebuild_public_feed()
+
+        tag.save()
+        self.assertFalse(PublicFeedChange.objects.exists())
+
+        tag.hide_from_home = True
+        tag.save()
+
+        self.assertEqual(
+            list(PublicFeedChange.objects.values_list("post_id_snapshot", "full_rebuild")),
+            [(tagged.id, False)],
+        )
+        refresh_public_feed()
+        self.assertEqual(self._ranked_post_ids(), [other.id])
+
+    def test_language_feeds_follow_translations(self):
+        russian = self._post("feed-lang-ru", 30)
+        translated = self._post("feed-lang-en", 31)
+        PostTranslation.objects.create(
+            post=translated,
+            language=POST_TRANSLATION_LANGUAGE_ENGLISH,
+            title="Translated",
+            content="<p>Translated</p>",
+            status=POST_TRANSLATION_STATUS_TRANSLATED,
+        )
+        rebuild_public_feed()
+        english_feed = PublicFeedItem.home_feed_for_language(POST_TRANSLATION_LANGUAGE_ENGLISH)
+
+        self.assertEqual(self._ranked_post_ids(english_feed), [translated.id])
+        self.assertEqual(self._ranked_post_ids(PublicFeedItem.home_feed_for_language("ru")), [translated.id, russian.id])
+
+        PostTranslation.objects.create(
+            post=russian,
+            language=POST_TRANSLATION_LANGUAGE_ENGLISH,
+            title="Also translated",
+            content="<p>Also translated</p>",
+            status=POST_TRANSLATION_STATUS_TRANSLATED,
+        )
+        refresh_public_feed()
+
+        self.assertEqual(self._ranked_post_ids(english_feed), [translated.id, russian.id])
+
+    def test_home_feed_reads_language_feed_and_excludes_hidden_content(self):
+        user = User.objects.create_user(username="feed-hider", password="secret")
+        visible = self._post("feed-visible", 40)
+        hidden_author_post = self._post("Feed-Hidden-Author", 41)
+        hidden_comun_post = self._post("feed-hidden-comun", 42)
+        hidden_comun_post.raw_data = {"comun_slug": "Secret-Comun"}
+        hidden_comun_post.save(update_fields=["raw_data", "updated_at"])
+        rebuild_public_feed()
+        UserFeedSettings.objects.create(
+            user=user,
+            hidden_authors=["feed-hidden-author"],
+            hidden_comuns=["secret-comun"],
+        )
+        token = user_service._issue_token(user)
+
+        response = self.client.get(
+            reverse("home-feed"),
+            {"card": "1", "limit": "10", "lang": "ru"},
+            HTTP_AUTHORIZATION=f"Bearer {token}",
+        )
+
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        self.assertTrue(response.json()["materialized"])
+        self.assertEqual([item["id"] for item in response.json()["posts"]], [visible.id])
+        self.assertNotIn(hidden_author_post.id, self._ranked_post_ids(PublicFeedItem.home_feed_for_language("en")))
@@ -0,0 +1,124 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from communities.models import Comun
+from feeds.models import (
+    POST_TRANSLATION_STATUS_PENDING,
+    POST_TRANSLATION_STATUS_TRANSLATED,
+    Author,
+    ComunTranslation,
+    Post,
+    PostSearchDocument,
+    PostTranslation,
+)
+from feeds.search_documents import rebuild_search_documents
+
+
+User = get_user_model()
+
+
+class StoredSearchVectorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(username="lighthouse-keeper", title="Смотритель маяка")
+        self.title_post = Post.objects.create(
+            author=self.author,
+            message_id=1,
+            title="Маяк на скале",
+            content="Короткая заметка",
+        )
+        self.body_post = Post.objects.create(
+            author=Author.objects.create(username="sailor"),
+            message_id=2,
+            title="Заметка",
+            content="Вдали показался маяк",
+        )
+        self.comun = Comun.objects.create(name="Маяки мира", slug="lighthouses")
+        User.objects.create_user(username="маяковский", password="secret")
+
+    def _search(self, query: str, **params) -> dict:
+        response = self.client.get(reverse("search-content"), {"q": query, **params})
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        return response.json()
+
+    def test_search_reads_stored_vectors_and_ranks_title_matches_first(self):
+        with CaptureQueriesContext(connection) as queries:
+            payload = self._search("маяк", sort="relevance")
+
+        self.assertEqual(
+            [post["id"] for post in payload["posts"]],
+            [self.title_post.id, self.body_post.id],
+        )
+        self.assertEqual([comun["slug"] for comun in payload["communities"]], ["lighthouses"])
+        self.assertIn("маяковский", [author["username"] for author in payload["authors"]])
+        self.assertFalse(any("to_tsvector" in query["sql"] for query in queries.captured_queries))
+
+    def test_vectors_follow_updates(self):
+        self.body_post.content = "Только море"
+        self.body_post.save(update_fields=["content"])
+        self.author.title = "Капитан"
+        self.author.save(update_fields=["title"])
+
+        payload = self._search("маяк", type="posts")
+
+        self.assertEqual([post["id"] for post in payload["posts"]], [self.title_post.id])
+        self.assertEqual(self._search("капитан", type="authors")["authors"][0]["username"], "lighthouse-keeper")
+
+    def test_rebuild_restores_missing_documents(self):
+        PostSearchDocument.objects.all().delete()
+
+        stats = rebuild_search_documents()
+
+        self.assertEqual(stats["posts"], 2)
+        self.assertEqual(len(self._search("маяк", type="posts")["posts"]), 2)
+
+
+class TranslatedSearchTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.post = Post.objects.create(
+            author=Author.objects.create(username="keeper"),
+            message_id=1,
+            title="Маяк на скале",
+            content="Короткая заметка",
+        )
+        self.translation = PostTranslation.objects.create(
+            post=self.post,
+            language="en",
+            title="Lighthouses on the cliff",
+            content="Running the old lamp",
+            status=POST_TRANSLATION_STATUS_TRANSLATED,
+        )
+        self.comun = Comun.objects.create(name="Маяки мира", slug="lighthouses")
+        ComunTranslation.objects.create(
+            comun=self.comun,
+            language="en",
+            name="World lighthouses",
+            status=POST_TRANSLATION_STATUS_TRANSLATED,
+        )
+
+    def _search(self, query: str, **params) -> dict:
+        response = self.client.get(reverse("search-content"), {"q": query, **params})
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        return response.json()
+
+    def test_request_language_matches_stemmed_translations(self):
+        payload = self._search("lighthouse runs", lang="en")
+
+        self.assertEqual([post["id"] for post in payload["posts"]], [self.post.id])
+        self.assertEqual(payload["posts"][0]["title"], "Lighthouses on the cliff")
+        self.assertTrue(payload["posts"][0]["is_translated"])
+        self.assertEqual([comun["name"] for comun in self._search("lighthouse", lang="en")["communities"]], [
+            "World lighthouses"
+        ])
+        self.assertEqual(self._search("lighthouse", lang="de")["posts"], [])
+
+    def test_unpublished_translation_leaves_the_index(self):
+        self.translation.status = POST_TRANSLATION_STATUS_PENDING
+        self.translation.save(update_fields=["status"])
+
+        self.assertEqual(self._search("lighthouse", lang="en")["posts"], [])
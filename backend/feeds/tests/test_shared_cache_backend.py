@@ -0,0 +1,91 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+
+from rabotaem_backend.cache_backends.postgres import SHARED_CACHE_TABLE, PostgresCache
+from rabotaem_backend.rate_limit import is_rate_limited
+
+
+class PostgresCacheBackendTests(TestCase):
+    # The cache alias autocommits outside the test transaction.
+    databases = {"default", "cache"}
+
+    def setUp(self):
+        self.cache = PostgresCache(SHARED_CACHE_TABLE, {"TIMEOUT": 60})
+        self.cache.clear()
+        self.addCleanup(self.cache.clear)
+
+    def test_roundtrips_values_and_expiry(self):
+        self.cache.set("payload", {"content": b"body", "status": 200})
+        self.cache.set("short", "soon gone", timeout=1)
+        self.cache.set("forever", True, timeout=None)
+
+        self.assertEqual(self.cache.get("payload"), {"content": b"body", "status": 200})
+        self.assertEqual(self.cache.get_many(["payload", "forever", "missing"]), {
+            "payload": {"content": b"body", "status": 200},
+            "forever": True,
+        })
+        self.assertTrue(self.cache.delete("payload"))
+        self.assertIsNone(self.cache.get("payload"))
+
+        time.sleep(1.1)
+        self.assertIsNone(self.cache.get("short"))
+        self.assertTrue(self.cache.add("short", "again"))
+        self.assertFalse(self.cache.add("short", "not replaced"))
+        self.assertEqual(self.cache.get("short"), "again")
+
+    def test_incr_is_atomic_in_the_database(self):
+        self.assertTrue(self.cache.add("counter", 1))
+
+        with self.assertNumQueries(1, using="cache"):
+            self.assertEqual(self.cache.incr("counter", 4), 5)
+        self.assertEqual(self.cache.decr("counter"), 4)
+        self.assertEqual(self.cache.get("counter"), 4)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+
+    def test_writes_do_not_join_the_callers_transaction(self):
+        self.assertTrue(self.cache.add("version", 1))
+
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                self.cache.incr("version")
+                self.cache.set("payload", "kept")
+                raise RuntimeError("rolled back")
+
+        self.assertEqual(self.cache.get("version"), 2)
+        self.assertEqual(self.cache.get("payload"), "kept")
+
+    def test_counters_are_shared_across_worker_instances(self):
+        other_worker = PostgresCache(SHARED_CACHE_TABLE, {"TIMEOUT": 60})
+        request = RequestFactory().post("/", REMOTE_ADDR="203.0.113.5")
+
+        self.assertTrue(self.cache.add("version", 1))
+        self.assertEqual(other_worker.incr("version"), 2)
+        self.assertEqual(self.cache.get("version"), 2)
+
+        with override_settings(CACHES={"default": {
+            "BACKEND": "rabotaem_backend.cache_backends.postgres.PostgresCache",
+            "LOCATION": SHARED_CACHE_TABLE,
+        }}):
+            results = [is_rate_limited(request, scope="test", limit=2, window_seconds=60) for _attempt in range(3)]
+
+        self.assertEqual(results, [False, False, True])
+
+    def test_benchmark_command_reports_both_backends(self):
+        output = StringIO()
+        with override_settings(CACHES={
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+            "shared": {
+                "BACKEND": "rabotaem_backend.cache_backends.postgres.PostgresCache",
+                "LOCATION": SHARED_CACHE_TABLE,
+            },
+        }):
+            call_command("benchmark_cache", alias="shared", keys=5, rounds=1, stdout=output)
+
+        self.assertIn("locmem (LocMemCache)", output.getvalue())
+        self.assertIn("shared (PostgresCache)", output.getvalue())
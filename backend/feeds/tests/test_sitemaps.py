@@ -7,7 +7,9 @@ from pathlib import Path
 from xml.etree import ElementTree
 
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from communities.models import Comun
@@ -156,6 +158,23 @@ class MaterializedSitemapTests(TestCase):
         self.assertEqual(_range_bounds(5000), (1, 5000))
         self.assertEqual(_range_bounds(5001), (5001, 10000))
 
+    def test_noop_run_fingerprints_all_shards_with_grouped_queries(self) -> None:
+        Post.objects.create(
+            id=500_001,
+            author=self.author,
+            message_id=500_001,
+            title="Далекий пост",
+            content=LONG_CONTENT,
+        )
+        first = self._materialize()
+        self.assertIn("posts:500001:505000", first["groups"])
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self._materialize()
+
+        self.assertEqual(first["groups"], second["groups"])
+        self.assertLess(len(queries), 20)
+
     def test_materializes_localized_shards_index_and_gzip_files(self) -> None:
         manifest = self._materialize()
 
@@ -0,0 +1,138 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from feeds.models import Author, Post, PostSocialImage
+from feeds.social_images import refresh_post_social_image
+
+
+def _webp_bytes(width: int, height: int) -> bytes:
+    output = io.BytesIO()
+    Image.new("RGBA", (width, height), (40, 120, 200, 255)).save(output, format="WEBP")
+    return output.getvalue()
+
+
+@override_settings(SITE_BASE_URL="https://tambur.pub", MEDIA_URL="/media/", MEDIA_PUBLIC_URL_MODE="legacy")
+class PostSocialImageTests(TestCase):
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.media_root = Path(tmp_dir.name)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self._store("uploads/post/cover-1280.webp", 1600, 900)
+        self.author = Author.objects.create(username="social-author")
+
+    def _store(self, path: str, width: int, height: int) -> None:
+        target = self.media_root / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_bytes(_webp_bytes(width, height))
+
+    def _create_post(self) -> Post:
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(
+                author=self.author,
+                message_id=1,
+                title="Пост с обложкой",
+                content='<p>Текст</p><img src="/media/uploads/post/cover-1280.webp" alt="">',
+            )
+
+    def test_publish_renders_jpeg_from_storage(self):
+        post = self._create_post()
+
+        social_image = PostSocialImage.objects.get(post=post)
+        self.assertEqual(social_image.source_path, "uploads/post/cover-1280.webp")
+        self.assertTrue(social_image.image_path.startswith(f"social/posts/{post.id}/"))
+        with Image.open(self.media_root / social_image.image_path) as rendered:
+            self.assertEqual(rendered.format, "JPEG")
+            self.assertEqual(rendered.size, (1200, 675))
+
+    def test_endpoint_redirects_to_rendered_image_without_fetching(self):
+        post = self._create_post()
+        image_path = PostSocialImage.objects.get(post=post).image_path
+
+        with patch("urllib.request.urlopen") as urlopen:
+            response = self.client.get(f"/api/posts/{post.id}/social-image.jpg")
+
+        urlopen.assert_not_called()
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["Location"], f"https://tambur.pub/media/{image_path}")
+        self.assertEqual(response["Cache-Control"], "public, max-age=86400")
+
+    def test_endpoint_renders_posts_published_before_prerendering(self):
+        post = self._create_post()
+        PostSocialImage.objects.all().delete()
+
+        response = self.client.get(f"/api/posts/{post.id}/social-image.jpg")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(PostSocialImage.objects.filter(post=post).exclude(image_path="").exists())
+
+    def test_preview_change_replaces_image_and_unrelated_saves_do_not_rerender(self):
+        post = self._create_post()
+        previous_path = PostSocialImage.objects.get(post=post).image_path
+
+        with patch("feeds.social_images.render_social_image_bytes") as render:
+            with self.captureOnCommitCallbacks(execute=True):
+                post.title = "Новый заголовок"
+                post.save(update_fields=["title"])
+            refresh_post_social_image(post)
+        render.assert_not_called()
+
+        self._store("uploads/post/other-1920.webp", 800, 800)
+        with self.captureOnCommitCallbacks(execute=True):
+            post.content = '<img src="/media/uploads/post/other-1280.webp" alt="">'
+            post.save(update_fields=["content"])
+
+        social_image = PostSocialImage.objects.get(post=post)
+        self.assertEqual(social_image.source_path, "uploads/post/other-1280.webp")
+        self.assertNotEqual(social_image.image_path, previous_path)
+        self.assertFalse((self.media_root / previous_path).exists())
+        with Image.open(self.media_root / social_image.image_path) as rendered:
+            self.assertEqual(rendered.size, (800, 800))
+
+    def test_missing_source_is_recorded_and_served_as_not_found(self):
+        post = self._create_post()
+        with self.captureOnCommitCallbacks(execute=True):
+            post.content = '<img src="/media/uploads/post/missing-1280.webp" alt="">'
+            post.save(update_fields=["content"])
+
+        self.assertEqual(PostSocialImage.objects.get(post=post).image_path, "")
+        self.assertEqual(self.client.get(f"/api/posts/{post.id}/social-image.jpg").status_code, 404)
+
+    def test_storage_error_is_not_recorded_and_render_is_retried(self):
+        post = self._create_post()
+        PostSocialImage.objects.all().delete()
+
+        with patch("feeds.social_images.default_storage.open", side_effect=OSError("connection reset")):
+            self.assertEqual(self.client.get(f"/api/posts/{post.id}/social-image.jpg").status_code, 404)
+        self.assertFalse(PostSocialImage.objects.filter(post=post).exists())
+
+        response = self.client.get(f"/api/posts/{post.id}/social-image.jpg")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(PostSocialImage.objects.filter(post=post).exclude(image_path="").exists())
+
+    def test_endpoint_returns_not_found_when_lazy_render_fails(self):
+        post = self._create_post()
+        PostSocialImage.objects.all().delete()
+
+        with patch("feeds.social_images.default_storage.save", side_effect=RuntimeError("bucket unavailable")):
+            response = self.client.get(f"/api/posts/{post.id}/social-image.jpg")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(PostSocialImage.objects.filter(post=post).exists())
+
+    def test_backfill_command_renders_posts_without_images(self):
+        post = self._create_post()
+        PostSocialImage.objects.all().delete()
+
+        call_command("render_post_social_images", stdout=io.StringIO())
+
+        self.assertTrue(PostSocialImage.objects.filter(post=post).exclude(image_path="").exists())
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import requests
+from django.test import TestCase, override_settings
+
+from feeds.models import (
+    POST_TRANSLATION_STATUS_FAILED,
+    POST_TRANSLATION_STATUS_TRANSLATED,
+    Author,
+    Post,
+    PostTranslation,
+)
+from feeds.translation_service import PostTranslationError, translate_post_to_languages
+
+
+class FakeOpenRouterResponse:
+    def __init__(self, payload: dict):
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def _provider_reply(payload: dict) -> FakeOpenRouterResponse:
+    return FakeOpenRouterResponse(
+        {"choices": [{"finish_reason": "stop", "message": {"content": json.dumps(payload, ensure_ascii=False)}}]}
+    )
+
+
+def _paragraph(block_id: str, text: str) -> dict:
+    return {"id": block_id, "type": "paragraph", "data": {"text": text}}
+
+
+def _sent_payload(call) -> dict:
+    return json.loads(call.kwargs["json"]["messages"][1]["content"])
+
+
+@override_settings(
+    OPENROUTER_API_KEY="test-key",
+    OPENROUTER_API_URL="https://openrouter.test/api/v1/chat/completions",
+    OPENROUTER_TRANSLATION_MODEL="deepseek/deepseek-v4-flash",
+    SITE_BASE_URL="https://tambur.pub",
+    CONTENT_TRANSLATION_BATCH_MAX_CHARS=6000,
+)
+class BatchedPostTranslationTests(TestCase):
+    def setUp(self) -> None:
+        self.post = Post.objects.create(
+            author=Author.objects.create(username="batch-author"),
+            message_id=1,
+            title="Заголовок",
+            content=json.dumps(
+                {"time": 1, "blocks": [_paragraph("p-1", "Первый абзац")], "version": "2.30.0"},
+                ensure_ascii=False,
+            ),
+        )
+
+    @patch("feeds.translation_service.requests.post")
+    def test_languages_share_one_request_and_are_validated_separately(self, post_mock) -> None:
+        post_mock.return_value = _provider_reply(
+            {
+                "translations": {
+                    "en": {"title": "Title", "content": {"blocks": [_paragraph("p-1", "First paragraph")]}},
+                    "de": {"title": "Titel", "content": {"blocks": []}},
+                }
+            }
+        )
+
+        results = translate_post_to_languages(self.post, ["en", "de"])
+
+        post_mock.assert_called_once()
+        sent = _sent_payload(post_mock.call_args)
+        self.assertEqual([target["code"] for target in sent["target_languages"]], ["en", "de"])
+        self.assertEqual(results["en"].status, POST_TRANSLATION_STATUS_TRANSLATED)
+        self.assertEqual(results["en"].title, "Title")
+        self.assertEqual(results["en"].raw_response["batch_languages"], ["en", "de"])
+        self.assertIsInstance(results["de"], PostTranslationError)
+        self.assertIn("количество блоков", str(results["de"]))
+        self.assertEqual(
+            PostTranslation.objects.get(post=self.post, language="de").status,
+            POST_TRANSLATION_STATUS_FAILED,
+        )
+
+    @patch("feeds.translation_service.requests.post")
+    def test_language_missing_from_batched_answer_is_requested_alone(self, post_mock) -> None:
+        post_mock.side_effect = [
+            _provider_reply(
+                {"translations": {"en": {"title": "Title", "content": {"blocks": [_paragraph("p-1", "First")]}}}}
+            ),
+            _provider_reply({"title": "Titel", "content": {"blocks": [_paragraph("p-1", "Erster")]}}),
+        ]
+
+        results = translate_post_to_languages(self.post, ["en", "de"])
+
+        self.assertEqual(post_mock.call_count, 2)
+        self.assertEqual(_sent_payload(post_mock.call_args)["target_language"], "German")
+        self.assertEqual(results["de"].title, "Titel")
+        self.assertEqual(results["en"].title, "Title")
+
+    @override_settings(CONTENT_TRANSLATION_BATCH_MAX_CHARS=10)
+    @patch("feeds.translation_service.requests.post")
+    def test_large_payload_falls_back_to_one_request_per_language(self, post_mock) -> None:
+        post_mock.return_value = _provider_reply(
+            {"title": "Title", "content": {"blocks": [_paragraph("p-1", "First paragraph")]}}
+        )
+
+        results = translate_post_to_languages(self.post, ["en", "de"])
+
+        self.assertEqual(post_mock.call_count, 2)
+        self.assertEqual(
+            [_sent_payload(call)["target_language"] for call in post_mock.call_args_list],
+            ["English", "German"],
+        )
+        self.assertTrue(all(result.status == POST_TRANSLATION_STATUS_TRANSLATED for result in results.values()))
+
+    @patch("feeds.translation_service.requests.post")
+    def test_failed_batched_request_is_retried_per_language(self, post_mock) -> None:
+        post_mock.side_effect = [
+            requests.Timeout("read timed out"),
+            _provider_reply({"title": "Title", "content": {"blocks": [_paragraph("p-1", "First")]}}),
+            _provider_reply({"title": "Titel", "content": {"blocks": [_paragraph("p-1", "Erster")]}}),
+        ]
+
+        results = translate_post_to_languages(self.post, ["en", "de"])
+
+        self.assertEqual(post_mock.call_count, 3)
+        self.assertEqual(results["en"].title, "Title")
+        self.assertEqual(results["de"].title, "Titel")
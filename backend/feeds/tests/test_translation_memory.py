@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+
+from feeds.models import Author, Post, TranslationMemoryEntry
+from feeds.translation_service import (
+    PostTranslationError,
+    serialize_content_translation_settings,
+    translate_post_to_language,
+)
+
+
+class FakeOpenRouterResponse:
+    def __init__(self, payload: dict):
+        self.status_code = 200
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def _provider_reply(payload: dict) -> FakeOpenRouterResponse:
+    return FakeOpenRouterResponse(
+        {
+            "choices": [
+                {
+                    "finish_reason": "stop",
+                    "message": {"content": json.dumps(payload, ensure_ascii=False)},
+                }
+            ]
+        }
+    )
+
+
+def _paragraph(block_id: str, text: str) -> dict:
+    return {"id": block_id, "type": "paragraph", "data": {"text": text}}
+
+
+def _sent_post_payload(post_mock) -> dict:
+    request_payload = post_mock.call_args.kwargs["json"]
+    return json.loads(request_payload["messages"][1]["content"])["post"]
+
+
+@override_settings(
+    OPENROUTER_API_KEY="test-key",
+    OPENROUTER_API_URL="https://openrouter.test/api/v1/chat/completions",
+    OPENROUTER_TRANSLATION_MODEL="deepseek/deepseek-v4-flash",
+    SITE_BASE_URL="https://tambur.pub",
+)
+class TranslationMemoryTests(TestCase):
+    def setUp(self) -> None:
+        self.author = Author.objects.create(username="memory-author")
+        self.post = self._create_post(
+            [_paragraph("p-1", "Первый абзац"), _paragraph("p-2", "Второй абзац")],
+            message_id=1,
+        )
+
+    def _create_post(self, blocks: list[dict], *, message_id: int) -> Post:
+        return Post.objects.create(
+            author=self.author,
+            message_id=message_id,
+            title="Заголовок",
+            content=json.dumps({"time": 1, "blocks": blocks, "version": "2.30.0"}, ensure_ascii=False),
+        )
+
+    @patch("feeds.translation_service.requests.post")
+    def test_edit_sends_only_changed_blocks(self, post_mock) -> None:
+        post_mock.return_value = _provider_reply(
+            {
+                "title": "Title",
+                "content": {"blocks": [_paragraph("p-1", "First paragraph"), _paragraph("p-2", "Second paragraph")]},
+            }
+        )
+        translate_post_to_language(self.post, "en")
+
+        self.post.content = json.dumps(
+            {"time": 2, "blocks": [_paragraph("p-1", "Первый абзац"), _paragraph("p-2", "Новый второй абзац")]},
+            ensure_ascii=False,
+        )
+        self.post.save(update_fields=["content", "updated_at"])
+        post_mock.return_value = _provider_reply(
+            {"content": {"blocks": [_paragraph("p-2", "New second paragraph")]}}
+        )
+
+        translation = translate_post_to_language(self.post, "en")
+
+        sent = _sent_post_payload(post_mock)
+        self.assertNotIn("title", sent)
+        self.assertEqual(sent["content"]["blocks"], [_paragraph("p-2", "Новый второй абзац")])
+        self.assertEqual(translation.title, "Title")
+        self.assertEqual(
+            json.loads(translation.content)["blocks"],
+            [_paragraph("p-1", "First paragraph"), _paragraph("p-2", "New second paragraph")],
+        )
+        self.assertEqual(translation.raw_response["translation_memory"], {"segments": 3, "reused": 2})
+
+    @patch("feeds.translation_service.requests.post")
+    def test_fully_remembered_post_skips_provider_and_keeps_its_block_ids(self, post_mock) -> None:
+        post_mock.return_value = _provider_reply(
+            {
+                "title": "Title",
+                "content": {"blocks": [_paragraph("p-1", "First paragraph"), _paragraph("p-2", "Second paragraph")]},
+            }
+        )
+        translate_post_to_language(self.post, "en")
+        post_mock.reset_mock()
+        copy = self._create_post(
+            [_paragraph("other-2", "Второй абзац"), _paragraph("other-1", "Первый абзац")],
+            message_id=2,
+        )
+
+        translation = translate_post_to_language(copy, "en")
+
+        post_mock.assert_not_called()
+        self.assertEqual(
+            json.loads(translation.content)["blocks"],
+            [_paragraph("other-2", "Second paragraph"), _paragraph("other-1", "First paragraph")],
+        )
+        stats = serialize_content_translation_settings()["translation_memory"]
+        self.assertEqual(stats["translated_segments"], 3)
+        self.assertEqual(stats["reused_segments"], 3)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    @patch("feeds.translation_service.requests.post")
+    def test_rejected_translation_is_not_remembered(self, post_mock) -> None:
+        post_mock.return_value = _provider_reply(
+            {"title": "Title", "content": {"blocks": [_paragraph("p-1", "First paragraph")]}}
+        )
+
+        with self.assertRaises(PostTranslationError):
+            translate_post_to_language(self.post, "en")
+
+        self.assertFalse(TranslationMemoryEntry.objects.exists())
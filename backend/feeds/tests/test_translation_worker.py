@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from feeds.models import (
+    CONTENT_TRANSLATION_KIND_COMUN,
+    CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+    CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
+    ContentTranslationSettings,
+    ContentTranslationTask,
+)
+from feeds.translation_limits import (
+    ProviderRateLimiter,
+    refresh_translation_provider_limits,
+    translation_provider_limiter,
+)
+from feeds.translation_worker import run_translation_worker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class ProviderRateLimiterTests(SimpleTestCase):
+    def test_tokens_per_minute_budget_refills_over_time(self):
+        clock = FakeClock()
+        limiter = ProviderRateLimiter(concurrency=4, tokens_per_minute=600, clock=clock)
+
+        reserved = limiter.acquire(600)
+        limiter.release(reserved=reserved, used=600)
+
+        self.assertEqual(limiter._wait_seconds(300), 30)
+        clock.now += 30
+        limiter._refill()
+        self.assertEqual(limiter._wait_seconds(300), 0)
+
+    def test_billed_usage_above_the_estimate_delays_next_request(self):
+        clock = FakeClock()
+        limiter = ProviderRateLimiter(concurrency=4, tokens_per_minute=600, clock=clock)
+
+        reserved = limiter.acquire(100)
+        limiter.release(reserved=reserved, used=700)
+
+        self.assertEqual(limiter._wait_seconds(100), 20)
+
+    def test_concurrency_and_rate_limit_pause_block_new_slots(self):
+        clock = FakeClock()
+        limiter = ProviderRateLimiter(concurrency=1, clock=clock)
+
+        reserved = limiter.acquire(1)
+        self.assertGreater(limiter._wait_seconds(1), 0)
+        limiter.release(reserved=reserved)
+        self.assertEqual(limiter._wait_seconds(1), 0)
+
+        limiter.pause(15)
+        self.assertEqual(limiter._wait_seconds(1), 15)
+
+    def test_zero_concurrency_means_no_cap(self):
+        limiter = ProviderRateLimiter(concurrency=0, clock=FakeClock())
+
+        for _slot in range(10):
+            limiter.acquire(1)
+
+        self.assertEqual(limiter.concurrency, 0)
+        self.assertEqual(limiter._wait_seconds(1), 0)
+
+
+class TranslationProviderLimitSettingsTests(TestCase):
+    def test_limiter_follows_translation_settings(self):
+        ContentTranslationSettings.objects.update_or_create(
+            pk=1,
+            defaults={"provider_concurrency": 2, "provider_tokens_per_minute": 6000},
+        )
+        refresh_translation_provider_limits(force=True)
+        limiter = translation_provider_limiter("test-provider")
+        self.assertEqual(limiter.concurrency, 2)
+
+        ContentTranslationSettings.objects.filter(pk=1).update(provider_concurrency=6)
+        refresh_translation_provider_limits(force=True)
+
+        self.assertEqual(limiter.concurrency, 6)
+
+
+class TranslationWorkerTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.tasks = [
+            ContentTranslationTask.objects.create(
+                kind=CONTENT_TRANSLATION_KIND_COMUN,
+                object_id=object_id,
+                status=CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+                scheduled_at=now - timedelta(minutes=1),
+            )
+            for object_id in (101, 102, 103)
+        ]
+
+    def test_claimed_tasks_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=5)
+
+        def process(task_id):
+            barrier.wait()
+            return "done"
+
+        with patch("feeds.translation_worker._process_claimed_translation_task", side_effect=process):
+            stats = run_translation_worker(concurrency=3, stop_event=threading.Event(), idle_seconds=1)
+
+        self.assertEqual(stats["processed"], 3)
+        self.assertEqual(stats["done"], 3)
+
+    def test_stop_keeps_the_claim_of_tasks_that_are_still_running(self):
+        stop_event = threading.Event()
+        finish = threading.Event()
+        self.addCleanup(finish.set)
+
+        def process(task_id):
+            stop_event.set()
+            finish.wait(5)
+            return "done"
+
+        with patch("feeds.translation_worker._process_claimed_translation_task", side_effect=process):
+            stats = run_translation_worker(
+                concurrency=1,
+                stop_event=stop_event,
+                idle_seconds=1,
+                shutdown_timeout=0.1,
+            )
+
+        self.assertEqual(stats["released"], 0)
+        running = ContentTranslationTask.objects.get(pk=self.tasks[0].pk)
+        self.assertEqual(running.status, CONTENT_TRANSLATION_TASK_STATUS_RUNNING)
+        self.assertEqual(running.attempts, 1)
+        self.assertIsNotNone(running.locked_at)
+        self.assertEqual(
+            ContentTranslationTask.objects.filter(status=CONTENT_TRANSLATION_TASK_STATUS_PENDING).count(),
+            2,
+        )
+
+    def test_stop_returns_tasks_that_never_started_to_the_queue(self):
+        stop_event = threading.Event()
+        future = Future()
+        task_id = self.tasks[0].pk
+        ContentTranslationTask.objects.filter(pk=task_id).update(
+            status=CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
+            attempts=1,
+            locked_at=timezone.now(),
+        )
+
+        with (
+            patch("feeds.translation_worker.ThreadPoolExecutor.submit", return_value=future),
+            patch("feeds.translation_worker._claim_due_translation_task_ids", return_value=[task_id]),
+        ):
+            threading.Timer(0.2, stop_event.set).start()
+            stats = run_translation_worker(
+                concurrency=1,
+                stop_event=stop_event,
+                idle_seconds=1,
+                shutdown_timeout=0,
+                loop=True,
+            )
+
+        self.assertTrue(future.cancelled())
+        self.assertEqual(stats["released"], 1)
+        released = ContentTranslationTask.objects.get(pk=task_id)
+        self.assertEqual(released.status, CONTENT_TRANSLATION_TASK_STATUS_PENDING)
+        self.assertEqual(released.attempts, 0)
+        self.assertIsNone(released.locked_at)
+
+    def test_maintenance_does_not_reset_tasks_still_in_flight(self):
+        stop_event = threading.Event()
+
+        def process(task_id):
+            time.sleep(2.5)
+            stop_event.set()
+            return "done"
+
+        with (
+            patch("feeds.translation_worker._process_claimed_translation_task", side_effect=process) as process_mock,
+            patch("feeds.translation_worker.TRANSLATION_WORKER_MAINTENANCE_SECONDS", 0),
+            patch("feeds.translation_service.CONTENT_TRANSLATION_TASK_STALE_AFTER", timedelta(0)),
+        ):
+            run_translation_worker(concurrency=3, stop_event=stop_event, idle_seconds=1)
+
+        self.assertEqual(process_mock.call_count, 3)
+        for task in ContentTranslationTask.objects.all():
+            self.assertEqual(task.status, CONTENT_TRANSLATION_TASK_STATUS_RUNNING)
+            self.assertEqual(task.attempts, 1)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+
+TRANSLATION_LIMITS_REFRESH_SECONDS = 30
+# Rough chars-per-token ratio for mixed Cyrillic/Latin prompts.
+_CHARS_PER_TOKEN = 3
+
+
+def estimate_translation_tokens(prompt_chars: int, *, completions: int = 1) -> int:
+    prompt_tokens = max(int(prompt_chars) // _CHARS_PER_TOKEN, 1)
+    # Each completion is roughly as long as the source text it translates.
+    return prompt_tokens * (1 + max(int(completions), 1))
+
+
+class ProviderRateLimiter:
+    """Caps in-flight requests and tokens per minute for one translation provider.
+
+    A limit of 0 (or less) disables that cap.
+    """
+
+    def __init__(self, *, concurrency: int = 4, tokens_per_minute: int = 0, clock=time.monotonic):
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._concurrency = 0
+        self._tokens_per_minute = 0
+        self._available_tokens = 0.0
+        self._refilled_at = clock()
+        self.configure(concurrency=concurrency, tokens_per_minute=tokens_per_minute)
+
+    def configure(self, *, concurrency: int, tokens_per_minute: int) -> None:
+        with self._condition:
+            self._refill()
+            self._concurrency = max(int(concurrency or 0), 0)
+            tokens_per_minute = max(int(tokens_per_minute or 0), 0)
+            if not self._tokens_per_minute:
+                self._available_tokens = float(tokens_per_minute)
+            else:
+                self._available_tokens = min(self._available_tokens, float(tokens_per_minute))
+            self._tokens_per_minute = tokens_per_minute
+            self._condition.notify_all()
+
+    @property
+    def concurrency(self) -> int:
+        return self._concurrency
+
+    def _refill(self) -> None:
+        now = self._clock()
+        if self._tokens_per_minute:
+            self._available_tokens = min(
+                float(self._tokens_per_minute),
+                self._available_tokens + (now - self._refilled_at) * self._tokens_per_minute / 60,
+            )
+        self._refilled_at = now
+
+    def _wait_seconds(self, tokens: int) -> float:
+        now = self._clock()
+        if self._paused_until > now:
+            return self._paused_until - now
+        if self._concurrency and self._in_flight >= self._concurrency:
+            return 1.0
+        if self._tokens_per_minute and self._available_tokens < tokens:
+            return (tokens - self._available_tokens) * 60 / self._tokens_per_minute
+        return 0.0
+
+    def acquire(self, tokens: int) -> int:
+        with self._condition:
+            while True:
+                self._refill()
+                reserved = min(max(int(tokens), 0), self._tokens_per_minute) if self._tokens_per_minute else 0
+                wait_seconds = self._wait_seconds(reserved)
+                if wait_seconds <= 0:
+                    self._in_flight += 1
+                    self._available_tokens -= reserved
+                    return reserved
+                self._condition.wait(timeout=min(wait_seconds, 5.0))
+
+    def release(self, *, reserved: int, used: int | None = None) -> None:
+        with self._condition:
+            self._in_flight = max(self._in_flight - 1, 0)
+            if self._tokens_per_minute and used is not None:
+                # Settle the estimate against what the provider actually billed.
+                self._available_tokens -= int(used) - reserved
+            self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        with self._condition:
+            self._paused_until = max(self._paused_until, self._clock() + max(float(seconds), 0))
+
+    @contextmanager
+    def slot(self, tokens: int):
+        reserved = self.acquire(tokens)
+        usage = _SlotUsage()
+        try:
+            yield usage
+        finally:
+            self.release(reserved=reserved, used=usage.tokens)
+
+
+class _SlotUsage:
+    tokens: int | None = None
+
+    def record(self, tokens: object) -> None:
+        try:
+            self.tokens = int(tokens)
+        except (TypeError, ValueError):
+            self.tokens = None
+
+
+_limiters: dict[str, ProviderRateLimiter] = {}
+_limiters_lock = threading.Lock()
+_limits_loaded_at = 0.0
+_limits = (4, 0)
+
+
+def _configured_limits() -> tuple[int, int]:
+    from feeds.translation_service import get_content_translation_settings
+
+    settings_obj = get_content_translation_settings()
+    return int(settings_obj.provider_concurrency or 0), int(settings_obj.provider_tokens_per_minute or 0)
+
+
+def refresh_translation_provider_limits(*, force: bool = False) -> None:
+    global _limits, _limits_loaded_at
+    now = time.monotonic()
+    if not force and _limits_loaded_at and now - _limits_loaded_at < TRANSLATION_LIMITS_REFRESH_SECONDS:
+        return
+    concurrency, tokens_per_minute = _configured_limits()
+    with _limiters_lock:
+        _limits = (concurrency, tokens_per_minute)
+        _limits_loaded_at = now
+        for limiter in _limiters.values():
+            limiter.configure(concurrency=concurrency, tokens_per_minute=tokens_per_minute)
+
+
+def translation_provider_limiter(provider: str) -> ProviderRateLimiter:
+    refresh_translation_provider_limits()
+    with _limiters_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            concurrency, tokens_per_minute = _limits
+            limiter = ProviderRateLimiter(concurrency=concurrency, tokens_per_minute=tokens_per_minute)
+            _limiters[provider] = limiter
+        return limiter
+
+
+__all__ = [
+    "ProviderRateLimiter",
+    "estimate_translation_tokens",
+    "refresh_translation_provider_limits",
+    "translation_provider_limiter",
+]
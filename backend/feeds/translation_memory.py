@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Any
+
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from feeds.models import TranslationMemoryEntry
+
+# Format markers sent along with the text but never translated.
+_PASSTHROUGH_KEYS = frozenset({"content_format"})
+# Appended to the system prompt when unchanged segments were left out.
+PARTIAL_PAYLOAD_PROMPT = (
+    " Some keys, blocks or items may be omitted because they are already translated: "
+    "translate and return only what is present in the input, keeping every id."
+)
+
+
+@dataclass(frozen=True)
+class TranslationSegment:
+    """One independently translatable piece of a source payload.
+
+    ``path`` is ``(key,)`` for a top-level string and ``(key, index)`` for an
+    EditorJS block or a list item. The value excludes ``id``, so the same block
+    moved to another post or position hashes the same.
+    """
+
+    path: tuple
+    value: Any
+    item_id: Any
+    digest: str
+
+
+def _segment_digest(value: Any) -> str:
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _is_editor_payload(value: object) -> bool:
+    return isinstance(value, dict) and isinstance(value.get("blocks"), list)
+
+
+def _without_id(value: dict[str, Any]) -> dict[str, Any]:
+    return {key: item for key, item in value.items() if key != "id"}
+
+
+def split_translation_segments(payload: dict[str, Any]) -> list[TranslationSegment]:
+    segments: list[TranslationSegment] = []
+    for key, value in payload.items():
+        if key in _PASSTHROUGH_KEYS:
+            continue
+        if isinstance(value, str):
+            if value.strip():
+                segments.append(TranslationSegment((key,), value, None, _segment_digest(value)))
+            continue
+        if _is_editor_payload(value):
+            items = value["blocks"]
+        elif isinstance(value, list):
+            items = value
+        else:
+            continue
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            item_value = _without_id(item)
+            segments.append(TranslationSegment((key, index), item_value, item.get("id"), _segment_digest(item_value)))
+    return segments
+
+
+def lookup_translation_memory(
+    segments: list[TranslationSegment],
+    *,
+    source_language: str,
+    target_language: str,
+    model: str,
+) -> dict[str, Any]:
+    digests = {segment.digest for segment in segments}
+    if not digests or not model:
+        return {}
+    entries = list(
+        TranslationMemoryEntry.objects.filter(
+            segment_hash__in=digests,
+            source_language=source_language,
+            target_language=target_language,
+            model=model,
+        ).only("id", "segment_hash", "translation")
+    )
+    if entries:
+        TranslationMemoryEntry.objects.filter(pk__in=[entry.pk for entry in entries]).update(
+            hit_count=F("hit_count") + 1,
+            last_used_at=timezone.now(),
+        )
+    return {entry.segment_hash: entry.translation for entry in entries}
+
+
+def build_partial_payload(
+    payload: dict[str, Any],
+    segments: list[TranslationSegment],
+    cached: dict[str, Any],
+) -> dict[str, Any] | None:
+    """Returns ``payload`` reduced to segments missing from ``cached``.
+
+    Keys that are not segments (format markers and the like) are kept as they
+    are. Returns None when every segment is already translated.
+    """
+    missing_paths = {segment.path for segment in segments if segment.digest not in cached}
+    if not missing_paths:
+        return None
+    partial: dict[str, Any] = {}
+    for key, value in payload.items():
+        if key in _PASSTHROUGH_KEYS:
+            partial[key] = value
+            continue
+        if isinstance(value, str):
+            if (key,) in missing_paths or not value.strip():
+                partial[key] = value
+            continue
+        if _is_editor_payload(value) or isinstance(value, list):
+            items = value["blocks"] if isinstance(value, dict) else value
+            kept = [item for index, item in enumerate(items) if (key, index) in missing_paths]
+            if not kept:
+                continue
+            partial[key] = {**value, "blocks": kept} if isinstance(value, dict) else kept
+            continue
+        partial[key] = value
+    return partial
+
+
+def _match_translated_items(source_items: list, translated_items: object, missing_indexes: list[int]) -> dict:
+    if not isinstance(translated_items, list):
+        return {}
+    by_id = {
+        str(item.get("id")): item
+        for item in translated_items
+        if isinstance(item, dict) and item.get("id") is not None
+    }
+    result = {}
+    for position, index in enumerate(missing_indexes):
+        source_id = source_items[index].get("id")
+        translated = by_id.get(str(source_id)) if source_id is not None else None
+        if translated is None and position < len(translated_items):
+            # Keep a renumbered item so the caller's id validation reports it.
+            translated = translated_items[position]
+        if isinstance(translated, dict):
+            result[index] = translated
+    return result
+
+
+def merge_translated_payload(
+    payload: dict[str, Any],
+    segments: list[TranslationSegment],
+    cached: dict[str, Any],
+    translated: dict[str, Any] | None,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Rebuilds the full translated payload from memory and a partial response.
+
+    Returns the merged payload and the newly translated segments by digest.
+    Missing translations are left out so the callers' validation reports them.
+    """
+    translated = translated or {}
+    segments_by_path = {segment.path: segment for segment in segments}
+    learned: dict[str, Any] = {}
+    merged: dict[str, Any] = {}
+    for key, value in payload.items():
+        if key in _PASSTHROUGH_KEYS:
+            merged[key] = value
+            continue
+        if isinstance(value, str):
+            segment = segments_by_path.get((key,))
+            if segment is None:
+                merged[key] = value
+            elif segment.digest in cached:
+                merged[key] = cached[segment.digest]
+            elif key in translated:
+                merged[key] = translated[key]
+                if isinstance(translated[key], str) and translated[key].strip():
+                    learned[segment.digest] = translated[key]
+            continue
+        if not (_is_editor_payload(value) or isinstance(value, list)):
+            merged[key] = value
+            continue
+
+        items = value["blocks"] if isinstance(value, dict) else value
+        missing_indexes = [
+            index
+            for index in range(len(items))
+            if (key, index) in segments_by_path and segments_by_path[(key, index)].digest not in cached
+        ]
+        translated_value = translated.get(key)
+        if isinstance(value, dict) and isinstance(translated_value, dict):
+            translated_value = translated_value.get("blocks")
+        fresh = _match_translated_items(items, translated_value, missing_indexes)
+
+        merged_items = []
+        for index, item in enumerate(items):
+            segment = segments_by_path.get((key, index))
+            if segment is None:
+                merged_items.append(item)
+            elif segment.digest in cached and isinstance(cached[segment.digest], dict):
+                reused = dict(cached[segment.digest])
+                if "id" in item:
+                    reused = {"id": segment.item_id, **reused}
+                merged_items.append(reused)
+            elif index in fresh:
+                merged_items.append(fresh[index])
+                learned[segment.digest] = _without_id(fresh[index])
+        merged[key] = {**value, "blocks": merged_items} if isinstance(value, dict) else merged_items
+    return merged, learned
+
+
+def remember_translation_segments(
+    learned: dict[str, Any],
+    *,
+    source_language: str,
+    target_language: str,
+    model: str,
+) -> None:
+    if not learned or not model:
+        return
+    TranslationMemoryEntry.objects.bulk_create(
+        [
+            TranslationMemoryEntry(
+                segment_hash=digest,
+                source_language=source_language,
+                target_language=target_language,
+                model=model,
+                translation=translation,
+            )
+            for digest, translation in learned.items()
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def translation_memory_stats() -> dict[str, int | float]:
+    totals = TranslationMemoryEntry.objects.aggregate(entries=Count("id"), reused=Sum("hit_count"))
+    translated = int(totals["entries"] or 0)
+    reused = int(totals["reused"] or 0)
+    looked_up = translated + reused
+    return {
+        "translated_segments": translated,
+        "reused_segments": reused,
+        "hit_rate": round(reused / looked_up, 4) if looked_up else 0.0,
+    }
+
+
+__all__ = [
+    "PARTIAL_PAYLOAD_PROMPT",
+    "TranslationSegment",
+    "build_partial_payload",
+    "lookup_translation_memory",
+    "merge_translated_payload",
+    "remember_translation_segments",
+    "split_translation_segments",
+    "translation_memory_stats",
+]
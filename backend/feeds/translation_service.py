@@ -3,8 +3,6 @@ from __future__ import annotations
 import base64
 import json
 import re
-import subprocess
-import sys
 from datetime import timedelta
 from typing import Any
 
@@ -18,7 +16,9 @@ from feeds.models import (
     CONTENT_TRANSLATION_KIND_COMMENT,
     CONTENT_TRANSLATION_KIND_COMUN,
     CONTENT_TRANSLATION_KIND_POST,
+    CONTENT_TRANSLATION_KIND_POST_MANUAL,
     CONTENT_TRANSLATION_KIND_STATIC_PAGE,
+    CONTENT_TRANSLATION_TASK_PRIORITY_MANUAL,
     CONTENT_TRANSLATION_TASK_STATUS_DONE,
     CONTENT_TRANSLATION_TASK_STATUS_FAILED,
     CONTENT_TRANSLATION_TASK_STATUS_PENDING,
@@ -48,6 +48,16 @@ from feeds.models import (
     StaticPageTranslation,
 )
 from feeds.preview import build_post_preview
+from feeds.translation_limits import estimate_translation_tokens, translation_provider_limiter
+from feeds.translation_memory import (
+    PARTIAL_PAYLOAD_PROMPT,
+    build_partial_payload,
+    lookup_translation_memory,
+    merge_translated_payload,
+    remember_translation_segments,
+    split_translation_segments,
+    translation_memory_stats,
+)
 
 
 class PostTranslationError(Exception):
@@ -128,6 +138,12 @@ TRANSLATION_PROVIDER_OPENROUTER = "openrouter"
 POST_CONTENT_FORMAT_TEXT = "text"
 POST_CONTENT_FORMAT_EDITORJS_JSON = "editorjs_json"
 POST_CONTENT_FORMAT_EDITORJS_BASE64 = "editorjs_base64"
+# Appended to the system prompt when one request covers several target languages.
+BATCH_TRANSLATION_PROMPT = (
+    " Translate the input into every language listed in target_languages. Return only valid JSON "
+    'of the form {"translations": {"<code>": {...}}}: one object per language code, each shaped '
+    "exactly like a single-language answer."
+)
 
 
 def get_translation_language_label(language: str) -> str:
@@ -340,6 +356,9 @@ def serialize_content_translation_settings(
         "post_daily_limit": post_limit,
         "comment_daily_limit": comment_limit,
         "post_object_daily_limit": int(settings_obj.post_object_daily_limit or 0),
+        "provider_concurrency": int(settings_obj.provider_concurrency or 0),
+        "provider_tokens_per_minute": int(settings_obj.provider_tokens_per_minute or 0),
+        "translation_memory": translation_memory_stats(),
         "updated_at": settings_obj.updated_at.isoformat() if settings_obj.updated_at else None,
         "usage": {
             **usage,
@@ -359,6 +378,8 @@ def update_content_translation_settings(payload: dict) -> ContentTranslationSett
         "post_daily_limit": 200,
         "comment_daily_limit": 1000,
         "post_object_daily_limit": 3,
+        "provider_concurrency": 4,
+        "provider_tokens_per_minute": 0,
     }
     for field, default in integer_fields.items():
         if field not in payload:
@@ -379,6 +400,8 @@ def update_content_translation_settings(payload: dict) -> ContentTranslationSett
             "post_daily_limit",
             "comment_daily_limit",
             "post_object_daily_limit",
+            "provider_concurrency",
+            "provider_tokens_per_minute",
             "updated_at",
         ]
     )
@@ -390,96 +413,172 @@ def translate_post_to_language(post: Post, language: str) -> PostTranslation:
     source_language = str(post.original_language or POST_TRANSLATION_LANGUAGE_RUSSIAN).strip().lower()
     if language == source_language:
         raise AutoTranslationSkipped("Исходный язык поста не требует перевода")
-    target = SUPPORTED_TRANSLATION_LANGUAGES.get(language)
-    if target is None:
-        raise PostTranslationError(f"Язык перевода не поддерживается: {language}")
+    result = translate_post_to_languages(post, [language])[language]
+    if isinstance(result, PostTranslationError):
+        raise result
+    return result
+
+
+def translate_post_to_languages(
+    post: Post,
+    languages: list[str],
+) -> dict[str, PostTranslation | PostTranslationError]:
+    """Translates ``post`` into ``languages``, several of them per request.
+
+    Each language is validated and saved on its own: a broken answer for one
+    language is returned as its error and does not affect the others.
+    """
+    source_language = str(post.original_language or POST_TRANSLATION_LANGUAGE_RUSSIAN).strip().lower()
+    targets: dict[str, dict[str, str]] = {}
+    for language in languages:
+        language = str(language or "").strip().lower()
+        if language == source_language:
+            continue
+        target = SUPPORTED_TRANSLATION_LANGUAGES.get(language)
+        if target is None:
+            raise PostTranslationError(f"Язык перевода не поддерживается: {language}")
+        targets[language] = target
+    if not targets:
+        return {}
 
-    translation, _ = PostTranslation.objects.get_or_create(post=post, language=language)
     model = str(_translation_model() or "").strip()
-    translation.status = POST_TRANSLATION_STATUS_PENDING
-    translation.model = model
-    translation.error_message = ""
-    translation.save(update_fields=["status", "model", "error_message", "updated_at"])
+    translations: dict[str, PostTranslation] = {}
+    for language in targets:
+        translation, _ = PostTranslation.objects.get_or_create(post=post, language=language)
+        translation.status = POST_TRANSLATION_STATUS_PENDING
+        translation.model = model
+        translation.error_message = ""
+        translation.save(update_fields=["status", "model", "error_message", "updated_at"])
+        translations[language] = translation
 
     try:
         source_payload, source_content_format = _post_translation_source_payload(post)
-        response_payload = _request_openrouter_translation(
+        responses = _request_translations_with_memory(
             source_payload,
-            target,
+            payload_key="post",
+            targets=targets,
             source_language=source_language,
+            system_prompt=_post_translation_system_prompt(source_language),
+            model=model,
         )
-        raw_translated_payload = _parse_translated_json_payload(response_payload)
-        translated_title = _truncate_translation_title(
-            str(raw_translated_payload.get("title", "") or "")
-        )
-        raw_translated_content = raw_translated_payload.get("content")
-        if source_content_format in {
-            POST_CONTENT_FORMAT_EDITORJS_JSON,
-            POST_CONTENT_FORMAT_EDITORJS_BASE64,
-        }:
-            translated_editor_payload = _validate_translated_editor_payload(
-                source_payload["content"],
-                raw_translated_content,
-            )
-            translated_content = _encode_post_editor_payload(
-                translated_editor_payload,
-                source_content_format,
+    except Exception as exc:
+        return {
+            language: _fail_translation(translation, exc)
+            for language, translation in translations.items()
+        }
+
+    results: dict[str, PostTranslation | PostTranslationError] = {}
+    for language, translation in translations.items():
+        try:
+            response = responses[language]
+            if isinstance(response, Exception):
+                raise response
+            _save_post_translation(
+                post,
+                translation,
+                response,
+                source_payload=source_payload,
+                source_content_format=source_content_format,
+                source_language=source_language,
+                model=model,
             )
+        except Exception as exc:
+            results[language] = _fail_translation(translation, exc)
         else:
-            if raw_translated_content is not None and not isinstance(
-                raw_translated_content, str
-            ):
-                raise PostTranslationError(
-                    f"{_translation_provider_label()} вернул текст поста не строкой"
-                )
-            translated_content = str(raw_translated_content or "").strip()
-        if (post.title or "").strip() and not translated_title:
-            raise PostTranslationError(
-                f"{_translation_provider_label()} вернул пустой заголовок"
-            )
-        if (post.content or "").strip() and not translated_content:
+            results[language] = translation
+    return results
+
+
+def _save_post_translation(
+    post: Post,
+    translation: PostTranslation,
+    response: tuple[dict[str, Any], dict[str, Any], dict[str, Any]],
+    *,
+    source_payload: dict[str, Any],
+    source_content_format: str,
+    source_language: str,
+    model: str,
+) -> None:
+    raw_translated_payload, response_payload, learned_segments = response
+    translated_title = _truncate_translation_title(
+        str(raw_translated_payload.get("title", "") or "")
+    )
+    raw_translated_content = raw_translated_payload.get("content")
+    if source_content_format in {
+        POST_CONTENT_FORMAT_EDITORJS_JSON,
+        POST_CONTENT_FORMAT_EDITORJS_BASE64,
+    }:
+        translated_editor_payload = _validate_translated_editor_payload(
+            source_payload["content"],
+            raw_translated_content,
+        )
+        translated_content = _encode_post_editor_payload(
+            translated_editor_payload,
+            source_content_format,
+        )
+    else:
+        if raw_translated_content is not None and not isinstance(
+            raw_translated_content, str
+        ):
             raise PostTranslationError(
-                f"{_translation_provider_label()} вернул пустой текст поста"
+                f"{_translation_provider_label()} вернул текст поста не строкой"
             )
-
-        preview = build_post_preview(translated_content, post.raw_data)
-        translation.title = translated_title
-        translation.content = translated_content
-        translation.preview_content = preview["preview_content"]
-        translation.status = POST_TRANSLATION_STATUS_TRANSLATED
-        translation.error_message = ""
-        translation.raw_response = response_payload
-        translation.model = model
-        translation.save(
-            update_fields=[
-                "title",
-                "content",
-                "preview_content",
-                "status",
-                "error_message",
-                "raw_response",
-                "model",
-                "updated_at",
-            ]
+        translated_content = str(raw_translated_content or "").strip()
+    if (post.title or "").strip() and not translated_title:
+        raise PostTranslationError(
+            f"{_translation_provider_label()} вернул пустой заголовок"
+        )
+    if (post.content or "").strip() and not translated_content:
+        raise PostTranslationError(
+            f"{_translation_provider_label()} вернул пустой текст поста"
         )
-    except Exception as exc:
-        message = str(exc)[:2000]
-        translation.status = POST_TRANSLATION_STATUS_FAILED
-        translation.error_message = message
-        translation.save(update_fields=["status", "error_message", "updated_at"])
-        if isinstance(exc, PostTranslationError):
-            raise
-        raise PostTranslationError(message) from exc
 
-    return translation
+    remember_translation_segments(
+        learned_segments,
+        source_language=source_language,
+        target_language=translation.language,
+        model=model,
+    )
+    preview = build_post_preview(translated_content, post.raw_data)
+    translation.title = translated_title
+    translation.content = translated_content
+    translation.preview_content = preview["preview_content"]
+    translation.status = POST_TRANSLATION_STATUS_TRANSLATED
+    translation.error_message = ""
+    translation.raw_response = response_payload
+    translation.model = model
+    translation.save(
+        update_fields=[
+            "title",
+            "content",
+            "preview_content",
+            "status",
+            "error_message",
+            "raw_response",
+            "model",
+            "updated_at",
+        ]
+    )
+
+
+def _fail_translation(translation, exc: Exception) -> PostTranslationError:
+    message = str(exc)[:2000]
+    translation.status = POST_TRANSLATION_STATUS_FAILED
+    translation.error_message = message
+    translation.save(update_fields=["status", "error_message", "updated_at"])
+    if isinstance(exc, PostTranslationError):
+        return exc
+    error = PostTranslationError(message)
+    error.__cause__ = exc
+    return error
 
 
 def translate_post_to_all_languages(post: Post) -> list[PostTranslation]:
-    return [
-        translate_post_to_language(post, language)
-        for language in SUPPORTED_TRANSLATION_LANGUAGES
-        if language != post.original_language
-    ]
+    results = translate_post_to_languages(post, list(SUPPORTED_TRANSLATION_LANGUAGES))
+    for result in results.values():
+        if isinstance(result, PostTranslationError):
+            raise result
+    return list(results.values())
 
 
 def translate_comment_to_language(comment: PostComment, language: str) -> PostCommentTranslation:
@@ -503,12 +602,13 @@ def translate_comment_to_language(comment: PostComment, language: str) -> PostCo
     translation.save(update_fields=["status", "model", "error_message", "updated_at"])
 
     try:
-        response_payload = _request_openrouter_json_translation(
-            {
+        raw_translated_payload, response_payload, learned_segments = _request_translation_with_memory(
+            {"body": comment.body or ""},
+            payload_key="comment",
+            request_context={
                 "source_language": "Russian",
                 "target_language": target["target"],
                 "target_locale": target["locale"],
-                "comment": {"body": comment.body or ""},
             },
             system_prompt=(
                 "You are a professional localization editor. Translate Tambur comments from Russian. "
@@ -516,11 +616,20 @@ def translate_comment_to_language(comment: PostComment, language: str) -> PostCo
                 "emoji, mentions, and placeholders. Translate only human-readable Russian text. "
                 "Do not add commentary."
             ),
+            source_language=POST_TRANSLATION_LANGUAGE_RUSSIAN,
+            target_language=language,
+            model=model,
         )
-        translated_payload = _parse_translated_payload(response_payload, keys=("body",))
+        translated_payload = _translated_fields(raw_translated_payload, keys=("body",))
         translated_body = str(translated_payload.get("body", "") or "").strip()
         if (comment.body or "").strip() and not translated_body:
             raise PostTranslationError("OpenRouter вернул пустой комментарий")
+        remember_translation_segments(
+            learned_segments,
+            source_language=POST_TRANSLATION_LANGUAGE_RUSSIAN,
+            target_language=language,
+            model=model,
+        )
 
         translation.body = translated_body
         translation.status = POST_TRANSLATION_STATUS_TRANSLATED
@@ -669,12 +778,13 @@ def translate_comun_to_language(comun: Comun, language: str) -> ComunTranslation
     translation.save(update_fields=["status", "model", "error_message", "updated_at"])
 
     try:
-        response_payload = _request_openrouter_json_translation(
-            {
+        raw_translated_payload, response_payload, learned_segments = _request_translation_with_memory(
+            source_payload,
+            payload_key="community",
+            request_context={
                 "source_language": "Russian",
                 "target_language": target["target"],
                 "target_locale": target["locale"],
-                "community": source_payload,
             },
             system_prompt=(
                 "You are a professional localization editor. Translate Tambur community content from "
@@ -685,12 +795,14 @@ def translate_comun_to_language(comun: Comun, language: str) -> ComunTranslation
                 "placeholders, and formatting. Translate only human-readable Russian text. Do not add "
                 "commentary."
             ),
+            source_language=POST_TRANSLATION_LANGUAGE_RUSSIAN,
+            target_language=language,
+            model=model,
         )
-        translated_payload = _parse_translated_payload(
-            response_payload,
+        translated_payload = _translated_fields(
+            raw_translated_payload,
             keys=("name", "product_description", "target_audience", "rules_text"),
         )
-        raw_translated_payload = _parse_translated_json_payload(response_payload)
         translated_name = _truncate_comun_name(translated_payload.get("name", ""))
         translated_description = str(translated_payload.get("product_description", "") or "").strip()
         translated_target_audience = str(translated_payload.get("target_audience", "") or "").strip()
@@ -723,6 +835,12 @@ def translate_comun_to_language(comun: Comun, language: str) -> ComunTranslation
             keys=("term", "definition"),
             error_message="OpenRouter вернул неполные термины глоссария",
         )
+        remember_translation_segments(
+            learned_segments,
+            source_language=POST_TRANSLATION_LANGUAGE_RUSSIAN,
+            target_language=language,
+            model=model,
+        )
 
         translation.name = translated_name
         translation.product_description = translated_description
@@ -816,12 +934,13 @@ def translate_static_page_to_language(page: StaticPageContent, language: str) ->
     translation.save(update_fields=["status", "model", "error_message", "updated_at"])
 
     try:
-        response_payload = _request_openrouter_json_translation(
-            {
+        raw_translated_payload, response_payload, learned_segments = _request_translation_with_memory(
+            source_payload,
+            payload_key="static_page",
+            request_context={
                 "source_language": "Russian",
                 "target_language": target["target"],
                 "target_locale": target["locale"],
-                "static_page": source_payload,
             },
             system_prompt=(
                 "You are a professional localization editor. Translate Tambur static pages from Russian. "
@@ -830,9 +949,11 @@ def translate_static_page_to_language(page: StaticPageContent, language: str) ->
                 "media URL, embed, code block, placeholder, and non-text field. Translate only "
                 "human-readable Russian text inside title and content. Do not add commentary."
             ),
+            source_language=POST_TRANSLATION_LANGUAGE_RUSSIAN,
+            target_language=language,
+            model=model,
         )
-        raw_translated_payload = _parse_translated_json_payload(response_payload)
-        translated_payload = _parse_translated_payload(response_payload, keys=("title",))
+        translated_payload = _translated_fields(raw_translated_payload, keys=("title",))
         translated_title = _truncate_static_page_title(translated_payload.get("title", ""))
         if (page.title or "").strip() and not translated_title:
             raise PostTranslationError("OpenRouter вернул пустой заголовок статичной страницы")
@@ -849,6 +970,12 @@ def translate_static_page_to_language(page: StaticPageContent, language: str) ->
 
         if (page.content or "").strip() and not translated_content:
             raise PostTranslationError("OpenRouter вернул пустое содержимое статичной страницы")
+        remember_translation_segments(
+            learned_segments,
+            source_language=POST_TRANSLATION_LANGUAGE_RUSSIAN,
+            target_language=language,
+            model=model,
+        )
 
         translation.title = translated_title
         translation.content = translated_content
@@ -903,10 +1030,78 @@ def queue_post_translation(post: Post, languages: list[str]) -> list[PostTransla
         )
         translations.append(translation)
 
-    _start_post_translation_process(post.pk, tuple(normalized_languages))
+    _queue_manual_post_translation_task(post.pk, normalized_languages)
     return translations
 
 
+def _queue_manual_post_translation_task(post_id: int, languages: list[str]) -> ContentTranslationTask:
+    now = timezone.now()
+    with transaction.atomic():
+        task, created = ContentTranslationTask.objects.select_for_update().get_or_create(
+            kind=CONTENT_TRANSLATION_KIND_POST_MANUAL,
+            object_id=post_id,
+            defaults={
+                "scheduled_at": now,
+                "priority": CONTENT_TRANSLATION_TASK_PRIORITY_MANUAL,
+                "languages": languages,
+                "source_updated_at": now,
+            },
+        )
+        if created:
+            return task
+        if task.status in {CONTENT_TRANSLATION_TASK_STATUS_PENDING, CONTENT_TRANSLATION_TASK_STATUS_RUNNING}:
+            languages = [*task.languages, *[language for language in languages if language not in task.languages]]
+        if task.status == CONTENT_TRANSLATION_TASK_STATUS_RUNNING:
+            # The in-flight run sees the new source_updated_at when it finishes
+            # and re-queues the task itself, so it is never claimed twice.
+            task.languages = languages
+            task.source_updated_at = now
+            task.save(update_fields=["languages", "source_updated_at", "updated_at"])
+            return task
+        task.status = CONTENT_TRANSLATION_TASK_STATUS_PENDING
+        task.scheduled_at = now
+        task.priority = CONTENT_TRANSLATION_TASK_PRIORITY_MANUAL
+        task.languages = languages
+        task.source_updated_at = now
+        task.attempts = 0
+        task.last_error = ""
+        task.locked_at = None
+        task.save()
+    return task
+
+
+def serialize_post_translation_status(post: Post) -> dict[str, Any]:
+    task = ContentTranslationTask.objects.filter(
+        kind=CONTENT_TRANSLATION_KIND_POST_MANUAL,
+        object_id=post.pk,
+    ).first()
+    translations = PostTranslation.objects.filter(post=post).order_by("language")
+    return {
+        "post_id": post.pk,
+        "task": (
+            {
+                "status": task.status,
+                "languages": task.languages,
+                "attempts": task.attempts,
+                "last_error": task.last_error,
+                "scheduled_at": task.scheduled_at.isoformat(),
+                "updated_at": task.updated_at.isoformat(),
+            }
+            if task
+            else None
+        ),
+        "translations": [
+            {
+                "language": translation.language,
+                "status": translation.status,
+                "error_message": translation.error_message,
+                "updated_at": translation.updated_at.isoformat(),
+            }
+            for translation in translations
+        ],
+    }
+
+
 def schedule_post_auto_translation(post: Post) -> ContentTranslationTask | None:
     if not _post_is_translatable(post):
         _delete_auto_translation_task(CONTENT_TRANSLATION_KIND_POST, post.pk)
@@ -988,7 +1183,7 @@ def _claim_due_translation_task_ids(*, limit: int, now) -> list[int]:
                 scheduled_at__lte=now,
                 attempts__lt=CONTENT_TRANSLATION_TASK_MAX_ATTEMPTS,
             )
-            .order_by("scheduled_at", "id")[:limit]
+            .order_by("-priority", "scheduled_at", "id")[:limit]
         )
         _mark_translation_tasks_running(tasks)
         return [task.pk for task in tasks]
@@ -1057,12 +1252,12 @@ def _process_claimed_translation_task(task_id: int) -> str:
     )
 
 
-def _reset_stale_running_translation_tasks(now) -> int:
+def _reset_stale_running_translation_tasks(now, *, exclude_ids=()) -> int:
     stale_before = now - CONTENT_TRANSLATION_TASK_STALE_AFTER
     stale_tasks = ContentTranslationTask.objects.filter(
         status=CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
         locked_at__lt=stale_before,
-    )
+    ).exclude(pk__in=list(exclude_ids))
     failed = stale_tasks.filter(
         attempts__gte=CONTENT_TRANSLATION_TASK_MAX_ATTEMPTS,
     ).update(
@@ -1107,23 +1302,6 @@ def _normalize_translation_languages(languages: list[str]) -> list[str]:
     return normalized
 
 
-def _start_post_translation_process(post_id: int, languages: tuple[str, ...]) -> None:
-    manage_py = settings.BASE_DIR / "manage.py"
-    command = [sys.executable, str(manage_py), "translate_post", str(post_id)]
-    for language in languages:
-        command.extend(["--language", language])
-    try:
-        subprocess.Popen(
-            command,
-            cwd=str(settings.BASE_DIR),
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            start_new_session=True,
-        )
-    except OSError as exc:
-        raise PostTranslationError(f"Не удалось запустить фоновый перевод: {exc}") from exc
-
-
 def _schedule_auto_translation_task(
     kind: str,
     object_id: int,
@@ -1169,7 +1347,23 @@ def _finish_translation_task(
         locked_at=None,
         updated_at=timezone.now(),
     )
-    return result if updated else "skipped"
+    if updated:
+        return result
+    # The source changed while this run was in flight: hand the task back to
+    # the queue so the next run picks up the new source and languages.
+    now = timezone.now()
+    ContentTranslationTask.objects.filter(
+        pk=task.pk,
+        status=CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
+    ).exclude(source_updated_at=task.source_updated_at).update(
+        status=CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+        scheduled_at=now,
+        attempts=0,
+        last_error="",
+        locked_at=None,
+        updated_at=now,
+    )
+    return "skipped"
 
 
 def _reschedule_translation_task(task: ContentTranslationTask, *, scheduled_at, reason: str) -> None:
@@ -1368,12 +1562,25 @@ def _process_translation_task_payload(task: ContentTranslationTask) -> None:
         _raise_if_task_is_stale(task, post.updated_at)
         _reserve_translation_budget(task)
         source_content_info = _decode_post_editor_payload(post.content or "")
-        for language in SUPPORTED_TRANSLATION_LANGUAGES:
-            if language == post.original_language:
-                continue
-            if _post_translation_is_current(post, language, source_content_info):
-                continue
-            translate_post_to_language(post, language)
+        languages = [
+            language
+            for language in SUPPORTED_TRANSLATION_LANGUAGES
+            if language != post.original_language
+            and not _post_translation_is_current(post, language, source_content_info)
+        ]
+        for result in translate_post_to_languages(post, languages).values():
+            if isinstance(result, PostTranslationError):
+                raise result
+        return
+
+    if task.kind == CONTENT_TRANSLATION_KIND_POST_MANUAL:
+        post = Post.objects.filter(pk=task.object_id).first()
+        if not post:
+            raise AutoTranslationSkipped("Пост не найден")
+        languages = [language for language in task.languages or [] if language in SUPPORTED_TRANSLATION_LANGUAGES]
+        for result in translate_post_to_languages(post, languages).values():
+            if isinstance(result, PostTranslationError):
+                raise result
         return
 
     if task.kind == CONTENT_TRANSLATION_KIND_COMMENT:
@@ -1556,35 +1763,247 @@ def _raise_if_task_is_stale(task: ContentTranslationTask, source_updated_at) ->
         raise AutoTranslationRescheduled("Контент был обновлен, задача перенесена")
 
 
-def _request_openrouter_translation(
-    post_payload: dict[str, Any],
-    target: dict[str, str],
+def _post_translation_system_prompt(source_language: str) -> str:
+    source_name = POST_SOURCE_LANGUAGE_NAMES.get(source_language, source_language)
+    return (
+        f"You are a professional localization editor. Translate Tambur posts from {source_name}. "
+        "Return only valid JSON with keys title and content. If content is an EditorJS object, "
+        "return content as the same EditorJS object shape and preserve every block type, id, URL, "
+        "media URL, embed, code block, placeholder, and non-text field. Preserve HTML tags and "
+        f"markdown. Translate only human-readable {source_name} text. Do not add commentary."
+    )
+
+
+def _translation_batch_max_chars() -> int:
+    return max(int(getattr(settings, "CONTENT_TRANSLATION_BATCH_MAX_CHARS", 6000) or 0), 0)
+
+
+def _translation_memory_summary(segments, cached: dict[str, Any]) -> dict[str, int]:
+    return {
+        "segments": len(segments),
+        "reused": sum(1 for segment in segments if segment.digest in cached),
+    }
+
+
+def _request_partial_translation(
+    source_payload: dict[str, Any],
+    segments,
+    cached: dict[str, Any],
+    partial_payload: dict[str, Any] | None,
+    *,
+    payload_key: str,
+    request_context: dict[str, Any],
+    system_prompt: str,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    response_payload: dict[str, Any] = {}
+    translated_payload = None
+    if partial_payload is not None:
+        response_payload = _request_openrouter_json_translation(
+            {**request_context, payload_key: partial_payload},
+            system_prompt=system_prompt + PARTIAL_PAYLOAD_PROMPT if cached else system_prompt,
+        )
+        translated_payload = _parse_translated_json_payload(response_payload)
+    merged_payload, learned_segments = merge_translated_payload(
+        source_payload,
+        segments,
+        cached,
+        translated_payload,
+    )
+    response_payload = {
+        **response_payload,
+        "translation_memory": _translation_memory_summary(segments, cached),
+    }
+    return merged_payload, response_payload, learned_segments
+
+
+def _request_translation_with_memory(
+    source_payload: dict[str, Any],
     *,
+    payload_key: str,
+    request_context: dict[str, Any],
+    system_prompt: str,
     source_language: str,
-) -> dict[str, Any]:
-    source_name = POST_SOURCE_LANGUAGE_NAMES.get(source_language, source_language)
-    return _request_openrouter_json_translation(
-        {
-            "source_language": source_name,
-            "target_language": target["target"],
-            "target_locale": target["locale"],
-            "post": post_payload,
-        },
-        system_prompt=(
-            f"You are a professional localization editor. Translate Tambur posts from {source_name}. "
-            "Return only valid JSON with keys title and content. If content is an EditorJS object, "
-            "return content as the same EditorJS object shape and preserve every block type, id, URL, "
-            "media URL, embed, code block, placeholder, and non-text field. Preserve HTML tags and "
-            f"markdown. Translate only human-readable {source_name} text. Do not add commentary."
-        ),
+    target_language: str,
+    model: str,
+) -> tuple[dict[str, Any], dict[str, Any], dict[str, Any]]:
+    """Translates only the segments the translation memory does not know yet.
+
+    Returns the full translated payload, the provider response (empty when
+    every segment came from memory) and the new segments to remember once the
+    caller has validated the result.
+    """
+    segments = split_translation_segments(source_payload)
+    cached = lookup_translation_memory(
+        segments,
+        source_language=source_language,
+        target_language=target_language,
+        model=model,
+    )
+    return _request_partial_translation(
+        source_payload,
+        segments,
+        cached,
+        build_partial_payload(source_payload, segments, cached),
+        payload_key=payload_key,
+        request_context=request_context,
+        system_prompt=system_prompt,
     )
 
 
+def _request_translations_with_memory(
+    source_payload: dict[str, Any],
+    *,
+    payload_key: str,
+    targets: dict[str, dict[str, str]],
+    source_language: str,
+    system_prompt: str,
+    model: str,
+) -> dict[str, tuple[dict[str, Any], dict[str, Any], dict[str, Any]] | Exception]:
+    """Runs _request_translation_with_memory for several target languages.
+
+    Languages missing the same segments share one request while that partial
+    payload, once per language, fits CONTENT_TRANSLATION_BATCH_MAX_CHARS.
+    Bigger payloads, failed batched requests and languages a batched answer
+    left out get a request of their own. Failures are returned per language
+    instead of raised.
+    """
+    source_name = POST_SOURCE_LANGUAGE_NAMES.get(source_language, source_language)
+    segments = split_translation_segments(source_payload)
+    plans: dict[str, tuple[dict[str, Any], dict[str, Any] | None]] = {}
+    groups: dict[str, list[str]] = {}
+    for language in targets:
+        cached = lookup_translation_memory(
+            segments,
+            source_language=source_language,
+            target_language=language,
+            model=model,
+        )
+        partial_payload = build_partial_payload(source_payload, segments, cached)
+        plans[language] = (cached, partial_payload)
+        group_key = "" if partial_payload is None else json.dumps(partial_payload, ensure_ascii=False, sort_keys=True)
+        groups.setdefault(group_key, []).append(language)
+
+    results: dict[str, tuple[dict[str, Any], dict[str, Any], dict[str, Any]] | Exception] = {}
+    single_languages: list[str] = []
+    for group_key, languages in groups.items():
+        # The answer grows with every language, so the budget is shared between them.
+        if len(languages) > 1 and group_key and len(group_key) * len(languages) <= _translation_batch_max_chars():
+            single_languages += _request_batched_translations(
+                source_payload,
+                segments,
+                plans,
+                languages,
+                results,
+                payload_key=payload_key,
+                targets=targets,
+                source_name=source_name,
+                system_prompt=system_prompt,
+            )
+        else:
+            single_languages += languages
+
+    for language in single_languages:
+        cached, partial_payload = plans[language]
+        try:
+            results[language] = _request_partial_translation(
+                source_payload,
+                segments,
+                cached,
+                partial_payload,
+                payload_key=payload_key,
+                request_context={
+                    "source_language": source_name,
+                    "target_language": targets[language]["target"],
+                    "target_locale": targets[language]["locale"],
+                },
+                system_prompt=system_prompt,
+            )
+        except Exception as exc:
+            results[language] = exc
+    return results
+
+
+def _request_batched_translations(
+    source_payload: dict[str, Any],
+    segments,
+    plans: dict[str, tuple[dict[str, Any], dict[str, Any] | None]],
+    languages: list[str],
+    results: dict[str, Any],
+    *,
+    payload_key: str,
+    targets: dict[str, dict[str, str]],
+    source_name: str,
+    system_prompt: str,
+) -> list[str]:
+    """Asks for ``languages`` in one request and returns those left unanswered."""
+    cached, partial_payload = plans[languages[0]]
+    if cached:
+        system_prompt += PARTIAL_PAYLOAD_PROMPT
+    try:
+        response_payload = _request_openrouter_json_translation(
+            {
+                "source_language": source_name,
+                "target_languages": [
+                    {
+                        "code": language,
+                        "target_language": targets[language]["target"],
+                        "target_locale": targets[language]["locale"],
+                    }
+                    for language in languages
+                ],
+                payload_key: partial_payload,
+            },
+            system_prompt=system_prompt + BATCH_TRANSLATION_PROMPT,
+            completions=len(languages),
+        )
+    except PostTranslationError:
+        # Timeouts and transport errors are retried one language at a time.
+        return languages
+    try:
+        translations = _parse_translated_json_payload(response_payload).get("translations")
+    except PostTranslationError:
+        # Usually a truncated answer: the languages one by one are shorter.
+        return languages
+    if not isinstance(translations, dict):
+        return languages
+
+    # The full answer covers every language; keep only its metadata per translation.
+    batch_response = {
+        key: response_payload[key]
+        for key in ("id", "model", "usage")
+        if key in response_payload
+    }
+    batch_response["batch_languages"] = languages
+    unanswered = []
+    for language in languages:
+        translated_payload = translations.get(language)
+        if not isinstance(translated_payload, dict):
+            unanswered.append(language)
+            continue
+        language_cached = plans[language][0]
+        merged_payload, learned_segments = merge_translated_payload(
+            source_payload,
+            segments,
+            language_cached,
+            translated_payload,
+        )
+        results[language] = (
+            merged_payload,
+            {
+                **batch_response,
+                "translation_memory": _translation_memory_summary(segments, language_cached),
+            },
+            learned_segments,
+        )
+    return unanswered
+
+
 def _request_openrouter_json_translation(
     user_payload: dict[str, Any],
     *,
     system_prompt: str,
     timeout_seconds: float = 90,
+    completions: int = 1,
 ) -> dict[str, Any]:
     provider = _translation_provider()
     provider_label = _translation_provider_label()
@@ -1632,20 +2051,28 @@ def _request_openrouter_json_translation(
     elif provider == TRANSLATION_PROVIDER_DEEPSEEK:
         payload["thinking"] = {"type": "disabled"}
 
-    try:
-        response = requests.post(
-            api_url,
-            headers=headers,
-            json=payload,
-            timeout=max(min(float(timeout_seconds), 90), 1),
-        )
-    except requests.RequestException as exc:
-        raise PostTranslationError(f"Ошибка запроса {provider_label}: {exc}") from exc
+    limiter = translation_provider_limiter(provider)
+    prompt_chars = sum(len(message["content"]) for message in payload["messages"])
+    with limiter.slot(estimate_translation_tokens(prompt_chars, completions=completions)) as usage:
+        try:
+            response = requests.post(
+                api_url,
+                headers=headers,
+                json=payload,
+                timeout=max(min(float(timeout_seconds), 90), 1),
+            )
+        except requests.RequestException as exc:
+            raise PostTranslationError(f"Ошибка запроса {provider_label}: {exc}") from exc
+        if response.status_code == 429:
+            # Other workers hold off for as long as the provider asked.
+            limiter.pause(_retry_after_seconds(response))
 
-    try:
-        response_payload = response.json()
-    except ValueError as exc:
-        raise PostTranslationError(f"{provider_label} вернул не JSON, HTTP {response.status_code}") from exc
+        try:
+            response_payload = response.json()
+        except ValueError as exc:
+            raise PostTranslationError(f"{provider_label} вернул не JSON, HTTP {response.status_code}") from exc
+        if isinstance(response_payload, dict) and isinstance(response_payload.get("usage"), dict):
+            usage.record(response_payload["usage"].get("total_tokens"))
 
     if response.status_code >= 400:
         raise PostTranslationError(
@@ -1655,6 +2082,14 @@ def _request_openrouter_json_translation(
     return response_payload
 
 
+def _retry_after_seconds(response) -> float:
+    retry_after = (getattr(response, "headers", None) or {}).get("Retry-After")
+    try:
+        return min(max(float(retry_after), 0.0), 300.0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
 def _extract_translation_provider_error(response_payload: dict[str, Any], status_code: int) -> str:
     provider_label = _translation_provider_label()
     error = response_payload.get("error")
@@ -1665,12 +2100,7 @@ def _extract_translation_provider_error(response_payload: dict[str, Any], status
     return f"{provider_label} HTTP {status_code}"
 
 
-def _parse_translated_payload(
-    response_payload: dict[str, Any],
-    *,
-    keys: tuple[str, ...] = ("title", "content"),
-) -> dict[str, str]:
-    payload = _parse_translated_json_payload(response_payload)
+def _translated_fields(payload: dict[str, Any], *, keys: tuple[str, ...]) -> dict[str, str]:
     return {key: str(payload.get(key, "") or "") for key in keys}
 
 
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from feeds.models import (
+    CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+    CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
+    ContentTranslationTask,
+)
+from feeds.translation_limits import refresh_translation_provider_limits
+from feeds.translation_service import (
+    _claim_due_translation_task_ids,
+    _process_claimed_translation_task,
+    _reset_retryable_failed_translation_tasks,
+    _reset_stale_running_translation_tasks,
+)
+
+TRANSLATION_WORKER_MAINTENANCE_SECONDS = 60
+# Pool size when provider_concurrency is 0 (no provider cap).
+TRANSLATION_WORKER_DEFAULT_CONCURRENCY = 4
+_STOP_CHECK_SECONDS = 1.0
+
+
+def _empty_stats() -> dict[str, int]:
+    return {"processed": 0, "done": 0, "failed": 0, "skipped": 0, "released": 0}
+
+
+def _run_claimed_translation_task(task_id: int) -> str:
+    try:
+        return _process_claimed_translation_task(task_id)
+    finally:
+        # Pool threads keep their own connection; do not hold it between tasks.
+        connection.close()
+
+
+def touch_claimed_translation_tasks(task_ids: list[int]) -> int:
+    """Refreshes ``locked_at`` so long-running tasks are not reset as stale."""
+    if not task_ids:
+        return 0
+    return ContentTranslationTask.objects.filter(
+        pk__in=task_ids,
+        status=CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
+    ).update(locked_at=timezone.now())
+
+
+def release_claimed_translation_tasks(task_ids: list[int]) -> int:
+    if not task_ids:
+        return 0
+    return ContentTranslationTask.objects.filter(
+        pk__in=task_ids,
+        status=CONTENT_TRANSLATION_TASK_STATUS_RUNNING,
+    ).update(
+        status=CONTENT_TRANSLATION_TASK_STATUS_PENDING,
+        locked_at=None,
+        attempts=Greatest(F("attempts") - 1, 0),
+        last_error="Задача возвращена в очередь при остановке обработчика",
+        updated_at=timezone.now(),
+    )
+
+
+def run_translation_worker(
+    *,
+    concurrency: int,
+    stop_event: threading.Event,
+    limit: int | None = None,
+    loop: bool = False,
+    idle_seconds: float = 10,
+    shutdown_timeout: float = 30,
+    report=None,
+    report_interval: float = 60,
+) -> dict[str, int]:
+    """Claims due tasks and runs up to ``concurrency`` of them at once.
+
+    An empty queue is polled again after ``idle_seconds``. Without ``loop``
+    the worker stops once the queue is drained or ``limit`` tasks were claimed.
+    On ``stop_event`` it stops claiming and waits up to ``shutdown_timeout``
+    for running tasks. Tasks that never started go back to the queue; tasks
+    still running keep their claim and finish in their threads, since a
+    started future cannot be cancelled and releasing it would run it twice.
+    """
+    concurrency = max(int(concurrency), 1)
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="translation")
+    in_flight: dict[Future, int] = {}
+    stats = _empty_stats()
+    period_stats = _empty_stats()
+    claimed = 0
+    maintained_at: float | None = None
+    queue_drained_at: float | None = None
+    reported_at = time.monotonic()
+
+    def collect(futures) -> None:
+        for future in futures:
+            in_flight.pop(future, None)
+            try:
+                result = future.result()
+            except Exception:
+                result = "failed"
+            for bucket in (stats, period_stats):
+                bucket["processed"] += 1
+                bucket[result] = bucket.get(result, 0) + 1
+
+    try:
+        while not stop_event.is_set():
+            now = timezone.now()
+            if maintained_at is None or time.monotonic() - maintained_at >= TRANSLATION_WORKER_MAINTENANCE_SECONDS:
+                # Tasks of this pool may wait on the provider limiter past the
+                # stale cutoff; keep them locked instead of claiming them twice.
+                touch_claimed_translation_tasks(list(in_flight.values()))
+                _reset_stale_running_translation_tasks(now, exclude_ids=in_flight.values())
+                _reset_retryable_failed_translation_tasks(now)
+                refresh_translation_provider_limits(force=True)
+                maintained_at = time.monotonic()
+
+            free_slots = concurrency - len(in_flight)
+            if limit is not None:
+                free_slots = min(free_slots, limit - claimed)
+            queue_due = queue_drained_at is None or time.monotonic() - queue_drained_at >= idle_seconds
+            if free_slots > 0 and queue_due:
+                task_ids = _claim_due_translation_task_ids(limit=free_slots, now=now)
+                for task_id in task_ids:
+                    in_flight[executor.submit(_run_claimed_translation_task, task_id)] = task_id
+                claimed += len(task_ids)
+                queue_drained_at = time.monotonic() if len(task_ids) < free_slots else None
+
+            if report is not None and time.monotonic() - reported_at >= report_interval:
+                report(dict(period_stats))
+                period_stats = _empty_stats()
+                reported_at = time.monotonic()
+
+            if not in_flight:
+                limit_reached = limit is not None and claimed >= limit
+                if not loop and (limit_reached or queue_drained_at is not None):
+                    break
+                stop_event.wait(_STOP_CHECK_SECONDS)
+                continue
+            done, _pending = wait(list(in_flight), timeout=_STOP_CHECK_SECONDS, return_when=FIRST_COMPLETED)
+            collect(done)
+    finally:
+        done, pending = wait(list(in_flight), timeout=max(float(shutdown_timeout), 0))
+        collect(done)
+        cancelled = [future for future in pending if future.cancel()]
+        released = release_claimed_translation_tasks([in_flight.pop(future) for future in cancelled])
+        touch_claimed_translation_tasks(list(in_flight.values()))
+        stats["released"] += released
+        period_stats["released"] += released
+        executor.shutdown(wait=False)
+        if report is not None and any(period_stats.values()):
+            report(dict(period_stats))
+    return stats
+
+
+__all__ = [
+    "TRANSLATION_WORKER_DEFAULT_CONCURRENCY",
+    "release_claimed_translation_tasks",
+    "run_translation_worker",
+    "touch_claimed_translation_tasks",
+]
@@ -11,13 +11,13 @@ import secrets
 import base64
 import time
 import inspect
-from io import BytesIO
 from typing import Sequence
 try:
     import pymorphy2
 except ImportError:  # optional dependency for lemmatization
     pymorphy2 = None
 from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.utils.text import get_valid_filename
 import urllib.error
 import urllib.parse
@@ -25,17 +25,16 @@ import urllib.request
 from collections import defaultdict
 from datetime import datetime as dt_datetime, time as dt_time, timedelta, timezone as dt_timezone
 from html import escape, unescape
-from django.db import IntegrityError, transaction
+from django.db import transaction
 from django.db.models import Avg, Count, Exists, F, IntegerField, OuterRef, Prefetch, Q, Sum, Value
 from django.db.models.functions import Cast, Coalesce
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.contrib.postgres.search import SearchQuery, SearchRank
 
 from django.conf import settings
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect, JsonResponse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import get_user_model
-from PIL import Image, ImageOps, UnidentifiedImageError
 
 from communities import views as community_views
 from communities import service as community_service
@@ -47,7 +46,7 @@ from communities.models import (
     ComunPostCategoryAssignment,
     ComunVote,
 )
-from rabotaem_backend.cache import anonymous_cache, bump_public_cache_prefix
+from rabotaem_backend.cache import add_cache_tags, anonymous_cache, bump_public_cache_prefix, cache_tag
 from rabotaem_backend.media_urls import (
     media_storage_path_from_url,
     public_media_url,
@@ -65,6 +64,7 @@ from editor.models import (
     POST_TEMPLATE_TYPE_POST_VOTE_POLL as MODEL_POST_TEMPLATE_TYPE_POST_VOTE_POLL,
     POST_TEMPLATE_TYPE_QUESTION as MODEL_POST_TEMPLATE_TYPE_QUESTION,
     POST_TEMPLATE_TYPE_EVENT as MODEL_POST_TEMPLATE_TYPE_EVENT,
+    PostPollTally,
     PostPollVote,
     PostRatingVote,
     PostTemplateConfig,
@@ -121,8 +121,12 @@ from editor.service import (
     _user_can_manage_site_post,
 )
 from ratings.models import AuthorRatingEvent
+from .post_cards import PostCardContext, post_card_context
+from .post_views import attach_pending_post_views, record_post_view
+from .search_documents import SEARCH_CONFIG, search_config_for_language
 from .post_paths import build_post_public_path
 from .seo_indexing import post_is_seo_indexable
+from .social_images import refresh_post_social_image
 from .models import (
     Author,
     ContentReport,
@@ -143,18 +147,20 @@ from .models import (
     PostEventAttendance,
     PostLike,
     PostRead,
+    PostSocialImage,
     PublicFeedItem,
     StaticPageContent,
     StaticPageTranslation,
     Tag,
     PostTranslation,
+    ComunTranslation,
+    ComunTranslationSearchDocument,
+    PostTranslationSearchDocument,
 )
 from .preview import build_post_preview, post_preview_has_more
-from notifications.service import (
-    create_grouped_user_notification,
-    create_user_notification,
-    notification_grouping_period_for_user,
-)
+from notifications.fanout import FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS, enqueue_notification_fanout
+from notifications.models import TELEGRAM_OUTBOX_STATUS_FAILED
+from notifications.service import create_user_notification
 from my_feed import service as my_feed_service
 from my_feed.models import UserFeedSettings
 from ratings.service import (
@@ -181,8 +187,6 @@ _FAKE_VIEWS_RAMP_SECONDS = 48 * 60 * 60
 _IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
 _POST_PREVIEW_IMAGE_WIDTH = 1280
 _POST_THUMBNAIL_IMAGE_WIDTH = 640
-_SOCIAL_IMAGE_MAX_BYTES = 12 * 1024 * 1024
-_SOCIAL_IMAGE_MAX_SIZE = (1200, 1200)
 _LOCAL_WEBP_VARIANT_RE = re.compile(r"-(320|640|960|1280|1920)\.webp$", re.IGNORECASE)
 _IMAGE_URL_PATH_RE = re.compile(r"\.(?:jpe?g|png|webp|gif|avif)$", re.IGNORECASE)
 _COMUN_CREATION_MIN_AUTHOR_RATING = 0.0
@@ -869,7 +873,11 @@ def _author_owner_users_for_notifications(author: Author) -> list[User]:
 
 
 def _delivered_notification_telegram_chat_ids(notification) -> set[int]:
-    if not notification or not notification.telegram_sent_at:
+    if not notification:
+        return set()
+    if not notification.telegram_sent_at and not notification.telegram_outbox_items.exclude(
+        status=TELEGRAM_OUTBOX_STATUS_FAILED
+    ).exists():
         return set()
     telegram_id = (
         TelegramAccount.objects.filter(user_id=notification.user_id)
@@ -1058,25 +1066,6 @@ def _post_comun_category_for_notifications(
     return None
 
 
-def _feed_settings_subscribed_to_comun_post(
-    settings: UserFeedSettings,
-    *,
-    comun: Comun,
-    category: ComunCategory | None,
-) -> bool:
-    serialized = my_feed_service._serialize_user_feed_settings(settings)
-    comun_slug = (comun.slug or "").strip()
-    if not comun_slug:
-        return False
-    if comun_slug in set(serialized.get("my_feed_comuns", []) or []):
-        return True
-    category_selection = serialized.get("my_feed_comun_categories", {}) or {}
-    selected_category_slugs = set(category_selection.get(comun_slug, []) or [])
-    if not selected_category_slugs:
-        return False
-    return bool(category and (category.slug or "").strip() in selected_category_slugs)
-
-
 def _post_published_group_key(period: str, *, now=None) -> str:
     now = timezone.localtime(now or timezone.now())
     local_date = now.date()
@@ -1124,6 +1113,7 @@ def _maybe_notify_post_published_to_subscribers(
     comun_title = (comun.name or comun.slug or "").strip() or "сообществе"
     category_title = (category.name or category.slug or "").strip() if category else ""
     link_url = _post_public_path(post)
+    published_at = timezone.now()
     payload = {
         "post_id": post.id,
         "post_title": post_title,
@@ -1142,66 +1132,46 @@ def _maybe_notify_post_published_to_subscribers(
         "comun_name": comun_title,
         "category_slug": category.slug if category else "",
         "category_name": category_title,
-        "published_at": timezone.now().isoformat(),
+        "published_at": published_at.isoformat(),
     }
+    groups = {}
+    for grouping_period, group_label in (("day", "за день"), ("week", "за неделю")):
+        groups[grouping_period] = {
+            "group_key": _post_published_group_key(grouping_period, now=published_at),
+            "delivery_at": _post_published_delivery_at(grouping_period, now=published_at).isoformat(),
+            "title": f"Новые посты {group_label}",
+            "message": (
+                "В сообществах, на которые вы подписаны, появились новые публикации. "
+                f"Последний пост: «{post_title}» в «{comun_title}»."
+            ),
+            "link_url": link_url,
+            "payload": {
+                "grouping_period": grouping_period,
+                "group_label": group_label,
+                "latest": payload,
+            },
+            "group_item": item_payload,
+        }
 
-    settings_qs = (
-        UserFeedSettings.objects.select_related("user")
-        .filter(user__is_active=True)
-        .order_by("user_id")
-    )
-    if author_owner_ids:
-        settings_qs = settings_qs.exclude(user_id__in=author_owner_ids)
-
-    notified_user_ids: set[int] = set()
-    for feed_settings in settings_qs.iterator(chunk_size=500):
-        recipient = feed_settings.user
-        if not recipient or recipient.id in notified_user_ids:
-            continue
-        if not _feed_settings_subscribed_to_comun_post(
-            feed_settings,
-            comun=comun,
-            category=category,
-        ):
-            continue
-        notified_user_ids.add(recipient.id)
-
-        grouping_period = notification_grouping_period_for_user(recipient, "post_published")
-        if grouping_period in {"day", "week"}:
-            group_key = _post_published_group_key(grouping_period)
-            group_label = "за день" if grouping_period == "day" else "за неделю"
-            create_grouped_user_notification(
-                user=recipient,
-                event_key="post_published",
-                title=f"Новые посты {group_label}",
-                message=(
-                    "В сообществах, на которые вы подписаны, появились новые публикации. "
-                    f"Последний пост: «{post_title}» в «{comun_title}»."
-                ),
-                link_url=link_url,
-                payload={
-                    "grouping_period": grouping_period,
-                    "group_label": group_label,
-                    "latest": payload,
-                },
-                group_key=group_key,
-                group_item=item_payload,
-                delivery_at=_post_published_delivery_at(grouping_period),
-                defer_delivery=True,
-            )
-            continue
-
-        create_user_notification(
-            user=recipient,
-            event_key="post_published",
-            title="Пост опубликован",
-            message=(
+    enqueue_notification_fanout(
+        event_key="post_published",
+        recipients={
+            "type": FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS,
+            "comun_id": comun.id,
+            "category_id": category.id if category else None,
+        },
+        exclude_user_ids=author_owner_ids,
+        notification={
+            "title": "Пост опубликован",
+            "message": (
                 f"Опубликован пост в сообществе «{comun_title}», "
                 f"на которое вы подписаны: «{post_title}»."
             ),
-            link_url=link_url,
-            payload=payload,
-        )
+            "link_url": link_url,
+            "payload": payload,
+        },
+        groups=groups,
+    )
 
 
 def _media_url(request: HttpRequest | None, field) -> str | None:
@@ -1522,10 +1492,29 @@ _post_display_views_current = _post_fake_views_current
 
 def _post_total_views(post: Post, now=None) -> int:
     real_views = max(int(getattr(post, "real_views_count", 0) or 0), 0)
+    real_views += max(int(getattr(post, "_pending_views_count", 0) or 0), 0)
     return real_views + _post_fake_views_current(post, now=now)
 
 
 def _post_rating_score(post: Post, *, author_rating=None, base_rating=None) -> float:
+    card_context = post_card_context(post)
+    if card_context is not None:
+        return round(
+            float(
+                _calculate_post_total_rating(
+                    post,
+                    settings=card_context.rating_settings,
+                    author_rating=(
+                        card_context.author_ratings.get(post.author_id, 0)
+                        if author_rating is None and card_context.author_ratings is not None
+                        else author_rating
+                    ),
+                    base_rating=card_context.base_ratings[post.id] if base_rating is None else base_rating,
+                    community_rating=card_context.community_ratings[post.id],
+                )
+            ),
+            2,
+        )
     return round(
         float(
             _calculate_post_total_rating(
@@ -2529,25 +2518,31 @@ def _live_poll_for_post(post: Post, user: User | None = None) -> dict | None:
     options = payload.get("options") or []
     options_count = len(options)
     counts = [int(option.get("voter_count") or 0) for option in options]
-    user_selection: list[int] = []
-    site_voters: set[int] = set()
+    site_voters_count = 0
 
-    votes = PostPollVote.objects.filter(post=post).values_list("user_id", "selected_options")
-    for vote_user_id, selected_options in votes:
-        normalized = _normalize_poll_selection(selected_options, options_count)
-        if not normalized:
-            continue
-        site_voters.add(vote_user_id)
-        for index in normalized:
-            counts[index] += 1
-        if user and vote_user_id == user.id:
-            user_selection = normalized
+    card_context = post_card_context(post, user)
+    if card_context is not None:
+        tally = card_context.poll_tallies.get(post.id)
+        own_selection = card_context.poll_user_selections.get(post.id)
+    else:
+        tally = PostPollTally.objects.filter(post_id=post.id).first()
+        own_selection = (
+            PostPollVote.objects.filter(post=post, user=user).values_list("selected_options", flat=True).first()
+            if user
+            else None
+        )
+
+    if tally is not None:
+        for index, count in enumerate(tally.option_counts[:options_count]):
+            counts[index] += int(count or 0)
+        site_voters_count = int(tally.voters_count or 0)
+    user_selection = _normalize_poll_selection(own_selection, options_count)
 
     live_payload = _build_poll_payload(
         raw_poll,
         option_counts=counts,
         user_selection=user_selection,
-        extra_voters=len(site_voters),
+        extra_voters=site_voters_count,
     )
     if not live_payload:
         return None
@@ -3587,7 +3582,7 @@ def author_posts(request: HttpRequest, username: str) -> HttpResponse:
         .order_by("-created_at")
         .all()[offset : offset + limit]
     )
-    favorite_post_ids = _favorite_post_ids_for_user(posts, current_user)
+    favorite_post_ids = PostCardContext.load(posts, current_user).favorite_post_ids
 
     posts_count = (
         Post.objects.filter(author=author, is_blocked=False, is_pending=False)
@@ -3784,7 +3779,7 @@ def tag_posts(request: HttpRequest, tag: str) -> HttpResponse:
         .order_by("-created_at")
         .all()[offset : offset + limit]
     )
-    favorite_post_ids = _favorite_post_ids_for_user(posts, current_user)
+    favorite_post_ids = PostCardContext.load(posts, current_user).favorite_post_ids
 
     serialized = []
     for post in posts:
@@ -3868,6 +3863,7 @@ def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
         )
     except Post.DoesNotExist:
         return JsonResponse({"ok": False, "error": "post not found"}, status=404)
+    attach_pending_post_views([post])
     special_project_redirect = _special_project_redirect_path(post)
     if special_project_redirect:
         return JsonResponse(
@@ -3886,20 +3882,32 @@ def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
         if translation is None:
             translation_unavailable = True
     current_user = _get_user_from_request(request)
+    original_content, original_poll_payload = _content_with_live_poll(post, current_user)
     if translation_unavailable:
         content, poll_payload = "", None
     else:
-        content, poll_payload = _content_with_live_poll(post, current_user)
+        content, poll_payload = original_content, original_poll_payload
     title = _post_display_title(post)
     if translation is not None:
         title = translation.title or title
         content = rewrite_public_media_urls(translation.content or content)
-    original_content, _original_poll_payload = _content_with_live_poll(post, current_user)
     template_payload = _serialize_localized_post_template(post, language)
     author_channel_url, author_title = _author_display_fields(
         request, post.author, post.channel_url
     )
     language_versions = _post_language_versions(post)
+    comun_payload = community_service._serialize_post_comun(
+        request,
+        post,
+        current_user,
+        language=language,
+    )
+    add_cache_tags(
+        request,
+        cache_tag("post", post.id),
+        cache_tag("author", post.author_id),
+        cache_tag("comun", comun_payload["id"]) if comun_payload else "",
+    )
     return JsonResponse(
         {
             "ok": True,
@@ -3924,13 +3932,8 @@ def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
                 "question_answer": _serialize_question_answer(post, current_user),
                 "event_attendance": _serialize_event_attendance(post, current_user),
                 "vote_poll_participations": _serialize_post_vote_poll_participations(post),
-                "comun": community_service._serialize_post_comun(
-                    request,
-                    post,
-                    current_user,
-                    language=language,
-                ),
-                "content": rewrite_public_media_urls(content),
+                "comun": comun_payload,
+                "content": content,
                 "poll": poll_payload,
                 "post_ratings": _serialize_post_ratings(post, current_user),
                 "post_rating": _serialize_post_rating(post, current_user, template_payload=template_payload),
@@ -3960,12 +3963,11 @@ def post_detail(request: HttpRequest, post_id: int) -> HttpResponse:
     )
 
 
-@anonymous_cache(prefix="post-social-image", seconds=3600)
 def post_social_image(request: HttpRequest, post_id: int) -> HttpResponse:
     try:
         now = timezone.now()
         post = (
-            Post.objects.select_related("author")
+            Post.objects.select_related("author", "social_image")
             .filter(is_blocked=False, is_pending=False, author__is_blocked=False)
             .filter(_publish_ready_filter(now))
             .get(id=post_id)
@@ -3973,48 +3975,19 @@ def post_social_image(request: HttpRequest, post_id: int) -> HttpResponse:
     except Post.DoesNotExist:
         return HttpResponse(status=404)
 
-    template_payload = _serialize_post_template(post)
-    preview_image_url, _thumbnail_url = _extract_post_preview_image_urls(
-        request,
-        post,
-        template_payload=template_payload,
-    )
-    storage_path = media_storage_path_from_url(preview_image_url or "", request=request)
-    if not storage_path:
-        return HttpResponse(status=404)
-
-    image_url = public_media_url(preview_image_url, request=request)
-    if not image_url:
+    try:
+        social_image = post.social_image
+    except PostSocialImage.DoesNotExist:
+        # Posts published before pre-rendering existed are rendered once here.
+        try:
+            social_image = refresh_post_social_image(post)
+        except Exception:
+            return HttpResponse(status=404)
+    if not social_image.image_path:
         return HttpResponse(status=404)
 
-    try:
-        upstream_request = urllib.request.Request(
-            image_url,
-            headers={"User-Agent": "TamburSocialPreview/1.0"},
-        )
-        with urllib.request.urlopen(upstream_request, timeout=12) as upstream:
-            content_length = int(upstream.headers.get("Content-Length") or 0)
-            if content_length > _SOCIAL_IMAGE_MAX_BYTES:
-                return HttpResponse(status=413)
-            source_bytes = upstream.read(_SOCIAL_IMAGE_MAX_BYTES + 1)
-        if len(source_bytes) > _SOCIAL_IMAGE_MAX_BYTES:
-            return HttpResponse(status=413)
-        with Image.open(BytesIO(source_bytes)) as source_image:
-            image = ImageOps.exif_transpose(source_image)
-            image.thumbnail(_SOCIAL_IMAGE_MAX_SIZE, Image.Resampling.LANCZOS)
-            if image.mode != "RGB":
-                rgba_image = image.convert("RGBA")
-                background = Image.new("RGB", rgba_image.size, "white")
-                background.paste(rgba_image, mask=rgba_image.getchannel("A"))
-                image = background
-            output = BytesIO()
-            image.save(output, format="JPEG", quality=88, optimize=True)
-    except (OSError, ValueError, urllib.error.URLError, UnidentifiedImageError):
-        return HttpResponse(status=502)
-
-    response = HttpResponse(output.getvalue(), content_type="image/jpeg")
+    response = HttpResponseRedirect(public_media_url(default_storage.url(social_image.image_path), request=request))
     response["Cache-Control"] = "public, max-age=86400"
-    response["Content-Length"] = str(len(response.content))
     return response
 
 
@@ -4059,31 +4032,14 @@ def post_view(request: HttpRequest, post_id: int) -> HttpResponse:
         window_seconds=60,
         identifiers=(post.id,),
     ):
+        attach_pending_post_views([post])
         return JsonResponse({"ok": True, "views_count": _post_total_views(post, now)})
 
-    Post.objects.filter(id=post.id).update(real_views_count=F("real_views_count") + 1)
-    _record_post_daily_view(post.id, timezone.localdate())
-    post.real_views_count = (post.real_views_count or 0) + 1
+    record_post_view(post.id, timezone.localdate())
+    attach_pending_post_views([post])
     return JsonResponse({"ok": True, "views_count": _post_total_views(post, now)})
 
 
-def _record_post_daily_view(post_id: int, view_date) -> None:
-    from feeds.models import PostDailyView
-
-    updated = PostDailyView.objects.filter(post_id=post_id, date=view_date).update(
-        views_count=F("views_count") + 1
-    )
-    if updated:
-        return
-    try:
-        with transaction.atomic():
-            PostDailyView.objects.create(post_id=post_id, date=view_date, views_count=1)
-    except IntegrityError:
-        PostDailyView.objects.filter(post_id=post_id, date=view_date).update(
-            views_count=F("views_count") + 1
-        )
-
-
 def _apply_user_hidden_content(queryset, user, *, prefix: str = ""):
     if not user:
         return queryset
@@ -4196,11 +4152,16 @@ def home_feed(request: HttpRequest) -> HttpResponse:
             posts_page_query.prefetch_related(*prefetches)
             .order_by("-created_at")[offset : offset + limit]
         )
-        _attach_post_user_votes(posts_page, current_user)
-        favorite_post_ids = _favorite_post_ids_for_user(posts_page, current_user)
+        favorite_post_ids = PostCardContext.load(posts_page, current_user, language=language).favorite_post_ids
+        author_rating_map = {
+            author_id: round(float(value), 2)
+            for author_id, value in _calculate_author_ratings(
+                {post.author_id: post.author for post in posts_page}.values()
+            ).items()
+        }
         serialized = []
         for post in posts_page:
-            author_rating = round(float(_calculate_author_rating(post.author)), 2)
+            author_rating = author_rating_map.get(post.author_id, 0)
             if card_mode:
                 serialized.append(
                     _serialize_lightweight_post_card(
@@ -4239,8 +4200,6 @@ def home_feed(request: HttpRequest) -> HttpResponse:
         .prefetch_related(*prefetches)
         .order_by("-created_at")[:fetch_size]
     )
-    _attach_post_user_votes(posts, current_user)
-    favorite_post_ids = _favorite_post_ids_for_user(posts, current_user)
     author_ids = {post.author_id for post in posts}
     author_rating_map = {}
     if author_ids:
@@ -4261,11 +4220,11 @@ def home_feed(request: HttpRequest) -> HttpResponse:
     )
     community_day_counts: dict[tuple[int, object], int] = {}
 
-    serialized_posts = []
+    selected_posts = []
     remaining = posts[:]
     last_author_id = None
 
-    while remaining and len(serialized_posts) < target_count:
+    while remaining and len(selected_posts) < target_count:
         next_index = None
         for idx, candidate in enumerate(remaining):
             if candidate.author_id != last_author_id:
@@ -4284,36 +4243,33 @@ def home_feed(request: HttpRequest) -> HttpResponse:
             if community_day_count >= home_posts_per_community_per_day:
                 continue
             community_day_counts[community_day_key] = community_day_count + 1
-        if card_mode:
-            serialized_posts.append(
-                _serialize_lightweight_post_card(
-                    request,
-                    post,
-                    current_user,
-                    now=now,
-                    is_favorite=post.id in favorite_post_ids,
-                    author_rating=author_rating,
-                    language=language,
-                )
-            )
-        else:
-            serialized_posts.append(
-                _serialize_backend_post_card(
-                    request,
-                    post,
-                    current_user,
-                    now=now,
-                    is_favorite=post.id in favorite_post_ids,
-                    author_rating=author_rating,
-                    language=language,
-                )
-            )
+        selected_posts.append((post, author_rating))
         last_author_id = post.author_id
 
+    page = selected_posts[offset : offset + limit]
+    favorite_post_ids = PostCardContext.load(
+        [post for post, _author_rating in page],
+        current_user,
+        language=language,
+    ).favorite_post_ids
+    serialize_card = _serialize_lightweight_post_card if card_mode else _serialize_backend_post_card
+    serialized_posts = [
+        serialize_card(
+            request,
+            post,
+            current_user,
+            now=now,
+            is_favorite=post.id in favorite_post_ids,
+            author_rating=author_rating,
+            language=language,
+        )
+        for post, author_rating in page
+    ]
+
     return JsonResponse(
         {
             "ok": True,
-            "posts": serialized_posts[offset : offset + limit],
+            "posts": serialized_posts,
         }
     )
 
@@ -4365,7 +4321,7 @@ def favorites_feed(request: HttpRequest) -> HttpResponse:
 
     favorite_rows = list(filtered_favorites[offset : offset + limit])
     posts = [row.post for row in favorite_rows]
-    _attach_post_user_votes(posts, user)
+    PostCardContext.load(posts, user, language=language, with_author_ratings=True)
     favorite_post_ids = {post.id for post in posts}
 
     serialized = []
@@ -4416,6 +4372,13 @@ def favorites_feed(request: HttpRequest) -> HttpResponse:
     return JsonResponse({"ok": True, "posts": serialized})
 
 
+def _post_card_enabled_template_editor_blocks(post: Post, template_payload: dict | None) -> list[str]:
+    card_context = post_card_context(post)
+    if card_context is not None:
+        return card_context.enabled_template_editor_blocks(template_payload)
+    return _serialize_enabled_template_editor_blocks(template_payload)
+
+
 def _serialize_backend_post_card(
     request: HttpRequest,
     post: Post,
@@ -4443,7 +4406,7 @@ def _serialize_backend_post_card(
         "language": language,
         "is_translated": translation is not None,
         "template": template_payload,
-        "enabled_template_editor_blocks": _serialize_enabled_template_editor_blocks(template_payload),
+        "enabled_template_editor_blocks": _post_card_enabled_template_editor_blocks(post, template_payload),
         "can_manage_bug_report_status": _user_can_manage_bug_report_status(current_user, post),
         "bug_report_confirmation": _serialize_bug_report_confirmation(post, current_user),
         "comun": community_service._serialize_post_comun(request, post, current_user),
@@ -4501,7 +4464,7 @@ def _serialize_lightweight_post_card(
         "language": language,
         "is_translated": translation is not None,
         "template": template_payload,
-        "enabled_template_editor_blocks": _serialize_enabled_template_editor_blocks(template_payload),
+        "enabled_template_editor_blocks": _post_card_enabled_template_editor_blocks(post, template_payload),
         "can_manage_bug_report_status": _user_can_manage_bug_report_status(current_user, post),
         "bug_report_confirmation": _serialize_bug_report_confirmation(post, current_user),
         "comun": community_service._serialize_post_comun(request, post, current_user),
@@ -4531,6 +4494,33 @@ def _serialize_lightweight_post_card(
     }
 
 
+def _home_feed_exclusion_filter(user: User | None) -> Q | None:
+    if not user:
+        return None
+    settings = UserFeedSettings.objects.filter(user=user).first()
+    if not settings:
+        return None
+    serialized = my_feed_service._serialize_user_feed_settings(settings)
+    exclusion = Q()
+    hidden_post_ids = serialized.get("hidden_post_ids") or []
+    if hidden_post_ids:
+        exclusion |= Q(post_id__in=hidden_post_ids)
+    hidden_authors = serialized.get("hidden_authors") or []
+    if hidden_authors:
+        author_filter = Q()
+        for username in hidden_authors:
+            author_filter |= Q(username__iexact=username)
+        exclusion |= Q(author_id_snapshot__in=Author.objects.filter(author_filter).values("id"))
+    hidden_comuns = [
+        str(slug or "").strip().lower()
+        for slug in serialized.get("hidden_comuns") or []
+        if str(slug or "").strip()
+    ]
+    if hidden_comuns:
+        exclusion |= Q(comun_slugs_snapshot__overlap=hidden_comuns)
+    return exclusion or None
+
+
 def _materialized_home_feed_response(
     request: HttpRequest,
     *,
@@ -4539,6 +4529,64 @@ def _materialized_home_feed_response(
     now=None,
     language: str = ORIGINAL_POST_LANGUAGE,
     current_user: User | None = None,
+) -> HttpResponse | None:
+    language_feed = PublicFeedItem.home_feed_for_language(language)
+    items_query = PublicFeedItem.objects.filter(feed=language_feed)
+    exclusion = _home_feed_exclusion_filter(current_user)
+    if exclusion is not None:
+        items_query = items_query.exclude(exclusion)
+    prefetches = ["post__tags"]
+    translation_prefetch = _post_translation_prefetch(language, prefix="post__")
+    if translation_prefetch:
+        prefetches.append(translation_prefetch)
+    items = list(
+        items_query.select_related("post", "post__author")
+        .prefetch_related(*prefetches)
+        .order_by("rank")[offset : offset + limit]
+    )
+    if not items:
+        if PublicFeedItem.objects.filter(feed=language_feed).exists():
+            return JsonResponse({"ok": True, "posts": [], "materialized": True})
+        return _legacy_materialized_home_feed_response(
+            request,
+            limit=limit,
+            offset=offset,
+            now=now,
+            language=language,
+            current_user=current_user,
+        )
+
+    posts = [item.post for item in items]
+    favorite_post_ids = PostCardContext.load(posts, current_user, language=language).favorite_post_ids
+    serialized = [
+        _serialize_lightweight_post_card(
+            request,
+            item.post,
+            current_user,
+            now=now,
+            is_favorite=item.post_id in favorite_post_ids,
+            score_override=round(float(item.score), 2),
+            language=language,
+        )
+        for item in items
+    ]
+    return JsonResponse(
+        {
+            "ok": True,
+            "posts": serialized,
+            "materialized": True,
+        }
+    )
+
+
+def _legacy_materialized_home_feed_response(
+    request: HttpRequest,
+    *,
+    limit: int,
+    offset: int,
+    now=None,
+    language: str = ORIGINAL_POST_LANGUAGE,
+    current_user: User | None = None,
 ) -> HttpResponse | None:
     items_query = PublicFeedItem.objects.filter(feed=PublicFeedItem.FEED_HOME)
     items_query = _filter_posts_for_language(items_query, language, prefix="post__")
@@ -4574,8 +4622,6 @@ def _materialized_home_feed_response(
         settings=rating_settings,
         author_ratings=author_rating_map,
     )
-    _attach_materialized_post_user_votes(posts, current_user)
-    favorite_post_ids = _favorite_post_ids_for_user(posts, current_user)
     visible_items = []
     community_day_counts: dict[tuple[int, object], int] = {}
     for item in items:
@@ -4592,6 +4638,12 @@ def _materialized_home_feed_response(
         if len(visible_items) >= target_count:
             break
 
+    page = visible_items[offset : offset + limit]
+    favorite_post_ids = PostCardContext.load(
+        [item.post for item, _score in page],
+        current_user,
+        language=language,
+    ).favorite_post_ids
     serialized = [
         _serialize_lightweight_post_card(
             request,
@@ -4602,7 +4654,7 @@ def _materialized_home_feed_response(
             score_override=score,
             language=language,
         )
-        for item, score in visible_items[offset : offset + limit]
+        for item, score in page
     ]
     return JsonResponse(
         {
@@ -4613,22 +4665,6 @@ def _materialized_home_feed_response(
     )
 
 
-def _attach_materialized_post_user_votes(
-    posts: list[Post],
-    user: User | None,
-) -> None:
-    vote_by_post_id = {}
-    if user and posts:
-        vote_by_post_id = dict(
-            PostLike.objects.filter(
-                user=user,
-                post_id__in=[post.id for post in posts],
-            ).values_list("post_id", "value")
-        )
-    for post in posts:
-        post._current_user_vote = int(vote_by_post_id.get(post.id, 0))
-
-
 def _serialize_search_author_result(
     request: HttpRequest,
     author: Author,
@@ -4663,6 +4699,7 @@ def _serialize_search_site_user_result(
 def _serialize_search_comun_result(
     request: HttpRequest,
     comun: Comun,
+    translation: ComunTranslation | None = None,
 ) -> dict:
     rating_value = getattr(comun, "rating_score", 0) or 0
     try:
@@ -4671,11 +4708,11 @@ def _serialize_search_comun_result(
         rating_score = 0.0
     return {
         "id": comun.id,
-        "name": comun.name,
+        "name": (translation.name if translation else "") or comun.name,
         "slug": comun.slug,
         "logo_url": community_service._comun_logo_url(request, comun),
-        "product_description": comun.product_description,
-        "target_audience": comun.target_audience,
+        "product_description": (translation.product_description if translation else "") or comun.product_description,
+        "target_audience": (translation.target_audience if translation else "") or comun.target_audience,
         "website_url": comun.website_url,
         "rating_score": rating_score,
     }
@@ -4730,10 +4767,7 @@ def _search_comun_result_rank(item: dict, query: str) -> tuple[int, float, str]:
     return (8, -rating_score, name)
 
 
-SEARCH_CONFIG = "simple"
-
-
-def _search_prefix_query(raw_query: str) -> SearchQuery | None:
+def _search_prefix_query(raw_query: str, config: str = SEARCH_CONFIG) -> SearchQuery | None:
     terms = [
         term.lower()
         for term in re.findall(r"\w+", raw_query or "", flags=re.UNICODE)
@@ -4742,32 +4776,31 @@ def _search_prefix_query(raw_query: str) -> SearchQuery | None:
     if not terms:
         return None
     raw_tsquery = " & ".join(f"{term}:*" for term in terms[:8])
-    return SearchQuery(raw_tsquery, config=SEARCH_CONFIG, search_type="raw")
-
-
-def _post_search_vector() -> SearchVector:
-    return SearchVector("title", "content", config=SEARCH_CONFIG)
+    return SearchQuery(raw_tsquery, config=config, search_type="raw")
 
 
-def _author_search_vector() -> SearchVector:
-    return SearchVector("username", "title", "description", config=SEARCH_CONFIG)
+def _search_document_vector() -> F:
+    return F("search_document__search_vector")
 
 
-def _comun_search_vector() -> SearchVector:
-    return SearchVector(
-        "name",
-        "slug",
-        "product_description",
-        "target_audience",
-        "rules_text",
-        config=SEARCH_CONFIG,
+def _translation_search_ranks(
+    document_model,
+    owner_field: str,
+    language: str,
+    search_query: SearchQuery | None,
+    limit: int,
+    **filters,
+) -> list[tuple[int, float]]:
+    if search_query is None:
+        return []
+    return list(
+        document_model.objects.filter(language=language, search_vector=search_query, **filters)
+        .annotate(search_rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-search_rank")
+        .values_list(owner_field, "search_rank")[:limit]
     )
 
 
-def _user_search_vector() -> SearchVector:
-    return SearchVector("username", "first_name", "last_name", config=SEARCH_CONFIG)
-
-
 def _page_with_next(queryset, offset: int, limit: int) -> tuple[list, int]:
     items = list(queryset[offset : offset + limit + 1])
     page_items = items[:limit]
@@ -4810,7 +4843,9 @@ def search_content(request: HttpRequest) -> HttpResponse:
         page = 1
 
     offset = (page - 1) * limit
+    language = _request_post_language(request)
     search_query = _search_prefix_query(query)
+    translated_search_query = _search_prefix_query(query, search_config_for_language(language))
     if search_query is None:
         return JsonResponse(
             {
@@ -4835,22 +4870,48 @@ def search_content(request: HttpRequest) -> HttpResponse:
     total_communities = 0
 
     if type_filter in ("all", "communities"):
-        comun_vector = _comun_search_vector()
-        comun_qs = (
+        comun_vector = _search_document_vector()
+        comun_window = offset + limit + 1
+        comun_ranks = dict(
             Comun.objects.filter(is_active=True)
             .annotate(search_vector=comun_vector)
             .filter(search_vector=search_query)
             .annotate(search_rank=SearchRank(comun_vector, search_query))
             .order_by("-search_rank", "-rating_score", "name")
+            .values_list("id", "search_rank")[:comun_window]
+        )
+        for comun_id, search_rank in _translation_search_ranks(
+            ComunTranslationSearchDocument,
+            "comun_id",
+            language,
+            translated_search_query,
+            comun_window,
+            comun__is_active=True,
+        ):
+            comun_ranks[comun_id] = max(comun_ranks.get(comun_id, 0), search_rank)
+        ranked_comuns = sorted(
+            Comun.objects.filter(id__in=comun_ranks.keys()),
+            key=lambda comun: (-comun_ranks[comun.id], -float(comun.rating_score or 0), comun.name),
         )
-        comun_page, total_communities = _page_with_next(comun_qs, offset, limit)
+        comun_page = ranked_comuns[offset : offset + limit]
+        total_communities = offset + len(comun_page) + (1 if len(ranked_comuns) > offset + limit else 0)
+        comun_translations = {}
+        if language != ORIGINAL_POST_LANGUAGE and comun_page:
+            comun_translations = {
+                translation.comun_id: translation
+                for translation in ComunTranslation.objects.filter(
+                    comun_id__in=[comun.id for comun in comun_page],
+                    language=language,
+                    status=POST_TRANSLATION_STATUS_TRANSLATED,
+                )
+            }
         communities.extend(
-            _serialize_search_comun_result(request, comun)
+            _serialize_search_comun_result(request, comun, comun_translations.get(comun.id))
             for comun in comun_page
         )
 
     if type_filter in ("all", "posts"):
-        author_vector = _author_search_vector()
+        author_vector = _search_document_vector()
         matching_author_ids = list(
             Author.objects.filter(is_blocked=False)
             .annotate(search_vector=author_vector)
@@ -4858,7 +4919,7 @@ def search_content(request: HttpRequest) -> HttpResponse:
             .values_list("id", flat=True)[:50]
         )
         now = timezone.now()
-        post_vector = _post_search_vector()
+        post_vector = _search_document_vector()
         base_posts_qs = (
             Post.objects.filter(
                 is_blocked=False,
@@ -4894,6 +4955,27 @@ def search_content(request: HttpRequest) -> HttpResponse:
         for post in text_posts:
             post_candidates_by_id[post.id] = post
 
+        translated_ranks = _translation_search_ranks(
+            PostTranslationSearchDocument,
+            "post_id",
+            language,
+            translated_search_query,
+            candidate_limit,
+            post__in=base_posts_qs,
+        )
+        missing_post_ids = [post_id for post_id, _rank in translated_ranks if post_id not in post_candidates_by_id]
+        if missing_post_ids:
+            for post in (
+                base_posts_qs.filter(id__in=missing_post_ids)
+                .select_related("author")
+                .prefetch_related("tags")
+            ):
+                post_candidates_by_id[post.id] = post
+        for post_id, search_rank in translated_ranks:
+            post = post_candidates_by_id.get(post_id)
+            if post is not None:
+                post.search_rank = max(getattr(post, "search_rank", 0) or 0, search_rank)
+
         if matching_author_ids:
             author_posts = (
                 base_posts_qs.filter(author_id__in=matching_author_ids)
@@ -4924,7 +5006,7 @@ def search_content(request: HttpRequest) -> HttpResponse:
         posts_page = list(
             base_posts_qs.filter(id__in=posts_page_ids)
             .select_related("author")
-            .prefetch_related("tags")
+            .prefetch_related("tags", _post_translation_prefetch(language))
         )
         posts_by_id = {post.id: post for post in posts_page}
         posts_page = [posts_by_id[post_id] for post_id in posts_page_ids if post_id in posts_by_id]
@@ -4932,6 +5014,7 @@ def search_content(request: HttpRequest) -> HttpResponse:
         favorite_post_ids = _favorite_post_ids_for_user(posts_page, current_user)
         for post in posts_page:
             _content, poll_payload = _content_with_live_poll(post, current_user)
+            translation = _feed_post_translation(post, language)
             template_payload = _serialize_post_template(post)
             author_channel_url, author_title = _author_display_fields(
                 request, post.author, post.channel_url
@@ -4939,12 +5022,19 @@ def search_content(request: HttpRequest) -> HttpResponse:
             posts.append(
                 {
                     "id": post.id,
-                    "title": _post_display_title(post),
+                    "title": (translation.title if translation else "") or _post_display_title(post),
+                    "language": language,
+                    "is_translated": translation is not None,
                     "template": template_payload,
                     "can_manage_bug_report_status": _user_can_manage_bug_report_status(current_user, post),
                     "bug_report_confirmation": _serialize_bug_report_confirmation(post, current_user),
-                    "comun": community_service._serialize_post_comun(request, post, current_user),
-                    **_post_card_preview_payload(post),
+                    "comun": community_service._serialize_post_comun(
+                        request,
+                        post,
+                        current_user,
+                        language=language,
+                    ),
+                    **_post_card_preview_payload(post, translation),
                     "poll": poll_payload,
                     **_serialize_post_preview_image_fields(request, post, template_payload),
                     "source_url": post.source_url,
@@ -4968,7 +5058,7 @@ def search_content(request: HttpRequest) -> HttpResponse:
             )
 
     if type_filter in ("all", "users", "authors"):
-        author_vector = _author_search_vector()
+        author_vector = _search_document_vector()
         authors_qs = (
             Author.objects.filter(is_blocked=False)
             .annotate(search_vector=author_vector)
@@ -4988,7 +5078,7 @@ def search_content(request: HttpRequest) -> HttpResponse:
             combined_author_results.append(serialized)
 
         if type_filter in ("all", "users"):
-            user_vector = _user_search_vector()
+            user_vector = _search_document_vector()
             users_qs = (
                 User.objects.filter(is_active=True)
                 .annotate(search_vector=user_vector)
@@ -6,30 +6,21 @@ from django.utils import timezone
 
 from communities import service as community_service
 from communities.models import Comun
-from my_feed.models import UserFeedSettings
+from my_feed import subscription_index
 
 
 def compute_comun_cached_counts(comun: Comun, *, now=None) -> dict[str, int]:
     """
     Фактические subscribers_count и authors_count без записи в БД.
 
-    Подписчики: UserFeedSettings (my_feed_comuns / my_feed_comun_categories).
+    Подписчики: индекс ComunSubscription (синхронизируется с UserFeedSettings,
+    для старых данных — команда backfill_comun_subscriptions).
     Авторы: distinct site-user авторы постов в ленте коммуны (как feeds.0134 backfill),
     минимум 1 если в коммуне есть посты, но нет «сайтовых» авторов.
     """
     now = now or timezone.now()
     slug = str(comun.slug or "").strip()
-    subscribers_count = 0
-    if slug:
-        for settings in UserFeedSettings.objects.all().iterator(chunk_size=500):
-            subscribed = community_service._subscribed_comun_slugs_from_settings(
-                {
-                    "my_feed_comuns": settings.my_feed_comuns,
-                    "my_feed_comun_categories": settings.my_feed_comun_categories,
-                }
-            )
-            if slug in subscribed:
-                subscribers_count += 1
+    subscribers_count = subscription_index.comun_subscribers_count(comun.id) if slug else 0
 
     site_authors_count = (
         community_service._comun_site_user_posts_queryset(comun)
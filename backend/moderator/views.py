@@ -15,6 +15,7 @@ from feeds.models import (
     CONTENT_TRANSLATION_KIND_COMMENT,
     CONTENT_TRANSLATION_KIND_COMUN,
     CONTENT_TRANSLATION_KIND_POST,
+    CONTENT_TRANSLATION_KIND_POST_MANUAL,
     CONTENT_TRANSLATION_KIND_STATIC_PAGE,
     ComunTranslation,
     ContentReport,
@@ -708,7 +709,9 @@ def _translated_comun_item_rows(
 
 def _content_translation_queue() -> dict:
     pending = ContentTranslationTask.objects.filter(status="pending")
-    pending_posts = pending.filter(kind=CONTENT_TRANSLATION_KIND_POST).count()
+    pending_posts = pending.filter(
+        kind__in=[CONTENT_TRANSLATION_KIND_POST, CONTENT_TRANSLATION_KIND_POST_MANUAL]
+    ).count()
     pending_comments = pending.filter(kind=CONTENT_TRANSLATION_KIND_COMMENT).count()
     pending_comuns = pending.filter(kind=CONTENT_TRANSLATION_KIND_COMUN).count()
     pending_static_pages = pending.filter(kind=CONTENT_TRANSLATION_KIND_STATIC_PAGE).count()
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from my_feed.models import ComunSubscriptionEvent, FeedSourcePost, UserFeedSettings
+from my_feed.models import ComunSubscription, ComunSubscriptionEvent, FeedSourcePost, UserFeedSettings
 
 
 @admin.register(UserFeedSettings)
@@ -52,3 +52,10 @@ class ComunSubscriptionEventAdmin(admin.ModelAdmin):
     list_filter = ("source", "created_at")
     search_fields = ("user__username", "user__email", "comun__name", "comun_slug")
     readonly_fields = ("user", "comun", "comun_slug", "source", "created_at")
+
+
+@admin.register(ComunSubscription)
+class ComunSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ("user", "comun", "category", "created_at")
+    search_fields = ("user__username", "user__email", "comun__name", "comun__slug")
+    readonly_fields = ("user", "comun", "category", "created_at")
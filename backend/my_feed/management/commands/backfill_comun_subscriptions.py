@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from my_feed import subscription_index
+from my_feed.models import ComunSubscription, UserFeedSettings
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ComunSubscription index from my_feed_comuns / my_feed_comun_categories."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user-id", type=int, action="append", default=[])
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        user_ids = [user_id for user_id in options["user_id"] if user_id > 0]
+        batch_size = min(max(int(options["batch_size"] or 500), 1), 5000)
+
+        queryset = UserFeedSettings.objects.order_by("id")
+        if user_ids:
+            queryset = queryset.filter(user_id__in=user_ids)
+        else:
+            orphan_rows, _deleted = ComunSubscription.objects.exclude(
+                user_id__in=UserFeedSettings.objects.values("user_id")
+            ).delete()
+            if orphan_rows:
+                self.stdout.write(f"removed orphan subscriptions={orphan_rows}")
+
+        scanned = 0
+        for settings in queryset.filter(
+            ~Q(my_feed_comuns=[]) | ~Q(my_feed_comun_categories={})
+        ).iterator(chunk_size=batch_size):
+            subscription_index.sync_comun_subscriptions_for_settings(settings)
+            scanned += 1
+        cleared = 0
+        for user_id in (
+            queryset.filter(my_feed_comuns=[], my_feed_comun_categories={})
+            .filter(user_id__in=ComunSubscription.objects.values("user_id"))
+            .values_list("user_id", flat=True)
+            .iterator(chunk_size=batch_size)
+        ):
+            ComunSubscription.objects.filter(user_id=user_id).delete()
+            cleared += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"comun subscriptions: scanned={scanned} cleared={cleared} "
+                f"rows={ComunSubscription.objects.count()}"
+            )
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from django.db import models
+from django.db.models import Q
 
 from django.contrib.auth import get_user_model
 
@@ -91,6 +92,54 @@ class ComunSubscriptionEvent(models.Model):
         return f"{self.user_id}:{self.comun_slug}:{self.action}:{self.created_at:%Y-%m-%d %H:%M:%S}"
 
 
+class ComunSubscription(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name="comun_subscriptions",
+    )
+    comun = models.ForeignKey(
+        "feeds.Comun",
+        on_delete=models.CASCADE,
+        related_name="feed_subscriptions",
+    )
+    category = models.ForeignKey(
+        "feeds.ComunCategory",
+        null=True,
+        blank=True,
+        on_delete=models.CASCADE,
+        related_name="feed_subscriptions",
+    )
+    # Строка без категории, но с all_categories=False — коммуна есть только в
+    # my_feed_comun_categories: она считается подпиской, но посты вне выбранных
+    # категорий подписчику не рассылаются.
+    all_categories = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = "feeds"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "comun"],
+                condition=Q(category__isnull=True),
+                name="feeds_comunsub_unique_comun",
+            ),
+            models.UniqueConstraint(
+                fields=["user", "comun", "category"],
+                condition=Q(category__isnull=False),
+                name="feeds_comunsub_unique_category",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["comun", "category", "user"], name="feeds_comunsub_lookup_idx"),
+        ]
+        verbose_name = "Подписка на сообщество"
+        verbose_name_plural = "Подписки на сообщества"
+
+    def __str__(self) -> str:
+        return f"{self.user_id}:{self.comun_id}:{self.category_id or '*'}"
+
+
 class FeedSourcePost(models.Model):
     SOURCE_AUTHOR = "author"
     SOURCE_COMUN = "comun"
@@ -136,6 +185,7 @@ class FeedSourcePost(models.Model):
 
 __all__ = [
     "UserFeedSettings",
+    "ComunSubscription",
     "ComunSubscriptionEvent",
     "FeedSourcePost",
     "default_feed_tag_rules",
@@ -3,9 +3,10 @@ from __future__ import annotations
 from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
-from communities.models import Comun, ComunPostCategoryAssignment
+from communities.models import Comun, ComunCategory, ComunPostCategoryAssignment
 from feeds.models import Post
-from my_feed import source_index
+from my_feed import source_index, subscription_index
+from my_feed.models import UserFeedSettings
 
 
 @receiver(post_save, sender=Post)
@@ -98,3 +99,52 @@ def _sync_comun_feed_sources(
     if previous_author_id and previous_author_id != instance.telegram_source_author_id:
         source_index.sync_feed_sources_for_author_posts(previous_author_id)
     source_index.sync_feed_sources_for_author_posts(instance.telegram_source_author_id)
+
+
+@receiver(post_save, sender=Comun)
+def _sync_comun_slug_subscriptions(sender, instance: Comun, created: bool, **kwargs) -> None:
+    previous_slug = getattr(instance, "_feed_source_previous_slug", None)
+    if not created and previous_slug == instance.slug:
+        return
+    subscription_index.sync_comun_subscriptions_for_comun_slugs({previous_slug, instance.slug})
+
+
+@receiver(pre_save, sender=ComunCategory)
+def _capture_comun_category_subscription_fields(sender, instance: ComunCategory, **kwargs) -> None:
+    instance._subscription_previous_fields = (
+        ComunCategory.objects.filter(pk=instance.pk).values_list("comun_id", "slug").first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=ComunCategory)
+def _sync_comun_category_subscriptions(sender, instance: ComunCategory, **kwargs) -> None:
+    previous_fields = getattr(instance, "_subscription_previous_fields", None)
+    if previous_fields == (instance.comun_id, instance.slug):
+        return
+    comun_ids = {instance.comun_id, previous_fields[0] if previous_fields else None} - {None}
+    if comun_ids:
+        subscription_index.sync_comun_subscriptions_for_comun_slugs(
+            Comun.objects.filter(id__in=comun_ids).values_list("slug", flat=True)
+        )
+
+
+@receiver(post_save, sender=UserFeedSettings)
+def _sync_feed_settings_comun_subscriptions(
+    sender,
+    instance: UserFeedSettings,
+    created: bool,
+    update_fields=None,
+    **kwargs,
+) -> None:
+    if not created and update_fields is not None:
+        relevant_fields = {"user", "user_id", "my_feed_comuns", "my_feed_comun_categories"}
+        if not relevant_fields.intersection(set(update_fields)):
+            return
+    subscription_index.sync_comun_subscriptions_for_settings(instance)
+
+
+@receiver(post_delete, sender=UserFeedSettings)
+def _delete_feed_settings_comun_subscriptions(sender, instance: UserFeedSettings, **kwargs) -> None:
+    subscription_index.sync_comun_subscriptions_for_user_id(instance.user_id)
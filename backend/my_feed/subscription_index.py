@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from django.db.models import Q, QuerySet
+from django.db.utils import OperationalError, ProgrammingError
+
+from communities.models import Comun, ComunCategory
+from my_feed.models import ComunSubscription, UserFeedSettings
+
+
+def _clean_slug_list(value: object) -> list[str]:
+    if not isinstance(value, (list, tuple)):
+        return []
+    return [slug for slug in (str(item or "").strip() for item in value) if slug]
+
+
+def _subscription_keys_for_settings(
+    settings: UserFeedSettings,
+) -> set[tuple[int, int | None, bool]]:
+    comun_slugs = set(_clean_slug_list(settings.my_feed_comuns))
+    raw_category_selection = settings.my_feed_comun_categories
+    category_selection: dict[str, set[str]] = {}
+    if isinstance(raw_category_selection, dict):
+        for raw_comun_slug, raw_category_slugs in raw_category_selection.items():
+            comun_slug = str(raw_comun_slug or "").strip()
+            if comun_slug:
+                category_selection[comun_slug] = set(_clean_slug_list(raw_category_slugs))
+    if not comun_slugs and not category_selection:
+        return set()
+
+    comun_id_by_slug = dict(
+        Comun.objects.filter(slug__in=comun_slugs | set(category_selection)).values_list("slug", "id")
+    )
+    keys: set[tuple[int, int | None, bool]] = {
+        (int(comun_id_by_slug[slug]), None, True) for slug in comun_slugs if slug in comun_id_by_slug
+    }
+    keys.update(
+        (int(comun_id_by_slug[slug]), None, False)
+        for slug in category_selection
+        if slug in comun_id_by_slug and slug not in comun_slugs
+    )
+
+    selected_comun_ids = {
+        int(comun_id_by_slug[slug]): slugs
+        for slug, slugs in category_selection.items()
+        if slug in comun_id_by_slug and slugs
+    }
+    if selected_comun_ids:
+        for category_id, comun_id, category_slug in ComunCategory.objects.filter(
+            comun_id__in=selected_comun_ids.keys()
+        ).values_list("id", "comun_id", "slug"):
+            if category_slug in selected_comun_ids.get(int(comun_id), set()):
+                keys.add((int(comun_id), int(category_id), False))
+    return keys
+
+
+def sync_comun_subscriptions_for_settings(settings: UserFeedSettings | None) -> None:
+    if not settings or not settings.user_id:
+        return
+    keys = _subscription_keys_for_settings(settings)
+    try:
+        existing_rows = list(
+            ComunSubscription.objects.filter(user_id=settings.user_id).values_list(
+                "id",
+                "comun_id",
+                "category_id",
+                "all_categories",
+            )
+        )
+        existing_keys = {tuple(row[1:]) for row in existing_rows}
+        stale_row_ids = [row[0] for row in existing_rows if tuple(row[1:]) not in keys]
+        if stale_row_ids:
+            ComunSubscription.objects.filter(id__in=stale_row_ids).delete()
+        missing_keys = keys - existing_keys
+        if missing_keys:
+            ComunSubscription.objects.bulk_create(
+                [
+                    ComunSubscription(
+                        user_id=settings.user_id,
+                        comun_id=comun_id,
+                        category_id=category_id,
+                        all_categories=all_categories,
+                    )
+                    for comun_id, category_id, all_categories in missing_keys
+                ],
+                batch_size=500,
+                ignore_conflicts=True,
+            )
+    except (OperationalError, ProgrammingError):
+        return
+
+
+def sync_comun_subscriptions_for_user_id(user_id: int | None) -> None:
+    if not user_id:
+        return
+    settings = UserFeedSettings.objects.filter(user_id=user_id).first()
+    if settings is None:
+        try:
+            ComunSubscription.objects.filter(user_id=user_id).delete()
+        except (OperationalError, ProgrammingError):
+            return
+        return
+    sync_comun_subscriptions_for_settings(settings)
+
+
+def sync_comun_subscriptions_for_comun_slugs(slugs) -> None:
+    slugs = {slug for slug in (str(item or "").strip() for item in slugs or ()) if slug}
+    if not slugs:
+        return
+    settings_filter = Q()
+    for slug in slugs:
+        settings_filter |= Q(my_feed_comuns__contains=[slug]) | Q(my_feed_comun_categories__has_key=slug)
+    for settings in UserFeedSettings.objects.filter(settings_filter).order_by("id").iterator(chunk_size=500):
+        sync_comun_subscriptions_for_settings(settings)
+
+
+def comun_subscriber_user_ids(comun_id: int, *, category_id: int | None = None) -> QuerySet:
+    subscription_filter = Q(category_id__isnull=True, all_categories=True)
+    if category_id:
+        subscription_filter |= Q(category_id=category_id)
+    return (
+        ComunSubscription.objects.filter(subscription_filter, comun_id=comun_id)
+        .values_list("user_id", flat=True)
+        .distinct()
+    )
+
+
+def comun_subscribers_count(comun_id: int) -> int:
+    return ComunSubscription.objects.filter(comun_id=comun_id).values("user_id").distinct().count()
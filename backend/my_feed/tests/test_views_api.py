@@ -12,7 +12,8 @@ from my_feed.views import (
 )
 from communities.models import Comun, ComunCategory, ComunPostCategoryAssignment
 from feeds.models import Author, Post, PostRead
-from my_feed.models import ComunSubscriptionEvent, FeedSourcePost, UserFeedSettings
+from my_feed import subscription_index
+from my_feed.models import ComunSubscription, ComunSubscriptionEvent, FeedSourcePost, UserFeedSettings
 from users.service import _issue_token
 
 User = get_user_model()
@@ -316,6 +317,93 @@ class UserFeedSettingsApiTests(TestCase):
         self.assertEqual(self.comun.subscribers_count, 0)
         self.assertEqual(ComunSubscriptionEvent.objects.filter(user=self.user).count(), 1)
 
+    def test_auth_feed_settings_syncs_comun_subscription_index(self):
+        general = ComunCategory.objects.create(comun=self.other_comun, name="Общее", slug="general")
+        other_user = User.objects.create_user(username="feed-other", password="secret")
+        UserFeedSettings.objects.create(user=other_user, my_feed_comuns=[self.other_comun.slug])
+
+        response = self.client.patch(
+            reverse("auth-feed-settings"),
+            data=json.dumps(
+                {
+                    "my_feed_comuns": [self.comun.slug],
+                    "my_feed_comun_categories": {self.other_comun.slug: ["general"]},
+                }
+            ),
+            content_type="application/json",
+            **self.auth_headers,
+        )
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        self.assertEqual(
+            set(
+                ComunSubscription.objects.filter(user=self.user).values_list(
+                    "comun_id",
+                    "category_id",
+                    "all_categories",
+                )
+            ),
+            {
+                (self.comun.id, None, True),
+                (self.other_comun.id, None, False),
+                (self.other_comun.id, general.id, False),
+            },
+        )
+        self.assertEqual(
+            set(subscription_index.comun_subscriber_user_ids(self.other_comun.id, category_id=general.id)),
+            {self.user.id, other_user.id},
+        )
+        self.assertEqual(
+            set(subscription_index.comun_subscriber_user_ids(self.other_comun.id)),
+            {other_user.id},
+        )
+
+        response = self.client.patch(
+            reverse("auth-feed-settings"),
+            data=json.dumps({"my_feed_comuns": [], "my_feed_comun_categories": {}}),
+            content_type="application/json",
+            **self.auth_headers,
+        )
+        self.assertEqual(response.status_code, 200, response.content.decode())
+        self.assertFalse(ComunSubscription.objects.filter(user=self.user).exists())
+        self.assertEqual(subscription_index.comun_subscribers_count(self.other_comun.id), 1)
+
+    def test_category_selection_key_counts_as_comun_subscription(self):
+        UserFeedSettings.objects.create(
+            user=self.user,
+            my_feed_comun_categories={self.other_comun.slug: [], self.comun.slug: ["missing"]},
+        )
+
+        self.assertEqual(subscription_index.comun_subscribers_count(self.other_comun.id), 1)
+        self.assertEqual(subscription_index.comun_subscribers_count(self.comun.id), 1)
+        self.assertFalse(subscription_index.comun_subscriber_user_ids(self.other_comun.id).exists())
+        self.assertFalse(subscription_index.comun_subscriber_user_ids(self.comun.id).exists())
+
+    def test_comun_category_create_resyncs_selected_subscriptions(self):
+        UserFeedSettings.objects.create(
+            user=self.user,
+            my_feed_comun_categories={self.other_comun.slug: ["general"]},
+        )
+        self.assertFalse(ComunSubscription.objects.filter(category__isnull=False).exists())
+
+        general = ComunCategory.objects.create(comun=self.other_comun, name="Общее", slug="general")
+
+        self.assertEqual(
+            set(subscription_index.comun_subscriber_user_ids(self.other_comun.id, category_id=general.id)),
+            {self.user.id},
+        )
+
+    def test_comun_slug_rename_resyncs_subscriptions(self):
+        UserFeedSettings.objects.create(user=self.user, my_feed_comuns=["renamed-comun"])
+        self.assertEqual(subscription_index.comun_subscribers_count(self.other_comun.id), 0)
+
+        self.other_comun.slug = "renamed-comun"
+        self.other_comun.save(update_fields=["slug"])
+
+        self.assertEqual(
+            set(subscription_index.comun_subscriber_user_ids(self.other_comun.id)),
+            {self.user.id},
+        )
+
     def test_my_feed_uses_saved_comun_subscriptions_without_query_filters(self):
         UserFeedSettings.objects.create(
             user=self.user,
@@ -12,6 +12,7 @@ from django.views.decorators.csrf import csrf_exempt
 from communities import service as community_service
 from communities import views as community_views
 from feeds.models import Author, Post, PostRead
+from feeds.post_cards import PostCardContext
 from my_feed import serializers as my_feed_serializers
 from my_feed import service as my_feed_service
 from my_feed.models import FeedSourcePost
@@ -533,8 +534,7 @@ def my_feed(request: HttpRequest) -> HttpResponse:
         )
     else:
         posts = index_posts
-    _fv()._attach_post_user_votes(posts, current_user)
-    favorite_post_ids = _fv()._favorite_post_ids_for_user(posts, current_user)
+    favorite_post_ids = PostCardContext.load(posts, current_user, language=language).favorite_post_ids
 
     serialized = [
         _serialize_feed_post_card(
@@ -1,6 +1,12 @@
 from django.contrib import admin
 
-from notifications.models import MobilePushDevice, SiteNotification, SiteNotificationPreference
+from notifications.models import (
+    MobilePushDevice,
+    NotificationFanoutJob,
+    SiteNotification,
+    SiteNotificationPreference,
+    TelegramNotificationOutbox,
+)
 
 
 @admin.register(SiteNotificationPreference)
@@ -62,3 +68,52 @@ class MobilePushDeviceAdmin(admin.ModelAdmin):
     list_filter = ("platform", "is_active")
     search_fields = ("user__username", "device_id", "device_name", "app_version", "token")
     raw_id_fields = ("user",)
+
+
+@admin.register(NotificationFanoutJob)
+class NotificationFanoutJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "event_key",
+        "status",
+        "recipients_processed",
+        "notifications_created",
+        "notifications_grouped",
+        "deliveries_sent",
+        "attempts",
+        "scheduled_at",
+        "finished_at",
+    )
+    list_filter = ("event_key", "status")
+    readonly_fields = (
+        "cursor_user_id",
+        "pending_delivery_ids",
+        "recipients_processed",
+        "notifications_created",
+        "notifications_grouped",
+        "deliveries_sent",
+        "attempts",
+        "last_error",
+        "locked_at",
+        "finished_at",
+        "created_at",
+        "updated_at",
+    )
+
+
+@admin.register(TelegramNotificationOutbox)
+class TelegramNotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "chat_id",
+        "notification",
+        "status",
+        "attempts",
+        "available_at",
+        "sent_at",
+        "created_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("chat_id", "last_error")
+    raw_id_fields = ("notification",)
+    readonly_fields = ("attempts", "last_error", "locked_at", "sent_at", "created_at", "updated_at")
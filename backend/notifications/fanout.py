@@ -0,0 +1,396 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import timedelta
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from my_feed import subscription_index
+from notifications import service as notification_service
+from notifications.models import (
+    NOTIFICATION_FANOUT_STATUS_DONE,
+    NOTIFICATION_FANOUT_STATUS_FAILED,
+    NOTIFICATION_FANOUT_STATUS_PENDING,
+    NOTIFICATION_FANOUT_STATUS_RUNNING,
+    NotificationFanoutJob,
+    SiteNotification,
+    SiteNotificationPreference,
+)
+from notifications.push_service import send_site_notifications_to_push
+from telegram_integration.service import enqueue_site_notifications_to_telegram
+
+User = get_user_model()
+
+NOTIFICATION_FANOUT_CHUNK_SIZE = 500
+NOTIFICATION_FANOUT_MAX_ATTEMPTS = 5
+NOTIFICATION_FANOUT_STALE_AFTER = timedelta(minutes=10)
+NOTIFICATION_FANOUT_FAILED_RETRY_AFTER = timedelta(minutes=5)
+
+FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS = "comun_subscribers"
+
+
+def _comun_subscriber_recipients(spec: dict[str, Any]) -> QuerySet:
+    comun_id = int(spec.get("comun_id") or 0)
+    category_id = int(spec.get("category_id") or 0) or None
+    return User.objects.filter(
+        id__in=subscription_index.comun_subscriber_user_ids(comun_id, category_id=category_id)
+    )
+
+
+_FANOUT_RECIPIENT_RESOLVERS = {
+    FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS: _comun_subscriber_recipients,
+}
+
+
+def enqueue_notification_fanout(
+    *,
+    event_key: str,
+    recipients: dict[str, Any],
+    notification: dict[str, Any],
+    groups: dict[str, dict[str, Any]] | None = None,
+    exclude_user_ids: Iterable[int] = (),
+    scheduled_at=None,
+) -> NotificationFanoutJob:
+    if recipients.get("type") not in _FANOUT_RECIPIENT_RESOLVERS:
+        raise ValueError(f"unknown fanout recipients: {recipients.get('type')}")
+    return NotificationFanoutJob.objects.create(
+        event_key=event_key,
+        payload={
+            "recipients": recipients,
+            "exclude_user_ids": sorted({int(user_id) for user_id in exclude_user_ids if user_id}),
+            "notification": notification,
+            "groups": groups or {},
+        },
+        scheduled_at=scheduled_at or timezone.now(),
+    )
+
+
+def process_due_notification_fanout_jobs(
+    *,
+    limit: int = 5,
+    chunk_size: int = NOTIFICATION_FANOUT_CHUNK_SIZE,
+) -> dict[str, int]:
+    stats = {"processed": 0, "done": 0, "failed": 0, "skipped": 0}
+    now = timezone.now()
+    _reset_stale_running_fanout_jobs(now)
+    _reset_retryable_failed_fanout_jobs(now)
+    for _ in range(max(int(limit), 1)):
+        job_id = _claim_due_fanout_job_id(now=timezone.now())
+        if job_id is None:
+            break
+        result = _process_claimed_fanout_job(job_id, chunk_size=chunk_size)
+        stats["processed"] += 1
+        stats[result] = stats.get(result, 0) + 1
+    return stats
+
+
+def _claim_due_fanout_job_id(*, now) -> int | None:
+    with transaction.atomic():
+        job = (
+            NotificationFanoutJob.objects.select_for_update(skip_locked=True)
+            .filter(
+                status=NOTIFICATION_FANOUT_STATUS_PENDING,
+                scheduled_at__lte=now,
+                attempts__lt=NOTIFICATION_FANOUT_MAX_ATTEMPTS,
+            )
+            .order_by("scheduled_at", "id")
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = NOTIFICATION_FANOUT_STATUS_RUNNING
+        job.locked_at = now
+        job.attempts = int(job.attempts or 0) + 1
+        job.last_error = ""
+        job.save(update_fields=["status", "locked_at", "attempts", "last_error", "updated_at"])
+        return job.pk
+
+
+def _process_claimed_fanout_job(job_id: int, *, chunk_size: int) -> str:
+    job = NotificationFanoutJob.objects.filter(
+        pk=job_id,
+        status=NOTIFICATION_FANOUT_STATUS_RUNNING,
+    ).first()
+    if job is None:
+        return "skipped"
+    chunk_size = min(max(int(chunk_size or NOTIFICATION_FANOUT_CHUNK_SIZE), 1), 5000)
+    try:
+        _deliver_pending_fanout_notifications(job)
+        while True:
+            job = _expand_fanout_chunk(job, chunk_size=chunk_size)
+            if job is None:
+                break
+            _deliver_pending_fanout_notifications(job)
+    except Exception as exc:
+        NotificationFanoutJob.objects.filter(pk=job_id).update(
+            status=NOTIFICATION_FANOUT_STATUS_FAILED,
+            locked_at=None,
+            last_error=str(exc)[:2000],
+            updated_at=timezone.now(),
+        )
+        return "failed"
+
+    now = timezone.now()
+    NotificationFanoutJob.objects.filter(pk=job_id).update(
+        status=NOTIFICATION_FANOUT_STATUS_DONE,
+        locked_at=None,
+        finished_at=now,
+        updated_at=now,
+    )
+    return "done"
+
+
+def _fanout_recipient_queryset(job: NotificationFanoutJob) -> QuerySet:
+    payload = job.payload if isinstance(job.payload, dict) else {}
+    recipients = payload.get("recipients") if isinstance(payload.get("recipients"), dict) else {}
+    resolver = _FANOUT_RECIPIENT_RESOLVERS.get(recipients.get("type"))
+    if resolver is None:
+        raise ValueError(f"unknown fanout recipients: {recipients.get('type')}")
+    queryset = resolver(recipients).filter(is_active=True)
+    exclude_user_ids = payload.get("exclude_user_ids") or []
+    if exclude_user_ids:
+        queryset = queryset.exclude(id__in=exclude_user_ids)
+    return queryset
+
+
+def _expand_fanout_chunk(job: NotificationFanoutJob, *, chunk_size: int) -> NotificationFanoutJob | None:
+    recipients_qs = _fanout_recipient_queryset(job)
+    now = timezone.now()
+    with transaction.atomic():
+        job = NotificationFanoutJob.objects.select_for_update().filter(pk=job.pk).first()
+        if job is None or job.status != NOTIFICATION_FANOUT_STATUS_RUNNING:
+            return None
+        user_ids = list(
+            recipients_qs.filter(id__gt=job.cursor_user_id)
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not user_ids:
+            return None
+        created, grouped = _write_fanout_notifications(job, user_ids, now=now)
+        job.cursor_user_id = user_ids[-1]
+        job.pending_delivery_ids = [
+            notification.id
+            for notification in created
+            if notification.is_telegram or notification.is_push
+        ]
+        job.recipients_processed = int(job.recipients_processed or 0) + len(user_ids)
+        job.notifications_created = int(job.notifications_created or 0) + len(created)
+        job.notifications_grouped = int(job.notifications_grouped or 0) + grouped
+        job.locked_at = now
+        job.save(
+            update_fields=[
+                "cursor_user_id",
+                "pending_delivery_ids",
+                "recipients_processed",
+                "notifications_created",
+                "notifications_grouped",
+                "locked_at",
+                "updated_at",
+            ]
+        )
+    return job
+
+
+def _write_fanout_notifications(
+    job: NotificationFanoutJob,
+    user_ids: list[int],
+    *,
+    now,
+) -> tuple[list[SiteNotification], int]:
+    event_key = job.event_key
+    payload = job.payload if isinstance(job.payload, dict) else {}
+    base = payload.get("notification") if isinstance(payload.get("notification"), dict) else {}
+    groups = payload.get("groups") if isinstance(payload.get("groups"), dict) else {}
+    definition = notification_service._notification_definition_for_event(event_key)
+    preferences = {
+        pref.user_id: pref
+        for pref in SiteNotificationPreference.objects.filter(
+            user_id__in=user_ids,
+            event_key=notification_service._notification_preference_key(event_key),
+        )
+    }
+
+    immediate: list[SiteNotification] = []
+    grouped_recipients: dict[str, list[tuple[int, tuple[bool, bool, bool]]]] = defaultdict(list)
+    for user_id in user_ids:
+        pref = preferences.get(user_id)
+        channels = notification_service._notification_channel_flags(pref, definition)
+        if not any(channels):
+            continue
+        grouping_period = notification_service._notification_grouping_period(pref, definition)
+        if grouping_period in groups:
+            grouped_recipients[grouping_period].append((user_id, channels))
+            continue
+        is_site, is_telegram, is_push = channels
+        immediate.append(
+            SiteNotification(
+                user_id=user_id,
+                event_key=event_key,
+                title=str(base.get("title") or "").strip()[:255],
+                message=str(base.get("message") or "").strip(),
+                link_url=str(base.get("link_url") or "").strip()[:500],
+                payload=base.get("payload") or {},
+                group_count=1,
+                is_site=is_site,
+                is_telegram=is_telegram,
+                is_push=is_push,
+                delivery_at=now,
+                delivered_at=now,
+            )
+        )
+
+    created = SiteNotification.objects.bulk_create(immediate, batch_size=500) if immediate else []
+    grouped = 0
+    for grouping_period, recipients in grouped_recipients.items():
+        grouped += _upsert_grouped_fanout_notifications(
+            event_key,
+            groups[grouping_period],
+            recipients,
+            now=now,
+        )
+    return created, grouped
+
+
+def _upsert_grouped_fanout_notifications(
+    event_key: str,
+    group: dict[str, Any],
+    recipients: list[tuple[int, tuple[bool, bool, bool]]],
+    *,
+    now,
+) -> int:
+    group_key = str(group.get("group_key") or "").strip()[:160]
+    delivery_at = parse_datetime(str(group.get("delivery_at") or "")) or now
+    item = group.get("group_item") if isinstance(group.get("group_item"), dict) else {}
+    channels_by_user_id = dict(recipients)
+    existing = {
+        notification.user_id: notification
+        for notification in SiteNotification.objects.select_for_update().filter(
+            user_id__in=channels_by_user_id.keys(),
+            event_key=event_key,
+            group_key=group_key,
+        )
+    }
+
+    to_update: list[SiteNotification] = []
+    to_create: list[SiteNotification] = []
+    for user_id, channels in channels_by_user_id.items():
+        notification = existing.get(user_id)
+        if notification is not None:
+            notification_service._merge_item_into_grouped_notification(
+                notification,
+                title=group.get("title") or "",
+                message=group.get("message") or "",
+                link_url=group.get("link_url") or "",
+                payload=group.get("payload") or {},
+                item=item,
+                channels=channels,
+                delivery_at=delivery_at,
+                defer_delivery=True,
+                now=now,
+            )
+            to_update.append(notification)
+            continue
+        group_payload = dict(group.get("payload") or {})
+        group_payload["items"] = [item] if item else []
+        is_site, is_telegram, is_push = channels
+        to_create.append(
+            SiteNotification(
+                user_id=user_id,
+                event_key=event_key,
+                title=str(group.get("title") or "").strip()[:255],
+                message=str(group.get("message") or "").strip(),
+                link_url=str(group.get("link_url") or "").strip()[:500],
+                payload=group_payload,
+                group_key=group_key,
+                group_count=1,
+                is_site=is_site,
+                is_telegram=is_telegram,
+                is_push=is_push,
+                delivery_at=delivery_at,
+                delivered_at=None,
+            )
+        )
+    if to_update:
+        SiteNotification.objects.bulk_update(
+            to_update,
+            notification_service.GROUPED_NOTIFICATION_UPDATE_FIELDS,
+            batch_size=500,
+        )
+    if to_create:
+        SiteNotification.objects.bulk_create(to_create, batch_size=500)
+    return len(to_update) + len(to_create)
+
+
+def _deliver_pending_fanout_notifications(job: NotificationFanoutJob) -> None:
+    pending_ids = [int(notification_id) for notification_id in job.pending_delivery_ids or []]
+    if not pending_ids:
+        return
+    notifications = list(
+        SiteNotification.objects.select_related("user").filter(id__in=pending_ids).order_by("id")
+    )
+    telegram_notifications = [
+        notification
+        for notification in notifications
+        if notification.is_telegram and notification.telegram_sent_at is None
+    ]
+    if telegram_notifications:
+        enqueue_site_notifications_to_telegram(telegram_notifications)
+    push_notifications = [
+        notification
+        for notification in notifications
+        if notification.is_push and notification.push_sent_at is None
+    ]
+    if push_notifications:
+        send_site_notifications_to_push(push_notifications)
+    sent = len(notifications)
+    job.pending_delivery_ids = []
+    job.deliveries_sent = int(job.deliveries_sent or 0) + sent
+    job.locked_at = timezone.now()
+    job.save(update_fields=["pending_delivery_ids", "deliveries_sent", "locked_at", "updated_at"])
+
+
+def _reset_stale_running_fanout_jobs(now) -> int:
+    stale_jobs = NotificationFanoutJob.objects.filter(
+        status=NOTIFICATION_FANOUT_STATUS_RUNNING,
+        locked_at__lt=now - NOTIFICATION_FANOUT_STALE_AFTER,
+    )
+    failed = stale_jobs.filter(attempts__gte=NOTIFICATION_FANOUT_MAX_ATTEMPTS).update(
+        status=NOTIFICATION_FANOUT_STATUS_FAILED,
+        locked_at=None,
+        last_error="Исчерпан лимит попыток после таймаута обработчика",
+        updated_at=now,
+    )
+    pending = stale_jobs.filter(attempts__lt=NOTIFICATION_FANOUT_MAX_ATTEMPTS).update(
+        status=NOTIFICATION_FANOUT_STATUS_PENDING,
+        locked_at=None,
+        last_error="Рассылка возвращена в очередь после таймаута обработчика",
+        updated_at=now,
+    )
+    return failed + pending
+
+
+def _reset_retryable_failed_fanout_jobs(now) -> int:
+    return NotificationFanoutJob.objects.filter(
+        status=NOTIFICATION_FANOUT_STATUS_FAILED,
+        updated_at__lt=now - NOTIFICATION_FANOUT_FAILED_RETRY_AFTER,
+        attempts__lt=NOTIFICATION_FANOUT_MAX_ATTEMPTS,
+    ).update(
+        status=NOTIFICATION_FANOUT_STATUS_PENDING,
+        scheduled_at=now,
+        locked_at=None,
+        updated_at=now,
+    )
+
+
+__all__ = [
+    "FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS",
+    "enqueue_notification_fanout",
+    "process_due_notification_fanout_jobs",
+]
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.fanout import NOTIFICATION_FANOUT_CHUNK_SIZE, process_due_notification_fanout_jobs
+
+
+class Command(BaseCommand):
+    help = "Expand queued notification fan-out jobs into site notifications."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=5)
+        parser.add_argument("--chunk-size", type=int, default=NOTIFICATION_FANOUT_CHUNK_SIZE)
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument("--interval", type=int, default=5)
+
+    def handle(self, *args, **options):
+        limit = max(int(options["limit"] or 5), 1)
+        chunk_size = max(int(options["chunk_size"] or NOTIFICATION_FANOUT_CHUNK_SIZE), 1)
+        interval = max(int(options["interval"] or 5), 1)
+
+        while True:
+            stats = process_due_notification_fanout_jobs(limit=limit, chunk_size=chunk_size)
+            if stats["processed"] or not options["loop"]:
+                self.stdout.write(
+                    "notification fanout: processed={processed} done={done} failed={failed} skipped={skipped}".format(
+                        **stats
+                    )
+                )
+            if not options["loop"]:
+                break
+            time.sleep(interval)
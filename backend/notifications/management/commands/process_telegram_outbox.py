@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.telegram_outbox import TELEGRAM_OUTBOX_BATCH_SIZE, process_telegram_outbox
+
+
+class Command(BaseCommand):
+    help = "Deliver queued Telegram notifications within Bot API rate limits."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=TELEGRAM_OUTBOX_BATCH_SIZE)
+        parser.add_argument("--loop", action="store_true")
+        parser.add_argument("--interval", type=int, default=2)
+
+    def handle(self, *args, **options):
+        limit = max(int(options["limit"] or TELEGRAM_OUTBOX_BATCH_SIZE), 1)
+        interval = max(int(options["interval"] or 2), 1)
+
+        while True:
+            stats = process_telegram_outbox(limit=limit)
+            if stats["claimed"] or not options["loop"]:
+                self.stdout.write(
+                    "telegram outbox: claimed={claimed} messages={messages} sent={sent} "
+                    "deferred={deferred} failed={failed} skipped={skipped}".format(**stats)
+                )
+            if not options["loop"]:
+                break
+            if not stats["claimed"]:
+                time.sleep(interval)
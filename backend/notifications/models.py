@@ -10,6 +10,28 @@ PUSH_PLATFORM_CHOICES = (
     ("android", "Android"),
 )
 
+NOTIFICATION_FANOUT_STATUS_PENDING = "pending"
+NOTIFICATION_FANOUT_STATUS_RUNNING = "running"
+NOTIFICATION_FANOUT_STATUS_DONE = "done"
+NOTIFICATION_FANOUT_STATUS_FAILED = "failed"
+NOTIFICATION_FANOUT_STATUS_CHOICES = (
+    (NOTIFICATION_FANOUT_STATUS_PENDING, "Ожидает"),
+    (NOTIFICATION_FANOUT_STATUS_RUNNING, "Выполняется"),
+    (NOTIFICATION_FANOUT_STATUS_DONE, "Готово"),
+    (NOTIFICATION_FANOUT_STATUS_FAILED, "Ошибка"),
+)
+
+TELEGRAM_OUTBOX_STATUS_PENDING = "pending"
+TELEGRAM_OUTBOX_STATUS_SENDING = "sending"
+TELEGRAM_OUTBOX_STATUS_SENT = "sent"
+TELEGRAM_OUTBOX_STATUS_FAILED = "failed"
+TELEGRAM_OUTBOX_STATUS_CHOICES = (
+    (TELEGRAM_OUTBOX_STATUS_PENDING, "Ожидает"),
+    (TELEGRAM_OUTBOX_STATUS_SENDING, "Отправляется"),
+    (TELEGRAM_OUTBOX_STATUS_SENT, "Отправлено"),
+    (TELEGRAM_OUTBOX_STATUS_FAILED, "Ошибка"),
+)
+
 NOTIFICATION_GROUPING_PERIOD_CHOICES = (
     ("none", "Не группировать"),
     ("day", "За день"),
@@ -86,6 +108,75 @@ class SiteNotification(models.Model):
         return f"notification:{self.user_id}:{self.event_key}:{self.id}"
 
 
+class TelegramNotificationOutbox(models.Model):
+    notification = models.ForeignKey(
+        SiteNotification,
+        on_delete=models.CASCADE,
+        related_name="telegram_outbox_items",
+    )
+    chat_id = models.BigIntegerField()
+    status = models.CharField(
+        max_length=16,
+        choices=TELEGRAM_OUTBOX_STATUS_CHOICES,
+        default=TELEGRAM_OUTBOX_STATUS_PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "feeds"
+        verbose_name = "Telegram-уведомление в очереди"
+        verbose_name_plural = "Очередь Telegram-уведомлений"
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("status", "available_at"), name="tg_outbox_due_idx"),
+            models.Index(fields=("chat_id", "status"), name="tg_outbox_chat_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"telegram-outbox:{self.chat_id}:{self.notification_id}:{self.status}"
+
+
+class NotificationFanoutJob(models.Model):
+    event_key = models.CharField(max_length=80)
+    status = models.CharField(
+        max_length=16,
+        choices=NOTIFICATION_FANOUT_STATUS_CHOICES,
+        default=NOTIFICATION_FANOUT_STATUS_PENDING,
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    cursor_user_id = models.PositiveBigIntegerField(default=0)
+    pending_delivery_ids = models.JSONField(default=list, blank=True)
+    recipients_processed = models.PositiveIntegerField(default=0)
+    notifications_created = models.PositiveIntegerField(default=0)
+    notifications_grouped = models.PositiveIntegerField(default=0)
+    deliveries_sent = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    scheduled_at = models.DateTimeField()
+    locked_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = "feeds"
+        verbose_name = "Рассылка уведомлений"
+        verbose_name_plural = "Рассылки уведомлений"
+        ordering = ("-created_at", "-id")
+        indexes = [
+            models.Index(fields=("status", "scheduled_at"), name="notif_fanout_due_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"notification-fanout:{self.event_key}:{self.id}:{self.status}"
+
+
 class MobilePushDevice(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="mobile_push_devices")
     token = models.CharField(max_length=512, unique=True)
@@ -117,8 +208,20 @@ class MobilePushDevice(models.Model):
 
 __all__ = [
     "MobilePushDevice",
+    "NOTIFICATION_FANOUT_STATUS_CHOICES",
+    "NOTIFICATION_FANOUT_STATUS_DONE",
+    "NOTIFICATION_FANOUT_STATUS_FAILED",
+    "NOTIFICATION_FANOUT_STATUS_PENDING",
+    "NOTIFICATION_FANOUT_STATUS_RUNNING",
     "NOTIFICATION_GROUPING_PERIOD_CHOICES",
+    "NotificationFanoutJob",
     "PUSH_PLATFORM_CHOICES",
     "SiteNotification",
     "SiteNotificationPreference",
+    "TELEGRAM_OUTBOX_STATUS_CHOICES",
+    "TELEGRAM_OUTBOX_STATUS_FAILED",
+    "TELEGRAM_OUTBOX_STATUS_PENDING",
+    "TELEGRAM_OUTBOX_STATUS_SENDING",
+    "TELEGRAM_OUTBOX_STATUS_SENT",
+    "TelegramNotificationOutbox",
 ]
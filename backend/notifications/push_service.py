@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import json
 import re
+import threading
 import time
-import urllib.error
-import urllib.request
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone as dt_timezone
 from functools import lru_cache
 from typing import Any
 
@@ -24,6 +27,13 @@ _TERMINAL_PUSH_ERROR_MARKERS = (
 _APNS_DEVICE_TOKEN_RE = re.compile(r"^[0-9a-fA-F]{64}$")
 _APNS_AUTH_TOKEN_TTL_SECONDS = 50 * 60
 _APNS_AUTH_TOKEN_CACHE: dict[str, Any] = {}
+_FCM_ACCESS_TOKEN_REFRESH_MARGIN_SECONDS = 5 * 60
+_FCM_ACCESS_TOKEN_FALLBACK_TTL_SECONDS = 50 * 60
+_FCM_ACCESS_TOKEN_CACHE: dict[str, Any] = {}
+_PUSH_HTTP_CLIENTS: dict[str, Any] = {}
+_PUSH_STATE_LOCK = threading.Lock()
+_PUSH_PROVIDER_FCM = "fcm"
+_PUSH_PROVIDER_APNS = "apns"
 
 
 def normalize_push_platform(value: str) -> str:
@@ -91,6 +101,9 @@ def _get_apns_provider_config() -> dict[str, Any]:
     team_id = str(getattr(settings, "PUSH_APNS_TEAM_ID", "") or "").strip()
     topic = str(getattr(settings, "PUSH_APNS_TOPIC", "") or "").strip()
     use_sandbox = bool(getattr(settings, "PUSH_APNS_USE_SANDBOX", False))
+    api_url = str(getattr(settings, "PUSH_APNS_API_URL", "") or "").strip().rstrip("/")
+    if not api_url:
+        api_url = "https://api.sandbox.push.apple.com" if use_sandbox else "https://api.push.apple.com"
     missing = [
         label
         for label, value in {
@@ -111,6 +124,7 @@ def _get_apns_provider_config() -> dict[str, Any]:
         "topic": topic,
         "auth_key": auth_key,
         "use_sandbox": use_sandbox,
+        "api_url": api_url,
     }
 
 
@@ -137,6 +151,9 @@ def get_push_provider_config() -> dict[str, Any]:
         "apns_configured": apns_config["configured"],
         "apns_config_error": apns_config["config_error"],
         "project_id": project_id,
+        "fcm_api_url": str(
+            getattr(settings, "PUSH_FCM_API_URL", "") or "https://fcm.googleapis.com"
+        ).rstrip("/"),
         "service_account_info": info,
         "apns": apns_config,
     }
@@ -338,30 +355,93 @@ def _build_push_request_body(notification: SiteNotification, device: MobilePushD
     return body
 
 
+def _fetch_fcm_access_token(service_account_info: dict[str, Any]) -> tuple[str, float | None]:
+    from google.auth.transport.requests import Request
+    from google.oauth2 import service_account
+
+    credentials = service_account.Credentials.from_service_account_info(
+        service_account_info,
+        scopes=list(_PUSH_SCOPES),
+    )
+    credentials.refresh(Request())
+    expires_at = None
+    if credentials.expiry is not None:
+        expires_at = credentials.expiry.replace(tzinfo=dt_timezone.utc).timestamp()
+    return str(credentials.token or "").strip(), expires_at
+
+
 def _get_fcm_access_token() -> tuple[str | None, str | None]:
     config = get_push_provider_config()
     if not config["fcm_configured"]:
         return None, str(config.get("fcm_config_error") or "FCM push provider is not configured")
 
-    try:
-        from google.auth.transport.requests import Request
-        from google.oauth2 import service_account
-    except ImportError as exc:
-        return None, f"push auth dependency is not installed: {exc}"
+    info = config["service_account_info"]
+    cache_key = f"{config['project_id']}:{info.get('client_email') or ''}"
+    with _PUSH_STATE_LOCK:
+        cached = _FCM_ACCESS_TOKEN_CACHE.get(cache_key)
+        if cached and cached.get("expires_at", 0) - _FCM_ACCESS_TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            return str(cached.get("token") or ""), None
 
+        try:
+            token, expires_at = _fetch_fcm_access_token(info)
+        except ImportError as exc:
+            return None, f"push auth dependency is not installed: {exc}"
+        except Exception as exc:
+            return None, str(exc)
+
+        if not token:
+            return None, "failed to get firebase access token"
+        _FCM_ACCESS_TOKEN_CACHE[cache_key] = {
+            "token": token,
+            "expires_at": expires_at or time.time() + _FCM_ACCESS_TOKEN_FALLBACK_TTL_SECONDS,
+        }
+    return token, None
+
+
+def _forget_fcm_access_token(access_token: str) -> None:
+    with _PUSH_STATE_LOCK:
+        for cache_key, cached in list(_FCM_ACCESS_TOKEN_CACHE.items()):
+            if cached.get("token") == access_token:
+                _FCM_ACCESS_TOKEN_CACHE.pop(cache_key, None)
+
+
+def _push_provider_concurrency(provider: str) -> int:
+    setting_name = "PUSH_APNS_MAX_CONCURRENCY" if provider == _PUSH_PROVIDER_APNS else "PUSH_FCM_MAX_CONCURRENCY"
     try:
-        credentials = service_account.Credentials.from_service_account_info(
-            config["service_account_info"],
-            scopes=list(_PUSH_SCOPES),
-        )
-        credentials.refresh(Request())
-    except Exception as exc:
-        return None, str(exc)
+        value = int(getattr(settings, setting_name, 32) or 32)
+    except (TypeError, ValueError):
+        value = 32
+    return max(1, value)
+
+
+def _get_push_http_client(provider: str):
+    import httpx
+
+    with _PUSH_STATE_LOCK:
+        client = _PUSH_HTTP_CLIENTS.get(provider)
+        if client is None or client.is_closed:
+            concurrency = _push_provider_concurrency(provider)
+            client = httpx.Client(
+                http2=True,
+                timeout=float(getattr(settings, "PUSH_REQUEST_TIMEOUT_SECONDS", 5) or 5),
+                limits=httpx.Limits(
+                    max_connections=concurrency,
+                    max_keepalive_connections=concurrency,
+                ),
+            )
+            _PUSH_HTTP_CLIENTS[provider] = client
+    return client
 
-    token = str(credentials.token or "").strip()
-    if not token:
-        return None, "failed to get firebase access token"
-    return token, None
+
+def close_push_http_clients() -> None:
+    with _PUSH_STATE_LOCK:
+        clients = list(_PUSH_HTTP_CLIENTS.values())
+        _PUSH_HTTP_CLIENTS.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
 
 
 def _apns_device_token(value: str) -> str:
@@ -433,28 +513,34 @@ def _is_terminal_push_error(message: str) -> bool:
     return any(marker.lower() in normalized for marker in _TERMINAL_PUSH_ERROR_MARKERS)
 
 
-def _send_fcm_request(project_id: str, access_token: str, body: dict[str, Any]) -> tuple[bool, str]:
-    request_body = json.dumps(body).encode("utf-8")
-    request = urllib.request.Request(
-        f"https://fcm.googleapis.com/v1/projects/{project_id}/messages:send",
-        data=request_body,
-        method="POST",
-        headers={
-            "Authorization": f"Bearer {access_token}",
-            "Content-Type": "application/json; charset=utf-8",
-        },
-    )
+def _send_fcm_request(
+    project_id: str,
+    access_token: str,
+    body: dict[str, Any],
+    *,
+    api_url: str = "https://fcm.googleapis.com",
+) -> tuple[bool, str]:
     try:
-        with urllib.request.urlopen(request, timeout=5) as response:
-            response.read()
-    except urllib.error.HTTPError as exc:
-        raw_body = exc.read().decode("utf-8", errors="ignore")
-        return False, _extract_push_error_message(raw_body)
-    except urllib.error.URLError as exc:
-        return False, str(exc)
+        client = _get_push_http_client(_PUSH_PROVIDER_FCM)
+    except ImportError as exc:
+        return False, f"FCM HTTP/2 dependency is not installed: {exc}"
+
+    try:
+        response = client.post(
+            f"{api_url}/v1/projects/{project_id}/messages:send",
+            content=json.dumps(body).encode("utf-8"),
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json; charset=utf-8",
+            },
+        )
     except Exception as exc:
         return False, str(exc)
-    return True, ""
+    if response.status_code == 200:
+        return True, ""
+    if response.status_code == 401:
+        _forget_fcm_access_token(access_token)
+    return False, _extract_push_error_message(response.text)
 
 
 def _extract_apns_error_message(status_code: int, raw_body: str) -> str:
@@ -503,12 +589,11 @@ def _send_apns_request(
         return False, auth_error or "failed to create APNs auth token"
 
     try:
-        import httpx
+        client = _get_push_http_client(_PUSH_PROVIDER_APNS)
     except ImportError as exc:
         return False, f"APNs HTTP/2 dependency is not installed: {exc}"
 
-    host = "api.sandbox.push.apple.com" if apns_config.get("use_sandbox") else "api.push.apple.com"
-    url = f"https://{host}/3/device/{device_token}"
+    url = f"{apns_config['api_url']}/3/device/{device_token}"
     headers = {
         "authorization": f"bearer {auth_token}",
         "apns-topic": str(apns_config.get("topic") or ""),
@@ -516,8 +601,7 @@ def _send_apns_request(
         "apns-priority": "10",
     }
     try:
-        with httpx.Client(http2=True, timeout=5.0) as client:
-            response = client.post(url, headers=headers, json=_build_apns_payload(notification))
+        response = client.post(url, headers=headers, json=_build_apns_payload(notification))
     except Exception as exc:
         return False, str(exc)
     if response.status_code == 200:
@@ -533,75 +617,150 @@ def _should_send_device_via_apns(device: MobilePushDevice, config: dict[str, Any
     )
 
 
-def send_site_notification_to_push(notification: SiteNotification) -> None:
-    if not notification.is_push:
-        return
+def _send_push_delivery(
+    notification: SiteNotification,
+    device: MobilePushDevice,
+    config: dict[str, Any],
+    fcm_access_token: str | None,
+    fcm_access_token_error: str,
+) -> tuple[bool, str]:
+    if _should_send_device_via_apns(device, config):
+        return _send_apns_request(notification, device, config["apns"])
+    if not config.get("fcm_configured"):
+        return False, "FCM push provider is not configured"
+    if not fcm_access_token:
+        return False, fcm_access_token_error or "failed to initialize FCM push sender"
+    return _send_fcm_request(
+        str(config["project_id"]),
+        fcm_access_token,
+        _build_push_request_body(notification, device),
+        api_url=str(config.get("fcm_api_url") or "https://fcm.googleapis.com"),
+    )
+
+
+def send_site_notifications_to_push(notifications: Iterable[SiteNotification]) -> int:
+    notifications = [notification for notification in notifications if notification.is_push]
+    if not notifications:
+        return 0
 
     config = get_push_provider_config()
     if not config["configured"]:
-        return
+        return 0
+
+    devices_by_user_id: dict[int, list[MobilePushDevice]] = defaultdict(list)
+    for device in MobilePushDevice.objects.filter(
+        user_id__in={notification.user_id for notification in notifications},
+        is_active=True,
+    ).order_by("user_id", "-last_seen_at", "-id"):
+        devices_by_user_id[device.user_id].append(device)
+
+    deliveries_by_provider: dict[str, list[tuple[SiteNotification, MobilePushDevice]]] = defaultdict(list)
+    for notification in notifications:
+        for device in devices_by_user_id.get(notification.user_id, []):
+            provider = _PUSH_PROVIDER_APNS if _should_send_device_via_apns(device, config) else _PUSH_PROVIDER_FCM
+            deliveries_by_provider[provider].append((notification, device))
+    if not deliveries_by_provider:
+        return 0
 
-    devices = list(
-        MobilePushDevice.objects.filter(user=notification.user, is_active=True).order_by("-last_seen_at", "-id")
-    )
-    if not devices:
-        return
-
-    now = timezone.now()
-    sent = False
-    errors: list[str] = []
     fcm_access_token: str | None = None
     fcm_access_token_error = ""
-    fcm_access_token_loaded = False
+    if deliveries_by_provider.get(_PUSH_PROVIDER_FCM) and config.get("fcm_configured"):
+        fcm_access_token, fcm_access_token_error = _get_fcm_access_token()
+    if deliveries_by_provider.get(_PUSH_PROVIDER_APNS):
+        _get_apns_auth_token(config["apns"])
+
+    results: list[tuple[SiteNotification, MobilePushDevice, bool, str]] = []
+    executors: list[ThreadPoolExecutor] = []
+    futures = []
+    try:
+        for provider, deliveries in deliveries_by_provider.items():
+            if len(deliveries) == 1:
+                notification, device = deliveries[0]
+                ok, error_message = _send_push_delivery(
+                    notification, device, config, fcm_access_token, fcm_access_token_error
+                )
+                results.append((notification, device, ok, error_message))
+                continue
+            executor = ThreadPoolExecutor(
+                max_workers=min(len(deliveries), _push_provider_concurrency(provider)),
+                thread_name_prefix=f"push-{provider}",
+            )
+            executors.append(executor)
+            futures.extend(
+                (
+                    notification,
+                    device,
+                    executor.submit(
+                        _send_push_delivery,
+                        notification,
+                        device,
+                        config,
+                        fcm_access_token,
+                        fcm_access_token_error,
+                    ),
+                )
+                for notification, device in deliveries
+            )
+        for notification, device, future in futures:
+            ok, error_message = future.result()
+            results.append((notification, device, ok, error_message))
+    finally:
+        for executor in executors:
+            executor.shutdown(wait=True)
 
-    for device in devices:
-        if _should_send_device_via_apns(device, config):
-            ok, error_message = _send_apns_request(notification, device, config["apns"])
-        else:
-            if not config.get("fcm_configured"):
-                ok = False
-                error_message = "FCM push provider is not configured"
-            else:
-                if not fcm_access_token_loaded:
-                    fcm_access_token, fcm_access_token_error = _get_fcm_access_token()
-                    fcm_access_token_loaded = True
-                if not fcm_access_token:
-                    ok = False
-                    error_message = fcm_access_token_error or "failed to initialize FCM push sender"
-                else:
-                    payload = _build_push_request_body(notification, device)
-                    ok, error_message = _send_fcm_request(str(config["project_id"]), fcm_access_token, payload)
+    now = timezone.now()
+    changed_devices: dict[int, MobilePushDevice] = {}
+    errors_by_notification_id: dict[int, list[str]] = defaultdict(list)
+    sent_notification_ids: set[int] = set()
+    for notification, device, ok, error_message in results:
+        device.last_seen_at = now
+        device.updated_at = now
+        changed_devices[device.id] = device
         if ok:
-            sent = True
+            sent_notification_ids.add(notification.id)
             device.last_push_sent_at = now
             device.last_error = ""
-            device.save(update_fields=["last_push_sent_at", "last_error", "last_seen_at", "updated_at"])
             continue
-
         device.last_error = error_message
-        update_fields = ["last_error", "last_seen_at", "updated_at"]
         if _is_terminal_push_error(error_message):
             device.is_active = False
-            update_fields.append("is_active")
-        device.save(update_fields=update_fields)
         if error_message:
-            errors.append(f"{device.platform}: {error_message}")
+            errors_by_notification_id[notification.id].append(f"{device.platform}: {error_message}")
 
-    notification.push_error = "; ".join(errors[:3])[:2000] if errors else ""
-    update_fields = ["push_error", "updated_at"]
-    if sent:
-        notification.push_sent_at = now
-        update_fields.append("push_sent_at")
-    notification.save(update_fields=update_fields)
+    with transaction.atomic():
+        MobilePushDevice.objects.bulk_update(
+            list(changed_devices.values()),
+            ["is_active", "last_push_sent_at", "last_error", "last_seen_at", "updated_at"],
+            batch_size=500,
+        )
+        delivered_notifications = {notification.id: notification for notification, _device, _ok, _error in results}
+        for notification in delivered_notifications.values():
+            errors = errors_by_notification_id.get(notification.id) or []
+            notification.push_error = "; ".join(errors[:3])[:2000] if errors else ""
+            notification.updated_at = now
+            if notification.id in sent_notification_ids:
+                notification.push_sent_at = now
+        SiteNotification.objects.bulk_update(
+            list(delivered_notifications.values()),
+            ["push_error", "push_sent_at", "updated_at"],
+            batch_size=500,
+        )
+    return len(sent_notification_ids)
+
+
+def send_site_notification_to_push(notification: SiteNotification) -> None:
+    send_site_notifications_to_push([notification])
 
 
 __all__ = [
     "_serialize_push_device_item",
+    "close_push_http_clients",
     "deactivate_push_devices_for_user",
     "get_push_provider_config",
     "is_push_configured",
     "normalize_push_platform",
     "register_push_device_for_user",
     "send_site_notification_to_push",
+    "send_site_notifications_to_push",
     "summarize_push_devices_for_user",
 ]
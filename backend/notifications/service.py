@@ -382,6 +382,106 @@ def update_notification_settings_for_user(
     return serialize_notification_settings_for_user(user)
 
 
+def _notification_definition_for_event(event_key: str) -> dict[str, Any]:
+    return (
+        get_notification_event_definition(_notification_preference_key(event_key))
+        or get_notification_event_definition(event_key)
+        or {}
+    )
+
+
+def _notification_channel_flags(
+    pref: SiteNotificationPreference | None,
+    definition: dict[str, Any],
+    *,
+    force_site: bool | None = None,
+    force_telegram: bool | None = None,
+    force_push: bool | None = None,
+) -> tuple[bool, bool, bool]:
+    is_site = bool(force_site) if force_site is not None else bool(
+        pref.site_enabled if pref else definition.get("default_site_enabled", True)
+    )
+    is_telegram = bool(force_telegram) if force_telegram is not None else bool(
+        pref.telegram_enabled if pref else definition.get("default_telegram_enabled", False)
+    )
+    is_push = bool(force_push) if force_push is not None else bool(
+        pref.push_enabled if pref else definition.get("default_push_enabled", True)
+    )
+    return is_site, is_telegram, is_push
+
+
+def _notification_grouping_period(
+    pref: SiteNotificationPreference | None,
+    definition: dict[str, Any],
+) -> str:
+    if not definition.get("supports_grouping"):
+        return "none"
+    default_grouping_period = _default_grouping_period(definition)
+    return _normalize_grouping_period(
+        pref.grouping_period if pref else default_grouping_period,
+        default=default_grouping_period,
+    )
+
+
+GROUPED_NOTIFICATION_UPDATE_FIELDS = [
+    "title",
+    "message",
+    "link_url",
+    "payload",
+    "group_count",
+    "is_site",
+    "is_telegram",
+    "is_push",
+    "delivery_at",
+    "delivered_at",
+    "telegram_sent_at",
+    "telegram_error",
+    "push_sent_at",
+    "push_error",
+    "read_at",
+    "updated_at",
+]
+
+
+def _merge_item_into_grouped_notification(
+    notification: SiteNotification,
+    *,
+    title: str,
+    message: str,
+    link_url: str,
+    payload: dict[str, Any] | None,
+    item: dict[str, Any],
+    channels: tuple[bool, bool, bool],
+    delivery_at,
+    defer_delivery: bool,
+    now,
+) -> None:
+    group_payload = notification.payload if isinstance(notification.payload, dict) else {}
+    items = list(group_payload.get("items") or [])
+    item_id = item.get("id") if item else None
+    if item and not any(existing.get("id") == item_id for existing in items if isinstance(existing, dict)):
+        items.append(item)
+    group_payload.update(payload or {})
+    group_payload["items"] = items[-100:]
+    notification.title = str(title or "").strip()[:255]
+    notification.message = str(message or "").strip()
+    notification.link_url = str(link_url or "").strip()[:500]
+    notification.payload = group_payload
+    notification.group_count = max(len(items), int(notification.group_count or 0), 1)
+    notification.is_site, notification.is_telegram, notification.is_push = channels
+    notification.delivery_at = delivery_at
+    if defer_delivery:
+        notification.delivered_at = None
+        notification.telegram_sent_at = None
+        notification.telegram_error = ""
+        notification.push_sent_at = None
+        notification.push_error = ""
+    else:
+        notification.delivered_at = now
+    notification.read_at = None
+    notification.updated_at = now
+
+
 def create_user_notification(
     *,
     user: User | None,
@@ -398,18 +498,15 @@ def create_user_notification(
         return None
 
     preference_key = _notification_preference_key(event_key)
-    definition = get_notification_event_definition(preference_key) or get_notification_event_definition(event_key) or {}
+    definition = _notification_definition_for_event(event_key)
     preferences = _ensure_user_notification_preferences(user)
 
-    pref = preferences.get(preference_key)
-    is_site = bool(force_site) if force_site is not None else bool(
-        pref.site_enabled if pref else definition.get("default_site_enabled", True)
-    )
-    is_telegram = bool(force_telegram) if force_telegram is not None else bool(
-        pref.telegram_enabled if pref else definition.get("default_telegram_enabled", False)
-    )
-    is_push = bool(force_push) if force_push is not None else bool(
-        pref.push_enabled if pref else definition.get("default_push_enabled", True)
+    is_site, is_telegram, is_push = _notification_channel_flags(
+        preferences.get(preference_key),
+        definition,
+        force_site=force_site,
+        force_telegram=force_telegram,
+        force_push=force_push,
     )
 
     if not is_site and not is_telegram and not is_push:
@@ -467,17 +564,14 @@ def create_grouped_user_notification(
         )
 
     preference_key = _notification_preference_key(event_key)
-    definition = get_notification_event_definition(preference_key) or get_notification_event_definition(event_key) or {}
+    definition = _notification_definition_for_event(event_key)
     preferences = _ensure_user_notification_preferences(user)
-    pref = preferences.get(preference_key)
-    is_site = bool(force_site) if force_site is not None else bool(
-        pref.site_enabled if pref else definition.get("default_site_enabled", True)
-    )
-    is_telegram = bool(force_telegram) if force_telegram is not None else bool(
-        pref.telegram_enabled if pref else definition.get("default_telegram_enabled", False)
-    )
-    is_push = bool(force_push) if force_push is not None else bool(
-        pref.push_enabled if pref else definition.get("default_push_enabled", True)
+    is_site, is_telegram, is_push = _notification_channel_flags(
+        preferences.get(preference_key),
+        definition,
+        force_site=force_site,
+        force_telegram=force_telegram,
+        force_push=force_push,
     )
     if not is_site and not is_telegram and not is_push:
         return None
@@ -511,51 +605,19 @@ def create_grouped_user_notification(
                 delivered_at=delivered_at,
             )
         else:
-            group_payload = notification.payload if isinstance(notification.payload, dict) else {}
-            items = list(group_payload.get("items") or [])
-            item_id = item.get("id") if item else None
-            if item and not any(existing.get("id") == item_id for existing in items if isinstance(existing, dict)):
-                items.append(item)
-            group_payload.update(payload or {})
-            group_payload["items"] = items[-100:]
-            notification.title = str(title or "").strip()[:255]
-            notification.message = str(message or "").strip()
-            notification.link_url = str(link_url or "").strip()[:500]
-            notification.payload = group_payload
-            notification.group_count = max(len(items), int(notification.group_count or 0), 1)
-            notification.is_site = is_site
-            notification.is_telegram = is_telegram
-            notification.is_push = is_push
-            notification.delivery_at = effective_delivery_at
-            if defer_delivery:
-                notification.delivered_at = None
-                notification.telegram_sent_at = None
-                notification.telegram_error = ""
-                notification.push_sent_at = None
-                notification.push_error = ""
-            else:
-                notification.delivered_at = now
-            notification.read_at = None
-            notification.save(
-                update_fields=[
-                    "title",
-                    "message",
-                    "link_url",
-                    "payload",
-                    "group_count",
-                    "is_site",
-                    "is_telegram",
-                    "is_push",
-                    "delivery_at",
-                    "delivered_at",
-                    "telegram_sent_at",
-                    "telegram_error",
-                    "push_sent_at",
-                    "push_error",
-                    "read_at",
-                    "updated_at",
-                ]
+            _merge_item_into_grouped_notification(
+                notification,
+                title=title,
+                message=message,
+                link_url=link_url,
+                payload=payload,
+                item=item,
+                channels=(is_site, is_telegram, is_push),
+                delivery_at=effective_delivery_at,
+                defer_delivery=defer_delivery,
+                now=now,
             )
+            notification.save(update_fields=GROUPED_NOTIFICATION_UPDATE_FIELDS)
 
     if defer_delivery:
         return notification
@@ -656,12 +718,7 @@ def notification_grouping_period_for_user(user: User | None, event_key: str) ->
     if not definition.get("supports_grouping"):
         return "none"
     preferences = _ensure_user_notification_preferences(user)
-    pref = preferences.get(event_key)
-    default_grouping_period = _default_grouping_period(definition)
-    return _normalize_grouping_period(
-        pref.grouping_period if pref else default_grouping_period,
-        default=default_grouping_period,
-    )
+    return _notification_grouping_period(preferences.get(event_key), definition)
 
 
 def list_site_notifications_for_user(
@@ -0,0 +1,266 @@
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from notifications.models import (
+    TELEGRAM_OUTBOX_STATUS_FAILED,
+    TELEGRAM_OUTBOX_STATUS_PENDING,
+    TELEGRAM_OUTBOX_STATUS_SENDING,
+    TELEGRAM_OUTBOX_STATUS_SENT,
+    SiteNotification,
+    TelegramNotificationOutbox,
+)
+from telegram_integration.service import (
+    TELEGRAM_MESSAGE_LIMIT,
+    send_telegram_bot_message,
+    site_notification_telegram_text,
+)
+
+TELEGRAM_OUTBOX_BATCH_SIZE = 200
+TELEGRAM_OUTBOX_MAX_ATTEMPTS = 5
+TELEGRAM_OUTBOX_STALE_AFTER = timedelta(minutes=10)
+TELEGRAM_OUTBOX_RETRY_BASE_SECONDS = 30
+TELEGRAM_OUTBOX_GLOBAL_MESSAGES_PER_SECOND = 25.0
+TELEGRAM_OUTBOX_CHAT_MESSAGES_PER_SECOND = 1.0
+TELEGRAM_OUTBOX_CHAT_BURST = 1.0
+TELEGRAM_OUTBOX_MESSAGE_SEPARATOR = "\n\n———\n\n"
+_TELEGRAM_TERMINAL_ERROR_CODES = {400, 403}
+_CHAT_BUCKET_IDLE_SECONDS = 10 * 60
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float, *, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def take(self) -> float:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        self._refill()
+        self.tokens = min(self.tokens, 0.0) - max(float(seconds), 0.0) * self.rate
+
+
+_global_bucket = TokenBucket(
+    TELEGRAM_OUTBOX_GLOBAL_MESSAGES_PER_SECOND,
+    TELEGRAM_OUTBOX_GLOBAL_MESSAGES_PER_SECOND,
+)
+_chat_buckets: dict[int, TokenBucket] = {}
+
+
+def _chat_bucket(chat_id: int) -> TokenBucket:
+    bucket = _chat_buckets.get(chat_id)
+    if bucket is None:
+        if len(_chat_buckets) > 10000:
+            idle_before = time.monotonic() - _CHAT_BUCKET_IDLE_SECONDS
+            for stale_chat_id in [key for key, value in _chat_buckets.items() if value.updated_at < idle_before]:
+                _chat_buckets.pop(stale_chat_id, None)
+        bucket = TokenBucket(TELEGRAM_OUTBOX_CHAT_MESSAGES_PER_SECOND, TELEGRAM_OUTBOX_CHAT_BURST)
+        _chat_buckets[chat_id] = bucket
+    return bucket
+
+
+def _coalesce_outbox_items(
+    items: list[TelegramNotificationOutbox],
+) -> list[tuple[list[TelegramNotificationOutbox], str]]:
+    messages: list[tuple[list[TelegramNotificationOutbox], str]] = []
+    current_items: list[TelegramNotificationOutbox] = []
+    current_text = ""
+    for item in items:
+        text = site_notification_telegram_text(item.notification)
+        if not text:
+            continue
+        candidate = f"{current_text}{TELEGRAM_OUTBOX_MESSAGE_SEPARATOR}{text}" if current_text else text
+        if current_items and len(candidate) > TELEGRAM_MESSAGE_LIMIT:
+            messages.append((current_items, current_text))
+            current_items, current_text = [item], text
+            continue
+        current_items.append(item)
+        current_text = candidate
+    if current_items:
+        messages.append((current_items, current_text))
+    return messages
+
+
+def process_telegram_outbox(*, limit: int = TELEGRAM_OUTBOX_BATCH_SIZE) -> dict[str, int]:
+    stats = {"claimed": 0, "messages": 0, "sent": 0, "deferred": 0, "failed": 0, "skipped": 0}
+    now = timezone.now()
+    _reset_stale_sending_outbox_items(now)
+    items = _claim_due_outbox_items(limit=max(int(limit), 1), now=now)
+    if not items:
+        return stats
+    stats["claimed"] = len(items)
+
+    token = (getattr(settings, "TELEGRAM_BOT_TOKEN", "") or "").strip()
+    items_by_chat_id: dict[int, list[TelegramNotificationOutbox]] = defaultdict(list)
+    for item in items:
+        items_by_chat_id[int(item.chat_id)].append(item)
+
+    sent_items: list[TelegramNotificationOutbox] = []
+    changed_items: list[TelegramNotificationOutbox] = []
+    errored_notifications: dict[int, SiteNotification] = {}
+
+    for chat_id, chat_items in items_by_chat_id.items():
+        messages = _coalesce_outbox_items(chat_items)
+        skipped_items = {item.id for item in chat_items} - {
+            item.id for message_items, _text in messages for item in message_items
+        }
+        for item in chat_items:
+            if item.id in skipped_items:
+                item.status = TELEGRAM_OUTBOX_STATUS_FAILED
+                item.last_error = "пустой текст уведомления"
+                item.locked_at = None
+                changed_items.append(item)
+                stats["skipped"] += 1
+
+        bucket = _chat_bucket(chat_id)
+        for index, (message_items, text) in enumerate(messages):
+            wait = bucket.take() if token else 0.0
+            if not token or wait > 0:
+                deferred_until = timezone.now() + timedelta(seconds=max(wait, 1.0) if token else 60)
+                for pending_items, _pending_text in messages[index:]:
+                    for item in pending_items:
+                        item.status = TELEGRAM_OUTBOX_STATUS_PENDING
+                        item.available_at = deferred_until
+                        item.locked_at = None
+                        if not token:
+                            item.last_error = "TELEGRAM_BOT_TOKEN не настроен"
+                        changed_items.append(item)
+                        stats["deferred"] += 1
+                break
+
+            global_wait = _global_bucket.take()
+            while global_wait > 0:
+                time.sleep(global_wait)
+                global_wait = _global_bucket.take()
+
+            ok, error, error_code, retry_after = send_telegram_bot_message(token, chat_id, text)
+            stats["messages"] += 1
+            if ok:
+                sent_items.extend(message_items)
+                stats["sent"] += len(message_items)
+                continue
+
+            if retry_after:
+                bucket.penalize(retry_after)
+                deferred_until = timezone.now() + timedelta(seconds=retry_after)
+                for pending_items, _pending_text in messages[index:]:
+                    for item in pending_items:
+                        item.status = TELEGRAM_OUTBOX_STATUS_PENDING
+                        item.available_at = deferred_until
+                        item.locked_at = None
+                        item.last_error = error[:2000]
+                        changed_items.append(item)
+                        stats["deferred"] += 1
+                break
+
+            for item in message_items:
+                item.attempts = int(item.attempts or 0) + 1
+                item.last_error = error[:2000]
+                item.locked_at = None
+                if error_code in _TELEGRAM_TERMINAL_ERROR_CODES or item.attempts >= TELEGRAM_OUTBOX_MAX_ATTEMPTS:
+                    item.status = TELEGRAM_OUTBOX_STATUS_FAILED
+                    stats["failed"] += 1
+                else:
+                    item.status = TELEGRAM_OUTBOX_STATUS_PENDING
+                    item.available_at = timezone.now() + timedelta(
+                        seconds=TELEGRAM_OUTBOX_RETRY_BASE_SECONDS * 2 ** (item.attempts - 1)
+                    )
+                    stats["deferred"] += 1
+                changed_items.append(item)
+                item.notification.telegram_error = error[:2000]
+                errored_notifications[item.notification_id] = item.notification
+
+    _record_outbox_results(sent_items, changed_items, list(errored_notifications.values()))
+    return stats
+
+
+def _claim_due_outbox_items(*, limit: int, now) -> list[TelegramNotificationOutbox]:
+    with transaction.atomic():
+        items = list(
+            TelegramNotificationOutbox.objects.select_for_update(skip_locked=True, of=("self",))
+            .select_related("notification")
+            .filter(status=TELEGRAM_OUTBOX_STATUS_PENDING, available_at__lte=now)
+            .order_by("id")[:limit]
+        )
+        if items:
+            TelegramNotificationOutbox.objects.filter(id__in=[item.id for item in items]).update(
+                status=TELEGRAM_OUTBOX_STATUS_SENDING,
+                locked_at=now,
+                updated_at=now,
+            )
+    return items
+
+
+def _record_outbox_results(
+    sent_items: list[TelegramNotificationOutbox],
+    changed_items: list[TelegramNotificationOutbox],
+    errored_notifications: list[SiteNotification],
+) -> None:
+    now = timezone.now()
+    with transaction.atomic():
+        if sent_items:
+            TelegramNotificationOutbox.objects.filter(id__in=[item.id for item in sent_items]).update(
+                status=TELEGRAM_OUTBOX_STATUS_SENT,
+                sent_at=now,
+                locked_at=None,
+                last_error="",
+                updated_at=now,
+            )
+            SiteNotification.objects.filter(id__in={item.notification_id for item in sent_items}).update(
+                telegram_sent_at=now,
+                telegram_error="",
+                updated_at=now,
+            )
+        if changed_items:
+            for item in changed_items:
+                item.updated_at = now
+            TelegramNotificationOutbox.objects.bulk_update(
+                changed_items,
+                ["status", "attempts", "last_error", "available_at", "locked_at", "updated_at"],
+                batch_size=500,
+            )
+        if errored_notifications:
+            for notification in errored_notifications:
+                notification.updated_at = now
+            SiteNotification.objects.bulk_update(
+                errored_notifications,
+                ["telegram_error", "updated_at"],
+                batch_size=500,
+            )
+
+
+def _reset_stale_sending_outbox_items(now) -> int:
+    return TelegramNotificationOutbox.objects.filter(
+        status=TELEGRAM_OUTBOX_STATUS_SENDING,
+        locked_at__lt=now - TELEGRAM_OUTBOX_STALE_AFTER,
+    ).update(
+        status=TELEGRAM_OUTBOX_STATUS_PENDING,
+        available_at=now,
+        locked_at=None,
+        updated_at=now,
+    )
+
+
+__all__ = [
+    "TokenBucket",
+    "process_telegram_outbox",
+]
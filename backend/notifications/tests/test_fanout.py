@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from communities.models import Comun
+from my_feed.models import UserFeedSettings
+from notifications.fanout import (
+    FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS,
+    enqueue_notification_fanout,
+    process_due_notification_fanout_jobs,
+)
+from notifications.models import (
+    NOTIFICATION_FANOUT_STATUS_DONE,
+    NotificationFanoutJob,
+    SiteNotification,
+    SiteNotificationPreference,
+)
+
+User = get_user_model()
+
+
+class NotificationFanoutTests(TestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username="fanout-owner", password="secret")
+        self.comun = Comun.objects.create(name="Fanout", slug="fanout", creator=self.owner)
+        self.subscribers = [
+            User.objects.create_user(username=f"fanout-subscriber-{index}", password="secret")
+            for index in range(5)
+        ]
+        for user in [self.owner, *self.subscribers]:
+            UserFeedSettings.objects.create(user=user, my_feed_comuns=[self.comun.slug])
+        User.objects.filter(id=self.subscribers[-1].id).update(is_active=False)
+
+    def _enqueue(self, **kwargs) -> NotificationFanoutJob:
+        delivery_at = timezone.now() + timedelta(days=1)
+        return enqueue_notification_fanout(
+            event_key="post_published",
+            recipients={"type": FANOUT_RECIPIENTS_COMUN_SUBSCRIBERS, "comun_id": self.comun.id},
+            exclude_user_ids=[self.owner.id],
+            notification={
+                "title": "Пост опубликован",
+                "message": "Опубликован пост",
+                "link_url": "/b/post/1-first",
+                "payload": {"post_id": 1},
+            },
+            groups={
+                "day": {
+                    "group_key": "post_published:day:2026-06-29",
+                    "delivery_at": delivery_at.isoformat(),
+                    "title": "Новые посты за день",
+                    "link_url": "/b/post/1-first",
+                    "payload": {"grouping_period": "day", "group_label": "за день"},
+                    "group_item": {"id": 1, "title": "Первый пост", "link_url": "/b/post/1-first"},
+                },
+            },
+            **kwargs,
+        )
+
+    def test_fanout_job_bulk_creates_notifications_for_active_subscribers(self):
+        SiteNotificationPreference.objects.create(
+            user=self.subscribers[0],
+            event_key="post_published",
+            grouping_period="day",
+        )
+        job = self._enqueue()
+
+        with (
+            patch("notifications.fanout.enqueue_site_notifications_to_telegram") as telegram_mock,
+            patch("notifications.fanout.send_site_notifications_to_push") as push_mock,
+        ):
+            stats = process_due_notification_fanout_jobs(chunk_size=2)
+
+        self.assertEqual(stats["done"], 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, NOTIFICATION_FANOUT_STATUS_DONE)
+        self.assertEqual(job.recipients_processed, 4)
+        self.assertEqual(job.notifications_created, 3)
+        self.assertEqual(job.notifications_grouped, 1)
+        self.assertEqual(job.pending_delivery_ids, [])
+        self.assertEqual(push_mock.call_count, 2)
+        self.assertEqual(sum(len(call.args[0]) for call in push_mock.call_args_list), 3)
+        telegram_mock.assert_not_called()
+
+        self.assertFalse(SiteNotification.objects.filter(user=self.owner).exists())
+        self.assertFalse(SiteNotification.objects.filter(user=self.subscribers[-1]).exists())
+        grouped = SiteNotification.objects.get(user=self.subscribers[0])
+        self.assertEqual(grouped.group_key, "post_published:day:2026-06-29")
+        self.assertIsNone(grouped.delivered_at)
+        self.assertEqual(
+            SiteNotification.objects.filter(
+                event_key="post_published",
+                group_key="",
+                delivered_at__isnull=False,
+            ).count(),
+            3,
+        )
+
+    def test_fanout_job_resumes_from_cursor(self):
+        job = self._enqueue()
+        NotificationFanoutJob.objects.filter(id=job.id).update(cursor_user_id=self.subscribers[1].id)
+
+        with (
+            patch("notifications.fanout.enqueue_site_notifications_to_telegram"),
+            patch("notifications.fanout.send_site_notifications_to_push"),
+        ):
+            process_due_notification_fanout_jobs()
+
+        self.assertEqual(
+            set(SiteNotification.objects.values_list("user_id", flat=True)),
+            {self.subscribers[2].id, self.subscribers[3].id},
+        )
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from notifications import push_service
+from notifications.models import MobilePushDevice, SiteNotification
+from notifications.push_service import (
+    close_push_http_clients,
+    send_site_notification_to_push,
+    send_site_notifications_to_push,
+)
+
+User = get_user_model()
+
+
+class _StubFcmHandler(BaseHTTPRequestHandler):
+    requests: list[dict] = []
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length).decode("utf-8"))
+        self.requests.append(
+            {
+                "path": self.path,
+                "authorization": self.headers.get("Authorization"),
+                "token": body["message"]["token"],
+            }
+        )
+        if body["message"]["token"].startswith("dead-"):
+            status = 404
+            response = {"error": {"status": "NOT_FOUND", "message": "UNREGISTERED"}}
+        else:
+            status = 200
+            response = {"name": "projects/demo/messages/1"}
+        raw_response = json.dumps(response).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw_response)))
+        self.end_headers()
+        self.wfile.write(raw_response)
+
+    def log_message(self, format, *args):
+        return
+
+
+class PushDeliveryEngineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubFcmHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.server_thread.start()
+        cls.settings_override = override_settings(
+            PUSH_FCM_PROJECT_ID="demo",
+            PUSH_FCM_SERVICE_ACCOUNT_JSON=json.dumps({"project_id": "demo", "client_email": "push@demo"}),
+            PUSH_FCM_SERVICE_ACCOUNT_FILE="",
+            PUSH_FCM_API_URL=f"http://127.0.0.1:{cls.server.server_address[1]}",
+            PUSH_FCM_MAX_CONCURRENCY=4,
+            PUSH_APNS_KEY_ID="",
+            PUSH_APNS_TEAM_ID="",
+            PUSH_APNS_TOPIC="",
+            PUSH_APNS_AUTH_KEY="",
+            PUSH_APNS_AUTH_KEY_FILE="",
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        close_push_http_clients()
+        push_service._load_push_service_account_info.cache_clear()
+        push_service._load_apns_auth_key.cache_clear()
+        super().tearDownClass()
+
+    def setUp(self):
+        _StubFcmHandler.requests = []
+        push_service._FCM_ACCESS_TOKEN_CACHE.clear()
+        push_service._load_push_service_account_info.cache_clear()
+        push_service._load_apns_auth_key.cache_clear()
+        self.users = [User.objects.create_user(username=f"push-user-{index}", password="secret") for index in range(3)]
+        for index, user in enumerate(self.users):
+            MobilePushDevice.objects.create(user=user, token=f"live-token-{index}", platform="android")
+        MobilePushDevice.objects.create(user=self.users[0], token="dead-token-0", platform="android")
+
+    def _notification(self, user) -> SiteNotification:
+        return SiteNotification.objects.create(
+            user=user,
+            event_key="post_published",
+            title="Пост опубликован",
+            message="Опубликован пост",
+            is_push=True,
+        )
+
+    def test_batch_sends_through_pooled_client_and_bulk_updates_state(self):
+        notifications = [self._notification(user) for user in self.users]
+
+        with patch(
+            "notifications.push_service._fetch_fcm_access_token",
+            return_value=("access-1", time.time() + 3600),
+        ) as fetch_mock:
+            sent = send_site_notifications_to_push(notifications)
+            send_site_notification_to_push(self._notification(self.users[1]))
+
+        self.assertEqual(sent, 3)
+        fetch_mock.assert_called_once()
+        self.assertEqual(len(_StubFcmHandler.requests), 5)
+        self.assertTrue(all(item["authorization"] == "Bearer access-1" for item in _StubFcmHandler.requests))
+        self.assertTrue(all(item["path"] == "/v1/projects/demo/messages:send" for item in _StubFcmHandler.requests))
+
+        dead_device = MobilePushDevice.objects.get(token="dead-token-0")
+        self.assertFalse(dead_device.is_active)
+        self.assertIn("UNREGISTERED", dead_device.last_error)
+        live_device = MobilePushDevice.objects.get(token="live-token-0")
+        self.assertTrue(live_device.is_active)
+        self.assertIsNotNone(live_device.last_push_sent_at)
+
+        first = SiteNotification.objects.get(id=notifications[0].id)
+        self.assertIsNotNone(first.push_sent_at)
+        self.assertIn("UNREGISTERED", first.push_error)
+        self.assertEqual(SiteNotification.objects.filter(push_sent_at__isnull=False).count(), 4)
+
+    def test_fcm_access_token_is_refreshed_before_expiry(self):
+        with patch(
+            "notifications.push_service._fetch_fcm_access_token",
+            side_effect=[("access-1", time.time() + 60), ("access-2", time.time() + 3600)],
+        ) as fetch_mock:
+            send_site_notification_to_push(self._notification(self.users[1]))
+            send_site_notification_to_push(self._notification(self.users[2]))
+
+        self.assertEqual(fetch_mock.call_count, 2)
+        self.assertEqual(
+            [item["authorization"] for item in _StubFcmHandler.requests],
+            ["Bearer access-1", "Bearer access-2"],
+        )
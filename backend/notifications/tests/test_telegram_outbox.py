@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from notifications import telegram_outbox
+from notifications.models import (
+    TELEGRAM_OUTBOX_STATUS_FAILED,
+    TELEGRAM_OUTBOX_STATUS_PENDING,
+    TELEGRAM_OUTBOX_STATUS_SENT,
+    SiteNotification,
+    TelegramNotificationOutbox,
+)
+from notifications.telegram_outbox import TokenBucket, process_telegram_outbox
+from telegram_integration.models import TelegramAccount
+from telegram_integration.service import send_site_notification_to_telegram
+
+User = get_user_model()
+
+
+@override_settings(TELEGRAM_BOT_TOKEN="bot-token", SITE_BASE_URL="https://comuna.test")
+class TelegramOutboxTests(TestCase):
+    def setUp(self):
+        telegram_outbox._chat_buckets.clear()
+        self.first = User.objects.create_user(username="tg-first", password="secret")
+        self.second = User.objects.create_user(username="tg-second", password="secret")
+        TelegramAccount.objects.create(user=self.first, telegram_id=1001)
+        TelegramAccount.objects.create(user=self.second, telegram_id=1002)
+
+    def _notify(self, user, title: str) -> SiteNotification:
+        notification = SiteNotification.objects.create(
+            user=user,
+            event_key="post_comment",
+            title=title,
+            message="Текст",
+            link_url="/b/post/1-first",
+            is_telegram=True,
+        )
+        send_site_notification_to_telegram(notification)
+        return notification
+
+    def test_send_enqueues_once_without_calling_bot_api(self):
+        with patch("telegram_integration.service.urllib.request.urlopen") as urlopen_mock:
+            notification = self._notify(self.first, "Первый")
+            send_site_notification_to_telegram(notification)
+
+        urlopen_mock.assert_not_called()
+        item = TelegramNotificationOutbox.objects.get(notification=notification)
+        self.assertEqual(item.chat_id, 1001)
+        self.assertEqual(item.status, TELEGRAM_OUTBOX_STATUS_PENDING)
+
+    def test_worker_coalesces_pending_notifications_per_chat(self):
+        first_notifications = [self._notify(self.first, f"Комментарий {index}") for index in range(3)]
+        second_notification = self._notify(self.second, "Другой чат")
+
+        with patch(
+            "notifications.telegram_outbox.send_telegram_bot_message",
+            return_value=(True, "", 0, 0),
+        ) as send_mock:
+            stats = process_telegram_outbox()
+
+        self.assertEqual(stats["messages"], 2)
+        self.assertEqual(stats["sent"], 4)
+        texts_by_chat = {call.args[1]: call.args[2] for call in send_mock.call_args_list}
+        self.assertEqual(set(texts_by_chat), {1001, 1002})
+        for index in range(3):
+            self.assertIn(f"Комментарий {index}", texts_by_chat[1001])
+        self.assertIn("https://comuna.test/b/post/1-first", texts_by_chat[1002])
+        self.assertEqual(
+            SiteNotification.objects.filter(
+                id__in=[item.id for item in [*first_notifications, second_notification]],
+                telegram_sent_at__isnull=False,
+            ).count(),
+            4,
+        )
+        self.assertFalse(TelegramNotificationOutbox.objects.exclude(status=TELEGRAM_OUTBOX_STATUS_SENT).exists())
+
+    def test_worker_defers_chat_over_rate_limit(self):
+        self._notify(self.first, "Первый")
+        with patch(
+            "notifications.telegram_outbox.send_telegram_bot_message",
+            return_value=(True, "", 0, 0),
+        ) as send_mock:
+            process_telegram_outbox()
+            second = self._notify(self.first, "Второй")
+            stats = process_telegram_outbox()
+
+        self.assertEqual(send_mock.call_count, 1)
+        self.assertEqual(stats["deferred"], 1)
+        item = TelegramNotificationOutbox.objects.get(notification=second)
+        self.assertEqual(item.status, TELEGRAM_OUTBOX_STATUS_PENDING)
+        self.assertGreater(item.available_at, timezone.now())
+
+    def test_worker_honours_retry_after_and_fails_blocked_chats(self):
+        throttled = self._notify(self.first, "Первый")
+        blocked = self._notify(self.second, "Второй")
+
+        def fake_send(token, chat_id, text):
+            if chat_id == 1001:
+                return False, "Too Many Requests: retry after 30", 429, 30
+            return False, "Forbidden: bot was blocked by the user", 403, 0
+
+        with patch("notifications.telegram_outbox.send_telegram_bot_message", side_effect=fake_send):
+            process_telegram_outbox()
+
+        throttled_item = TelegramNotificationOutbox.objects.get(notification=throttled)
+        self.assertEqual(throttled_item.status, TELEGRAM_OUTBOX_STATUS_PENDING)
+        self.assertEqual(throttled_item.attempts, 0)
+        self.assertGreater((throttled_item.available_at - timezone.now()).total_seconds(), 20)
+        blocked_item = TelegramNotificationOutbox.objects.get(notification=blocked)
+        self.assertEqual(blocked_item.status, TELEGRAM_OUTBOX_STATUS_FAILED)
+        blocked.refresh_from_db()
+        self.assertIn("blocked", blocked.telegram_error)
+        self.assertIsNone(blocked.telegram_sent_at)
+
+
+class TokenBucketTests(TestCase):
+    def test_bucket_refills_at_rate(self):
+        clock = [0.0]
+        bucket = TokenBucket(2, 2, clock=lambda: clock[0])
+
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0)
+        self.assertAlmostEqual(bucket.take(), 0.5)
+        clock[0] = 0.5
+        self.assertEqual(bucket.take(), 0)
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import threading
+import time
+from collections import Counter
 from functools import wraps
 from hashlib import sha256
 from typing import Callable
@@ -9,6 +12,18 @@ from django.core.cache import cache
 from django.http import HttpRequest, HttpResponse
 from django.utils.cache import patch_vary_headers
 
+ANONYMOUS_CACHE_EARLY_REFRESH_RATIO = 0.9
+ANONYMOUS_CACHE_LOCK_SECONDS = 30
+ANONYMOUS_CACHE_WAIT_SECONDS = 2.0
+ANONYMOUS_CACHE_WAIT_STEP_SECONDS = 0.05
+ANONYMOUS_CACHE_STATS_FLUSH_SECONDS = 10
+ANONYMOUS_CACHE_OUTCOMES = ("hit", "miss", "stale", "refresh")
+PUBLIC_CACHE_TAG_SECONDS = 24 * 60 * 60
+
+_CACHE_PREFIXES: set[str] = set()
+_STATS_LOCK = threading.Lock()
+_PENDING_STATS: Counter = Counter()
+_STATS_FLUSHED_AT = 0.0
 
 def _cache_prefix_version_key(prefix: str) -> str:
     return f"public-api:{prefix}:version"
@@ -22,6 +37,33 @@ def bump_public_cache_prefix(prefix: str) -> None:
         cache.set(version_key, 2, timeout=None)
 
 
+def _cache_tag_key(tag: str) -> str:
+    return f"public-api:tag:{tag}"
+
+
+def cache_tag(kind: str, object_id: object) -> str:
+    return f"{kind}:{object_id}"
+
+
+def add_cache_tags(request: HttpRequest, *tags: str) -> None:
+    """Records objects the response depends on; see invalidate_cache_tags."""
+    request._public_cache_tags = getattr(request, "_public_cache_tags", set()) | {tag for tag in tags if tag}
+
+
+def invalidate_cache_tags(*tags: str) -> None:
+    now = time.time()
+    keys = {_cache_tag_key(tag): now for tag in tags if tag}
+    if keys:
+        cache.set_many(keys, timeout=PUBLIC_CACHE_TAG_SECONDS)
+
+
+def _tags_invalidated_since(tags, computed_at: float) -> bool:
+    if not tags:
+        return False
+    invalidated_at = cache.get_many([_cache_tag_key(tag) for tag in tags])
+    return any(timestamp >= computed_at for timestamp in invalidated_at.values())
+
+
 def has_auth_context(request: HttpRequest) -> bool:
     auth_cookie_name = str(
         getattr(settings, "SITE_AUTH_COOKIE_NAME", "comuna_site_token")
@@ -41,6 +83,72 @@ def public_cache_control(response: HttpResponse, *, seconds: int | None = None)
     return response
 
 
+def _count_cache_outcome(prefix: str, outcome: str) -> None:
+    global _STATS_FLUSHED_AT
+    now = time.monotonic()
+    with _STATS_LOCK:
+        _PENDING_STATS[(prefix, outcome)] += 1
+        due = now - _STATS_FLUSHED_AT >= ANONYMOUS_CACHE_STATS_FLUSH_SECONDS
+    if due:
+        flush_anonymous_cache_stats()
+
+
+def _cache_stats_key(prefix: str, outcome: str) -> str:
+    return f"public-api:{prefix}:stats:{outcome}"
+
+
+def flush_anonymous_cache_stats() -> None:
+    global _STATS_FLUSHED_AT
+    with _STATS_LOCK:
+        pending = dict(_PENDING_STATS)
+        _PENDING_STATS.clear()
+        _STATS_FLUSHED_AT = time.monotonic()
+    for (prefix, outcome), amount in pending.items():
+        stats_key = _cache_stats_key(prefix, outcome)
+        try:
+            if not cache.add(stats_key, amount, timeout=None):
+                cache.incr(stats_key, amount)
+        except ValueError:
+            cache.set(stats_key, amount, timeout=None)
+
+
+def anonymous_cache_stats() -> dict[str, dict[str, int]]:
+    flush_anonymous_cache_stats()
+    prefixes = sorted(_CACHE_PREFIXES)
+    keys = {
+        _cache_stats_key(prefix, outcome): (prefix, outcome)
+        for prefix in prefixes
+        for outcome in ANONYMOUS_CACHE_OUTCOMES
+    }
+    values = cache.get_many(list(keys))
+    stats = {prefix: dict.fromkeys(ANONYMOUS_CACHE_OUTCOMES, 0) for prefix in prefixes}
+    for stats_key, (prefix, outcome) in keys.items():
+        stats[prefix][outcome] = int(values.get(stats_key) or 0)
+    return stats
+
+
+def _cached_response(cached: dict, outcome: str) -> HttpResponse:
+    response = HttpResponse(
+        cached["content"],
+        status=cached["status"],
+        content_type=cached["content_type"],
+    )
+    for name, value in cached["headers"].items():
+        response[name] = value
+    response["X-Cache"] = outcome
+    return response
+
+
+def _wait_for_fill(cache_key: str, version: int) -> dict | None:
+    deadline = time.monotonic() + ANONYMOUS_CACHE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(ANONYMOUS_CACHE_WAIT_STEP_SECONDS)
+        cached = cache.get(cache_key)
+        if cached is not None and cached.get("version") == version:
+            return cached
+    return None
+
+
 def anonymous_cache(
     *,
     prefix: str,
@@ -48,6 +156,9 @@ def anonymous_cache(
     cache_authenticated: bool = False,
 ) -> Callable[[Callable[..., HttpResponse]], Callable[..., HttpResponse]]:
     timeout = int(seconds if seconds is not None else getattr(settings, "PUBLIC_API_CACHE_SECONDS", 60))
+    stale_seconds = int(getattr(settings, "PUBLIC_API_STALE_SECONDS", 300))
+    refresh_after = timeout * ANONYMOUS_CACHE_EARLY_REFRESH_RATIO
+    _CACHE_PREFIXES.add(prefix)
 
     def decorator(view_func: Callable[..., HttpResponse]) -> Callable[..., HttpResponse]:
         @wraps(view_func)
@@ -61,39 +172,64 @@ def anonymous_cache(
 
             version = cache.get(_cache_prefix_version_key(prefix)) or 1
             key_digest = sha256(request.get_full_path().encode("utf-8")).hexdigest()
-            cache_key = f"public-api:{prefix}:v{version}:{key_digest}"
+            # One entry per URL tagged with the prefix version, so the previous
+            # version stays available as a stale copy after a bump.
+            cache_key = f"public-api:{prefix}:{key_digest}"
+            lock_key = f"{cache_key}:lock"
             cached = cache.get(cache_key)
+            now = time.time()
+            outcome = "MISS"
             if cached is not None:
-                response = HttpResponse(
-                    cached["content"],
-                    status=cached["status"],
-                    content_type=cached["content_type"],
+                is_current = (
+                    cached.get("version") == version
+                    and now < cached["stored_at"] + timeout
+                    and not _tags_invalidated_since(cached.get("tags"), cached["computed_at"])
                 )
-                for name, value in cached["headers"].items():
-                    response[name] = value
-                response["X-Cache"] = "HIT"
-                return response
-
-            response = view_func(request, *args, **kwargs)
-            if not cache_authenticated:
-                patch_vary_headers(response, ["Cookie", "Authorization"])
-            if response.status_code == 200:
-                public_cache_control(response, seconds=timeout)
-                cache.set(
-                    cache_key,
-                    {
-                        "content": bytes(response.content),
-                        "status": response.status_code,
-                        "content_type": response.get("Content-Type", "application/json"),
-                        "headers": {
-                            name: value
-                            for name, value in response.items()
-                            if name.lower() not in {"set-cookie", "x-cache"}
+                if is_current and now < cached["stored_at"] + refresh_after:
+                    _count_cache_outcome(prefix, "hit")
+                    return _cached_response(cached, "HIT")
+                if not cache.add(lock_key, 1, timeout=ANONYMOUS_CACHE_LOCK_SECONDS):
+                    _count_cache_outcome(prefix, "hit" if is_current else "stale")
+                    return _cached_response(cached, "HIT" if is_current else "STALE")
+                if is_current:
+                    outcome = "REFRESH"
+            elif not cache.add(lock_key, 1, timeout=ANONYMOUS_CACHE_LOCK_SECONDS):
+                cached = _wait_for_fill(cache_key, version)
+                if cached is not None:
+                    _count_cache_outcome(prefix, "hit")
+                    return _cached_response(cached, "HIT")
+                lock_key = None
+
+            _count_cache_outcome(prefix, outcome.lower())
+            computed_at = time.time()
+            try:
+                response = view_func(request, *args, **kwargs)
+                if not cache_authenticated:
+                    patch_vary_headers(response, ["Cookie", "Authorization"])
+                if response.status_code == 200:
+                    public_cache_control(response, seconds=timeout)
+                    cache.set(
+                        cache_key,
+                        {
+                            "version": version,
+                            "stored_at": time.time(),
+                            "computed_at": computed_at,
+                            "tags": sorted(getattr(request, "_public_cache_tags", ())),
+                            "content": bytes(response.content),
+                            "status": response.status_code,
+                            "content_type": response.get("Content-Type", "application/json"),
+                            "headers": {
+                                name: value
+                                for name, value in response.items()
+                                if name.lower() not in {"set-cookie", "x-cache"}
+                            },
                         },
-                    },
-                    timeout=timeout,
-                )
-                response["X-Cache"] = "MISS"
+                        timeout=timeout + stale_seconds,
+                    )
+                    response["X-Cache"] = outcome
+            finally:
+                if lock_key:
+                    cache.delete(lock_key)
             return response
 
         return wrapped
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import pickle
+import time
+from itertools import count
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import connections
+
+CACHE_DATABASE_ALIAS = "cache"
+SHARED_CACHE_TABLE = "rabotaem_shared_cache"
+CULL_EVERY_WRITES = 500
+CULL_BATCH_SIZE = 1000
+
+
+class PostgresCache(BaseCache):
+    """Cache shared by every worker through an UNLOGGED Postgres table.
+
+    Integers are kept in a separate bigint column so ``incr``/``decr`` are a
+    single atomic UPDATE; everything else is pickled.
+
+    Statements go through the ``cache`` database alias, a separate autocommit
+    connection, so they never join (or roll back with) the caller's
+    transaction. The table is created by the ``feeds`` migration
+    ``0190_shared_cache_table``; LOCATION must name it.
+    """
+
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, table, params):
+        super().__init__(params)
+        options = params.get("OPTIONS") or {}
+        self._table = table
+        self._db = options.get("DATABASE", CACHE_DATABASE_ALIAS)
+        self._cull_every = max(1, int(options.get("CULL_EVERY_WRITES", CULL_EVERY_WRITES)))
+        self._writes = count(1)
+
+    @property
+    def _connection(self):
+        return connections[self._db]
+
+    def _quoted_table(self) -> str:
+        return self._connection.ops.quote_name(self._table)
+
+    def _cursor(self):
+        return self._connection.cursor()
+
+    def _encode(self, value) -> tuple[bytes | None, int | None]:
+        if type(value) is int and -(2**63) <= value < 2**63:
+            return None, value
+        return pickle.dumps(value, self.pickle_protocol), None
+
+    @staticmethod
+    def _decode(value, int_value):
+        if value is None:
+            return int_value
+        return pickle.loads(bytes(value))
+
+    def _upsert(self, key, value, timeout, *, only_if_missing: bool) -> bool:
+        encoded, int_value = self._encode(value)
+        expires_at = self.get_backend_timeout(timeout)
+        table = self._quoted_table()
+        condition = f"WHERE {table}.expires_at IS NOT NULL AND {table}.expires_at <= %s" if only_if_missing else ""
+        params = [key, encoded, int_value, expires_at]
+        if only_if_missing:
+            params.append(time.time())
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                INSERT INTO {table} (cache_key, value, int_value, expires_at)
+                VALUES (%s, %s, %s, %s)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    value = EXCLUDED.value,
+                    int_value = EXCLUDED.int_value,
+                    expires_at = EXCLUDED.expires_at
+                {condition}
+                RETURNING 1
+                """,
+                params,
+            )
+            stored = cursor.fetchone() is not None
+        self._maybe_cull()
+        return stored
+
+    def _maybe_cull(self) -> None:
+        if next(self._writes) % self._cull_every:
+            return
+        table = self._quoted_table()
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                DELETE FROM {table}
+                WHERE cache_key IN (
+                    SELECT cache_key FROM {table}
+                    WHERE expires_at <= %s
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED
+                )
+                """,
+                [time.time(), CULL_BATCH_SIZE],
+            )
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT cache_key, value, int_value FROM {self._quoted_table()}
+                WHERE cache_key = ANY(%s) AND (expires_at IS NULL OR expires_at > %s)
+                """,
+                [list(key_map), time.time()],
+            )
+            rows = cursor.fetchall()
+        return {key_map[cache_key]: self._decode(value, int_value) for cache_key, value, int_value in rows}
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        if timeout == 0:
+            self._delete_keys([key])
+            return
+        self._upsert(key, value, timeout, only_if_missing=False)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        for key, value in data.items():
+            self.set(key, value, timeout=timeout, version=version)
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        if timeout == 0:
+            return False
+        return self._upsert(key, value, timeout, only_if_missing=True)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {self._quoted_table()} SET expires_at = %s
+                WHERE cache_key = %s AND (expires_at IS NULL OR expires_at > %s)
+                """,
+                [self.get_backend_timeout(timeout), key, time.time()],
+            )
+            return bool(cursor.rowcount)
+
+    def incr(self, key, delta=1, version=None):
+        cache_key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                UPDATE {self._quoted_table()} SET int_value = int_value + %s
+                WHERE cache_key = %s AND int_value IS NOT NULL AND value IS NULL
+                  AND (expires_at IS NULL OR expires_at > %s)
+                RETURNING int_value
+                """,
+                [delta, cache_key, time.time()],
+            )
+            row = cursor.fetchone()
+        if row is None:
+            raise ValueError("Key '%s' not found" % key)
+        return row[0]
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"""
+                SELECT 1 FROM {self._quoted_table()}
+                WHERE cache_key = %s AND (expires_at IS NULL OR expires_at > %s)
+                """,
+                [key, time.time()],
+            )
+            return cursor.fetchone() is not None
+
+    def _delete_keys(self, keys) -> bool:
+        if not keys:
+            return False
+        with self._cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self._quoted_table()} WHERE cache_key = ANY(%s)",
+                [list(keys)],
+            )
+            return bool(cursor.rowcount)
+
+    def delete(self, key, version=None):
+        return self._delete_keys([self.make_and_validate_key(key, version=version)])
+
+    def delete_many(self, keys, version=None):
+        self._delete_keys([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def clear(self):
+        with self._cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self._quoted_table()}")
+
+
+__all__ = ["CACHE_DATABASE_ALIAS", "SHARED_CACHE_TABLE", "PostgresCache"]
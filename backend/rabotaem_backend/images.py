@@ -10,6 +10,13 @@ from PIL import Image, ImageOps, UnidentifiedImageError
 
 
 IMAGE_VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+WEBP_QUALITY = 82
+WEBP_METHOD = 6
+# Preview encoded inside the request when the other widths are deferred.
+PREVIEW_WEBP_METHOD = 4
+# Widths linked by feed cards (preview and thumbnail in feeds.views); written
+# inside the request too, so a card never points at a width that is queued.
+CARD_VARIANT_WIDTHS = (640, 1280)
 
 
 @dataclass(frozen=True)
@@ -26,13 +33,39 @@ class SavedImageSet:
     default_path: str
     default_url: str
     variants: tuple[SavedImageVariant, ...]
+    # Job that writes the widths left out of ``variants``, see feeds.image_variants.
+    variants_job_id: int | None = None
 
 
 def _storage_url(path: str) -> str:
     return default_storage.url(path)
 
 
-def _save_webp_variant(image: Image.Image, path: str, width: int) -> SavedImageVariant | None:
+def variant_path(original_path: str, width: int) -> str:
+    root, _ext = os.path.splitext(original_path)
+    return f"{root}-{width}.webp"
+
+
+def planned_variant_widths(image_width: int, variant_widths: tuple[int, ...] = IMAGE_VARIANT_WIDTHS) -> list[int]:
+    planned: list[int] = []
+    for width in variant_widths:
+        if width > image_width and planned:
+            continue
+        planned.append(width)
+    return planned
+
+
+def open_image(data: bytes) -> Image.Image | None:
+    try:
+        with Image.open(io.BytesIO(data)) as opened:
+            image = ImageOps.exif_transpose(opened)
+            image.load()
+    except (UnidentifiedImageError, OSError, ValueError):
+        return None
+    return image
+
+
+def encode_webp_variant(image: Image.Image, width: int, *, method: int = WEBP_METHOD) -> tuple[int, bytes] | None:
     if image.width <= 0 or image.height <= 0:
         return None
     target_width = min(width, image.width)
@@ -45,62 +78,86 @@ def _save_webp_variant(image: Image.Image, path: str, width: int) -> SavedImageV
         variant_image = variant_image.convert("RGBA" if "A" in variant_image.getbands() else "RGB")
 
     output = io.BytesIO()
-    variant_image.save(output, format="WEBP", quality=82, method=6)
-    content = ContentFile(output.getvalue())
-    content.content_type = "image/webp"
-    saved_path = default_storage.save(path, content)
+    variant_image.save(output, format="WEBP", quality=WEBP_QUALITY, method=method)
+    return target_width, output.getvalue()
+
+
+def encode_webp_variant_from_bytes(data: bytes, width: int, method: int = WEBP_METHOD) -> tuple[int, bytes] | None:
+    """Process-pool entry point: decodes the original and encodes one width."""
+    image = open_image(data)
+    if image is None:
+        return None
+    return encode_webp_variant(image, width, method=method)
+
+
+def save_webp_variant_bytes(path: str, content: bytes) -> str:
+    file = ContentFile(content)
+    file.content_type = "image/webp"
+    return default_storage.save(path, file)
+
+
+def _save_webp_variant(
+    image: Image.Image,
+    path: str,
+    width: int,
+    *,
+    method: int = WEBP_METHOD,
+) -> SavedImageVariant | None:
+    encoded = encode_webp_variant(image, width, method=method)
+    if encoded is None:
+        return None
+    target_width, content = encoded
+    saved_path = save_webp_variant_bytes(path, content)
     return SavedImageVariant(width=target_width, path=saved_path, url=_storage_url(saved_path))
 
 
+def _original_only(original_path: str, original_url: str) -> SavedImageSet:
+    return SavedImageSet(
+        original_path=original_path,
+        original_url=original_url,
+        default_path=original_path,
+        default_url=original_url,
+        variants=(),
+    )
+
+
 def save_image_with_variants(
     *,
     data: bytes,
     original_path: str,
     variant_widths: tuple[int, ...] = IMAGE_VARIANT_WIDTHS,
     keep_original: bool = True,
+    defer_variants: bool = False,
+    user=None,
 ) -> SavedImageSet:
     original_path = default_storage.save(original_path, ContentFile(data))
     original_url = _storage_url(original_path)
-    root, ext = os.path.splitext(original_path)
+    _root, ext = os.path.splitext(original_path)
     if ext.lower() == ".gif":
-        return SavedImageSet(
-            original_path=original_path,
-            original_url=original_url,
-            default_path=original_path,
-            default_url=original_url,
-            variants=(),
-        )
+        return _original_only(original_path, original_url)
 
-    try:
-        with Image.open(io.BytesIO(data)) as opened:
-            image = ImageOps.exif_transpose(opened)
-            image.load()
-    except (UnidentifiedImageError, OSError, ValueError):
-        return SavedImageSet(
+    image = open_image(data)
+    if image is None:
+        return _original_only(original_path, original_url)
+
+    if defer_variants:
+        return _save_preview_and_defer_variants(
+            image,
             original_path=original_path,
             original_url=original_url,
-            default_path=original_path,
-            default_url=original_url,
-            variants=(),
+            variant_widths=variant_widths,
+            keep_original=keep_original,
+            user=user,
         )
 
     variants: list[SavedImageVariant] = []
-    for width in variant_widths:
-        if width > image.width and variants:
-            continue
-        variant_path = f"{root}-{width}.webp"
-        variant = _save_webp_variant(image, variant_path, width)
+    for width in planned_variant_widths(image.width, variant_widths):
+        variant = _save_webp_variant(image, variant_path(original_path, width), width)
         if variant is not None:
             variants.append(variant)
 
     if not variants:
-        return SavedImageSet(
-            original_path=original_path,
-            original_url=original_url,
-            default_path=original_path,
-            default_url=original_url,
-            variants=(),
-        )
+        return _original_only(original_path, original_url)
 
     default_variant = variants[-1]
     if not keep_original and original_path != default_variant.path:
@@ -115,3 +172,60 @@ def save_image_with_variants(
         default_url=default_variant.url,
         variants=tuple(variants),
     )
+
+
+def _save_preview_and_defer_variants(
+    image: Image.Image,
+    *,
+    original_path: str,
+    original_url: str,
+    variant_widths: tuple[int, ...],
+    keep_original: bool,
+    user=None,
+) -> SavedImageSet:
+    from feeds.image_variants import enqueue_image_variant_job
+
+    widths = planned_variant_widths(image.width, variant_widths)
+    if not widths:
+        return _original_only(original_path, original_url)
+    default_variant = _save_webp_variant(
+        image,
+        variant_path(original_path, widths[-1]),
+        widths[-1],
+        method=PREVIEW_WEBP_METHOD,
+    )
+    if default_variant is None:
+        return _original_only(original_path, original_url)
+
+    written: list[SavedImageVariant] = []
+    pending: list[tuple[int, str]] = []
+    for width in widths[:-1]:
+        path = variant_path(original_path, width)
+        if width in CARD_VARIANT_WIDTHS:
+            variant = _save_webp_variant(image, path, width, method=PREVIEW_WEBP_METHOD)
+            if variant is not None:
+                written.append(variant)
+                continue
+        pending.append((width, path))
+    delete_original = not keep_original and original_path != default_variant.path
+    job = None
+    if pending or delete_original:
+        job = enqueue_image_variant_job(
+            original_path=original_path,
+            variants=pending,
+            delete_original=delete_original,
+            user=user,
+        )
+    if delete_original:
+        original_path = default_variant.path
+        original_url = default_variant.url
+
+    return SavedImageSet(
+        original_path=original_path,
+        original_url=original_url,
+        default_path=default_variant.path,
+        default_url=default_variant.url,
+        # Only widths that exist now; the job reports the rest once written.
+        variants=(*written, default_variant),
+        variants_job_id=job.pk if job and pending else None,
+    )
@@ -1,18 +1,27 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import re
+import threading
 import urllib.parse
+from collections import OrderedDict
 from typing import Any
 
 from django.conf import settings
+from django.core.cache import cache
 from django.http import HttpRequest
 
 _S3_PUBLIC_MODES = {"s3", "s3-first", "s3_first", "s3_public", "s3-public"}
 _URL_CANDIDATE_RE = re.compile(r"https?://[^\s\"'<>\\]+|(?<![:\w/])/[^\s\"'<>\\]+", re.IGNORECASE)
 _BASE64_CANDIDATE_RE = re.compile(r"[A-Za-z0-9_\-+/=]+")
 _TRAILING_PUNCTUATION = ".,;:)]}"
+REWRITE_CACHE_MIN_LENGTH = 256
+REWRITE_CACHE_SECONDS = 24 * 60 * 60
+REWRITE_MEMO_SIZE = 2048
+_REWRITE_MEMO: OrderedDict[str, str] = OrderedDict()
+_REWRITE_MEMO_LOCK = threading.Lock()
 
 
 def public_media_urls_prefer_s3() -> bool:
@@ -262,11 +271,60 @@ def _rewrite_base64_editor_media_urls(
     return None
 
 
+def _media_url_config_version() -> str:
+    values = [
+        str(getattr(settings, name, "") or "")
+        for name in (
+            "MEDIA_PUBLIC_URL_MODE",
+            "MEDIA_PUBLIC_BASE_URL",
+            "MEDIA_S3_PUBLIC_BASE_URL",
+            "MEDIA_LEGACY_URL",
+            "MEDIA_URL",
+            "SITE_BASE_URL",
+            "AWS_S3_CUSTOM_DOMAIN",
+            "AWS_S3_ENDPOINT_URL",
+            "AWS_STORAGE_BUCKET_NAME",
+            "AWS_LOCATION",
+        )
+    ]
+    return hashlib.sha1("\x1f".join(values).encode("utf-8")).hexdigest()[:12]
+
+
+def _remember_rewrite(key: str, rewritten: str) -> None:
+    with _REWRITE_MEMO_LOCK:
+        _REWRITE_MEMO[key] = rewritten
+        _REWRITE_MEMO.move_to_end(key)
+        while len(_REWRITE_MEMO) > REWRITE_MEMO_SIZE:
+            _REWRITE_MEMO.popitem(last=False)
+
+
 def rewrite_public_media_urls(value: object, *, request: HttpRequest | None = None) -> str:
     text = str(value or "")
     if not text or not public_media_urls_prefer_s3():
         return text
-
+    if request is not None or len(text) < REWRITE_CACHE_MIN_LENGTH:
+        return _rewrite_public_media_text(text, request=request)
+
+    # Rewrites are keyed by content and media settings, so each content
+    # version is decoded and rewritten once across requests and workers.
+    digest = hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+    key = f"media-rewrite:{_media_url_config_version()}:{digest}"
+    with _REWRITE_MEMO_LOCK:
+        rewritten = _REWRITE_MEMO.get(key)
+        if rewritten is not None:
+            _REWRITE_MEMO.move_to_end(key)
+    if rewritten is None:
+        cached = cache.get(key)
+        if cached is None:
+            rewritten = _rewrite_public_media_text(text)
+            cache.set(key, "" if rewritten == text else rewritten, timeout=REWRITE_CACHE_SECONDS)
+        else:
+            rewritten = cached or text
+        _remember_rewrite(key, rewritten)
+    return rewritten
+
+
+def _rewrite_public_media_text(text: str, *, request: HttpRequest | None = None) -> str:
     rewritten_editor_content = _rewrite_base64_editor_media_urls(text, request=request)
     if rewritten_editor_content is not None:
         return rewritten_editor_content
@@ -287,7 +345,9 @@ def rewrite_public_media_urls(value: object, *, request: HttpRequest | None = No
 
 def rewrite_public_media_payload(value: Any, *, request: HttpRequest | None = None) -> Any:
     if isinstance(value, str):
-        return rewrite_public_media_urls(value, request=request)
+        if not value or not public_media_urls_prefer_s3():
+            return value
+        return _rewrite_public_media_text(value, request=request)
     if isinstance(value, list):
         return [rewrite_public_media_payload(item, request=request) for item in value]
     if isinstance(value, tuple):
@@ -115,6 +115,15 @@ DATABASES = {
     },
 }
 
+# The shared cache talks to the same database over its own connection, so its
+# statements autocommit instead of joining the request's atomic blocks.
+DATABASES["cache"] = {
+    **DATABASES["default"],
+    "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CACHE_CONN_MAX_AGE", "300")),
+    "CONN_HEALTH_CHECKS": True,
+    "TEST": {"MIRROR": "default"},
+}
+
 DATABASE_ROUTERS = ["legacy_migration.db_router.RomawhoRouter"]
 
 CACHES = {
@@ -327,10 +336,16 @@ PUSH_APNS_USE_SANDBOX = (
     if APPLE_APNS_ENV
     else os.environ.get("PUSH_APNS_USE_SANDBOX", "0") == "1"
 )
+PUSH_FCM_API_URL = os.environ.get("PUSH_FCM_API_URL", "https://fcm.googleapis.com").strip().rstrip("/")
+PUSH_APNS_API_URL = os.environ.get("PUSH_APNS_API_URL", "").strip().rstrip("/")
+PUSH_FCM_MAX_CONCURRENCY = int(os.environ.get("PUSH_FCM_MAX_CONCURRENCY", "32"))
+PUSH_APNS_MAX_CONCURRENCY = int(os.environ.get("PUSH_APNS_MAX_CONCURRENCY", "32"))
+PUSH_REQUEST_TIMEOUT_SECONDS = float(os.environ.get("PUSH_REQUEST_TIMEOUT_SECONDS", "5"))
 SITE_BASE_URL = os.environ.get("SITE_BASE_URL", "http://localhost:5173")
 CONTENT_TRANSLATION_PROVIDER = os.environ.get("CONTENT_TRANSLATION_PROVIDER", "openrouter").strip().lower()
 CONTENT_TRANSLATION_MODEL = os.environ.get("CONTENT_TRANSLATION_MODEL", "").strip()
 CONTENT_TRANSLATION_MAX_TOKENS = int(os.environ.get("CONTENT_TRANSLATION_MAX_TOKENS", "65536"))
+CONTENT_TRANSLATION_BATCH_MAX_CHARS = int(os.environ.get("CONTENT_TRANSLATION_BATCH_MAX_CHARS", "6000"))
 OPENROUTER_API_KEY = os.environ.get("OPENROUTER_API_KEY", "")
 OPENROUTER_API_URL = os.environ.get(
     "OPENROUTER_API_URL",
@@ -1,5 +1,13 @@
 from __future__ import annotations
 
+import fcntl
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
 from django.conf import settings
 from django.core.files.storage import FileSystemStorage, Storage
 from django.utils.functional import cached_property
@@ -8,6 +16,107 @@ from django.utils.module_loading import import_string
 from rabotaem_backend.media_urls import public_media_urls_prefer_s3
 
 
+LOCAL_MEDIA_MANIFEST_NAME = "_migration_reports/local_media_manifest.txt"
+LOCAL_MEDIA_MANIFEST_CHECK_SECONDS = 60
+MEDIA_URL_MEMO_SIZE = 50_000
+
+
+def local_media_manifest_path() -> Path:
+    configured = str(getattr(settings, "MEDIA_LOCAL_MANIFEST_PATH", "") or "").strip()
+    return Path(configured) if configured else Path(settings.MEDIA_ROOT) / LOCAL_MEDIA_MANIFEST_NAME
+
+
+@contextmanager
+def _locked_local_media_manifest(path: Path):
+    # Serializes read-modify-write of the manifest across processes.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.with_name(f"{path.name}.lock").open("a+") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        yield
+
+
+def _replace_local_media_manifest(keys, path: Path) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w",
+        encoding="utf-8",
+        dir=path.parent,
+        prefix=f"{path.name}.",
+        suffix=".tmp",
+        delete=False,
+    ) as tmp_file:
+        tmp_file.write("".join(f"{key}\n" for key in sorted(set(keys))))
+    try:
+        os.replace(tmp_file.name, path)
+    except OSError:
+        os.unlink(tmp_file.name)
+        raise
+
+
+def write_local_media_manifest(keys, path: Path | None = None) -> Path:
+    path = path or local_media_manifest_path()
+    with _locked_local_media_manifest(path):
+        _replace_local_media_manifest(keys, path)
+    return path
+
+
+def prune_local_media_manifest(keys, path: Path | None = None) -> int:
+    """Drops ``keys`` from the manifest file so every process stops serving them locally."""
+    path = path or local_media_manifest_path()
+    with _locked_local_media_manifest(path):
+        try:
+            with path.open(encoding="utf-8") as manifest_file:
+                current = {line.rstrip("\n") for line in manifest_file if line.strip()}
+        except FileNotFoundError:
+            return 0
+        remaining = current - set(keys)
+        if len(remaining) != len(current):
+            _replace_local_media_manifest(remaining, path)
+    return len(current) - len(remaining)
+
+
+class LocalMediaManifest:
+    """In-memory set of legacy local media keys, reloaded when the file changes."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._keys: frozenset[str] | None = None
+        self._signature: tuple[int, int, int] | None = None
+        self._checked_at = float("-inf")
+        self.generation = 0
+
+    def keys(self) -> frozenset[str] | None:
+        now = time.monotonic()
+        if now - self._checked_at < LOCAL_MEDIA_MANIFEST_CHECK_SECONDS:
+            return self._keys
+        with self._lock:
+            if now - self._checked_at >= LOCAL_MEDIA_MANIFEST_CHECK_SECONDS:
+                self._reload()
+                self._checked_at = now
+        return self._keys
+
+    def _reload(self) -> None:
+        try:
+            stat = self.path.stat()
+            signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            signature = None
+        if signature == self._signature:
+            return
+        keys = None
+        if signature is not None:
+            with self.path.open(encoding="utf-8") as manifest_file:
+                keys = frozenset(line.rstrip("\n") for line in manifest_file if line.strip())
+        self._keys, self._signature = keys, signature
+        self.generation += 1
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            if self._keys is not None and name in self._keys:
+                self._keys = self._keys - {name}
+                self.generation += 1
+
+
 class S3MediaStorage(Storage):
     """Store new media in S3 while still serving legacy local files."""
 
@@ -26,8 +135,24 @@ class S3MediaStorage(Storage):
             base_url=getattr(settings, "MEDIA_LEGACY_URL", settings.MEDIA_URL),
         )
 
+    @cached_property
+    def local_manifest(self) -> LocalMediaManifest:
+        return LocalMediaManifest(local_media_manifest_path())
+
+    @cached_property
+    def _url_memo(self) -> dict[tuple[str, bool], str]:
+        self._url_memo_generation = self.local_manifest.generation
+        return {}
+
+    def _is_local(self, name: str) -> bool:
+        keys = self.local_manifest.keys()
+        if keys is None:
+            return self.local_storage.exists(name)
+        # Listed files may since have been moved to S3 and deleted locally.
+        return name in keys and self.local_storage.exists(name)
+
     def _open(self, name: str, mode: str = "rb"):
-        if self.local_storage.exists(name):
+        if self._is_local(name):
             return self.local_storage.open(name, mode)
         return self.s3_storage.open(name, mode)
 
@@ -40,25 +165,43 @@ class S3MediaStorage(Storage):
         finally:
             if self.local_storage.exists(name):
                 self.local_storage.delete(name)
+            # The manifest file is pruned in bulk by cleanup_local_media_s3;
+            # other processes already fall back to S3 once the file is gone.
+            self.local_manifest.discard(name)
+            for prefer_s3 in (False, True):
+                self._url_memo.pop((name, prefer_s3), None)
 
     def exists(self, name: str) -> bool:
-        if self.local_storage.exists(name):
+        if self._is_local(name):
             return True
         return self.s3_storage.exists(name)
 
     def size(self, name: str) -> int:
-        if self.local_storage.exists(name):
+        if self._is_local(name):
             return self.local_storage.size(name)
         return self.s3_storage.size(name)
 
     def url(self, name: str) -> str:
-        if public_media_urls_prefer_s3():
-            return self.s3_storage.url(name)
-        if self.local_storage.exists(name):
+        prefer_s3 = public_media_urls_prefer_s3()
+        if getattr(settings, "AWS_QUERYSTRING_AUTH", False):
+            # Signed URLs expire, so they are never memoized.
+            return self._resolve_url(name, prefer_s3)
+        memo = self._url_memo
+        self.local_manifest.keys()
+        if self._url_memo_generation != self.local_manifest.generation or len(memo) >= MEDIA_URL_MEMO_SIZE:
+            memo.clear()
+            self._url_memo_generation = self.local_manifest.generation
+        url = memo.get((name, prefer_s3))
+        if url is None:
+            url = memo[(name, prefer_s3)] = self._resolve_url(name, prefer_s3)
+        return url
+
+    def _resolve_url(self, name: str, prefer_s3: bool) -> str:
+        if not prefer_s3 and self._is_local(name):
             return self.local_storage.url(name)
         return self.s3_storage.url(name)
 
     def get_modified_time(self, name: str):
-        if self.local_storage.exists(name):
+        if self._is_local(name):
             return self.local_storage.get_modified_time(name)
         return self.s3_storage.get_modified_time(name)
@@ -41,6 +41,7 @@ from editor.views import (
     user_post_update,
     user_posts,
     user_upload,
+    user_upload_variants,
 )
 from feeds.views import (
     author_posts,
@@ -433,6 +434,7 @@ urlpatterns = [
         name="auth-shared-draft-comment-reply",
     ),
     path("api/auth/uploads/", user_upload, name="auth-uploads"),
+    path("api/auth/uploads/variants/<int:job_id>/", user_upload_variants, name="auth-upload-variants"),
     path("api/special-projects/landname/", landname_render, name="special-landname-render"),
     path(
         "api/special-projects/landname/share/",
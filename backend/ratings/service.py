@@ -326,6 +326,19 @@ def calculate_post_community_rating(post, *, settings: RatingSettings | None = N
     )
 
 
+def calculate_posts_community_rating(posts, *, settings: RatingSettings | None = None) -> dict[int, Decimal]:
+    settings = settings or get_rating_settings()
+    post_list = list(posts)
+    comuns_by_post_id = _candidate_comuns_for_posts(post_list)
+    return {
+        post.id: (
+            _decimal(getattr(comuns_by_post_id.get(post.id), "rating_score", 0))
+            * _decimal(settings.post_community_rating_weight)
+        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        for post in post_list
+    }
+
+
 def calculate_author_rating(author, *, settings: RatingSettings | None = None, cutoff=None, now=None) -> Decimal:
     settings = settings or get_rating_settings()
     Post = _post_model()
@@ -536,14 +549,17 @@ def calculate_post_total_rating(
     settings: RatingSettings | None = None,
     author_rating: Decimal | float | int | None = None,
     base_rating: Decimal | float | int | None = None,
+    community_rating: Decimal | float | int | None = None,
 ) -> Decimal:
     settings = settings or get_rating_settings()
     base = _decimal(base_rating) if base_rating is not None else calculate_post_base_rating(post, settings=settings)
     if author_rating is None:
         author_rating = calculate_author_rating(post.author, settings=settings) if getattr(post, "author", None) else 0
+    if community_rating is None:
+        community_rating = calculate_post_community_rating(post, settings=settings)
     rating = (
         base
-        + calculate_post_community_rating(post, settings=settings)
+        + _decimal(community_rating)
         + _decimal(author_rating) * _decimal(settings.post_author_rating_weight)
     )
     return rating.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
@@ -619,6 +635,7 @@ __all__ = [
     "calculate_post_base_rating",
     "calculate_post_total_rating",
     "calculate_posts_base_rating",
+    "calculate_posts_community_rating",
     "format_rating_value",
     "get_rating_settings",
     "home_feed_community_day_key",
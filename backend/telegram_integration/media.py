@@ -58,7 +58,7 @@ def download_telegram_file_by_path(file_path: str, token: str) -> str | None:
     if not ext or len(ext) > 8:
         ext = ".jpg"
     filename = f"posts/telegram/{secrets.token_hex(12)}{ext}"
-    image_set = save_image_with_variants(data=data, original_path=filename)
+    image_set = save_image_with_variants(data=data, original_path=filename, defer_variants=True)
     return build_public_storage_url(image_set.default_url)
 
 
@@ -74,7 +74,7 @@ def download_telegram_file_by_url(url: str) -> str | None:
     if not ext or len(ext) > 8:
         ext = ".jpg"
     filename = f"posts/telegram/{secrets.token_hex(12)}{ext}"
-    image_set = save_image_with_variants(data=data, original_path=filename)
+    image_set = save_image_with_variants(data=data, original_path=filename, defer_variants=True)
     return build_public_storage_url(image_set.default_url)
 
 
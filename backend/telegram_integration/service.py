@@ -15,12 +15,18 @@ from django.utils import timezone
 from jwt import PyJWKClient
 from jwt import PyJWTError
 
-from notifications.models import SiteNotification
+from notifications.models import (
+    TELEGRAM_OUTBOX_STATUS_PENDING,
+    TELEGRAM_OUTBOX_STATUS_SENDING,
+    SiteNotification,
+    TelegramNotificationOutbox,
+)
 from telegram_integration.models import TelegramAccount
 
 User = get_user_model()
 _oidc_jwks_client: PyJWKClient | None = None
 GROUPED_POST_NOTIFICATION_TELEGRAM_LIMIT = 10
+TELEGRAM_MESSAGE_LIMIT = 4096
 
 _TELEGRAM_LOGIN_FIELDS = {
     "id",
@@ -394,17 +400,7 @@ def _grouped_post_notification_text(notification: SiteNotification) -> str:
     return "\n\n".join(line for line in lines if line).strip()
 
 
-def send_site_notification_to_telegram(notification: SiteNotification) -> None:
-    if not notification.is_telegram:
-        return
-    token = (getattr(settings, "TELEGRAM_BOT_TOKEN", "") or "").strip()
-    if not token:
-        return
-
-    account = TelegramAccount.objects.filter(user=notification.user).first()
-    if not account:
-        return
-
+def site_notification_telegram_text(notification: SiteNotification) -> str:
     text = ""
     if notification.event_key == "post_published" and notification.group_key:
         text = _grouped_post_notification_text(notification)
@@ -416,39 +412,84 @@ def send_site_notification_to_telegram(notification: SiteNotification) -> None:
         if link:
             parts.append(link)
         text = "\n\n".join([part for part in parts if part]).strip()
-    if not text:
-        return
+    return text[:TELEGRAM_MESSAGE_LIMIT]
+
 
+def send_telegram_bot_message(token: str, chat_id: int, text: str) -> tuple[bool, str, int, int]:
     payload = urllib.parse.urlencode(
-        {"chat_id": str(account.telegram_id), "text": text[:4096]}
+        {"chat_id": str(chat_id), "text": text[:TELEGRAM_MESSAGE_LIMIT]}
     ).encode("utf-8")
-    if not payload:
-        return
-
     url = f"https://api.telegram.org/bot{token}/sendMessage"
     try:
         request = urllib.request.Request(url, data=payload, method="POST")
         with urllib.request.urlopen(request, timeout=5) as response:
             json.loads(response.read().decode("utf-8") or "{}")
-    except (urllib.error.URLError, TimeoutError, ValueError) as exc:
-        notification.telegram_error = str(exc)
-        notification.save(update_fields=["telegram_error", "updated_at"])
-        return
+    except urllib.error.HTTPError as exc:
+        raw_body = exc.read().decode("utf-8", errors="ignore")
+        try:
+            parsed = json.loads(raw_body or "{}")
+        except ValueError:
+            parsed = {}
+        if not isinstance(parsed, dict):
+            parsed = {}
+        parameters = parsed.get("parameters") if isinstance(parsed.get("parameters"), dict) else {}
+        try:
+            retry_after = int(parameters.get("retry_after") or 0)
+        except (TypeError, ValueError):
+            retry_after = 0
+        error = str(parsed.get("description") or raw_body or exc).strip()
+        return False, error, int(parsed.get("error_code") or exc.code or 0), retry_after
     except Exception as exc:
-        notification.telegram_error = str(exc)
-        notification.save(update_fields=["telegram_error", "updated_at"])
-        return
+        return False, str(exc), 0, 0
+    return True, "", 0, 0
+
+
+def enqueue_site_notifications_to_telegram(notifications) -> int:
+    notifications = [notification for notification in notifications if notification.is_telegram]
+    if not notifications:
+        return 0
+    token = (getattr(settings, "TELEGRAM_BOT_TOKEN", "") or "").strip()
+    if not token:
+        return 0
 
-    notification.telegram_sent_at = timezone.now()
-    notification.telegram_error = ""
-    notification.save(update_fields=["telegram_sent_at", "telegram_error", "updated_at"])
+    chat_id_by_user_id = dict(
+        TelegramAccount.objects.filter(
+            user_id__in={notification.user_id for notification in notifications}
+        ).values_list("user_id", "telegram_id")
+    )
+    queued_notification_ids = set(
+        TelegramNotificationOutbox.objects.filter(
+            notification_id__in=[notification.id for notification in notifications],
+            status__in=[TELEGRAM_OUTBOX_STATUS_PENDING, TELEGRAM_OUTBOX_STATUS_SENDING],
+        ).values_list("notification_id", flat=True)
+    )
+    now = timezone.now()
+    items = [
+        TelegramNotificationOutbox(
+            notification=notification,
+            chat_id=chat_id_by_user_id[notification.user_id],
+            available_at=now,
+        )
+        for notification in notifications
+        if notification.user_id in chat_id_by_user_id and notification.id not in queued_notification_ids
+    ]
+    if items:
+        TelegramNotificationOutbox.objects.bulk_create(items, batch_size=500)
+    return len(items)
+
+
+def send_site_notification_to_telegram(notification: SiteNotification) -> None:
+    enqueue_site_notifications_to_telegram([notification])
 
 
 __all__ = [
     "build_telegram_login_redirect_html",
+    "enqueue_site_notifications_to_telegram",
     "generate_unique_username",
     "notification_link_absolute",
     "send_site_notification_to_telegram",
+    "send_telegram_bot_message",
+    "site_notification_telegram_text",
     "telegram_login_will_create_new_user",
     "telegram_payload_from_oidc_claims",
     "upsert_telegram_account",
@@ -6,3 +6,5 @@ class UsersConfig(AppConfig):
     name = "users"
     verbose_name = "Users"
 
+    def ready(self):
+        import users.auth_signals  # noqa: F401
@@ -0,0 +1,20 @@
+from django.contrib.auth import get_user_model
+from django.core.signals import request_finished
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from . import service as user_service
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User, dispatch_uid="users.auth_cache_user_saved")
+def user_saved(sender, instance, created, update_fields, **kwargs):
+    if created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    user_service._invalidate_user_auth_cache(instance.pk)
+
+
+@receiver(request_finished, dispatch_uid="users.auth_token_touches_flush")
+def request_finished_flush_touches(sender, **kwargs):
+    user_service._flush_auth_token_touches()
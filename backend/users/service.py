@@ -7,6 +7,8 @@ import logging
 import os
 import re
 import secrets
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
@@ -18,6 +20,7 @@ from django.conf import settings
 from django.contrib.auth import authenticate, get_user_model
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth.tokens import default_token_generator
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.db import transaction
@@ -34,6 +37,7 @@ from communities import serializers as community_serializers
 from communities import service as community_service
 from communities.models import Comun
 from feeds.models import Author, Post
+from my_feed import subscription_index
 from post.service import send_email
 from telegram_integration import service as telegram_service
 from telegram_integration.media import is_private_telegram_file_url
@@ -57,6 +61,14 @@ _COOKIE_AUTH_SENTINEL = "__cookie__"
 _VK_JWKS_CLIENTS: dict[str, PyJWKClient] = {}
 _APPLE_JWKS_CLIENTS: dict[str, PyJWKClient] = {}
 DELETED_USER_DISPLAY_NAME = "Удаленный пользователь"
+_AUTH_TOKEN_CACHE_PREFIX = "site-auth-token:"
+_AUTH_TOKEN_CACHE_SECONDS = int(getattr(settings, "SITE_AUTH_TOKEN_CACHE_SECONDS", 60))
+_AUTH_TOKEN_TOUCH_INTERVAL = timedelta(minutes=5)
+_AUTH_TOKEN_TOUCH_FLUSH_SECONDS = int(getattr(settings, "SITE_AUTH_TOKEN_TOUCH_FLUSH_SECONDS", 30))
+_AUTH_TOKEN_TOUCH_LOCK = threading.Lock()
+_AUTH_TOKEN_PENDING_TOUCHES: set[int] = set()
+_AUTH_TOKEN_TOUCHES_FLUSHED_AT = 0.0
+_AUTH_USER_NOT_LOADED = object()
 
 
 def _fv():
@@ -101,26 +113,82 @@ def _issue_token(user: User, request: HttpRequest | None = None) -> str:
     return token
 
 
+def _auth_token_cache_key(token_hash: str) -> str:
+    return f"{_AUTH_TOKEN_CACHE_PREFIX}{token_hash}"
+
+
+def _invalidate_auth_token_cache(token_hashes) -> None:
+    keys = [_auth_token_cache_key(token_hash) for token_hash in token_hashes if token_hash]
+    if keys:
+        cache.delete_many(keys)
+
+
+def _invalidate_user_auth_cache(user_id: int | None, *, on_commit: bool = False) -> None:
+    if not user_id:
+        return
+    token_hashes = list(
+        SiteAuthToken.objects.filter(user_id=user_id, revoked_at__isnull=True).values_list("token_hash", flat=True)
+    )
+    if on_commit:
+        # Hashes are collected now: after commit the tokens are revoked or
+        # moved, and a concurrent request could otherwise re-cache them.
+        transaction.on_commit(lambda: _invalidate_auth_token_cache(token_hashes))
+        return
+    _invalidate_auth_token_cache(token_hashes)
+
+
+def _queue_auth_token_touch(token_id: int) -> None:
+    with _AUTH_TOKEN_TOUCH_LOCK:
+        _AUTH_TOKEN_PENDING_TOUCHES.add(token_id)
+
+
+def _flush_auth_token_touches(*, force: bool = False) -> int:
+    global _AUTH_TOKEN_TOUCHES_FLUSHED_AT
+    now_monotonic = time.monotonic()
+    with _AUTH_TOKEN_TOUCH_LOCK:
+        if not _AUTH_TOKEN_PENDING_TOUCHES:
+            return 0
+        if not force and now_monotonic - _AUTH_TOKEN_TOUCHES_FLUSHED_AT < _AUTH_TOKEN_TOUCH_FLUSH_SECONDS:
+            return 0
+        token_ids = sorted(_AUTH_TOKEN_PENDING_TOUCHES)
+        _AUTH_TOKEN_PENDING_TOUCHES.clear()
+        _AUTH_TOKEN_TOUCHES_FLUSHED_AT = now_monotonic
+    return SiteAuthToken.objects.filter(id__in=token_ids).update(last_used_at=timezone.now())
+
+
 def _get_user_from_token(token: str) -> User | None:
     token = (token or "").strip()
     if not token or token == _COOKIE_AUTH_SENTINEL:
         return None
-    auth_token = (
-        SiteAuthToken.objects.select_related("user")
-        .filter(
-            token_hash=_hash_auth_token(token),
-            revoked_at__isnull=True,
-            expires_at__gt=timezone.now(),
-            user__is_active=True,
+    token_hash = _hash_auth_token(token)
+    now = timezone.now()
+    cache_key = _auth_token_cache_key(token_hash)
+    cached = cache.get(cache_key)
+    if cached is None or cached["expires_at"] <= now:
+        auth_token = (
+            SiteAuthToken.objects.select_related("user")
+            .filter(
+                token_hash=token_hash,
+                revoked_at__isnull=True,
+                expires_at__gt=now,
+                user__is_active=True,
+            )
+            .first()
         )
-        .first()
-    )
-    if not auth_token:
-        return None
-    if not auth_token.last_used_at or auth_token.last_used_at < timezone.now() - timedelta(minutes=5):
-        auth_token.last_used_at = timezone.now()
-        auth_token.save(update_fields=["last_used_at"])
-    return auth_token.user
+        if not auth_token:
+            return None
+        cached = {
+            "user": auth_token.user,
+            "token_id": auth_token.id,
+            "expires_at": auth_token.expires_at,
+            "last_used_at": auth_token.last_used_at,
+        }
+        cache.set(cache_key, cached, _AUTH_TOKEN_CACHE_SECONDS)
+    if not cached["last_used_at"] or cached["last_used_at"] < now - _AUTH_TOKEN_TOUCH_INTERVAL:
+        _queue_auth_token_touch(cached["token_id"])
+        cached["last_used_at"] = now
+        cache.set(cache_key, cached, _AUTH_TOKEN_CACHE_SECONDS)
+    return cached["user"]
 
 
 def _get_auth_tokens_from_request(request: HttpRequest) -> list[str]:
@@ -142,26 +210,34 @@ def _get_auth_token_from_request(request: HttpRequest) -> str:
 
 
 def _get_user_from_request(request: HttpRequest) -> User | None:
+    memoized = getattr(request, "_site_auth_user", _AUTH_USER_NOT_LOADED)
+    if memoized is not _AUTH_USER_NOT_LOADED:
+        return memoized
+    user = None
     for token in _get_auth_tokens_from_request(request):
         user = _get_user_from_token(token)
         if user:
-            return user
-    return None
+            break
+    request._site_auth_user = user
+    return user
 
 
 def _revoke_token(token: str) -> None:
     token = (token or "").strip()
     if not token or token == _COOKIE_AUTH_SENTINEL:
         return
+    token_hash = _hash_auth_token(token)
     SiteAuthToken.objects.filter(
-        token_hash=_hash_auth_token(token),
+        token_hash=token_hash,
         revoked_at__isnull=True,
     ).update(revoked_at=timezone.now())
+    _invalidate_auth_token_cache([token_hash])
 
 
 def _revoke_request_tokens(request: HttpRequest) -> None:
     for token in _get_auth_tokens_from_request(request):
         _revoke_token(token)
+    request._site_auth_user = None
 
 
 def _set_auth_cookie(response: HttpResponse, token: str) -> None:
@@ -324,6 +400,7 @@ def _delete_site_user_account(user: User) -> None:
         AuthorVerificationCode.objects.filter(user=user).delete()
         TelegramAccount.objects.filter(user=user).delete()
         VkAccount.objects.filter(user=user).delete()
+        _invalidate_user_auth_cache(user.id, on_commit=True)
         SiteAuthToken.objects.filter(user=user, revoked_at__isnull=True).update(revoked_at=now)
         SiteChat.objects.filter(Q(user_one=user) | Q(user_two=user)).delete()
 
@@ -675,6 +752,7 @@ def _merge_feed_settings(target: User, source: User) -> None:
     if not target_settings:
         source_settings.user = target
         source_settings.save(update_fields=["user", "updated_at"])
+        subscription_index.sync_comun_subscriptions_for_user_id(source.id)
         return
     previous_source_settings = {
         "my_feed_comuns": source_settings.my_feed_comuns or [],
@@ -763,6 +841,7 @@ def _merge_user_accounts(target: User, source: User, *, reason: str = "") -> Use
 
         _move_unique_user_rows(AuthorAdmin, source, target, identity_fields=("author",))
         AuthorVerificationCode.objects.filter(user=source).update(user=target)
+        _invalidate_user_auth_cache(source.id, on_commit=True)
         SiteAuthToken.objects.filter(user=source).update(user=target)
 
         Comun = _model_class("feeds", "Comun")
@@ -1891,12 +1970,15 @@ __all__ = [
     "_is_deleted_site_user",
     "_fetch_vk_json",
     "_fetch_vk_id_json",
+    "_flush_auth_token_touches",
     "_generate_verification_code",
     "_generate_unique_username",
     "_get_auth_token_from_request",
     "_get_auth_tokens_from_request",
     "_get_user_from_request",
     "_get_user_from_token",
+    "_invalidate_auth_token_cache",
+    "_invalidate_user_auth_cache",
     "_issue_author_verification_code",
     "_issue_token",
     "_parse_vk_id_token",
@@ -0,0 +1,74 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+
+from users import service as user_service
+from users.models import SiteAuthToken
+
+
+User = get_user_model()
+
+
+class AuthTokenCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="cached-reader")
+        self.token = user_service._issue_token(self.user)
+
+    def _request(self):
+        return RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_repeated_lookups_are_served_from_cache_and_request_memo(self):
+        self.assertEqual(user_service._get_user_from_token(self.token), self.user)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(user_service._get_user_from_token(self.token), self.user)
+
+        cache.clear()
+        request = self._request()
+        with self.assertNumQueries(1):
+            user_service._get_user_from_request(request)
+            user_service._get_user_from_request(request)
+
+    def test_revoke_and_deactivation_invalidate_cached_user(self):
+        self.assertEqual(user_service._get_user_from_token(self.token), self.user)
+
+        user_service._revoke_token(self.token)
+        self.assertIsNone(user_service._get_user_from_token(self.token))
+
+        self.token = user_service._issue_token(self.user)
+        self.assertEqual(user_service._get_user_from_token(self.token), self.user)
+        self.user.is_active = False
+        self.user.save(update_fields=["is_active"])
+        self.assertIsNone(user_service._get_user_from_token(self.token))
+
+    def test_last_used_touches_are_batched(self):
+        stale = timezone.now() - timedelta(hours=1)
+        SiteAuthToken.objects.filter(user=self.user).update(last_used_at=stale)
+        other_token = user_service._issue_token(self.user)
+        SiteAuthToken.objects.filter(user=self.user).update(last_used_at=stale)
+
+        user_service._get_user_from_token(self.token)
+        user_service._get_user_from_token(other_token)
+        self.assertFalse(SiteAuthToken.objects.filter(last_used_at__gt=stale).exists())
+
+        with self.assertNumQueries(1):
+            self.assertEqual(user_service._flush_auth_token_touches(force=True), 2)
+        self.assertEqual(SiteAuthToken.objects.filter(last_used_at__gt=stale).count(), 2)
+        self.assertEqual(user_service._flush_auth_token_touches(force=True), 0)
+
+    def test_account_merge_invalidates_cached_tokens_after_commit(self):
+        target = User.objects.create_user(username="merge-target")
+        self.assertEqual(user_service._get_user_from_token(self.token), self.user)
+        cache_key = user_service._auth_token_cache_key(user_service._hash_auth_token(self.token))
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            user_service._merge_user_accounts(target, self.user)
+            self.assertIsNotNone(cache.get(cache_key))
+
+        self.assertTrue(callbacks)
+        self.assertIsNone(cache.get(cache_key))
+        self.assertEqual(user_service._get_user_from_token(self.token), target)